@@ -0,0 +1,129 @@
+"""
+Benchmark : requêtes/s d'un worker pour check_status, handler synchrone vs async
+Un faux Translator (processus séparé) répond avec une latence fixe ; chaque
+requête porte un ID distinct pour que le cache des statuts ne coalesce rien
+
+Avant : handler synchrone exécuté par le pool de threads du worker
+(PYTHON_THREADPOOL_THREAD_COUNT, par défaut min(32, CPU + 4))
+Après : ``async def main`` sur la boucle du worker, sans limite de threads
+
+Usage: python benchmarks/bench_async_handlers.py [requêtes] [latence_ms]
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import setup_env
+
+LATENCY_MS = 50
+ASYNC_CONCURRENCY = 200
+
+
+def _serve_translator(port_queue, latency_s: float) -> None:
+    """Faux Translator : GET de statut avec ``latency_s`` secondes de latence"""
+    from aiohttp import web
+
+    body = json.dumps({"status": "Running", "summary": {"total": 1, "inProgress": 1}})
+
+    async def status(request):
+        await asyncio.sleep(latency_s)
+        return web.Response(text=body, content_type="application/json")
+
+    async def start():
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", status)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0, backlog=1024)
+        await site.start()
+        port_queue.put(site._server.sockets[0].getsockname()[1])
+        await asyncio.Event().wait()
+
+    asyncio.run(start())
+
+
+def _start_translator(latency_s: float) -> multiprocessing.Process:
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve_translator, args=(port_queue, latency_s), daemon=True)
+    process.start()
+    port = port_queue.get(timeout=30)
+    os.environ["TRANSLATOR_ENDPOINT"] = f"http://127.0.0.1:{port}/"
+    return process
+
+
+def _request(func, translation_id: str):
+    return func.HttpRequest("GET", "/api/check_status", body=b"",
+                            params={"translation_id": translation_id})
+
+
+def run_sync(count: int, threads: int) -> float:
+    """Ancien handler synchrone : StatusHandler sur le pool de threads du worker"""
+    import azure.functions as func
+    from shared.services.status_handler import StatusHandler
+    from shared.utils.response_helper import create_response
+
+    def sync_main(req):
+        result = StatusHandler().check_status(req.params.get("translation_id"))
+        return create_response(result["data"], 200)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        responses = list(pool.map(
+            lambda index: sync_main(_request(func, f"sync-{index}")), range(count)))
+    elapsed = time.perf_counter() - start
+    assert all(response.status_code == 200 for response in responses)
+    return count / elapsed
+
+
+async def _run_async(count: int, concurrency: int) -> float:
+    import azure.functions as func
+    import check_status
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(index: int):
+        async with semaphore:
+            return await check_status.main(_request(func, f"async-{index}"))
+
+    # Préchauffage : construction des services et ouverture du pool
+    await call(-1)
+
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(call(index) for index in range(count)))
+    elapsed = time.perf_counter() - start
+    assert all(response.status_code == 200 for response in responses)
+    return count / elapsed
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else LATENCY_MS
+
+    translator = _start_translator(latency_ms / 1000)
+    # Pools HTTP assez grands pour ne pas brider la concurrence
+    os.environ["HTTP_POOL_CONNECTIONS"] = os.environ["HTTP_POOL_MAXSIZE"] = str(ASYNC_CONCURRENCY)
+    setup_env()
+    logging.disable(logging.CRITICAL)
+
+    default_threads = int(os.getenv("PYTHON_THREADPOOL_THREAD_COUNT", min(32, (os.cpu_count() or 1) + 4)))
+    print(f"{count} requêtes check_status, latence Translator {latency_ms:.0f} ms")
+    print(f"{'handler':<34} {'requêtes/s':>11}")
+    try:
+        for threads in sorted({1, default_threads}):
+            # Débit stable dès quelques centaines de requêtes par thread
+            rate = run_sync(min(count, threads * 200), threads)
+            print(f"{f'sync, {threads} thread(s)':<34} {rate:>11,.0f}")
+        rate = asyncio.run(_run_async(count, ASYNC_CONCURRENCY))
+        print(f"{f'async, {ASYNC_CONCURRENCY} requêtes en vol':<34} {rate:>11,.0f}")
+    finally:
+        translator.terminate()
+
+
+if __name__ == "__main__":
+    main()
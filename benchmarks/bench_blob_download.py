@@ -0,0 +1,146 @@
+"""
+Benchmark : téléchargement d'un fichier traduit de 100 MB
+Compare readall() séquentiel en mémoire (avant) aux plages parallèles
+avec débordement sur disque (après) : pic mémoire Python et débit
+
+Un serveur local minimal émule les GET par plage de Blob Storage ;
+définir AZURE_STORAGE_ENDPOINT (Azurite) pour mesurer contre un vrai stockage.
+
+Usage: python benchmarks/bench_blob_download.py [taille_mb] [latence_ms]
+"""
+
+import asyncio
+import http.server
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import time
+import tracemalloc
+from email.utils import formatdate
+
+from common import setup_env
+
+setup_env()
+logging.disable(logging.CRITICAL)
+
+BLOB_NAME = "bench-100mb-fr.pdf"
+
+
+class _RangeBlobHandler(http.server.BaseHTTPRequestHandler):
+    """GET par plage (x-ms-range) d'un blob unique en mémoire"""
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    payload = b""
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        total = len(self.payload)
+        match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("x-ms-range") or self.headers.get("Range") or "")
+        start, end = 0, total - 1
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2)) if match.group(2) else total - 1, total - 1)
+        body = self.payload[start:end + 1]
+        self.send_response(206 if match else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Type", "application/octet-stream")
+        if match:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{total}")
+        self.send_header("ETag", '"0x8DBENCH"')
+        self.send_header("Last-Modified", formatdate(usegmt=True))
+        self.send_header("x-ms-blob-type", "BlockBlob")
+        self.send_header("x-ms-version", "2023-11-03")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(size: int, latency: float, port_queue) -> None:
+    _RangeBlobHandler.payload = os.urandom(1024 * 1024) * (size // (1024 * 1024))
+    _RangeBlobHandler.latency = latency
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _RangeBlobHandler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def _start_fake_storage(size: int, latency: float) -> str:
+    """Serveur dans un processus séparé pour ne pas fausser la mesure mémoire"""
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(size, latency, port_queue), daemon=True)
+    process.start()
+    return f"http://127.0.0.1:{port_queue.get()}/benchaccount"
+
+
+def _run(label: str, func) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "cas": label,
+        "size_mb": size / 1024 / 1024,
+        "seconds": elapsed,
+        "throughput_mb_s": size / 1024 / 1024 / elapsed,
+        "peak_python_mb": peak / 1024 / 1024
+    }
+
+
+def main() -> None:
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.02
+
+    if not os.getenv("AZURE_STORAGE_ENDPOINT"):
+        os.environ["AZURE_STORAGE_ENDPOINT"] = _start_fake_storage(size_mb * 1024 * 1024, latency)
+
+    from shared.services.blob_service import AsyncBlobService, BlobService
+
+    service = BlobService()
+    if "127.0.0.1:10000" in os.environ["AZURE_STORAGE_ENDPOINT"]:
+        container = service.blob_service_client.get_container_client(service.output_container)
+        if not container.exists():
+            container.create_container()
+        container.upload_blob(BLOB_NAME, os.urandom(size_mb * 1024 * 1024), overwrite=True)
+
+    # Client aux réglages par défaut du SDK, comme avant la configuration des plages
+    from azure.storage.blob import BlobServiceClient
+    default_client = BlobServiceClient(
+        os.environ["AZURE_STORAGE_ENDPOINT"],
+        credential={"account_name": service.account_name, "account_key": service.account_key})
+
+    def before():
+        # Comportement historique : un flux séquentiel, tout le document en mémoire
+        blob_client = default_client.get_blob_client(service.output_container, BLOB_NAME)
+        return len(blob_client.download_blob().readall())
+
+    async def open_translated_file():
+        async_service = AsyncBlobService(service)
+        try:
+            return await async_service.open_translated_file(BLOB_NAME)
+        finally:
+            await async_service.aclose()
+
+    def after():
+        downloaded = asyncio.run(open_translated_file())
+        # Taille relue depuis le spool pour vérifier que tout a bien été écrit
+        with downloaded["file"] as spool:
+            return spool.seek(0, os.SEEK_END)
+
+    print(f"Fichier de {size_mb} MB, latence par requête {latency * 1000:.0f} ms, "
+          f"concurrence {service.download_concurrency}, seuil mémoire {service.spool_threshold // 1024 // 1024} MB")
+    print(f"{'cas':<28} {'durée':>8} {'débit':>12} {'pic mémoire':>12}")
+    for label, func in (("avant (readall séquentiel)", before), ("après (plages + spool)", after)):
+        result = _run(label, func)
+        print(f"{result['cas']:<28} {result['seconds']:>7.2f}s {result['throughput_mb_s']:>8.1f} MB/s "
+              f"{result['peak_python_mb']:>9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
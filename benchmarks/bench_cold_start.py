@@ -0,0 +1,281 @@
+"""
+Démarrage à froid des fonctions : temps d'import et latence de la première requête
+Chaque mesure se fait dans un processus Python neuf, comme une instance Consumption
+qui démarre ; azure.functions est préchargé (le worker l'a déjà importé) et son
+temps est compté à part. Le détail par paquet (``-X importtime``) distingue ce qui
+est chargé à l'import du module de ce qui l'est pendant la première requête
+
+Environnement : Azurite et les faux Translator/Graph, comme bench_e2e.py
+
+Usage: python benchmarks/bench_cold_start.py [--functions check_status,start_translation]
+       [--runs 5] [--top 8] [--azurite URL | --start-azurite]
+       [--output cold_start.json] [--compare reference.json] [--threshold 0.2]
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from common import ROOT_DIR
+from fake_services import start_fake_services
+
+import bench_e2e
+
+FUNCTIONS = ("health", "languages", "formats", "check_status", "start_translation", "get_result")
+# Séparateur écrit sur stderr entre l'import du module et la première requête
+IMPORT_DONE = "--- cold-start: import done ---"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Démarrage à froid des fonctions (import, première requête)")
+    parser.add_argument("--functions", default=",".join(FUNCTIONS), help="fonctions mesurées")
+    parser.add_argument("--runs", type=int, default=5, help="processus neufs par fonction")
+    parser.add_argument("--top", type=int, default=8, help="paquets les plus coûteux affichés")
+    parser.add_argument("--azurite", default=os.getenv("AZURITE_BLOB_ENDPOINT", bench_e2e.AZURITE_ENDPOINT),
+                        help="URL du service Blob d'Azurite")
+    parser.add_argument("--start-azurite", action="store_true",
+                        help="démarre azurite-blob (doit être dans le PATH) pour la durée du benchmark")
+    parser.add_argument("--output", help="fichier JSON des résultats")
+    parser.add_argument("--compare", help="résultats JSON de référence")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="régression tolérée sur les temps (0.2 = +20 %%)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--request", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+# --- Processus mesuré ------------------------------------------------------------
+
+def run_child(function_name: str, request_spec: Dict[str, Any]) -> None:
+    """Importe une fonction, lui envoie deux requêtes et écrit les temps en JSON sur stdout"""
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    logging.disable(logging.CRITICAL)
+
+    started = time.perf_counter()
+    import azure.functions as func
+    worker_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    module = importlib.import_module(function_name)
+    import_ms = (time.perf_counter() - started) * 1000
+    print(IMPORT_DONE, file=sys.stderr, flush=True)
+
+    # Boucle persistante, comme celle du worker
+    loop = asyncio.new_event_loop()
+
+    def call() -> Any:
+        request = func.HttpRequest(
+            request_spec["method"], f"/api/{function_name}", params=request_spec.get("params") or {},
+            body=json.dumps(request_spec["body"]).encode() if request_spec.get("body") else b"",
+            headers={"Content-Type": "application/json"})
+        if asyncio.iscoroutinefunction(module.main):
+            return loop.run_until_complete(module.main(request))
+        return module.main(request)
+
+    started = time.perf_counter()
+    response = call()
+    first_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    call()
+    warm_ms = (time.perf_counter() - started) * 1000
+
+    print(json.dumps({
+        "worker_ms": worker_ms,
+        "import_ms": import_ms,
+        "first_request_ms": first_ms,
+        "warm_request_ms": warm_ms,
+        "status_code": response.status_code,
+    }))
+
+
+def _package_times(importtime_lines: List[str]) -> Dict[str, float]:
+    """Temps propre (ms) par paquet de premier niveau d'une sortie ``-X importtime``"""
+    packages: Dict[str, float] = {}
+    for line in importtime_lines:
+        if not line.startswith("import time:") or "| cumulative |" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|", 2)
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0.0) + int(self_us) / 1000
+    return packages
+
+
+def measure_function(function_name: str, request_spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Un processus neuf : temps mesurés et paquets chargés à l'import puis à la première requête"""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__),
+         "--child", function_name, "--request", json.dumps(request_spec)],
+        capture_output=True, text=True, cwd=ROOT_DIR, env=os.environ.copy(), timeout=120)
+    if process.returncode != 0:
+        raise RuntimeError(f"{function_name}: {process.stderr.strip().splitlines()[-1:]}")
+
+    stderr = process.stderr.splitlines()
+    # Les imports précédant azure.functions sont ceux de l'interpréteur et du benchmark
+    worker_end = next((index for index, line in enumerate(stderr) if line.endswith("| azure.functions")), 0)
+    split = stderr.index(IMPORT_DONE)
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    result["import_packages"] = _package_times(stderr[worker_end + 1:split])
+    result["first_request_packages"] = _package_times(stderr[split + 1:])
+    return result
+
+
+def summarize_runs(runs: List[Dict[str, Any]], top: int) -> Dict[str, Any]:
+    """Médianes des temps ; paquets les plus coûteux (médiane par paquet)"""
+    summary: Dict[str, Any] = {"runs": len(runs), "status_code": runs[-1]["status_code"]}
+    for key in ("worker_ms", "import_ms", "first_request_ms", "warm_request_ms"):
+        summary[key] = round(statistics.median(run[key] for run in runs), 1)
+    for key in ("import_packages", "first_request_packages"):
+        names = {name for run in runs for name in run[key]}
+        medians = {name: statistics.median(run[key].get(name, 0.0) for run in runs) for name in names}
+        summary[key] = {
+            name: round(value, 1)
+            for name, value in sorted(medians.items(), key=lambda item: -item[1])[:top] if value >= 0.1
+        }
+    return summary
+
+
+# --- Préparation ---------------------------------------------------------------------
+
+async def seed_translation() -> Dict[str, str]:
+    """Document source et traduction terminée servant aux requêtes mesurées"""
+    harness = bench_e2e.Harness(argparse.Namespace(jobs=1, concurrency=1), {})
+    stats = bench_e2e.HandlerStats()
+    blob_name = (await harness.upload_documents(16384))[0]
+    response, payload = await harness.call("start_translation", stats, "POST", body={
+        "blob_name": blob_name, "target_language": "fr", "user_id": bench_e2e.USER_ID})
+    if response.status_code != 202:
+        raise RuntimeError(f"start_translation: HTTP {response.status_code}")
+    translation_id = payload["data"]["translation_id"]
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        response, payload = await harness.call("check_status", stats, params={"translation_id": translation_id})
+        if (payload.get("data") or {}).get("status") in bench_e2e.TERMINAL_STATUSES:
+            break
+        await asyncio.sleep(0.2)
+    return {"blob_name": blob_name, "translation_id": translation_id}
+
+
+def request_specs(seed: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    translation = {"translation_id": seed["translation_id"]}
+    document = {"blob_name": seed["blob_name"], "target_language": "fr", "user_id": bench_e2e.USER_ID}
+    return {
+        "health": {"method": "GET"},
+        "languages": {"method": "GET"},
+        "formats": {"method": "GET"},
+        "check_status": {"method": "GET", "params": translation},
+        # Chaque processus soumet un job au faux Translator
+        "start_translation": {"method": "POST", "body": document},
+        "get_result": {"method": "GET", "params": document},
+    }
+
+
+# --- Rapport -------------------------------------------------------------------------
+
+def print_report(results: Dict[str, Any]) -> None:
+    print(f"\n{'fonction':<20} {'import ms':>10} {'1re req. ms':>12} {'req. suiv. ms':>14} {'HTTP':>5}")
+    for name, stats in results["functions"].items():
+        print(f"{name:<20} {stats['import_ms']:>10.1f} {stats['first_request_ms']:>12.1f} "
+              f"{stats['warm_request_ms']:>14.1f} {stats['status_code']:>5}")
+    print(f"\nazure.functions (préchargé par le worker) : "
+          f"{statistics.median(stats['worker_ms'] for stats in results['functions'].values()):.1f} ms")
+    for name, stats in results["functions"].items():
+        def describe(packages: Dict[str, float]) -> str:
+            return ", ".join(f"{package} {value:.1f}" for package, value in packages.items()) or "-"
+        print(f"\n{name}\n  import       : {describe(stats['import_packages'])}"
+              f"\n  1re requête  : {describe(stats['first_request_packages'])}")
+
+
+def compare(results: Dict[str, Any], reference: Dict[str, Any], threshold: float) -> List[str]:
+    """Régressions du temps d'import ou de la première requête au-delà du seuil"""
+    regressions = []
+    print(f"\nComparaison avec {reference.get('meta', {}).get('git_revision') or 'la référence'}")
+    for name, before in reference.get("functions", {}).items():
+        after = results["functions"].get(name)
+        if after is None:
+            continue
+        for key in ("import_ms", "first_request_ms"):
+            ratio = after[key] / before[key] - 1 if before[key] else 0.0
+            print(f"{name + ' ' + key:<38} {before[key]:>9.1f} {after[key]:>9.1f} {ratio:>+7.0%}")
+            # Écarts de moins de 2 ms : bruit de mesure
+            if ratio > threshold and after[key] - before[key] > 2:
+                regressions.append(f"{name}: {key} {before[key]:.1f} → {after[key]:.1f} ms")
+    return regressions
+
+
+def main() -> None:
+    args = parse_args()
+    if args.child:
+        run_child(args.child, json.loads(args.request))
+        return
+
+    functions = [name.strip() for name in args.functions.split(",") if name.strip()]
+    unknown = set(functions) - set(FUNCTIONS)
+    if unknown:
+        sys.exit(f"Fonctions inconnues: {', '.join(sorted(unknown))}")
+
+    azurite = None
+    storage_endpoint = args.azurite.rstrip("/")
+    if args.start_azurite:
+        azurite, storage_endpoint = bench_e2e.start_azurite()
+    elif not bench_e2e.storage_reachable(storage_endpoint):
+        sys.exit(f"Azurite injoignable sur {storage_endpoint} (lancer azurite-blob ou utiliser --start-azurite)")
+
+    services, urls = start_fake_services({"job_seconds": 0.2})
+    state_dir = tempfile.TemporaryDirectory()
+    try:
+        bench_e2e.configure_environment(
+            argparse.Namespace(concurrency=10, no_onedrive=True), storage_endpoint, urls)
+        # État partagé avec les processus mesurés (le backend mémoire est propre à chaque processus)
+        os.environ.update({"STATE_BACKEND": "sqlite",
+                           "STATE_SQLITE_PATH": os.path.join(state_dir.name, "state.db")})
+        logging.disable(logging.CRITICAL)
+        bench_e2e.create_containers()
+        specs = request_specs(asyncio.run(seed_translation()))
+
+        results: Dict[str, Any] = {"functions": {}}
+        for name in functions:
+            print(f"… {name}", file=sys.stderr)
+            runs = [measure_function(name, specs[name]) for _ in range(args.runs)]
+            results["functions"][name] = summarize_runs(runs, args.top)
+        results["meta"] = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "git_revision": bench_e2e._git_revision(),
+            "python": sys.version.split()[0],
+            "runs": args.runs,
+        }
+        print_report(results)
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+            print(f"\nRésultats écrits dans {args.output}")
+
+        if args.compare:
+            with open(args.compare, encoding="utf-8") as reference_file:
+                regressions = compare(results, json.load(reference_file), args.threshold)
+            if regressions:
+                print("\nRégressions :")
+                for regression in regressions:
+                    print(f"  - {regression}")
+                sys.exit(1)
+            print("\nAucune régression")
+    finally:
+        services.terminate()
+        state_dir.cleanup()
+        if azurite is not None:
+            azurite.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,480 @@
+"""
+Benchmark de bout en bout, hors ligne : handlers réels contre Azurite et de faux Translator/Graph
+start_translation → check_status (jusqu'à l'état final) → get_result (avec upload OneDrive),
+pour plusieurs tailles de document, puis languages, formats et health
+
+Mesures par handler : percentiles de latence, codes HTTP, appels amont (Translator, Graph,
+OAuth) et allers-retours Storage par requête ; mémoire (RSS) par taille de document.
+Résultats en JSON (--output) et comparaison à une référence (--compare, code 1 si régression)
+
+Stockage : Azurite (compte de développement), démarré à part ou via --start-azurite :
+    azurite-blob --silent --skipApiVersionCheck --loose --location /tmp/azurite
+
+Usage: python benchmarks/bench_e2e.py [--sizes 16384,1048576,8388608] [--jobs 20]
+       [--concurrency 20] [--job-seconds 2] [--translator-latency-ms 50] [--rate-429 0]
+       [--rate-503 0] [--failure-rate 0] [--output e2e.json] [--compare reference.json]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+
+from common import ROOT_DIR, setup_env, summarize
+from fake_services import DEFAULT_PROFILE, fetch_stats, start_fake_services
+
+# Compte de développement Azurite (clé publique, documentée par Microsoft)
+AZURITE_ACCOUNT = "devstoreaccount1"
+AZURITE_KEY = "Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw=="
+AZURITE_ENDPOINT = f"http://127.0.0.1:10000/{AZURITE_ACCOUNT}"
+
+TERMINAL_STATUSES = {"Succeeded", "Failed", "Cancelled"}
+USER_ID = "bench-user"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de bout en bout hors ligne")
+    parser.add_argument("--sizes", default="16384,1048576,8388608",
+                        help="tailles de document en octets, séparées par des virgules")
+    parser.add_argument("--jobs", type=int, default=20, help="traductions par taille")
+    parser.add_argument("--concurrency", type=int, default=20, help="requêtes simultanées")
+    parser.add_argument("--languages", default="fr", help="langues cibles (ex. fr,de)")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="secondes entre deux check_status")
+    parser.add_argument("--catalog-iterations", type=int, default=200,
+                        help="appels de languages/formats/health")
+    parser.add_argument("--job-seconds", type=float, default=DEFAULT_PROFILE["job_seconds"])
+    parser.add_argument("--translator-latency-ms", type=float, default=DEFAULT_PROFILE["translator_latency_ms"])
+    parser.add_argument("--graph-latency-ms", type=float, default=DEFAULT_PROFILE["graph_latency_ms"])
+    parser.add_argument("--oauth-latency-ms", type=float, default=DEFAULT_PROFILE["oauth_latency_ms"])
+    parser.add_argument("--rate-429", type=float, default=DEFAULT_PROFILE["rate_429"],
+                        help="part des appels Translator répondus en 429")
+    parser.add_argument("--rate-503", type=float, default=DEFAULT_PROFILE["rate_503"],
+                        help="part des appels Translator répondus en 503")
+    parser.add_argument("--failure-rate", type=float, default=DEFAULT_PROFILE["failure_rate"],
+                        help="part des jobs terminés en échec")
+    parser.add_argument("--no-onedrive", action="store_true", help="get_result sans upload OneDrive")
+    parser.add_argument("--azurite", default=os.getenv("AZURITE_BLOB_ENDPOINT", AZURITE_ENDPOINT),
+                        help="URL du service Blob d'Azurite")
+    parser.add_argument("--start-azurite", action="store_true",
+                        help="démarre azurite-blob (doit être dans le PATH) pour la durée du benchmark")
+    parser.add_argument("--output", help="fichier JSON des résultats")
+    parser.add_argument("--compare", help="résultats JSON de référence")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="régression tolérée sur les latences (0.2 = +20 %%)")
+    return parser.parse_args()
+
+
+# --- Azurite -----------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def storage_reachable(endpoint: str) -> bool:
+    try:
+        urlopen(f"{endpoint}?comp=list", timeout=2).close()
+    except HTTPError:
+        # Requête anonyme refusée : le service répond
+        return True
+    except (URLError, OSError):
+        return False
+    return True
+
+
+def start_azurite() -> Tuple[subprocess.Popen, str]:
+    executable = shutil.which("azurite-blob")
+    if not executable:
+        sys.exit("azurite-blob introuvable (npm install -g azurite)")
+    port = _free_port()
+    process = subprocess.Popen(
+        [executable, "--silent", "--skipApiVersionCheck", "--loose",
+         "--blobHost", "127.0.0.1", "--blobPort", str(port),
+         "--location", tempfile.mkdtemp(prefix="azurite-")],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    endpoint = f"http://127.0.0.1:{port}/{AZURITE_ACCOUNT}"
+    deadline = time.monotonic() + 30
+    while not storage_reachable(endpoint):
+        if time.monotonic() > deadline or process.poll() is not None:
+            process.terminate()
+            sys.exit("Azurite n'a pas démarré")
+        time.sleep(0.2)
+    return process, endpoint
+
+
+def configure_environment(args: argparse.Namespace, storage_endpoint: str, urls: Dict[str, str]) -> None:
+    """Variables lues par shared.config : à définir avant tout import du code des fonctions"""
+    os.environ.update({
+        "AZURE_ACCOUNT_NAME": AZURITE_ACCOUNT,
+        "AZURE_ACCOUNT_KEY": AZURITE_KEY,
+        "AZURE_STORAGE_ENDPOINT": storage_endpoint,
+        "TRANSLATOR_ENDPOINT": urls["translator"] + "/",
+        "GRAPH_BASE_URL": urls["graph"] + "/v1.0",
+        "GRAPH_AUTHORITY_URL": urls["graph"],
+        "ONEDRIVE_UPLOAD_ENABLED": "false" if args.no_onedrive else "true",
+        "GRAPH_TOKEN_CACHE_PATH": "",
+        "STATE_BACKEND": "memory",
+        "TRACE_EXPORTER": "none",
+        "HTTP_POOL_CONNECTIONS": str(max(args.concurrency, 10)),
+        "HTTP_POOL_MAXSIZE": str(max(args.concurrency, 20)),
+    })
+    setup_env()
+
+
+def create_containers() -> None:
+    from azure.core.exceptions import ResourceExistsError
+    from azure.storage.blob import BlobServiceClient
+    from shared.config import Config
+
+    client = BlobServiceClient(Config.get_storage_url(), credential={
+        "account_name": AZURITE_ACCOUNT, "account_key": AZURITE_KEY})
+    for container in (Config.INPUT_CONTAINER, Config.OUTPUT_CONTAINER, Config.TRANSLATION_CACHE_CONTAINER):
+        try:
+            client.create_container(container)
+        except ResourceExistsError:
+            pass
+
+
+# --- Mesures -------------------------------------------------------------------
+
+def rss_mb() -> float:
+    """RSS courant du processus (Linux), sinon pic depuis le démarrage"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except OSError:
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kio sous Linux, octets sous macOS
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+class HandlerStats:
+    """Latences, codes HTTP et allers-retours Storage d'un handler pendant une phase"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.status_codes: Dict[str, int] = {}
+        self.round_trips = 0
+
+    def record(self, latency_ms: float, response) -> None:
+        self.latencies.append(latency_ms)
+        code = str(response.status_code)
+        self.status_codes[code] = self.status_codes.get(code, 0) + 1
+        self.round_trips += int(response.headers.get("X-Storage-Round-Trips") or 0)
+
+    def summary(self, upstream: Dict[str, int]) -> Dict[str, Any]:
+        count = len(self.latencies)
+        result = summarize(self.latencies)
+        result.update({
+            "status_codes": self.status_codes,
+            "errors": sum(n for code, n in self.status_codes.items() if code.startswith("5")),
+            "storage_round_trips_per_request": round(self.round_trips / count, 2) if count else 0.0,
+            "upstream_calls_per_request": {
+                route: round(calls / count, 2) for route, calls in sorted(upstream.items())
+            } if count else {},
+        })
+        return result
+
+
+def stats_delta(before: Dict[str, int], after: Dict[str, int]) -> Dict[str, int]:
+    return {route: after[route] - before.get(route, 0)
+            for route in after if after[route] - before.get(route, 0)}
+
+
+class Harness:
+    """Appelle les handlers comme le worker (HttpRequest → HttpResponse) et mesure"""
+
+    def __init__(self, args: argparse.Namespace, urls: Dict[str, str]):
+        import azure.functions as func
+        import check_status
+        import formats
+        import get_result
+        import health
+        import languages
+        import start_translation
+
+        self.func = func
+        self.args = args
+        self.urls = urls
+        self.handlers = {
+            "start_translation": start_translation.main,
+            "check_status": check_status.main,
+            "get_result": get_result.main,
+            "languages": languages.main,
+            "formats": formats.main,
+            "health": health.main,
+        }
+        self.semaphore = asyncio.Semaphore(args.concurrency)
+
+    def upstream_stats(self) -> Dict[str, int]:
+        stats = {}
+        for url in self.urls.values():
+            stats.update(fetch_stats(url))
+        return stats
+
+    async def call(self, name: str, stats: HandlerStats, method: str = "GET",
+                   params: Optional[Dict[str, str]] = None, body: Optional[Dict[str, Any]] = None):
+        request = self.func.HttpRequest(
+            method, f"/api/{name}", params=params or {},
+            body=json.dumps(body).encode() if body is not None else b"",
+            headers={"Content-Type": "application/json"})
+        handler = self.handlers[name]
+        async with self.semaphore:
+            start = time.perf_counter()
+            if asyncio.iscoroutinefunction(handler):
+                response = await handler(request)
+            else:
+                # Handlers synchrones : exécutés par le pool de threads du worker
+                response = await asyncio.to_thread(handler, request)
+            stats.record((time.perf_counter() - start) * 1000, response)
+        try:
+            payload = json.loads(response.get_body() or b"{}")
+        except ValueError:
+            payload = {}
+        return response, payload
+
+    async def phase(self, name: str, coroutines) -> Dict[str, Any]:
+        """Exécute une phase et lui attribue les appels amont observés pendant sa durée"""
+        stats = HandlerStats()
+        before = self.upstream_stats()
+        outcomes = await asyncio.gather(*(coroutine(stats) for coroutine in coroutines))
+        summary = stats.summary(stats_delta(before, self.upstream_stats()))
+        return summary, outcomes
+
+    async def run_catalog(self) -> Dict[str, Any]:
+        results = {}
+        for name in ("languages", "formats", "health"):
+            summary, _ = await self.phase(name, [
+                (lambda stats, name=name: self.call(name, stats))
+                for _ in range(self.args.catalog_iterations)
+            ])
+            results[name] = summary
+        return results
+
+    async def upload_documents(self, size: int) -> List[str]:
+        from azure.storage.blob.aio import BlobServiceClient
+        from shared.config import Config
+
+        run_id = uuid.uuid4().hex[:8]
+        names = [f"e2e-{run_id}-{size}-{index}.docx" for index in range(self.args.jobs)]
+        async with BlobServiceClient(Config.get_storage_url(), credential={
+                "account_name": AZURITE_ACCOUNT, "account_key": AZURITE_KEY}) as client:
+            container = client.get_container_client(Config.INPUT_CONTAINER)
+            # Contenu unique par document : aucune réponse servie par le cache de traductions
+            await asyncio.gather(*(
+                container.upload_blob(name, os.urandom(size), overwrite=True) for name in names))
+        return names
+
+    async def run_size(self, size: int) -> Dict[str, Any]:
+        languages = [language.strip() for language in self.args.languages.split(",") if language.strip()]
+        names = await self.upload_documents(size)
+        rss_before = rss_mb()
+        started = time.perf_counter()
+
+        async def start(stats, blob_name):
+            response, payload = await self.call("start_translation", stats, "POST", body={
+                "blob_name": blob_name, "target_language": languages, "user_id": USER_ID})
+            return (payload.get("data") or {}).get("translation_id") if response.status_code == 202 else None
+
+        start_summary, translation_ids = await self.phase("start_translation", [
+            (lambda stats, name=name: start(stats, name)) for name in names])
+
+        async def poll(stats, translation_id):
+            polls = 0
+            while True:
+                polls += 1
+                response, payload = await self.call(
+                    "check_status", stats, params={"translation_id": translation_id})
+                status = (payload.get("data") or {}).get("status")
+                if response.status_code != 200 or status in TERMINAL_STATUSES:
+                    return status or f"HTTP {response.status_code}", polls
+                await asyncio.sleep(self.args.poll_interval)
+
+        submitted = [(name, translation_id) for name, translation_id in zip(names, translation_ids)
+                     if translation_id]
+        status_summary, outcomes = await self.phase("check_status", [
+            (lambda stats, translation_id=translation_id: poll(stats, translation_id))
+            for _, translation_id in submitted])
+
+        succeeded = [name for (name, _), (status, _) in zip(submitted, outcomes) if status == "Succeeded"]
+        result_summary, _ = await self.phase("get_result", [
+            (lambda stats, name=name: self.call("get_result", stats, params={
+                "blob_name": name, "target_language": ",".join(languages), "user_id": USER_ID}))
+            for name in succeeded])
+
+        final_statuses: Dict[str, int] = {}
+        for status, _ in outcomes:
+            final_statuses[status] = final_statuses.get(status, 0) + 1
+        status_summary["polls_per_job"] = round(
+            sum(polls for _, polls in outcomes) / len(outcomes), 2) if outcomes else 0.0
+
+        return {
+            "start_translation": start_summary,
+            "check_status": status_summary,
+            "get_result": result_summary,
+            "jobs": {
+                "submitted": len(submitted),
+                "rejected": len(names) - len(submitted),
+                "final_status": final_statuses
+            },
+            "wall_seconds": round(time.perf_counter() - started, 3),
+            "memory": {
+                "rss_before_mb": round(rss_before, 1),
+                "rss_after_mb": round(rss_mb(), 1),
+                "rss_peak_mb": round(peak_rss_mb(), 1)
+            }
+        }
+
+
+# --- Rapport -------------------------------------------------------------------
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    def row(label: str, stats: Dict[str, Any]) -> None:
+        upstream = sum(stats.get("upstream_calls_per_request", {}).values())
+        print(f"{label:<30} {stats['iterations']:>6} {stats['mean_ms']:>9.1f} {stats['p50_ms']:>9.1f} "
+              f"{stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} {upstream:>9.2f} "
+              f"{stats['storage_round_trips_per_request']:>8.2f} {stats['errors']:>6}")
+
+    print(f"\n{'handler':<30} {'n':>6} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'amont/req':>9} {'storage':>8} {'5xx':>6}")
+    for name, stats in results["catalog"].items():
+        row(name, stats)
+    for size, scenario in results["sizes"].items():
+        for name in ("start_translation", "check_status", "get_result"):
+            row(f"{name} [{int(size) // 1024} Kio]", scenario[name])
+        memory = scenario["memory"]
+        print(f"{'':<30} jobs {scenario['jobs']['final_status']}, {scenario['wall_seconds']} s, "
+              f"RSS {memory['rss_before_mb']} → {memory['rss_after_mb']} Mo (pic {memory['rss_peak_mb']} Mo)")
+
+
+def _latency_entries(results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    entries = {f"catalog/{name}": stats for name, stats in results.get("catalog", {}).items()}
+    for size, scenario in results.get("sizes", {}).items():
+        for name in ("start_translation", "check_status", "get_result"):
+            entries[f"{size}/{name}"] = scenario[name]
+    return entries
+
+
+def compare(results: Dict[str, Any], reference: Dict[str, Any], threshold: float) -> List[str]:
+    """Régressions : p95 au-delà du seuil, plus d'appels amont ou Storage par requête"""
+    regressions = []
+    current = _latency_entries(results)
+    print(f"\nComparaison avec {reference.get('meta', {}).get('git_revision') or 'la référence'}")
+    print(f"{'handler':<34} {'p95 réf.':>10} {'p95':>10} {'écart':>8}")
+    for key, before in _latency_entries(reference).items():
+        after = current.get(key)
+        if after is None or not before.get("iterations"):
+            continue
+        ratio = after["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        print(f"{key:<34} {before['p95_ms']:>10.1f} {after['p95_ms']:>10.1f} {ratio:>+7.0%}")
+        # Écarts de moins d'une milliseconde : bruit de mesure
+        if ratio > threshold and after["p95_ms"] - before["p95_ms"] > 1:
+            regressions.append(f"{key}: p95 {before['p95_ms']:.1f} → {after['p95_ms']:.1f} ms")
+        for counter in ("storage_round_trips_per_request",):
+            if after[counter] > before[counter]:
+                regressions.append(f"{key}: {counter} {before[counter]} → {after[counter]}")
+        upstream_before = sum(before.get("upstream_calls_per_request", {}).values())
+        upstream_after = sum(after.get("upstream_calls_per_request", {}).values())
+        if upstream_after > upstream_before * (1 + threshold) and upstream_after - upstream_before > 0.05:
+            regressions.append(f"{key}: appels amont {upstream_before:.2f} → {upstream_after:.2f} par requête")
+    return regressions
+
+
+async def run(args: argparse.Namespace, urls: Dict[str, str]) -> Dict[str, Any]:
+    harness = Harness(args, urls)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    results = {"catalog": await harness.run_catalog(), "sizes": {}}
+    for size in sizes:
+        print(f"… documents de {size // 1024} Kio", file=sys.stderr)
+        results["sizes"][str(size)] = await harness.run_size(size)
+    return results
+
+
+def main() -> None:
+    args = parse_args()
+    profile = {
+        "translator_latency_ms": args.translator_latency_ms,
+        "graph_latency_ms": args.graph_latency_ms,
+        "oauth_latency_ms": args.oauth_latency_ms,
+        "job_seconds": args.job_seconds,
+        "rate_429": args.rate_429,
+        "rate_503": args.rate_503,
+        "failure_rate": args.failure_rate,
+    }
+
+    azurite = None
+    storage_endpoint = args.azurite.rstrip("/")
+    if args.start_azurite:
+        azurite, storage_endpoint = start_azurite()
+    elif not storage_reachable(storage_endpoint):
+        sys.exit(f"Azurite injoignable sur {storage_endpoint} (lancer azurite-blob ou utiliser --start-azurite)")
+
+    services, urls = start_fake_services(profile)
+    try:
+        configure_environment(args, storage_endpoint, urls)
+        logging.disable(logging.CRITICAL)
+        create_containers()
+
+        results = asyncio.run(run(args, urls))
+        results["meta"] = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "profile": profile,
+            "sizes": args.sizes,
+            "jobs": args.jobs,
+            "concurrency": args.concurrency,
+            "languages": args.languages,
+            "onedrive": not args.no_onedrive,
+        }
+        print_report(results)
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+            print(f"\nRésultats écrits dans {args.output}")
+
+        if args.compare:
+            with open(args.compare, encoding="utf-8") as reference_file:
+                regressions = compare(results, json.load(reference_file), args.threshold)
+            if regressions:
+                print("\nRégressions :")
+                for regression in regressions:
+                    print(f"  - {regression}")
+                sys.exit(1)
+            print("\nAucune régression")
+    finally:
+        services.terminate()
+        if azurite is not None:
+            azurite.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark : appels OAuth et latence d'obtention du token Graph pour des uploads OneDrive concurrents
+Avant : un cache par instance de GraphService (nouvelle instance par requête)
+Après : GraphTokenProvider partagé par le processus (single-flight, renouvellement anticipé)
+
+Usage: python benchmarks/bench_graph_token.py [requêtes] [threads]
+"""
+
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import setup_env
+
+setup_env()
+logging.disable(logging.CRITICAL)
+
+from shared.services import service_registry  # noqa: E402
+from shared.services.token_provider import GraphTokenProvider  # noqa: E402
+
+OAUTH_LATENCY_S = 0.08
+
+
+class FakeResponse:
+    status_code = 200
+    text = ""
+
+    def __init__(self, index: int):
+        self._body = {"access_token": f"token-{index}", "expires_in": 3599}
+
+    def json(self):
+        return self._body
+
+
+class FakeOAuthClient:
+    """login.microsoftonline.com simulé : latence fixe, appels comptés"""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def post(self, url, **kwargs):
+        with self._lock:
+            self.calls += 1
+            index = self.calls
+        time.sleep(OAUTH_LATENCY_S)
+        return FakeResponse(index)
+
+
+def run(requests_count: int, threads: int, shared: bool) -> dict:
+    service_registry.reset_services()
+    client = FakeOAuthClient()
+    service_registry.set_service("http", client)
+    provider = GraphTokenProvider(cache_path="") if shared else None
+
+    def get_token(_):
+        start = time.perf_counter()
+        # Ancien comportement : le cache vit sur une instance créée pour la requête
+        token = (provider or GraphTokenProvider(background_refresh=False, cache_path="")).get_token()
+        assert token
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = sorted(pool.map(get_token, range(requests_count)))
+    if provider:
+        provider.close()
+    return {
+        "oauth_calls": client.calls,
+        "mean_ms": sum(latencies) / len(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1]
+    }
+
+
+def main() -> None:
+    requests_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    print(f"{requests_count} uploads, {threads} threads, latence OAuth {OAUTH_LATENCY_S * 1000:.0f} ms")
+    print(f"{'cache':<22} {'appels OAuth':>13} {'moyenne':>10} {'p95':>10}")
+    for label, shared in (("par instance (avant)", False), ("processus (après)", True)):
+        result = run(requests_count, threads, shared)
+        print(f"{label:<22} {result['oauth_calls']:>13} {result['mean_ms']:>8.2f}ms {result['p95_ms']:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
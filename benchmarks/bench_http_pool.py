@@ -0,0 +1,89 @@
+"""
+Benchmark : latence d'un appel de statut avec et sans réutilisation des connexions
+Un serveur HTTPS local simule l'API Translator (handshake TLS réel)
+
+Usage: python benchmarks/bench_http_pool.py [iterations]
+"""
+
+import http.server
+import logging
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+
+import requests
+
+from common import measure, print_results, setup_env
+
+setup_env()
+logging.disable(logging.CRITICAL)
+
+from shared.services.http_client import HttpClient  # noqa: E402
+
+
+class _StatusHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Réponse écrite en un seul segment pour éviter l'effet Nagle/ACK retardé
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = b'{"status": "Running", "summary": {"total": 1, "inProgress": 1}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_tls_server() -> str:
+    """Démarre un serveur HTTPS auto-signé, fait confiance au certificat et retourne l'URL"""
+    workdir = tempfile.mkdtemp()
+    cert = os.path.join(workdir, "cert.pem")
+    key = os.path.join(workdir, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost", "-keyout", key, "-out", cert],
+        check=True, capture_output=True
+    )
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _StatusHandler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["REQUESTS_CA_BUNDLE"] = cert
+    os.environ["SSL_CERT_FILE"] = cert
+    return f"https://localhost:{server.server_address[1]}/batches/bench"
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    url = _start_tls_server()
+
+    requests_client = HttpClient(backend="requests")
+
+    results = {
+        "avant (requests.get)": measure(lambda: requests.get(url, timeout=5), iterations),
+        "après (pool requests)": measure(lambda: requests_client.get(url, timeout=5), iterations),
+    }
+
+    try:
+        httpx_client = HttpClient(backend="httpx")
+        results["après (pool httpx)"] = measure(lambda: httpx_client.get(url, timeout=5), iterations)
+    except ImportError:
+        httpx_client = None
+
+    print_results(f"Appel de statut HTTPS local ({iterations} itérations)", results)
+    print("\nCompteurs requests:", requests_client.get_stats())
+    if httpx_client:
+        print("Compteurs httpx:   ", httpx_client.get_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark : réponses/s de create_response pour des corps typiques (statut, résultat, langues)
+Avant : json.dumps indenté, trois datetime.utcnow() et en-têtes reconstruits à chaque réponse
+Après : en-têtes précalculés, un horodatage, JSON compact avec json ou orjson
+Catalogue des langues : corps précalculé (create_catalog_response), 200 et 304 sur If-None-Match
+
+Usage: python benchmarks/bench_response_helper.py [itérations]
+"""
+
+import importlib.util
+import json
+import logging
+import sys
+from datetime import datetime
+
+from common import measure, setup_env
+
+setup_env()
+logging.disable(logging.CRITICAL)
+
+import azure.functions as func  # noqa: E402
+
+import languages  # noqa: E402
+from shared.config import Config  # noqa: E402
+from shared.models.constants import SupportedLanguages  # noqa: E402
+from shared.services.tracing import trace_request  # noqa: E402
+from shared.utils import response_helper  # noqa: E402
+
+SAS_URL = ("https://sttradclient.blob.core.windows.net/doc-trad/rapport-annuel-2024-fr.docx"
+           "?se=2024-06-01T12%3A00%3A00Z&sp=r&sv=2023-11-03&sr=b&sig=" + "a" * 44)
+
+PAYLOADS = {
+    "statut": {
+        "translation_id": "3f2c9a7e-51b4-4c8e-9d0a-6b1e2f7c8d90",
+        "status": "InProgress",
+        "progress": 40,
+        "summary": {"total": 5, "failed": 0, "success": 2, "inProgress": 3, "notYetStarted": 0,
+                    "cancelled": 0, "totalCharacterCharged": 18342},
+        "created_at": "2024-06-01T10:00:00Z",
+        "last_updated": "2024-06-01T10:00:42Z",
+        "estimated_completion": "2024-06-01T10:01:30Z",
+        "next_poll_after": 5,
+        "message": "Traduction en cours… 2/5 documents traités",
+    },
+    "résultat": {
+        "translation_id": "3f2c9a7e-51b4-4c8e-9d0a-6b1e2f7c8d90",
+        "status": "Succeeded",
+        "blob_name": "rapport-annuel-2024.docx",
+        "target_language": "fr",
+        "translated_blob_name": "rapport-annuel-2024-fr.docx",
+        "download_url": SAS_URL,
+        "onedrive_url": "https://contoso-my.sharepoint.com/personal/alice/Documents/Traductions/rapport-annuel-2024-fr.docx",
+        "file_size": 482133,
+        "file_size_formatted": "470.8 KB",
+        "expires_at": "2024-06-01T12:00:00Z",
+    },
+    "langues": {
+        "languages": SupportedLanguages.get_all_languages(),
+        "count": len(SupportedLanguages.LANGUAGES),
+    },
+}
+
+
+def legacy_create_response(data, status_code=200):
+    """Ancienne implémentation : en-têtes reconstruits, json.dumps(indent=2), trois horodatages"""
+    headers = {
+        'Content-Type': 'application/json; charset=utf-8',
+        'X-Timestamp': datetime.utcnow().isoformat() + 'Z',
+        'X-Service': 'Azure-Functions-Translation'
+    }
+    headers.update(response_helper.tracing.response_headers())
+    if 'Access-Control-Allow-Origin' not in headers:
+        headers['Access-Control-Allow-Origin'] = '*'
+        headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
+        headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, X-Requested-With'
+        headers['Timing-Allow-Origin'] = '*'
+    response_data = {'success': True, 'timestamp': datetime.utcnow().isoformat() + 'Z', 'data': data}
+    return func.HttpResponse(body=json.dumps(response_data, ensure_ascii=False, indent=2),
+                             status_code=status_code, headers=headers, mimetype='application/json')
+
+
+def configure(encoder: str, compact: bool) -> None:
+    Config.RESPONSE_JSON_ENCODER = encoder
+    Config.RESPONSE_JSON_COMPACT = compact
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    variants = [
+        ("avant", None),
+        ("json indenté", ("json", False)),
+        ("json compact", ("json", True)),
+    ]
+    if _orjson_installed():
+        variants.append(("orjson compact", ("orjson", True)))
+    else:
+        print("orjson absent : variante orjson ignorée")
+
+    print(f"create_response : {iterations} réponses par cas")
+    print(f"{'corps':<10} {'variante':<16} {'taille':>8} {'µs/réponse':>11} {'réponses/s':>11}")
+    for payload_name, payload in PAYLOADS.items():
+        for label, settings in variants:
+            if settings is None:
+                create = legacy_create_response
+            else:
+                configure(*settings)
+                create = response_helper.create_response
+            size = len(create(payload).get_body())
+            result = measure(lambda: create(payload), iterations=iterations, warmup=200)
+            mean_us = result["mean_ms"] * 1000
+            print(f"{payload_name:<10} {label:<16} {size:>7}o {mean_us:>10.1f} {1e6 / mean_us:>11,.0f}")
+
+    def catalog_request(etag=None):
+        return func.HttpRequest("GET", "/api/languages", body=b"",
+                                headers={"If-None-Match": etag} if etag else {})
+
+    @trace_request("languages")
+    def legacy_languages(req):
+        return legacy_create_response(languages._payload(SupportedLanguages.get_all_languages()))
+
+    etag = languages.main(catalog_request()).headers["ETag"]
+    cases = {
+        "avant": lambda: legacy_languages(catalog_request()),
+        "précalculé 200": lambda: languages.main(catalog_request()),
+        "précalculé 304": lambda: languages.main(catalog_request(etag)),
+    }
+    print(f"\nGET /api/languages : {iterations} requêtes par cas")
+    print(f"{'cas':<16} {'taille':>8} {'µs/requête':>11} {'requêtes/s':>11}")
+    for label, call in cases.items():
+        size = len(call().get_body())
+        result = measure(call, iterations=iterations, warmup=200)
+        mean_us = result["mean_ms"] * 1000
+        print(f"{label:<16} {size:>7}o {mean_us:>10.1f} {1e6 / mean_us:>11,.0f}")
+
+
+def _orjson_installed() -> bool:
+    return importlib.util.find_spec("orjson") is not None
+
+
+if __name__ == "__main__":
+    main()
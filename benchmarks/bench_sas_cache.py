@@ -0,0 +1,56 @@
+"""
+Benchmark : coût de signature des URL SAS d'un get_result répété (job de plusieurs documents/langues)
+Avant : un HMAC par URL et par appel (generate_blob_sas)
+Après : SasCache, une signature par (blob, permissions) et par tranche d'expiration
+
+Usage: python benchmarks/bench_sas_cache.py [documents] [langues] [polls]
+"""
+
+import logging
+import sys
+from datetime import datetime, timedelta, timezone
+
+from common import measure, setup_env
+
+setup_env()
+logging.disable(logging.CRITICAL)
+
+from azure.storage.blob import generate_blob_sas  # noqa: E402
+
+from shared.config import Config  # noqa: E402
+from shared.services.sas_cache import SasCache  # noqa: E402
+
+CONTAINER = "doc-trad"
+
+
+def main() -> None:
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    languages = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    polls = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    blobs = [f"jobs/job-1/{lang}/document-{index}.docx"
+             for index in range(documents) for lang in range(languages)]
+
+    def sign_every_time():
+        expiry = datetime.now(timezone.utc) + timedelta(hours=2)
+        for blob in blobs:
+            generate_blob_sas(account_name=Config.AZURE_ACCOUNT_NAME, container_name=CONTAINER,
+                              blob_name=blob, account_key=Config.AZURE_ACCOUNT_KEY,
+                              permission="r", expiry=expiry)
+
+    cache = SasCache(Config.AZURE_ACCOUNT_NAME, Config.AZURE_ACCOUNT_KEY, user_delegation=False)
+
+    def cached():
+        for blob in blobs:
+            cache.blob_sas(CONTAINER, blob, "r", expiry_hours=2)
+
+    print(f"get_result : {len(blobs)} URL SAS par appel, {polls} appels")
+    print(f"{'signature':<18} {'moyenne':>10} {'p95':>10}")
+    for label, func in (("à chaque appel", sign_every_time), ("SasCache", cached)):
+        result = measure(func, iterations=polls, warmup=1)
+        print(f"{label:<18} {result['mean_ms']:>8.2f}ms {result['p95_ms']:>8.2f}ms")
+    stats = cache.get_stats()["blob"]
+    print(f"SasCache : {stats['hits']} hits, {stats['misses']} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark : coût par requête de l'obtention des services
+Compare la construction à chaque invocation (avant) au registre partagé (après)
+
+Usage: python benchmarks/bench_service_registry.py [iterations]
+"""
+
+import logging
+import sys
+
+from common import measure, print_results, setup_env
+
+setup_env()
+logging.disable(logging.CRITICAL)
+
+from shared.services.blob_service import BlobService  # noqa: E402
+from shared.services.graph_service import GraphService  # noqa: E402
+from shared.services.translation_service import TranslationService  # noqa: E402
+from shared.services import service_registry  # noqa: E402
+
+
+def per_request_construction():
+    """Comportement historique : un jeu de services neuf par requête"""
+    return BlobService(), TranslationService(), GraphService()
+
+
+def registry_lookup():
+    """Services partagés du worker"""
+    return (
+        service_registry.get_blob_service(),
+        service_registry.get_translation_service(),
+        service_registry.get_graph_service(),
+    )
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    service_registry.reset_services()
+
+    results = {
+        "avant (construction)": measure(per_request_construction, iterations),
+        "après (registre)": measure(registry_lookup, iterations),
+    }
+    print_results(f"Obtention des services par requête ({iterations} itérations)", results)
+
+    speedup = results["avant (construction)"]["mean_ms"] / max(results["après (registre)"]["mean_ms"], 1e-9)
+    print(f"\nGain moyen: x{speedup:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark : débit de save_translation_state / get_translation_state par backend d'état
+Compare les écritures unitaires aux écritures par lots, et les lectures
+servies par le cache local aux lectures sur le backend
+
+Usage: python benchmarks/bench_state_backends.py [opérations]
+Azure Table : démarrer Azurite puis définir
+AZURE_TABLE_ENDPOINT=http://127.0.0.1:10002/devstoreaccount1 (compte devstoreaccount1)
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from common import setup_env
+
+setup_env()
+logging.disable(logging.CRITICAL)
+
+from shared.models.schemas import TranslationInfo, TranslationStatus  # noqa: E402
+from shared.services.state_manager import StateManager  # noqa: E402
+from shared.services.state_store import (  # noqa: E402
+    MemoryStateBackend,
+    SqliteStateBackend,
+    StateStore,
+    TableStateBackend
+)
+
+
+def make_info(index: int) -> TranslationInfo:
+    name = f"document-{index}.docx"
+    return TranslationInfo(
+        file_name=name,
+        target_language="fr",
+        target_languages=["fr"],
+        user_id=f"user-{index % 50}",
+        blob_urls={
+            "source_url": f"https://bench.blob.core.windows.net/doc-to-trad/{name}?sv=2024&sig=x",
+            "target_url": f"https://bench.blob.core.windows.net/doc-trad/document-{index}-fr.docx?sv=2024&sig=x",
+            "input_blob_name": name,
+            "output_blob_name": f"document-{index}-fr.docx"
+        },
+        status=TranslationStatus.IN_PROGRESS.value,
+        started_at=time.time(),
+        translation_id=f"azure-{index}"
+    )
+
+
+def run_case(backend_factory, operations: int, batch_size: int) -> dict:
+    """Écritures puis lectures (cache chaud, puis backend seul) sur un backend"""
+    backend = backend_factory()
+    infos = [make_info(index) for index in range(operations)]
+    store = StateStore(backend, batch_size=batch_size,
+                       flush_interval=0 if batch_size == 1 else 0.05, cache_ttl=60)
+    manager = StateManager(store)
+
+    start = time.perf_counter()
+    for index, info in enumerate(infos):
+        manager.save_translation_state(f"tid-{index}", info)
+    store.flush()
+    write_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for index in range(operations):
+        manager.get_translation_state(f"tid-{index}")
+    cached_read_s = time.perf_counter() - start
+
+    # Autre worker : cache vide, chaque lecture va au backend
+    cold_manager = StateManager(StateStore(backend, cache_ttl=0))
+    start = time.perf_counter()
+    for index in range(operations):
+        assert cold_manager.get_translation_state(f"tid-{index}") is not None
+    backend_read_s = time.perf_counter() - start
+
+    store.close()
+    return {
+        "writes_per_s": operations / write_s,
+        "cached_reads_per_s": operations / cached_read_s,
+        "backend_reads_per_s": operations / backend_read_s,
+        "batches": store.get_stats()["batches"]
+    }
+
+
+def backends():
+    sqlite_dir = tempfile.mkdtemp(prefix="state-bench-")
+    counter = [0]
+
+    def sqlite_backend():
+        counter[0] += 1
+        return SqliteStateBackend(os.path.join(sqlite_dir, f"state-{counter[0]}.db"))
+
+    yield "memory", MemoryStateBackend
+    yield "sqlite", sqlite_backend
+
+    if os.getenv("AZURE_TABLE_ENDPOINT"):
+        def table_backend():
+            counter[0] += 1
+            return TableStateBackend(f"statebench{counter[0]}{int(time.time())}")
+        yield "table", table_backend
+    else:
+        print("(Azure Table ignoré : AZURE_TABLE_ENDPOINT non défini)")
+
+
+def main() -> None:
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{operations} états TranslationInfo par cas")
+    print(f"{'backend':<8} {'écriture':<10} {'écritures/s':>12} {'lots':>6} "
+          f"{'lectures cache/s':>17} {'lectures backend/s':>19}")
+    for name, factory in backends():
+        for label, batch_size in (("unitaire", 1), ("par lots", 100)):
+            result = run_case(factory, operations, batch_size)
+            print(f"{name:<8} {label:<10} {result['writes_per_s']:>12,.0f} {result['batches']:>6} "
+                  f"{result['cached_reads_per_s']:>17,.0f} {result['backend_reads_per_s']:>19,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark : passage à l'échelle du backend d'état en mémoire (1k → 1M jobs suivis)
+Compare le parcours complet sous verrou global (ancien StateManager) aux index
+maintenus à l'écriture : comptage par utilisateur, purge des jobs expirés,
+lectures concurrentes pendant des écritures
+
+Usage: python benchmarks/bench_state_index.py [tailles...]
+"""
+
+import gc
+import logging
+import random
+import sys
+import threading
+import time
+
+from common import measure, setup_env
+
+setup_env()
+logging.disable(logging.CRITICAL)
+
+from shared.services.state_store import MemoryStateBackend  # noqa: E402
+
+KIND = "translations"
+USERS = 1000
+ACTIVE = "InProgress"
+READERS = 8
+CONCURRENT_SECONDS = 1.0
+
+
+class ScanBackend:
+    """Ancien comportement : un dict et un verrou global, requêtes par parcours complet"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents = {}
+
+    def write_many(self, kind, documents):
+        with self._lock:
+            for key, document in documents.items():
+                if document is None:
+                    self._documents.pop(key, None)
+                else:
+                    self._documents[key] = document
+
+    def get(self, kind, key):
+        with self._lock:
+            return self._documents.get(key)
+
+    def count(self, kind, user_id=None, status=None):
+        with self._lock:
+            return sum(1 for document in self._documents.values()
+                       if document["user_id"] == user_id and document["status"] == status)
+
+    def find(self, kind, started_before=None, **_):
+        with self._lock:
+            return [(key, document) for key, document in self._documents.items()
+                    if document["started_at"] < started_before]
+
+
+def populate(backend, size: int, now: float) -> None:
+    # 1 % des jobs ont expiré, le reste est récent
+    for start in range(0, size, 10000):
+        backend.write_many(KIND, {
+            f"tid-{index}": {
+                "user_id": f"user-{index % USERS}",
+                "status": ACTIVE if index % 3 else "Succeeded",
+                "started_at": now - (10 * 3600 if index % 100 == 0 else random.random() * 3600)
+            }
+            for index in range(start, min(start + 10000, size))
+        })
+
+
+def concurrent_ops(backend, size: int) -> float:
+    """Opérations/s de READERS threads (get + count) pendant qu'un thread écrit"""
+    stop_at = time.monotonic() + CONCURRENT_SECONDS
+    counts = [0] * READERS
+
+    def reader(slot: int):
+        rng = random.Random(slot)
+        while time.monotonic() < stop_at:
+            backend.get(KIND, f"tid-{rng.randrange(size)}")
+            backend.count(KIND, user_id=f"user-{rng.randrange(USERS)}", status=ACTIVE)
+            counts[slot] += 2
+
+    def writer():
+        index = size
+        while time.monotonic() < stop_at:
+            backend.write_many(KIND, {f"tid-{index}": {
+                "user_id": "user-0", "status": ACTIVE, "started_at": time.time()}})
+            index += 1
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(READERS)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / CONCURRENT_SECONDS
+
+
+def run(backend_class, size: int) -> dict:
+    backend = backend_class()
+    now = time.time()
+    populate(backend, size, now)
+    iterations = 200 if size <= 100000 else 20
+
+    # Comme timeit : pas de pause du ramasse-miettes pendant les mesures
+    gc.collect()
+    gc.disable()
+    try:
+        count = measure(lambda: backend.count(KIND, user_id="user-7", status=ACTIVE),
+                        iterations=iterations, warmup=2)
+        expired = measure(lambda: backend.find(KIND, started_before=now - 2 * 3600),
+                          iterations=max(iterations // 10, 5), warmup=1)
+        ops = concurrent_ops(backend, size)
+    finally:
+        gc.enable()
+
+    del backend
+    gc.collect()
+    return {"count_ms": count["mean_ms"], "expired_ms": expired["mean_ms"], "ops": ops}
+
+
+def main() -> None:
+    sizes = [int(value) for value in sys.argv[1:]] or [1000, 10000, 100000, 1000000]
+    print(f"{USERS} utilisateurs, 1 % de jobs expirés, {READERS} lecteurs + 1 écrivain")
+    print(f"{'jobs':>9} {'backend':<8} {'comptage':>11} {'expirés':>11} {'ops concurrentes/s':>19}")
+    for size in sizes:
+        for label, backend_class in (("parcours", ScanBackend), ("index", MemoryStateBackend)):
+            result = run(backend_class, size)
+            print(f"{size:>9,} {label:<8} {result['count_ms']:>9.3f}ms {result['expired_ms']:>9.2f}ms "
+                  f"{result['ops']:>19,.0f}")
+
+
+if __name__ == "__main__":
+    main()
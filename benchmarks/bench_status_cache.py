@@ -0,0 +1,102 @@
+"""
+Benchmark : appels Translator générés par des sondages concurrents de check_status
+Simule plusieurs sessions qui interrogent les mêmes jobs, avec et sans cache
+
+Usage: python benchmarks/bench_status_cache.py [sessions] [durée_s]
+"""
+
+import logging
+import sys
+import threading
+import time
+
+from common import setup_env
+
+setup_env()
+logging.disable(logging.CRITICAL)
+
+from shared.config import Config  # noqa: E402
+from shared.services import service_registry  # noqa: E402
+from shared.services.status_cache import StatusCache  # noqa: E402
+from shared.services.status_handler import StatusHandler  # noqa: E402
+
+UPSTREAM_LATENCY_S = 0.05
+POLL_INTERVAL_S = 0.5
+JOB_IDS = [f"job-{i}" for i in range(5)]
+
+
+class FakeTranslationService:
+    """Translator simulé : latence fixe, jobs terminés au bout de ``job_duration``"""
+
+    def __init__(self, job_duration: float):
+        self.job_duration = job_duration
+        self.started_at = time.monotonic()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def check_translation_status(self, translation_id):
+        with self._lock:
+            self.calls += 1
+        time.sleep(UPSTREAM_LATENCY_S)
+        done = time.monotonic() - self.started_at > self.job_duration
+        status = "Succeeded" if done else "Running"
+        return {"status": "Succeeded" if done else "InProgress", "original_status": status}
+
+
+def run(sessions: int, duration: float, cached: bool) -> dict:
+    service_registry.reset_services()
+    translation_service = FakeTranslationService(job_duration=duration / 2)
+    service_registry.set_service("translation", translation_service)
+    service_registry.set_service("blob", object())
+    service_registry.set_service("graph", object())
+    cache = StatusCache()
+    if not cached:
+        # TTL nul : chaque sondage déclenche un appel amont
+        Config.STATUS_CACHE_TTL_SECONDS = 0
+        cache.get_or_fetch = lambda key, fetch: fetch()[0]
+    else:
+        Config.STATUS_CACHE_TTL_SECONDS = 5
+    service_registry.set_service("status_cache", cache)
+
+    polls = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def session(index: int):
+        handler = StatusHandler()
+        job_id = JOB_IDS[index % len(JOB_IDS)]
+        while time.monotonic() < stop_at:
+            handler.check_status(job_id)
+            with lock:
+                polls[0] += 1
+            time.sleep(POLL_INTERVAL_S)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "polls": polls[0],
+        "upstream_calls": translation_service.calls,
+        "cache": cache.get_stats() if cached else None
+    }
+
+
+def main() -> None:
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    print(f"{sessions} sessions, {len(JOB_IDS)} jobs, sondage toutes les {POLL_INTERVAL_S}s pendant {duration}s")
+    for label, cached in (("sans cache", False), ("avec cache", True)):
+        result = run(sessions, duration, cached)
+        ratio = result["polls"] / max(result["upstream_calls"], 1)
+        print(f"{label:<12} sondages={result['polls']:<6} appels Translator={result['upstream_calls']:<6} "
+              f"réduction=x{ratio:.1f}")
+        if result["cache"]:
+            print(f"{'':<12} {result['cache']}")
+
+
+if __name__ == "__main__":
+    main()
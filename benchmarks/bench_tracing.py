@@ -0,0 +1,56 @@
+"""
+Benchmark : surcoût des traces (spans, Server-Timing, export) sur le chemin des requêtes
+Une requête type ouvre un span racine et une dizaine de spans enfants, puis construit
+sa réponse avec create_response
+
+Usage: python benchmarks/bench_tracing.py [itérations]
+"""
+
+import logging
+import os
+import sys
+import tempfile
+
+from common import measure, print_results, setup_env
+
+setup_env()
+logging.disable(logging.CRITICAL)
+
+from shared.config import Config  # noqa: E402
+from shared.services import tracing  # noqa: E402
+from shared.utils.response_helper import create_response  # noqa: E402
+
+SPANS_PER_REQUEST = 10
+PAYLOAD = {"translation_id": "job-1", "status": "Running", "progress": "1/2"}
+
+
+@tracing.traced("bench.call", "storage")
+def external_call():
+    return None
+
+
+def handler(req=None):
+    for _ in range(SPANS_PER_REQUEST):
+        external_call()
+    return create_response(PAYLOAD, 200)
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    traced_handler = tracing.trace_request("bench")(handler)
+    export_path = os.path.join(tempfile.mkdtemp(), "traces.jsonl")
+
+    results = {}
+    Config.TRACING_ENABLED = False
+    results["traces désactivées"] = measure(traced_handler, iterations)
+    Config.TRACING_ENABLED = True
+    tracing.set_exporter(None)
+    results["spans + Server-Timing"] = measure(traced_handler, iterations)
+    tracing.set_exporter(tracing.FileExporter(export_path))
+    results["+ export fichier"] = measure(traced_handler, iterations)
+
+    print_results(f"Requête type ({SPANS_PER_REQUEST} spans enfants), {iterations} itérations", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Utilitaires communs aux benchmarks
+Configure un environnement factice pour importer le code des fonctions hors Azure
+"""
+
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FAKE_ENV = {
+    "AZURE_ACCOUNT_NAME": "benchaccount",
+    "AZURE_ACCOUNT_KEY": "YmVuY2htYXJrLWtleS1mb3ItbG9jYWwtdXNhZ2Utb25seQ==",
+    "TRANSLATOR_KEY": "bench-translator-key",
+    "TRANSLATOR_ENDPOINT": "https://bench.cognitiveservices.azure.com/",
+    "TRANSLATOR_REGION": "westeurope",
+    "CLIENT_ID": "00000000-0000-0000-0000-000000000000",
+    "SECRET_ID": "bench-secret",
+    "TENANT_ID": "00000000-0000-0000-0000-000000000000",
+}
+
+
+def setup_env() -> None:
+    """Ajoute la racine du projet au path et définit les variables manquantes"""
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    for key, value in FAKE_ENV.items():
+        os.environ.setdefault(key, value)
+
+
+def measure(func: Callable[[], object], iterations: int, warmup: int = 10) -> Dict[str, float]:
+    """Exécute ``func`` et retourne les statistiques de latence en millisecondes"""
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return summarize(samples)
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    """Statistiques de latence (ms) d'une liste d'échantillons"""
+    samples = sorted(samples_ms)
+    if not samples:
+        return {"iterations": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    return {
+        "iterations": len(samples),
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[max(int(len(samples) * 0.95) - 1, 0)],
+        "p99_ms": samples[max(int(len(samples) * 0.99) - 1, 0)],
+        "max_ms": samples[-1],
+    }
+
+
+def print_results(title: str, results: Dict[str, Dict[str, float]]) -> None:
+    """Affiche un tableau simple des résultats"""
+    print(f"\n{title}")
+    print(f"{'cas':<28} {'mean':>10} {'p50':>10} {'p95':>10} {'p99':>10}")
+    for name, stats in results.items():
+        print(f"{name:<28} {stats['mean_ms']:>9.3f}ms {stats['p50_ms']:>9.3f}ms "
+              f"{stats['p95_ms']:>9.3f}ms {stats['p99_ms']:>9.3f}ms")
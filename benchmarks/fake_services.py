@@ -0,0 +1,333 @@
+"""
+Faux services amont pour les benchmarks de bout en bout (aiohttp, processus séparé)
+- Translator Batch API : soumission, statut, documents, annulation. À la fin d'un job,
+  le document source est lu puis écrit vers chaque cible via les URL SAS reçues
+  (comme le vrai service), donc dans Azurite
+- Microsoft Graph : token OAuth, upload simple et session d'upload par fragments
+
+Latence, durée des jobs, taux de 429 et de 503 et taux d'échec sont configurables ;
+GET /__stats retourne le nombre d'appels par route
+"""
+
+import asyncio
+import json
+import multiprocessing
+import random
+import time
+import uuid
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+DEFAULT_PROFILE = {
+    "translator_latency_ms": 50,
+    "graph_latency_ms": 30,
+    "oauth_latency_ms": 80,
+    "job_seconds": 2.0,
+    "rate_429": 0.0,
+    "rate_503": 0.0,
+    "failure_rate": 0.0,
+    "seed": 1,
+}
+
+
+class _Stats:
+    def __init__(self):
+        self.calls: Dict[str, int] = {}
+
+    def add(self, route: str) -> None:
+        self.calls[route] = self.calls.get(route, 0) + 1
+
+
+def _iso(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))
+
+
+def _strip_query(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+
+
+def build_translator_app(profile: Dict[str, Any]):
+    """Application aiohttp émulant /translator/text/batch/v1.1/batches"""
+    from aiohttp import ClientSession, web
+
+    stats = _Stats()
+    jobs: Dict[str, Dict[str, Any]] = {}
+    rng = random.Random(profile["seed"])
+    prefix = "/translator/text/batch/v1.1/batches"
+    state: Dict[str, Any] = {}
+
+    async def delay():
+        await asyncio.sleep(profile["translator_latency_ms"] / 1000)
+
+    def throttled() -> Optional[web.Response]:
+        if rng.random() < profile.get("rate_503", 0.0):
+            stats.add("503")
+            return web.json_response(
+                {"error": {"code": "ServiceUnavailable", "message": "Simulated outage"}}, status=503)
+        if rng.random() < profile["rate_429"]:
+            stats.add("429")
+            return web.json_response(
+                {"error": {"code": "TooManyRequests", "message": "Simulated throttling"}},
+                status=429, headers={"Retry-After": "1"})
+        return None
+
+    async def run_job(job: Dict[str, Any]) -> None:
+        """Fin du job : copie source → cibles via les SAS, comme le service réel"""
+        await asyncio.sleep(profile["job_seconds"])
+        if job["status"] == "Cancelled":
+            return
+        if rng.random() < profile["failure_rate"]:
+            job["status"] = "Failed"
+            job["error"] = {"code": "InternalServerError", "message": "Simulated translation failure"}
+        else:
+            try:
+                session = state["session"]
+                async with session.get(job["source_url"]) as response:
+                    response.raise_for_status()
+                    content = await response.read()
+                for target in job["targets"]:
+                    async with session.put(target["targetUrl"], data=content,
+                                           headers={"x-ms-blob-type": "BlockBlob"}) as response:
+                        response.raise_for_status()
+                job["characters"] = len(content)
+                job["status"] = "Succeeded"
+            except Exception as e:
+                job["status"] = "Failed"
+                job["error"] = {"code": "TargetFileAccessFailed", "message": str(e)}
+        job["updated"] = time.time()
+
+    async def submit(request):
+        await delay()
+        stats.add("translator.submit")
+        limited = throttled()
+        if limited:
+            return limited
+        body = await request.json()
+        document = body["inputs"][0]
+        if document.get("storageType") != "File":
+            return web.json_response(
+                {"error": {"code": "InvalidRequest", "message": "Folder jobs are not emulated"}}, status=400)
+        job_id = str(uuid.uuid4())
+        job = {
+            "id": job_id,
+            "status": "NotStarted",
+            "source_url": document["source"]["sourceUrl"],
+            "targets": document["targets"],
+            "created": time.time(),
+            "updated": time.time(),
+        }
+        jobs[job_id] = job
+        job["status"] = "Running"
+        job["task"] = asyncio.ensure_future(run_job(job))
+        return web.Response(status=202, headers={
+            "Operation-Location": f"{request.url.scheme}://{request.host}{prefix}/{job_id}"})
+
+    def job_payload(job: Dict[str, Any]) -> Dict[str, Any]:
+        total = len(job["targets"])
+        done = job["status"] in ("Succeeded", "Failed", "Cancelled")
+        payload = {
+            "id": job["id"],
+            "status": job["status"],
+            "createdDateTimeUtc": _iso(job["created"]),
+            "lastActionDateTimeUtc": _iso(job["updated"]),
+            "summary": {
+                "total": total,
+                "failed": total if job["status"] == "Failed" else 0,
+                "success": total if job["status"] == "Succeeded" else 0,
+                "inProgress": 0 if done else total,
+                "notYetStarted": 0,
+                "cancelled": total if job["status"] == "Cancelled" else 0,
+                "totalCharacterCharged": job.get("characters", 0) * total,
+            }
+        }
+        if "error" in job:
+            payload["error"] = job["error"]
+        return payload
+
+    async def status(request):
+        await delay()
+        stats.add("translator.status")
+        limited = throttled()
+        if limited:
+            return limited
+        job = jobs.get(request.match_info["job_id"])
+        if job is None:
+            return web.json_response({"error": {"code": "NotFound", "message": "Job not found"}}, status=404)
+        return web.json_response(job_payload(job))
+
+    async def documents(request):
+        await delay()
+        stats.add("translator.documents")
+        limited = throttled()
+        if limited:
+            return limited
+        job = jobs.get(request.match_info["job_id"])
+        if job is None:
+            return web.json_response({"error": {"code": "NotFound", "message": "Job not found"}}, status=404)
+        return web.json_response({"value": [
+            {
+                "path": _strip_query(target["targetUrl"]),
+                "sourcePath": _strip_query(job["source_url"]),
+                "status": job["status"],
+                "to": target["language"],
+                "characterCharged": job.get("characters", 0),
+            }
+            for target in job["targets"]
+        ]})
+
+    async def cancel(request):
+        await delay()
+        stats.add("translator.cancel")
+        job = jobs.get(request.match_info["job_id"])
+        if job is None:
+            return web.json_response({"error": {"code": "NotFound", "message": "Job not found"}}, status=404)
+        if job["status"] in ("NotStarted", "Running"):
+            job["status"] = "Cancelled"
+        return web.json_response(job_payload(job))
+
+    async def get_stats(request):
+        return web.json_response(stats.calls)
+
+    async def on_startup(app):
+        state["session"] = ClientSession()
+
+    async def on_cleanup(app):
+        await state["session"].close()
+
+    app = web.Application(client_max_size=1024 ** 3)
+    app.router.add_post(prefix, submit)
+    app.router.add_get(prefix + "/{job_id}", status)
+    app.router.add_get(prefix + "/{job_id}/documents", documents)
+    app.router.add_delete(prefix + "/{job_id}", cancel)
+    app.router.add_get("/__stats", get_stats)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def build_graph_app(profile: Dict[str, Any]):
+    """Application aiohttp émulant le token OAuth et les uploads OneDrive de Graph"""
+    from aiohttp import web
+
+    stats = _Stats()
+    sessions: Dict[str, Dict[str, Any]] = {}
+    items: Dict[str, Dict[str, Any]] = {}
+
+    async def token(request):
+        await asyncio.sleep(profile["oauth_latency_ms"] / 1000)
+        stats.add("oauth.token")
+        await request.post()
+        return web.json_response({
+            "token_type": "Bearer",
+            "expires_in": 3599,
+            "access_token": f"fake-token-{uuid.uuid4().hex}"
+        })
+
+    def drive_item(name: str, size: int) -> Dict[str, Any]:
+        return {
+            "id": uuid.uuid4().hex,
+            "name": name,
+            "size": size,
+            "webUrl": f"https://onedrive.invalid/{name}"
+        }
+
+    async def drive(request):
+        """/v1.0/users/{id}/drive/root:/{chemin}:/content ou :/createUploadSession"""
+        await asyncio.sleep(profile["graph_latency_ms"] / 1000)
+        path = request.path
+        name = path.rsplit(":/", 1)[0].rsplit("/", 1)[-1]
+        if path.endswith(":/content") and request.method == "PUT":
+            stats.add("graph.simple_upload")
+            size = len(await request.read())
+            items[path.rsplit(":/", 1)[0]] = item = drive_item(name, size)
+            return web.json_response(item, status=201)
+        if path.endswith(":/createUploadSession") and request.method == "POST":
+            stats.add("graph.create_session")
+            session_id = uuid.uuid4().hex
+            sessions[session_id] = {"name": name, "path": path.rsplit(":/", 1)[0], "received": 0}
+            return web.json_response({
+                "uploadUrl": f"{request.url.scheme}://{request.host}/upload/{session_id}",
+                "expirationDateTime": _iso(time.time() + 3600)
+            })
+        if request.method == "GET" and path in items:
+            stats.add("graph.get_item")
+            return web.json_response(items[path])
+        if request.method == "GET":
+            return web.json_response({"error": {"code": "itemNotFound"}}, status=404)
+        return web.json_response({"error": {"code": "invalidRequest"}}, status=400)
+
+    async def upload(request):
+        await asyncio.sleep(profile["graph_latency_ms"] / 1000)
+        session = sessions.get(request.match_info["session_id"])
+        if session is None:
+            return web.json_response({"error": {"code": "itemNotFound"}}, status=404)
+        if request.method == "GET":
+            stats.add("graph.session_status")
+            return web.json_response({"nextExpectedRanges": [f"{session['received']}-"]})
+        if request.method == "DELETE":
+            stats.add("graph.cancel_session")
+            del sessions[request.match_info["session_id"]]
+            return web.Response(status=204)
+
+        stats.add("graph.fragment")
+        content = await request.read()
+        # Content-Range: bytes début-fin/total
+        range_spec, total = request.headers["Content-Range"].split(" ", 1)[1].split("/")
+        start = int(range_spec.split("-")[0])
+        if start != session["received"]:
+            return web.json_response({"nextExpectedRanges": [f"{session['received']}-"]}, status=416)
+        session["received"] += len(content)
+        if session["received"] >= int(total):
+            del sessions[request.match_info["session_id"]]
+            items[session["path"]] = item = drive_item(session["name"], session["received"])
+            return web.json_response(item, status=201)
+        return web.json_response({"nextExpectedRanges": [f"{session['received']}-"]}, status=202)
+
+    async def get_stats(request):
+        return web.json_response(stats.calls)
+
+    app = web.Application(client_max_size=1024 ** 3)
+    app.router.add_post("/{tenant}/oauth2/v2.0/token", token)
+    app.router.add_route("*", "/v1.0/users/{tail:.*}", drive)
+    app.router.add_route("*", "/upload/{session_id}", upload)
+    app.router.add_get("/__stats", get_stats)
+    return app
+
+
+def _serve(port_queue, profile: Dict[str, Any]) -> None:
+    from aiohttp import web
+
+    async def start():
+        ports = {}
+        for name, builder in (("translator", build_translator_app), ("graph", build_graph_app)):
+            runner = web.AppRunner(builder(profile), access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0, backlog=1024)
+            await site.start()
+            ports[name] = site._server.sockets[0].getsockname()[1]
+        port_queue.put(ports)
+        await asyncio.Event().wait()
+
+    asyncio.run(start())
+
+
+def start_fake_services(profile: Optional[Dict[str, Any]] = None):
+    """
+    Démarre Translator et Graph dans un processus séparé
+    Retourne (processus, {"translator": url, "graph": url})
+    """
+    merged = dict(DEFAULT_PROFILE, **(profile or {}))
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(port_queue, merged), daemon=True)
+    process.start()
+    ports = port_queue.get(timeout=30)
+    return process, {name: f"http://127.0.0.1:{port}" for name, port in ports.items()}
+
+
+def fetch_stats(base_url: str) -> Dict[str, int]:
+    """Compteurs d'appels d'un faux service"""
+    from urllib.request import urlopen
+
+    with urlopen(f"{base_url}/__stats", timeout=10) as response:
+        return json.loads(response.read())
@@ -0,0 +1,532 @@
+"""
+Générateur de charge : conversations Copilot Studio simultanées ou rejeu de traces
+- sessions : N conversations en parallèle, chacune démarre une traduction, interroge
+  check_status toutes les quelques secondes jusqu'à l'état final puis appelle get_result ;
+  intervalle de polling, tailles de fichiers et langues tirés selon des mélanges pondérés
+- replay : rejoue une trace enregistrée (JSON lines, voir --record) ou un fichier
+  sample.dat d'une fonction, N fois plus vite
+
+Cible : les handlers en processus contre Azurite et les faux Translator/Graph (défaut),
+ou une application déployée / `func start` (--target http://localhost:7071)
+Résultats : débit, latences de queue par fonction, amplification des appels Storage
+(X-Storage-Round-Trips) et Translator/Graph (Server-Timing, compteurs des faux services)
+
+Usage:
+  python benchmarks/load_generator.py sessions --sessions 50 --duration 120 \\
+      --poll-interval 3 --sizes 16384:70,1048576:25,8388608:5 --languages fr:60,de:25,fr+de:15 \\
+      [--record trace.jsonl] [--output load.json]
+  python benchmarks/load_generator.py replay trace.jsonl --speed 10 [--output load.json]
+  python benchmarks/load_generator.py replay check_status/sample.dat --loop 1000 --speed 50
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from common import ROOT_DIR, summarize
+from fake_services import DEFAULT_PROFILE, fetch_stats, start_fake_services
+
+import bench_e2e
+
+TERMINAL_STATUSES = bench_e2e.TERMINAL_STATUSES
+HTTP_METHODS = {
+    "start_translation": "POST",
+    "check_status": "GET",
+    "get_result": "GET",
+    "languages": "GET",
+    "formats": "GET",
+    "health": "GET",
+}
+# Catégories Server-Timing comptées comme appels amont (hors Storage, mesuré par requête HTTP)
+UPSTREAM_CATEGORIES = ("translator", "graph", "auth")
+_SERVER_TIMING_RE = re.compile(r'(\w+);dur=[\d.]+;desc="(\d+)"')
+
+
+def parse_args() -> argparse.Namespace:
+    # Options communes aux deux modes, acceptées après le nom du mode
+    options = argparse.ArgumentParser(add_help=False)
+    options.add_argument("--target", default="local",
+                         help="'local' (handlers en processus) ou URL de l'application (ex. http://localhost:7071)")
+    options.add_argument("--function-key", default=os.getenv("FUNCTION_KEY"), help="clé x-functions-key (cible HTTP)")
+    options.add_argument("--max-in-flight", type=int, default=200, help="requêtes simultanées au plus")
+    options.add_argument("--seed", type=int, default=1)
+    options.add_argument("--output", help="fichier JSON des résultats")
+    # Environnement local (voir bench_e2e.py)
+    options.add_argument("--azurite", default=os.getenv("AZURITE_BLOB_ENDPOINT", bench_e2e.AZURITE_ENDPOINT))
+    options.add_argument("--start-azurite", action="store_true")
+    options.add_argument("--job-seconds", type=float, default=DEFAULT_PROFILE["job_seconds"],
+                         help="durée des jobs du faux Translator")
+    options.add_argument("--translator-latency-ms", type=float, default=DEFAULT_PROFILE["translator_latency_ms"])
+    options.add_argument("--rate-429", type=float, default=DEFAULT_PROFILE["rate_429"])
+    options.add_argument("--rate-503", type=float, default=DEFAULT_PROFILE["rate_503"])
+    options.add_argument("--failure-rate", type=float, default=DEFAULT_PROFILE["failure_rate"])
+    options.add_argument("--no-onedrive", action="store_true", help="get_result sans upload OneDrive")
+
+    parser = argparse.ArgumentParser(description="Générateur de charge (conversations Copilot, rejeu de traces)")
+    modes = parser.add_subparsers(dest="mode", required=True)
+    sessions = modes.add_parser("sessions", parents=[options], help="conversations simultanées")
+    sessions.add_argument("--sessions", type=int, default=20, help="conversations simultanées")
+    sessions.add_argument("--duration", type=float, default=60,
+                          help="secondes pendant lesquelles de nouvelles conversations démarrent")
+    sessions.add_argument("--conversations", type=int, default=0,
+                          help="conversations par session (0 = jusqu'à --duration)")
+    sessions.add_argument("--poll-interval", type=float, default=3.0, help="secondes entre deux check_status")
+    sessions.add_argument("--poll-jitter", type=float, default=0.2, help="variation aléatoire (0.2 = ±20 %%)")
+    sessions.add_argument("--max-polls", type=int, default=200, help="abandon de la conversation au-delà")
+    sessions.add_argument("--think-time", type=float, default=1.0, help="secondes entre deux conversations")
+    sessions.add_argument("--ramp-up", type=float, default=5.0, help="secondes pour démarrer toutes les sessions")
+    sessions.add_argument("--sizes", default="16384:70,1048576:25,8388608:5",
+                          help="mélange taille_en_octets:poids")
+    sessions.add_argument("--languages", default="fr:60,de:25,fr+de:15",
+                          help="mélange langue(s):poids, plusieurs langues séparées par '+'")
+    sessions.add_argument("--record", help="enregistre la trace des requêtes (JSON lines)")
+
+    replay = modes.add_parser("replay", parents=[options], help="rejeu de traces")
+    replay.add_argument("traces", nargs="+", help="traces JSON lines ou fichiers sample.dat")
+    replay.add_argument("--speed", type=float, default=1.0, help="facteur d'accélération")
+    replay.add_argument("--loop", type=int, default=1, help="nombre de rejeux consécutifs")
+    return parser.parse_args()
+
+
+def parse_mix(spec: str) -> Tuple[List[str], List[float]]:
+    """'a:70,b:30' → (['a', 'b'], [70.0, 30.0]) ; poids 1 par défaut"""
+    values, weights = [], []
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        value, _, weight = item.strip().partition(":")
+        values.append(value)
+        weights.append(float(weight or 1))
+    return values, weights
+
+
+# --- Cibles ---------------------------------------------------------------------
+
+class Response:
+    __slots__ = ("status_code", "headers", "payload")
+
+    def __init__(self, status_code: int, headers, body: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        try:
+            self.payload = json.loads(body or b"{}")
+        except ValueError:
+            self.payload = {}
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return (self.payload.get("data") or {}) if isinstance(self.payload, dict) else {}
+
+
+class LocalTarget:
+    """Handlers appelés en processus, comme le ferait le worker Python"""
+
+    def __init__(self):
+        import azure.functions as func
+
+        self.func = func
+        self.handlers = {name: __import__(name).main for name in HTTP_METHODS}
+
+    async def send(self, function: str, method: str, params: Dict[str, str], body: Any) -> Response:
+        request = self.func.HttpRequest(
+            method, f"/api/{function}", params=params,
+            body=json.dumps(body).encode() if body is not None else b"",
+            headers={"Content-Type": "application/json"})
+        handler = self.handlers[function]
+        if asyncio.iscoroutinefunction(handler):
+            response = await handler(request)
+        else:
+            response = await asyncio.to_thread(handler, request)
+        return Response(response.status_code, response.headers, response.get_body())
+
+    async def close(self) -> None:
+        pass
+
+
+class HttpTarget:
+    """Application Azure Functions joignable en HTTP (déployée ou func start)"""
+
+    def __init__(self, base_url: str, function_key: Optional[str], max_in_flight: int):
+        import aiohttp
+
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"x-functions-key": function_key} if function_key else {}
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=max_in_flight),
+            timeout=aiohttp.ClientTimeout(total=300))
+
+    async def send(self, function: str, method: str, params: Dict[str, str], body: Any) -> Response:
+        async with self.session.request(method, f"{self.base_url}/api/{function}", params=params,
+                                        json=body, headers=self.headers) as response:
+            return Response(response.status, response.headers, await response.read())
+
+    async def close(self) -> None:
+        await self.session.close()
+
+
+# --- Mesures ---------------------------------------------------------------------
+
+class Recorder:
+    """Résultats de toutes les requêtes envoyées, et trace optionnelle"""
+
+    def __init__(self, record_path: Optional[str] = None):
+        self.started = time.perf_counter()
+        self.latencies: Dict[str, List[float]] = {}
+        self.status_codes: Dict[str, Dict[str, int]] = {}
+        self.upstream: Dict[str, Dict[str, int]] = {}
+        self.failures = 0
+        self.lags: List[float] = []
+        self.record_path = record_path
+        self.trace: List[Dict[str, Any]] = []
+
+    def add(self, function: str, latency_ms: float, response: Optional[Response]) -> None:
+        self.latencies.setdefault(function, []).append(latency_ms)
+        codes = self.status_codes.setdefault(function, {})
+        code = str(response.status_code) if response is not None else "error"
+        codes[code] = codes.get(code, 0) + 1
+        if response is None:
+            self.failures += 1
+            return
+
+        counters = self.upstream.setdefault(function, {})
+        counters["storage"] = counters.get("storage", 0) + int(response.headers.get("X-Storage-Round-Trips") or 0)
+        for category, count in _SERVER_TIMING_RE.findall(response.headers.get("Server-Timing") or ""):
+            if category in UPSTREAM_CATEGORIES:
+                counters[category] = counters.get(category, 0) + int(count)
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        if self.record_path:
+            entry["offset"] = round(time.perf_counter() - self.started, 4)
+            self.trace.append(entry)
+
+    def close(self) -> None:
+        if self.record_path:
+            with open(self.record_path, "w", encoding="utf-8") as record_file:
+                for entry in self.trace:
+                    record_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        functions = {}
+        for function, samples in sorted(self.latencies.items()):
+            stats = summarize(samples)
+            stats["throughput_rps"] = round(len(samples) / elapsed, 2) if elapsed else 0.0
+            stats["status_codes"] = self.status_codes[function]
+            stats["errors"] = sum(n for code, n in self.status_codes[function].items()
+                                  if code == "error" or code.startswith("5"))
+            stats["upstream_per_request"] = {
+                category: round(total / len(samples), 2)
+                for category, total in sorted(self.upstream.get(function, {}).items())
+            }
+            functions[function] = stats
+        requests = sum(len(samples) for samples in self.latencies.values())
+        return {
+            "elapsed_seconds": round(elapsed, 2),
+            "requests": requests,
+            "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+            "transport_errors": self.failures,
+            "functions": functions,
+            "schedule_lag": summarize(self.lags) if self.lags else None,
+        }
+
+
+class LoadGenerator:
+    def __init__(self, args: argparse.Namespace, target, recorder: Recorder):
+        self.args = args
+        self.target = target
+        self.recorder = recorder
+        self.in_flight = asyncio.Semaphore(args.max_in_flight)
+        self.rng = random.Random(args.seed)
+        self.conversations: List[Dict[str, Any]] = []
+
+    async def request(self, function: str, params: Optional[Dict[str, str]] = None,
+                      body: Any = None, method: Optional[str] = None,
+                      trace: Optional[Dict[str, Any]] = None) -> Optional[Response]:
+        method = method or HTTP_METHODS.get(function, "GET")
+        params = params or {}
+        entry = dict(trace or {}, function=function, method=method, params=params, body=body)
+        self.recorder.record(entry)
+        async with self.in_flight:
+            start = time.perf_counter()
+            try:
+                response = await self.target.send(function, method, params, body)
+            except Exception as e:
+                logging.getLogger(__name__).debug(f"{function}: {e}")
+                response = None
+            self.recorder.add(function, (time.perf_counter() - start) * 1000, response)
+        # ID obtenu au démarrage : remplacé par celui du job rejoué dans les requêtes suivantes
+        if function == "start_translation" and response is not None and response.data.get("translation_id"):
+            entry["translation_id"] = response.data["translation_id"]
+        return response
+
+    # --- Conversations -----------------------------------------------------------
+
+    async def conversation(self, session_id: int, container_client) -> Dict[str, Any]:
+        """Une conversation : démarrage, polling de check_status, get_result"""
+        sizes, size_weights = parse_mix(self.args.sizes)
+        languages, language_weights = parse_mix(self.args.languages)
+        size = int(self.rng.choices(sizes, size_weights)[0])
+        target_languages = self.rng.choices(languages, language_weights)[0].split("+")
+        blob_name = f"load-{uuid.uuid4().hex[:12]}-{size}.docx"
+        # Dépôt du document par l'utilisateur : hors mesure, contenu unique (pas de cache)
+        await container_client.upload_blob(blob_name, os.urandom(size), overwrite=True)
+
+        outcome = {"size": size, "languages": len(target_languages), "polls": 0, "status": None}
+        started = time.perf_counter()
+        response = await self.request(
+            "start_translation",
+            body={"blob_name": blob_name, "target_language": target_languages, "user_id": f"session-{session_id}"},
+            trace={"session": session_id, "document_size": size})
+        translation_id = response.data.get("translation_id") if response is not None else None
+        if not translation_id or response.status_code not in (200, 202):
+            outcome["status"] = f"start HTTP {response.status_code if response is not None else 'error'}"
+            return outcome
+
+        status = response.data.get("status")
+        while status not in TERMINAL_STATUSES and outcome["polls"] < self.args.max_polls:
+            jitter = 1 + self.rng.uniform(-self.args.poll_jitter, self.args.poll_jitter)
+            await asyncio.sleep(self.args.poll_interval * jitter)
+            outcome["polls"] += 1
+            response = await self.request("check_status", {"translation_id": translation_id},
+                                          trace={"session": session_id})
+            if response is not None and response.status_code == 200:
+                status = response.data.get("status")
+
+        outcome["status"] = status if status in TERMINAL_STATUSES else "abandoned"
+        if status == "Succeeded":
+            await self.request("get_result", {
+                "blob_name": blob_name, "target_language": ",".join(target_languages),
+                "user_id": f"session-{session_id}"}, trace={"session": session_id})
+        outcome["seconds"] = time.perf_counter() - started
+        return outcome
+
+    async def session(self, session_id: int, deadline: float, container_client) -> None:
+        await asyncio.sleep(self.args.ramp_up * session_id / max(self.args.sessions, 1))
+        completed = 0
+        while time.monotonic() < deadline:
+            if self.args.conversations and completed >= self.args.conversations:
+                break
+            self.conversations.append(await self.conversation(session_id, container_client))
+            completed += 1
+            await asyncio.sleep(self.args.think_time)
+
+    async def run_sessions(self) -> Dict[str, Any]:
+        deadline = time.monotonic() + self.args.duration
+        async with input_container_client() as container_client:
+            await asyncio.gather(*(self.session(session_id, deadline, container_client)
+                                   for session_id in range(self.args.sessions)))
+
+        outcomes: Dict[str, int] = {}
+        for conversation in self.conversations:
+            outcomes[conversation["status"]] = outcomes.get(conversation["status"], 0) + 1
+        finished = [conversation for conversation in self.conversations if "seconds" in conversation]
+        return {
+            "conversations": len(self.conversations),
+            "outcomes": outcomes,
+            "end_to_end": summarize([conversation["seconds"] * 1000 for conversation in finished]),
+            "polls_per_conversation": round(
+                sum(conversation["polls"] for conversation in self.conversations) / len(self.conversations), 2)
+            if self.conversations else 0.0,
+        }
+
+    # --- Rejeu -----------------------------------------------------------------------
+
+    async def run_replay(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Rejoue les requêtes à leur instant d'origine divisé par --speed"""
+        # Les identifiants de traduction de la trace sont remplacés par ceux des jobs rejoués
+        translation_ids: Dict[str, str] = {}
+        span = max((entry.get("offset", 0) for entry in entries), default=0)
+        period = max(span, 1.0)
+
+        async def replay_one(entry: Dict[str, Any], scheduled: float) -> None:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.recorder.lags.append(max(time.perf_counter() - scheduled, 0) * 1000)
+            params = dict(entry.get("params") or {})
+            if params.get("translation_id") in translation_ids:
+                params["translation_id"] = translation_ids[params["translation_id"]]
+            response = await self.request(entry["function"], params, entry.get("body"), entry.get("method"))
+            original_id = entry.get("translation_id")
+            if original_id and response is not None and response.data.get("translation_id"):
+                translation_ids[original_id] = response.data["translation_id"]
+
+        start = time.perf_counter() + 0.1
+        tasks = []
+        for iteration in range(self.args.loop):
+            for entry in entries:
+                offset = iteration * period + entry.get("offset", 0)
+                tasks.append(asyncio.ensure_future(replay_one(entry, start + offset / self.args.speed)))
+        await asyncio.gather(*tasks)
+        return {"entries": len(entries), "loops": self.args.loop, "speed": self.args.speed,
+                "trace_seconds": round(span, 2)}
+
+
+def input_container_client():
+    """Conteneur d'entrée du stockage de l'application (AZURE_* de l'environnement)"""
+    from azure.storage.blob.aio import BlobServiceClient
+    from shared.config import Config
+
+    if not Config.AZURE_ACCOUNT_NAME or not Config.AZURE_ACCOUNT_KEY:
+        sys.exit("AZURE_ACCOUNT_NAME et AZURE_ACCOUNT_KEY requis pour déposer les documents")
+    return BlobServiceClient(Config.get_storage_url(), credential={
+        "account_name": Config.AZURE_ACCOUNT_NAME, "account_key": Config.AZURE_ACCOUNT_KEY
+    }).get_container_client(Config.INPUT_CONTAINER)
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """
+    Trace JSON lines (une requête par ligne : offset, function, method, params, body)
+    ou sample.dat : corps de test d'une fonction, nommée d'après son dossier
+    """
+    with open(path, encoding="utf-8") as trace_file:
+        content = trace_file.read()
+    if os.path.basename(path) == "sample.dat":
+        function = os.path.basename(os.path.dirname(os.path.abspath(path)))
+        if function not in HTTP_METHODS:
+            sys.exit(f"{path}: fonction HTTP inconnue '{function}'")
+        method = HTTP_METHODS[function]
+        body = json.loads(content)
+        return [{"offset": 0.0, "function": function, "method": method,
+                 "params": {}, "body": body if method == "POST" else None}]
+
+    entries = [json.loads(line) for line in content.splitlines() if line.strip()]
+    for entry in entries:
+        if entry.get("function") not in HTTP_METHODS:
+            sys.exit(f"{path}: fonction inconnue dans la trace: {entry.get('function')}")
+    return entries
+
+
+async def prepare_replay(entries: List[Dict[str, Any]]) -> None:
+    """Recrée les documents des démarrages enregistrés (même nom, même taille)"""
+    documents = {(entry.get("body") or {}).get("blob_name"): entry["document_size"]
+                 for entry in entries
+                 if entry["function"] == "start_translation" and entry.get("document_size")}
+    documents.pop(None, None)
+    if not documents:
+        return
+    async with input_container_client() as container_client:
+        await asyncio.gather(*(container_client.upload_blob(name, os.urandom(size), overwrite=True)
+                               for name, size in documents.items()))
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    load = results["load"]
+    print(f"\n{load['requests']} requêtes en {load['elapsed_seconds']} s : {load['throughput_rps']} req/s"
+          f" ({load['transport_errors']} erreurs de transport)")
+    print(f"\n{'fonction':<20} {'n':>6} {'req/s':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'max ms':>9} {'5xx':>5}  amont/requête")
+    for function, stats in load["functions"].items():
+        upstream = ", ".join(f"{category} {value}" for category, value in stats["upstream_per_request"].items())
+        print(f"{function:<20} {stats['iterations']:>6} {stats['throughput_rps']:>7.1f} {stats['p50_ms']:>9.1f} "
+              f"{stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f} {stats['errors']:>5}  {upstream}")
+
+    if "sessions" in results:
+        sessions = results["sessions"]
+        end_to_end = sessions["end_to_end"]
+        print(f"\n{sessions['conversations']} conversations {sessions['outcomes']}, "
+              f"{sessions['polls_per_conversation']} check_status par conversation, "
+              f"bout en bout p50 {end_to_end['p50_ms'] / 1000:.1f} s / p95 {end_to_end['p95_ms'] / 1000:.1f} s")
+    if load.get("schedule_lag"):
+        print(f"Retard d'émission du rejeu : p95 {load['schedule_lag']['p95_ms']:.1f} ms")
+    amplification = results.get("amplification")
+    if amplification:
+        print("\nAmplification (appels amont par conversation / par requête) :")
+        for route, values in amplification.items():
+            per_conversation = "-" if values["per_conversation"] is None else values["per_conversation"]
+            print(f"  {route:<28} {per_conversation:>8} {values['per_request']:>8}")
+
+
+async def run(args: argparse.Namespace, fake_urls: Dict[str, str]) -> Dict[str, Any]:
+    if args.target == "local":
+        target = LocalTarget()
+    else:
+        target = HttpTarget(args.target, args.function_key, args.max_in_flight)
+    recorder = Recorder(args.record if args.mode == "sessions" else None)
+    generator = LoadGenerator(args, target, recorder)
+
+    before = {url: fetch_stats(url) for url in fake_urls.values()}
+    started = time.perf_counter()
+    try:
+        if args.mode == "sessions":
+            results = {"sessions": await generator.run_sessions()}
+        else:
+            entries = [entry for path in args.traces for entry in load_trace(path)]
+            entries.sort(key=lambda entry: entry.get("offset", 0))
+            await prepare_replay(entries)
+            started = time.perf_counter()
+            results = {"replay": await generator.run_replay(entries)}
+    finally:
+        recorder.close()
+        await target.close()
+    results["load"] = recorder.summary(time.perf_counter() - started)
+
+    # Appels HTTP réellement reçus par les faux services (cible locale)
+    if fake_urls:
+        conversations = results["load"]["functions"].get("start_translation", {}).get("iterations", 0)
+        requests = results["load"]["requests"] or 1
+        results["amplification"] = {}
+        for url in fake_urls.values():
+            for route, calls in bench_e2e.stats_delta(before[url], fetch_stats(url)).items():
+                results["amplification"][route] = {
+                    "calls": calls,
+                    "per_conversation": round(calls / conversations, 2) if conversations else None,
+                    "per_request": round(calls / requests, 3),
+                }
+    return results
+
+
+def main() -> None:
+    args = parse_args()
+    logging.disable(logging.CRITICAL)
+    services, azurite, fake_urls = None, None, {}
+
+    if args.target == "local":
+        storage_endpoint = args.azurite.rstrip("/")
+        if args.start_azurite:
+            azurite, storage_endpoint = bench_e2e.start_azurite()
+        elif not bench_e2e.storage_reachable(storage_endpoint):
+            sys.exit(f"Azurite injoignable sur {storage_endpoint} (lancer azurite-blob ou utiliser --start-azurite)")
+        services, fake_urls = start_fake_services({
+            "job_seconds": args.job_seconds,
+            "translator_latency_ms": args.translator_latency_ms,
+            "rate_429": args.rate_429,
+            "rate_503": args.rate_503,
+            "failure_rate": args.failure_rate,
+            "seed": args.seed,
+        })
+        args.concurrency = args.max_in_flight
+        bench_e2e.configure_environment(args, storage_endpoint, fake_urls)
+        bench_e2e.create_containers()
+    elif ROOT_DIR not in sys.path:
+        # Cible distante : seuls les paramètres de stockage de l'environnement sont utilisés
+        sys.path.insert(0, ROOT_DIR)
+
+    try:
+        results = asyncio.run(run(args, fake_urls))
+        results["meta"] = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "target": args.target,
+            "arguments": {key: value for key, value in vars(args).items() if key != "function_key"},
+        }
+        print_report(results)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+            print(f"\nRésultats écrits dans {args.output}")
+    finally:
+        if services is not None:
+            services.terminate()
+        if azurite is not None:
+            azurite.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,64 @@
 """
 Vérifie le statut d'une traduction en cours
 Route: GET /api/check_status?translation_id={translation_id}
+Jobs multi-documents: GET /api/check_status?translation_ids={id1},{id2}
 """
 
 import azure.functions as func
 import logging
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO)
+# Journalisation configurée par le worker Azure Functions
 logger = logging.getLogger(__name__)
 
 # Import des handlers
-from shared.services.status_handler import StatusHandler
+from shared.services.status_handler import AsyncStatusHandler
+from shared.services.resilience import with_deadline
+from shared.services.storage_metrics import track_round_trips
 from shared.utils.response_helper import create_response, create_error_response
+from shared.services.tracing import trace_request
 
-def main(req: func.HttpRequest) -> func.HttpResponse:
+@trace_request("check_status")
+@track_round_trips("check_status")
+@with_deadline()
+async def main(req: func.HttpRequest) -> func.HttpResponse:
     """
     Vérifie le statut d'une traduction en cours
     Route: GET /api/check_status?translation_id={translation_id}
+    Handler asynchrone : le worker sert d'autres requêtes pendant l'appel Translator
     """
     try:
+        # Job multi-documents : plusieurs IDs de sous-lots séparés par des virgules
+        translation_ids = [
+            value.strip()
+            for value in (req.params.get('translation_ids') or '').split(',')
+            if value.strip()
+        ]
+
         # Récupération de l'ID de traduction depuis la requête
         translation_id = req.params.get('translation_id')
         
-        if not translation_id:
+        if not translation_id and not translation_ids:
             return create_error_response("ID de traduction manquant dans l'URL", 400)
         
-        if not translation_id.strip():
+        if not translation_ids and not translation_id.strip():
             return create_error_response("ID de traduction vide", 400)
             
-        logger.info(f"🔍 Vérification du statut pour: {translation_id}")
-        
         # Initialisation du handler
-        status_handler = StatusHandler()
+        status_handler = AsyncStatusHandler()
         
         # Vérification du statut
-        result = status_handler.check_status(translation_id)
+        if translation_ids:
+            logger.info(f"🔍 Vérification du statut pour {len(translation_ids)} sous-lots")
+            result = await status_handler.check_job_status(translation_ids)
+        else:
+            logger.info(f"🔍 Vérification du statut pour: {translation_id}")
+            result = await status_handler.check_status(translation_id)
         
         if result['success']:
-            return create_response(result['data'], 200)
+            # Job en cours : le client revient à la fin attendue plutôt qu'à intervalle fixe
+            next_poll_after = result['data'].get('next_poll_after')
+            headers = {'Retry-After': str(next_poll_after)} if next_poll_after else None
+            return create_response(result['data'], 200, headers=headers)
         else:
             return create_error_response(result['message'], 404)
             
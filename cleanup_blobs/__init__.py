@@ -0,0 +1,79 @@
+"""
+Nettoyage planifié des anciens fichiers de traduction
+Trigger: timer (toutes les 15 minutes)
+"""
+
+import azure.functions as func
+import logging
+
+# Journalisation configurée par le worker Azure Functions
+logger = logging.getLogger(__name__)
+
+from shared.config import Config
+from shared.services.service_registry import (
+    get_blob_service,
+    get_completion_estimator,
+    get_intake_service,
+    get_translation_cache
+)
+from shared.services.state_manager import StateManager
+from shared.services.tracing import trace_request
+
+
+@trace_request("cleanup_blobs")
+def main(timer: func.TimerRequest) -> None:
+    """
+    Supprime les blobs plus anciens que CLEANUP_INTERVAL_HOURS
+    dans les conteneurs d'entrée et de sortie (hors sources de requêtes
+    encore en file d'admission), et les entrées du cache
+    plus anciennes que TRANSLATION_CACHE_RETENTION_HOURS
+    """
+    if timer.past_due:
+        logger.warning("⚠️ Nettoyage planifié exécuté en retard")
+
+    try:
+        blob_service = get_blob_service()
+        max_age_hours = Config.CLEANUP_INTERVAL_HOURS
+
+        # Sources des requêtes encore en file d'admission : soumises plus tard à Translator
+        queued_blobs, queued_prefixes = get_intake_service().queued_sources()
+
+        def still_queued(blob_name: str) -> bool:
+            return blob_name in queued_blobs or blob_name.startswith(queued_prefixes)
+
+        for container_name in (Config.INPUT_CONTAINER, Config.OUTPUT_CONTAINER):
+            report = blob_service.sweep_old_files(
+                container_name, max_age_hours=max_age_hours,
+                keep=still_queued if container_name == Config.INPUT_CONTAINER else None)
+            logger.info(
+                f"🧹 Nettoyage {container_name}: {report['scanned']} blobs parcourus, "
+                f"{report['deleted']} supprimés, {report['kept']} conservés (en file), {report['failed']} échecs")
+            if report["deleted_blobs"]:
+                logger.info(f"🗑️ Supprimés ({container_name}): {', '.join(report['deleted_blobs'])}")
+
+        # Cache des traductions : durée de conservation propre
+        translation_cache = get_translation_cache()
+        if translation_cache.enabled:
+            report = translation_cache.sweep()
+            logger.info(
+                f"🧹 Nettoyage du cache {report['container']}: {report['scanned']} entrées parcourues, "
+                f"{report['deleted']} expirées, {report['failed']} échecs")
+
+        # Les états de jobs survivent un peu plus longtemps que leurs fichiers
+        removed = StateManager().cleanup_old_translations(max_age_hours=max_age_hours * 2)
+        if removed:
+            logger.info(f"🧹 {removed} états de traduction expirés supprimés")
+
+        # Suivi des requêtes de la file d'admission déjà soumises ou refusées
+        removed = get_intake_service().cleanup(max_age_hours=max_age_hours * 2)
+        if removed:
+            logger.info(f"🧹 {removed} suivis de file d'admission expirés supprimés")
+
+        # Historique des durées de jobs : conservé ETA_HISTORY_HOURS pour l'estimation
+        removed = get_completion_estimator().cleanup_history()
+        if removed:
+            logger.info(f"🧹 {removed} durées de jobs expirées supprimées")
+
+    except Exception as e:
+        logger.error(f"❌ Erreur lors du nettoyage planifié: {str(e)}")
+        raise
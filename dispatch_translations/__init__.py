@@ -0,0 +1,35 @@
+"""
+Répartiteur de la file d'admission des traductions (INTAKE_MODE=queue)
+Trigger: timer (toutes les 10 secondes, une seule exécution à la fois pour l'application)
+Désactivée par défaut (AzureWebJobs.dispatch_translations.Disabled=true), activée avec INTAKE_MODE=queue
+"""
+
+import azure.functions as func
+import logging
+
+# Journalisation configurée par le worker Azure Functions
+logger = logging.getLogger(__name__)
+
+from shared.config import Config
+from shared.services.service_registry import get_intake_service
+from shared.services.tracing import trace_request
+
+
+@trace_request("dispatch_translations")
+async def main(timer: func.TimerRequest) -> None:
+    """
+    Soumet à Translator les requêtes en file pendant INTAKE_DISPATCH_SECONDS :
+    voies prioritaires, équité entre utilisateurs, débit adapté aux 429 et à la latence
+    """
+    intake = get_intake_service()
+    if not intake.enabled:
+        return
+
+    if timer.past_due:
+        logger.warning("⚠️ Répartition exécutée en retard")
+
+    try:
+        await intake.dispatch(Config.INTAKE_DISPATCH_SECONDS)
+    except Exception as e:
+        logger.error(f"❌ Erreur lors de la répartition: {str(e)}")
+        raise
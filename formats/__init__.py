@@ -1,36 +1,34 @@
 """
-Retourne la liste des langues supportées
+Retourne la liste des formats de fichiers supportés
 """
 
 import azure.functions as func
-import json
 import logging
-import os
-from typing import Dict, Any
-from datetime import datetime, timezone
+from typing import Any, Dict
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO)
+# Journalisation configurée par le worker Azure Functions
 logger = logging.getLogger(__name__)
 
-# Création de l'application Azure Functions
-app = func.FunctionApp(http_auth_level=func.AuthLevel.FUNCTION)
+from shared.models.constants import FileFormats
+from shared.utils.response_helper import create_catalog_response, create_error_response
+from shared.services.tracing import trace_request
 
-from shared.utils.response_helper import create_response, create_error_response
 
+def _payload(formats: Dict[str, str]) -> Dict[str, Any]:
+    return {
+        "formats": dict(formats),
+        "count": len(formats)
+    }
+
+
+@trace_request("formats")
 def main(req: func.HttpRequest) -> func.HttpResponse:
     """
     Retourne la liste des formats de fichiers supportés
+    Corps précalculé avec ETag : If-None-Match → 304
     """
     try:
-        from shared.models.schemas import FileFormats
-        
-        formats = FileFormats.get_all_formats()
-        
-        return create_response({
-            "formats": formats,
-            "count": len(formats)
-        }, 200)
+        return create_catalog_response(req, "formats", FileFormats.SUPPORTED_FORMATS, _payload)
         
     except Exception as e:
         logger.error(f"❌ Erreur lors de la récupération des formats: {str(e)}")
@@ -3,25 +3,37 @@ Récupère l'URL SAS du document traduit
 Supporte POST (JSON body) et GET (paramètres URL)
 """
 
+import asyncio
 import azure.functions as func
 import logging
 import os
-from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO)
+# Journalisation configurée par le worker Azure Functions
 logger = logging.getLogger(__name__)
 
 # Import des handlers
 from shared.utils.response_helper import create_response, create_error_response, validate_json_request
-from shared.services.blob_service import BlobService
-from shared.services.graph_service import GraphService
+from shared.services.service_registry import (
+    get_async_blob_service,
+    get_async_graph_service,
+    get_translation_cache
+)
+from shared.services.status_handler import AsyncStatusHandler
+from shared.services.resilience import with_deadline
+from shared.services.storage_metrics import track_round_trips
+from shared.models.constants import normalize_target_languages
 from shared.config import Config
+from shared.services.tracing import trace_request, traced
 
-def main(req: func.HttpRequest) -> func.HttpResponse:
+@trace_request("get_result")
+@track_round_trips("get_result")
+@with_deadline()
+async def main(req: func.HttpRequest) -> func.HttpResponse:
     """
     Récupère l'URL SAS du document traduit
     Supporte POST (JSON body) et GET (paramètres URL)
+    ``target_language`` accepte plusieurs langues ("fr,de" ou liste) pour un job multi-langues
     """
     logger.info(f"📥 Récupération de résultat - Méthode: {req.method}")
     
@@ -29,15 +41,14 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
         # Extraction des paramètres selon la méthode HTTP
         if req.method.upper() == 'POST':
             # POST avec JSON body en utilisant le validateur commun
-            success, data_or_resp = validate_json_request(
-                req, ["blob_name", "target_language"]
-            )
+            success, data_or_resp = validate_json_request(req)
             if not success:
                 return data_or_resp
 
             blob_name = data_or_resp.get("blob_name")
-            target_language = data_or_resp.get("target_language")
+            target_language = data_or_resp.get("target_languages") or data_or_resp.get("target_language")
             user_id = data_or_resp.get("user_id")
+            translation_ids = data_or_resp.get("translation_ids")
 
             logger.info(
                 f"📋 Paramètres POST - blob: {blob_name}, langue: {target_language}, user: {user_id}"
@@ -46,70 +57,174 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
         else:
             # GET avec paramètres URL
             blob_name = req.params.get('blob_name')
-            target_language = req.params.get('target_language')
+            target_language = req.params.get('target_languages') or req.params.get('target_language')
             user_id = req.params.get('user_id')
+            translation_ids = req.params.get('translation_ids')
             
             logger.info(f"📋 Paramètres GET - blob: {blob_name}, langue: {target_language}, user: {user_id}")
 
+        # Job multi-documents : résultats listés depuis les sous-lots Translator
+        if isinstance(translation_ids, str):
+            translation_ids = [value.strip() for value in translation_ids.split(',') if value.strip()]
+        if translation_ids:
+            return await _get_job_result(translation_ids, user_id)
+
+        target_languages = normalize_target_languages(target_language)
+
         # Validation des paramètres obligatoires
-        if not blob_name or not target_language:
+        if not blob_name or not target_languages:
             missing = []
             if not blob_name:
                 missing.append('blob_name')
-            if not target_language:
+            if not target_languages:
                 missing.append('target_language')
             return create_error_response(f"Paramètres manquants: {', '.join(missing)}", 400)
         
-        if not blob_name.strip() or not target_language.strip():
+        if not blob_name.strip():
             return create_error_response("Les paramètres ne peuvent pas être vides", 400)
-        
-        # Initialisation des services
-        blob_service = BlobService()
-        onedrive_upload_enabled = Config.ONEDRIVE_UPLOAD_ENABLED
-        
-        # Génère le nom du blob de sortie
-        try:
-            file_base, file_ext = blob_name.rsplit('.', 1)
-            output_blob_name = f"{file_base}-{target_language}.{file_ext}"
-            logger.info(f"📄 Nom du blob de sortie: {output_blob_name}")
-        except ValueError:
+
+        if '.' not in blob_name:
             return create_error_response("Nom de fichier invalide (extension manquante)", 400)
 
-        # Génère l'URL SAS pour le téléchargement
-        download_url = blob_service.get_translated_file_url(output_blob_name)
-        if not download_url:
-            return create_error_response(f"Fichier traduit '{output_blob_name}' introuvable", 404)
+        # Initialisation des services
+        blob_service = get_async_blob_service()
+
+        # Job simple langue : réponse historique
+        if len(target_languages) == 1:
+            result = await _get_language_result(blob_service, blob_name, target_languages[0], user_id)
+            if "error" in result:
+                return create_error_response(result["error"], 404)
 
-        result = {
+            logger.info(f"✅ Résultat préparé pour {blob_name} -> {target_languages[0]}")
+            return create_response(result, 200)
+
+        # Job multi-langues : un résultat par langue cible, préparés en parallèle
+        language_results = await asyncio.gather(*(
+            _get_language_result(blob_service, blob_name, language, user_id)
+            for language in target_languages
+        ))
+        results = dict(zip(target_languages, language_results))
+        if all("error" in language_result for language_result in results.values()):
+            return create_error_response(f"Aucun fichier traduit trouvé pour '{blob_name}'", 404)
+
+        logger.info(f"✅ Résultats préparés pour {blob_name} -> {', '.join(target_languages)}")
+        return create_response({
             "blob_name": blob_name,
+            "target_languages": target_languages,
+            "user_id": user_id,
+            "results": results
+        }, 200)
+
+    except Exception as e:
+        logger.error(f"❌ Erreur lors de la récupération du résultat: {str(e)}")
+        return create_error_response(f"Erreur interne: {str(e)}", 500)
+
+
+async def _get_job_result(translation_ids: List[str], user_id: Optional[str]) -> func.HttpResponse:
+    """Résultats d'un job multi-documents : une URL par document et par langue"""
+    blob_service = get_async_blob_service()
+    documents = await AsyncStatusHandler().get_job_documents(translation_ids)
+
+    # Les URLs de téléchargement sont vérifiées en parallèle
+    results = list(await asyncio.gather(*(
+        _get_document_result(blob_service, document) for document in documents)))
+
+    logger.info(f"✅ {len(results)} résultats préparés pour {len(translation_ids)} sous-lot(s)")
+    return create_response({
+        "translation_ids": translation_ids,
+        "user_id": user_id,
+        "count": len(results),
+        "results": results
+    }, 200)
+
+
+@traced("result.document")
+async def _get_document_result(blob_service, document: Dict[str, Any]) -> Dict[str, Any]:
+    """Résultat d'un document d'un job multi-documents"""
+    entry = {
+        "translation_id": document["translation_id"],
+        "source_blob_name": document.get("source_blob_name"),
+        "target_language": document.get("language"),
+        "output_blob_name": document.get("output_blob_name"),
+        "status": document["status"]
+    }
+    if document["status"] == "Succeeded" and document.get("output_blob_name"):
+        download_url = await blob_service.get_translated_file_url(document["output_blob_name"])
+        if download_url:
+            entry["download_url"] = download_url
+        else:
+            entry["error"] = "Fichier traduit introuvable"
+    elif document.get("error"):
+        entry["error"] = document["error"]
+    return entry
+
+
+async def _settle_attached_output(output_blob_name: str) -> bool:
+    """
+    Requête rattachée par le cache des traductions à un job identique : sa sortie est copiée
+    quand ce job se termine, constaté ici si le client n'a pas appelé check_status
+    Retourne True si la sortie a pu être produite
+    """
+    translation_cache = get_translation_cache()
+    if not translation_cache.enabled:
+        return False
+    translation_id = await asyncio.to_thread(translation_cache.job_for_output, output_blob_name)
+    if not translation_id:
+        return False
+    result = await AsyncStatusHandler().check_status(translation_id)
+    return result["success"] and result["data"].get("status") == "Succeeded"
+
+
+@traced("result.language")
+async def _get_language_result(blob_service, blob_name: str, target_language: str,
+                         user_id: Optional[str]) -> Dict[str, Any]:
+    """
+    Prépare le résultat d'une langue cible : URL SAS et upload OneDrive optionnel
+    Retourne un dictionnaire avec "error" si le fichier traduit est introuvable
+    """
+    # Génère le nom du blob de sortie
+    output_blob_name = blob_service.build_output_blob_name(blob_name, target_language)
+    logger.info(f"📄 Nom du blob de sortie: {output_blob_name}")
+
+    # Génère l'URL SAS pour le téléchargement
+    download_url = await blob_service.get_translated_file_url(output_blob_name)
+    if not download_url and await _settle_attached_output(output_blob_name):
+        download_url = await blob_service.get_translated_file_url(output_blob_name)
+    if not download_url:
+        return {
             "target_language": target_language,
             "output_blob_name": output_blob_name,
-            "download_url": download_url,
-            "user_id": user_id
+            "error": f"Fichier traduit '{output_blob_name}' introuvable"
         }
 
-        # (Optionnel) Upload vers OneDrive si configuré et user_id fourni
-        if onedrive_upload_enabled and user_id:
-            try:
-                graph_service = GraphService()
-                file_content = blob_service.download_translated_file(output_blob_name)
-                if file_content:
-                    onedrive_result = graph_service.upload_to_onedrive(file_content, output_blob_name, user_id)
-                    if onedrive_result.get("success"):
-                        result["onedrive_url"] = onedrive_result.get("onedrive_url")
-                        logger.info("✅ Fichier uploadé vers OneDrive")
-                    else:
-                        result["onedrive_error"] = onedrive_result.get("error")
-                        logger.warning(f"⚠️ Erreur OneDrive: {onedrive_result.get('error')}")
-                else:
-                    result["onedrive_error"] = "Impossible de télécharger le fichier pour OneDrive"
-            except Exception as onedrive_error:
-                result["onedrive_error"] = f"Erreur OneDrive: {str(onedrive_error)}"
-                logger.error(f"❌ Erreur OneDrive: {str(onedrive_error)}")
+    result = {
+        "blob_name": blob_name,
+        "target_language": target_language,
+        "output_blob_name": output_blob_name,
+        "download_url": download_url,
+        "user_id": user_id
+    }
 
-        logger.info(f"✅ Résultat préparé pour {blob_name} -> {target_language}")
-        return create_response(result, 200)
+    # (Optionnel) Upload vers OneDrive si configuré et user_id fourni
+    if Config.ONEDRIVE_UPLOAD_ENABLED and user_id:
+        try:
+            graph_service = get_async_graph_service()
+            # Plages parallèles vers un fichier temporaire : mémoire bornée
+            downloaded = await blob_service.open_translated_file(output_blob_name)
+            if downloaded:
+                with downloaded["file"] as file_content:
+                    onedrive_result = await graph_service.upload_to_onedrive(
+                        file_content, output_blob_name, user_id, file_size=downloaded["size"])
+                if onedrive_result.get("success"):
+                    result["onedrive_url"] = onedrive_result.get("onedrive_url")
+                    logger.info("✅ Fichier uploadé vers OneDrive")
+                else:
+                    result["onedrive_error"] = onedrive_result.get("error")
+                    logger.warning(f"⚠️ Erreur OneDrive: {onedrive_result.get('error')}")
+            else:
+                result["onedrive_error"] = "Impossible de télécharger le fichier pour OneDrive"
+        except Exception as onedrive_error:
+            result["onedrive_error"] = f"Erreur OneDrive: {str(onedrive_error)}"
+            logger.error(f"❌ Erreur OneDrive: {str(onedrive_error)}")
 
-    except Exception as e:
-        logger.error(f"❌ Erreur lors de la récupération du résultat: {str(e)}")
-        return create_error_response(f"Erreur interne: {str(e)}", 500)
+    return result
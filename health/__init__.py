@@ -7,14 +7,26 @@ import logging
 import os
 from datetime import datetime, timezone
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO)
+# Journalisation configurée par le worker Azure Functions
 logger = logging.getLogger(__name__)
 
 # Import des handlers
 from shared.utils.response_helper import create_response, create_error_response
 from shared.config import Config
+from shared.services.service_registry import (
+    get_blob_service,
+    get_completion_estimator,
+    get_graph_token_provider,
+    get_http_client,
+    get_intake_service,
+    get_state_store,
+    get_status_cache,
+    get_translation_cache
+)
+from shared.services import resilience, storage_metrics
+from shared.services.tracing import trace_request
 
+@trace_request("health")
 def main(req: func.HttpRequest) -> func.HttpResponse:
     """
     Point de santé pour vérifier que les fonctions sont opérationnelles
@@ -42,15 +54,34 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
             od_available = "available"
         else:
             od_available = "not configured"
+        # Disjoncteur ouvert : dépendance signalée indisponible jusqu'au prochain appel d'essai
+        dependencies = resilience.get_stats()
+        translator_down = dependencies.get(resilience.TRANSLATOR, {}).get("state") == "open"
+        if od_available == "available" and dependencies.get(resilience.GRAPH, {}).get("state") == "open":
+            od_available = "unavailable"
         health_data = {
-            "status": "healthy",
+            "status": "degraded" if translator_down else "healthy",
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "services": {
-                "translator": "available",
+                "translator": "unavailable" if translator_down else "available",
                 "blob_storage": "available",
                 "onedrive": od_available
+            },
+            "metrics": {
+                "http": get_http_client().get_stats(),
+                "sas": get_blob_service().get_sas_stats(),
+                "blob_properties": get_blob_service().get_properties_cache_stats(),
+                "storage_round_trips": storage_metrics.get_stats(),
+                "status_cache": get_status_cache().get_stats(),
+                "translation_cache": get_translation_cache().get_stats(),
+                "state": get_state_store().get_stats(),
+                "completion_estimator": get_completion_estimator().get_stats(),
+                "intake": get_intake_service().get_stats(),
+                "dependencies": dependencies
             }
         }
+        if onedrive_upload_enabled:
+            health_data["metrics"]["graph_token"] = get_graph_token_provider().get_stats()
         
         return create_response(health_data, 200)
         
@@ -4,31 +4,32 @@ Retourne la liste des langues supportées
 
 import azure.functions as func
 import logging
+from typing import Any, Dict
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO)
+# Journalisation configurée par le worker Azure Functions
 logger = logging.getLogger(__name__)
 
-from shared.utils.response_helper import create_response, create_error_response
+from shared.models.constants import SupportedLanguages
+from shared.utils.response_helper import create_catalog_response, create_error_response
+from shared.services.tracing import trace_request
 
 
+def _payload(languages: Dict[str, str]) -> Dict[str, Any]:
+    return {
+        "languages": dict(languages),
+        "count": len(languages)
+    }
+
+
+@trace_request("languages")
 def main(req: func.HttpRequest) -> func.HttpResponse:
     """
     Retourne la liste des langues supportées
+    Corps précalculé avec ETag : If-None-Match → 304
     """
     try:
-        from shared.models.schemas import SupportedLanguages
-        
-        languages = SupportedLanguages.get_all_languages()
-        
-        return create_response({
-            "languages": languages,
-            "count": len(languages)
-        }, 200)
+        return create_catalog_response(req, "languages", SupportedLanguages.LANGUAGES, _payload)
         
     except Exception as e:
         logger.error(f"❌ Erreur lors de la récupération des langues: {str(e)}")
         return create_error_response(f"Erreur interne: {str(e)}", 500)
-
-
-
@@ -0,0 +1,58 @@
+"""
+Enregistre la complétion des traductions à l'arrivée des fichiers traduits
+Trigger: Event Grid (Microsoft.Storage.BlobCreated sur le conteneur de sortie)
+"""
+
+import azure.functions as func
+import logging
+import time
+from urllib.parse import unquote, urlparse
+
+# Journalisation configurée par le worker Azure Functions
+logger = logging.getLogger(__name__)
+
+from shared.config import Config
+from shared.services.service_registry import get_blob_service, get_status_cache
+from shared.services.state_manager import StateManager
+from shared.services.tracing import trace_request
+
+
+@trace_request("output_blob_created")
+def main(event: func.EventGridEvent) -> None:
+    """
+    Associe le blob créé à son job et enregistre l'heure et la taille de sortie
+    check_status répond ensuite localement sans appeler Translator
+    """
+    if event.event_type != "Microsoft.Storage.BlobCreated":
+        logger.debug(f"Événement ignoré: {event.event_type}")
+        return
+
+    data = event.get_json() or {}
+    container_name, blob_name = _parse_blob_url(data.get("url", ""))
+    if container_name != Config.OUTPUT_CONTAINER or not blob_name:
+        logger.debug(f"Blob hors conteneur de sortie ignoré: {data.get('url')}")
+        return
+
+    # Blob réécrit : les propriétés gardées en mémoire ne sont plus valides
+    get_blob_service().properties_cache.invalidate(container_name, blob_name)
+
+    completed_at = event.event_time.timestamp() if event.event_time else time.time()
+    translation_id = StateManager().record_output_completed(
+        blob_name, data.get("contentLength"), completed_at)
+
+    if translation_id is None:
+        logger.info(f"ℹ️ Blob de sortie sans job connu: {blob_name}")
+        return
+
+    # Le prochain check_status doit relire l'état local plutôt qu'un statut en cache
+    get_status_cache().invalidate(translation_id)
+    logger.info(f"✅ Sortie reçue pour {translation_id}: {blob_name} ({data.get('contentLength')} bytes)")
+
+
+def _parse_blob_url(url: str) -> tuple:
+    """Extrait (conteneur, nom du blob) d'une URL de blob"""
+    path = unquote(urlparse(url).path).lstrip('/')
+    if '/' not in path:
+        return path, None
+    container_name, blob_name = path.split('/', 1)
+    return container_name, blob_name
@@ -4,6 +4,7 @@ Adaptée du code conteneur existant
 """
 
 import os
+import tempfile
 from typing import List, Optional
 
 
@@ -15,6 +16,27 @@ class Config:
     AZURE_ACCOUNT_KEY = os.getenv('AZURE_ACCOUNT_KEY')
     INPUT_CONTAINER = os.getenv('INPUT_CONTAINER', 'doc-to-trad')
     OUTPUT_CONTAINER = os.getenv('OUTPUT_CONTAINER', 'doc-trad')
+    # Point de terminaison alternatif (Azurite: http://127.0.0.1:10000/devstoreaccount1)
+    AZURE_STORAGE_ENDPOINT = os.getenv('AZURE_STORAGE_ENDPOINT')
+    # Azure Table (Azurite: http://127.0.0.1:10002/devstoreaccount1)
+    AZURE_TABLE_ENDPOINT = os.getenv('AZURE_TABLE_ENDPOINT')
+    # Azure Queue (Azurite: http://127.0.0.1:10001/devstoreaccount1)
+    AZURE_QUEUE_ENDPOINT = os.getenv('AZURE_QUEUE_ENDPOINT')
+
+    # SAS : expiration arrondie à la tranche supérieure, jetons identiques réutilisés
+    SAS_EXPIRY_BUCKET_MINUTES = int(os.getenv('SAS_EXPIRY_BUCKET_MINUTES', 15))
+    SAS_CACHE_MAX_ENTRIES = int(os.getenv('SAS_CACHE_MAX_ENTRIES', 10000))
+    # Signature par clé de délégation utilisateur (identité managée) au lieu de la clé du compte
+    SAS_USER_DELEGATION = os.getenv('SAS_USER_DELEGATION', 'false').lower() == 'true'
+    SAS_USER_DELEGATION_KEY_HOURS = int(os.getenv('SAS_USER_DELEGATION_KEY_HOURS', 48))
+
+    # Téléchargements : requêtes de plage parallèles, débordement sur disque
+    BLOB_DOWNLOAD_CONCURRENCY = int(os.getenv('BLOB_DOWNLOAD_CONCURRENCY', 4))
+    BLOB_DOWNLOAD_CHUNK_MB = int(os.getenv('BLOB_DOWNLOAD_CHUNK_MB', 2))
+    BLOB_SPOOL_THRESHOLD_MB = int(os.getenv('BLOB_SPOOL_THRESHOLD_MB', 8))
+    # Propriétés des fichiers traduits gardées en mémoire (get_result sans HEAD répété)
+    BLOB_PROPERTIES_CACHE_SECONDS = int(os.getenv('BLOB_PROPERTIES_CACHE_SECONDS', 30))
+    BLOB_PROPERTIES_CACHE_MAX_ENTRIES = int(os.getenv('BLOB_PROPERTIES_CACHE_MAX_ENTRIES', 10000))
 
     # Azure Translator
     TRANSLATOR_KEY = os.getenv('TRANSLATOR_KEY')
@@ -26,9 +48,131 @@ class Config:
     CLIENT_SECRET = os.getenv('SECRET_ID')
     TENANT_ID = os.getenv('TENANT_ID')
     ONEDRIVE_UPLOAD_ENABLED = os.getenv('ONEDRIVE_UPLOAD_ENABLED', 'false').lower() == 'true'
+    # Points de terminaison Graph et Entra ID (remplaçables par des serveurs locaux)
+    GRAPH_BASE_URL = os.getenv('GRAPH_BASE_URL', 'https://graph.microsoft.com/v1.0').rstrip('/')
+    GRAPH_AUTHORITY_URL = os.getenv('GRAPH_AUTHORITY_URL', 'https://login.microsoftonline.com').rstrip('/')
     ONEDRIVE_FOLDER = os.getenv('ONEDRIVE_FOLDER')
+    # Upload par session : fragments multiples de 320 KiB (exigence Graph)
+    ONEDRIVE_SIMPLE_UPLOAD_MAX_MB = int(os.getenv('ONEDRIVE_SIMPLE_UPLOAD_MAX_MB', 4))
+    ONEDRIVE_FRAGMENT_SIZE_KB = int(os.getenv('ONEDRIVE_FRAGMENT_SIZE_KB', 320 * 10))
+    ONEDRIVE_FRAGMENT_RETRIES = int(os.getenv('ONEDRIVE_FRAGMENT_RETRIES', 3))
+    # Token Graph partagé par le processus, renouvelé avant expiration
+    GRAPH_TOKEN_REFRESH_MARGIN_SECONDS = int(os.getenv('GRAPH_TOKEN_REFRESH_MARGIN_SECONDS', 300))
+    GRAPH_TOKEN_BACKGROUND_REFRESH = os.getenv('GRAPH_TOKEN_BACKGROUND_REFRESH', 'true').lower() == 'true'
+    # Cache disque optionnel (ex. /home/data/graph_token.json, conservé au redémarrage du worker)
+    GRAPH_TOKEN_CACHE_PATH = os.getenv('GRAPH_TOKEN_CACHE_PATH')
     # Limites
     CLEANUP_INTERVAL_HOURS = int(os.getenv('CLEANUP_INTERVAL_HOURS', 1))
+    MAX_TARGET_LANGUAGES = int(os.getenv('MAX_TARGET_LANGUAGES', 10))
+
+    # Jobs multi-documents (limites de l'API Batch Translation)
+    JOBS_PREFIX = os.getenv('JOBS_PREFIX', 'jobs')
+    BATCH_MAX_DOCUMENTS = int(os.getenv('BATCH_MAX_DOCUMENTS', 1000))
+    BATCH_MAX_TOTAL_SIZE_MB = int(os.getenv('BATCH_MAX_TOTAL_SIZE_MB', 250))
+    BATCH_MAX_DOCUMENT_SIZE_MB = int(os.getenv('BATCH_MAX_DOCUMENT_SIZE_MB', 40))
+
+    # Transport HTTP sortant (Translator, Graph)
+    HTTP_BACKEND = os.getenv('HTTP_BACKEND', 'requests').lower()  # 'requests' ou 'httpx'
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 10))
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 20))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', 60))
+    HTTP2_ENABLED = os.getenv('HTTP2_ENABLED', 'false').lower() == 'true'
+
+    # Cache des statuts de traduction
+    STATUS_CACHE_TTL_SECONDS = float(os.getenv('STATUS_CACHE_TTL_SECONDS', 5))
+    STATUS_CACHE_MAX_ENTRIES = int(os.getenv('STATUS_CACHE_MAX_ENTRIES', 10000))
+
+    # État des traductions : 'memory' (un worker), 'sqlite' (un nœud), 'table' (partagé)
+    STATE_BACKEND = os.getenv('STATE_BACKEND', 'memory').lower()
+    STATE_SQLITE_PATH = os.getenv('STATE_SQLITE_PATH', os.path.join(tempfile.gettempdir(), 'translation_state.db'))
+    STATE_TABLE_NAME = os.getenv('STATE_TABLE_NAME', 'translationstate')
+    # Partitions par type de document ; changer la valeur impose une table neuve
+    STATE_TABLE_PARTITIONS = int(os.getenv('STATE_TABLE_PARTITIONS', 8))
+    STATE_WRITE_BATCH_SIZE = int(os.getenv('STATE_WRITE_BATCH_SIZE', 100))
+    STATE_FLUSH_INTERVAL_MS = int(os.getenv('STATE_FLUSH_INTERVAL_MS', 50))
+    STATE_CACHE_TTL_SECONDS = float(os.getenv('STATE_CACHE_TTL_SECONDS', 2))
+
+    # Durée attendue des jobs, apprise des jobs terminés (format, taille, langues)
+    ETA_HISTORY_HOURS = int(os.getenv('ETA_HISTORY_HOURS', 24 * 7))
+    ETA_MAX_SAMPLES = int(os.getenv('ETA_MAX_SAMPLES', 5000))
+    ETA_MIN_SAMPLES = int(os.getenv('ETA_MIN_SAMPLES', 8))
+    ETA_REFIT_SECONDS = int(os.getenv('ETA_REFIT_SECONDS', 300))
+    # Estimation sans historique : base + par Mo + par langue supplémentaire
+    ETA_DEFAULT_SECONDS = float(os.getenv('ETA_DEFAULT_SECONDS', 90))
+    ETA_DEFAULT_SECONDS_PER_MB = float(os.getenv('ETA_DEFAULT_SECONDS_PER_MB', 20))
+    ETA_DEFAULT_SECONDS_PER_LANGUAGE = float(os.getenv('ETA_DEFAULT_SECONDS_PER_LANGUAGE', 15))
+    # Polling conseillé (Retry-After, next_poll_after) ; après l'échéance, fraction de la durée estimée
+    POLL_MIN_SECONDS = int(os.getenv('POLL_MIN_SECONDS', 5))
+    POLL_MAX_SECONDS = int(os.getenv('POLL_MAX_SECONDS', 60))
+    POLL_DEFAULT_SECONDS = int(os.getenv('POLL_DEFAULT_SECONDS', 10))
+    ETA_OVERDUE_POLL_FRACTION = float(os.getenv('ETA_OVERDUE_POLL_FRACTION', 0.25))
+
+    # Cache des traductions (contenu source + langue + options → fichier traduit)
+    # Actif seulement avec STATE_BACKEND=table (état partagé entre workers)
+    TRANSLATION_CACHE_ENABLED = os.getenv('TRANSLATION_CACHE_ENABLED', 'true').lower() == 'true'
+    TRANSLATION_CACHE_CONTAINER = os.getenv('TRANSLATION_CACHE_CONTAINER', 'doc-trad-cache')
+    TRANSLATION_CACHE_RETENTION_HOURS = int(os.getenv('TRANSLATION_CACHE_RETENTION_HOURS', 24 * 7))
+    # Source sans Content-MD5 : lue pour calculer son empreinte jusqu'à cette taille (0 : cache ignoré)
+    TRANSLATION_CACHE_HASH_MAX_MB = float(os.getenv('TRANSLATION_CACHE_HASH_MAX_MB', 0))
+    # Au-delà, un job en cours n'est plus proposé aux requêtes identiques
+    TRANSLATION_CACHE_PENDING_TIMEOUT_MINUTES = int(os.getenv('TRANSLATION_CACHE_PENDING_TIMEOUT_MINUTES', 60))
+
+    # File d'admission : 'direct' (soumission immédiate) ou 'queue' (file, équité, débit adaptatif)
+    INTAKE_MODE = os.getenv('INTAKE_MODE', 'direct').lower()
+    # File : 'memory' (un worker) ou 'storage' (Azure Queue, partagée)
+    INTAKE_BACKEND = os.getenv('INTAKE_BACKEND', 'memory').lower()
+    INTAKE_QUEUE_PREFIX = os.getenv('INTAKE_QUEUE_PREFIX', 'translation-intake')
+    # Voies prioritaires : poids du tourniquet pondéré, voie par défaut d'un document seul
+    INTAKE_LANE_WEIGHTS = os.getenv('INTAKE_LANE_WEIGHTS', 'interactive=4,bulk=1')
+    INTAKE_DEFAULT_LANE = os.getenv('INTAKE_DEFAULT_LANE', 'interactive')
+    # Petits fichiers : file séparée de poids multiplié (passent devant les gros sans les affamer)
+    INTAKE_SMALL_FILE_MB = float(os.getenv('INTAKE_SMALL_FILE_MB', 5))
+    INTAKE_SMALL_FILE_BOOST = int(os.getenv('INTAKE_SMALL_FILE_BOOST', 2))
+    # Jobs Translator en cours : par utilisateur et au total
+    INTAKE_MAX_ACTIVE_PER_USER = int(os.getenv('INTAKE_MAX_ACTIVE_PER_USER', 3))
+    INTAKE_MAX_ACTIVE_JOBS = int(os.getenv('INTAKE_MAX_ACTIVE_JOBS', 50))
+    # Au-delà, un job soumis dont le statut n'a plus été vu ne compte plus comme actif
+    INTAKE_ACTIVE_TIMEOUT_MINUTES = int(os.getenv('INTAKE_ACTIVE_TIMEOUT_MINUTES', 120))
+    INTAKE_ACTIVE_REFRESH_SECONDS = int(os.getenv('INTAKE_ACTIVE_REFRESH_SECONDS', 15))
+    # Répartiteur : durée d'une passe (timer dispatch_translations), messages lus par file
+    INTAKE_DISPATCH_SECONDS = float(os.getenv('INTAKE_DISPATCH_SECONDS', 9))
+    INTAKE_IDLE_POLL_SECONDS = float(os.getenv('INTAKE_IDLE_POLL_SECONDS', 1))
+    INTAKE_WINDOW = int(os.getenv('INTAKE_WINDOW', 32))
+    INTAKE_VISIBILITY_SECONDS = int(os.getenv('INTAKE_VISIBILITY_SECONDS', 60))
+    INTAKE_MAX_ATTEMPTS = int(os.getenv('INTAKE_MAX_ATTEMPTS', 5))
+    # Débit de soumission adaptatif (AIMD) : soumissions par seconde
+    INTAKE_RATE_INITIAL = float(os.getenv('INTAKE_RATE_INITIAL', 2))
+    INTAKE_RATE_MIN = float(os.getenv('INTAKE_RATE_MIN', 0.2))
+    INTAKE_RATE_MAX = float(os.getenv('INTAKE_RATE_MAX', 10))
+    INTAKE_RATE_INCREASE = float(os.getenv('INTAKE_RATE_INCREASE', 0.1))
+    INTAKE_RATE_DECREASE = float(os.getenv('INTAKE_RATE_DECREASE', 0.5))
+    # Soumission plus lente que la cible : réduction douce du débit
+    INTAKE_TARGET_LATENCY_MS = int(os.getenv('INTAKE_TARGET_LATENCY_MS', 2000))
+    INTAKE_LATENCY_DECREASE = float(os.getenv('INTAKE_LATENCY_DECREASE', 0.9))
+
+    # Résilience des appels sortants (Translator, Graph, Entra ID) : retries avec backoff exponentiel
+    RETRY_MAX_ATTEMPTS = int(os.getenv('RETRY_MAX_ATTEMPTS', 4))
+    RETRY_BASE_DELAY_MS = int(os.getenv('RETRY_BASE_DELAY_MS', 500))
+    RETRY_MAX_DELAY_SECONDS = float(os.getenv('RETRY_MAX_DELAY_SECONDS', 10))
+    # Temps total consacré aux retries d'un appel (hors requête HTTP entrante)
+    RETRY_BUDGET_SECONDS = float(os.getenv('RETRY_BUDGET_SECONDS', 20))
+    # Échéance d'une requête HTTP entrante : aucun retry ne la dépasse
+    REQUEST_DEADLINE_SECONDS = float(os.getenv('REQUEST_DEADLINE_SECONDS', 25))
+    # Disjoncteur par dépendance : ouvert après N échecs consécutifs, demi-ouvert après le délai
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv('BREAKER_FAILURE_THRESHOLD', 5))
+    BREAKER_OPEN_SECONDS = float(os.getenv('BREAKER_OPEN_SECONDS', 30))
+
+    # Corps des réponses HTTP : JSON compact (false = indenté, pour le débogage)
+    RESPONSE_JSON_COMPACT = os.getenv('RESPONSE_JSON_COMPACT', 'true').lower() == 'true'
+    RESPONSE_JSON_ENCODER = os.getenv('RESPONSE_JSON_ENCODER', 'auto').lower()  # 'auto' (orjson si installé), 'orjson' ou 'json'
+
+    # Catalogues (langues, formats) : durée de cache client, revalidés ensuite par ETag
+    CATALOG_CACHE_MAX_AGE_SECONDS = int(os.getenv('CATALOG_CACHE_MAX_AGE_SECONDS', 3600))
+
+    # Traces : spans par requête, en-tête Server-Timing, export local ('none', 'log' ou 'file')
+    TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'true').lower() == 'true'
+    TRACE_EXPORTER = os.getenv('TRACE_EXPORTER', 'none').lower()
+    TRACE_EXPORT_PATH = os.getenv('TRACE_EXPORT_PATH', os.path.join(tempfile.gettempdir(), 'translation_traces.jsonl'))
 
     @classmethod
     def validate(cls) -> List[str]:
@@ -38,8 +182,8 @@ class Config:
         # Validation Azure Storage
         if not cls.AZURE_ACCOUNT_NAME:
             errors.append("AZURE_ACCOUNT_NAME manquant")
-        if not cls.AZURE_ACCOUNT_KEY:
-            errors.append("AZURE_ACCOUNT_KEY manquant")
+        if not cls.AZURE_ACCOUNT_KEY and not cls.SAS_USER_DELEGATION:
+            errors.append("AZURE_ACCOUNT_KEY manquant (ou SAS_USER_DELEGATION=true)")
 
         # Validation Azure Translator
         if not cls.TRANSLATOR_KEY:
@@ -56,8 +200,24 @@ class Config:
     @classmethod
     def get_storage_url(cls) -> str:
         """URL du service Azure Storage"""
+        if cls.AZURE_STORAGE_ENDPOINT:
+            return cls.AZURE_STORAGE_ENDPOINT.rstrip('/')
         return f"https://{cls.AZURE_ACCOUNT_NAME}.blob.core.windows.net"
 
+    @classmethod
+    def get_table_url(cls) -> str:
+        """URL du service Azure Table Storage"""
+        if cls.AZURE_TABLE_ENDPOINT:
+            return cls.AZURE_TABLE_ENDPOINT.rstrip('/')
+        return f"https://{cls.AZURE_ACCOUNT_NAME}.table.core.windows.net"
+
+    @classmethod
+    def get_queue_url(cls) -> str:
+        """URL du service Azure Queue Storage"""
+        if cls.AZURE_QUEUE_ENDPOINT:
+            return cls.AZURE_QUEUE_ENDPOINT.rstrip('/')
+        return f"https://{cls.AZURE_ACCOUNT_NAME}.queue.core.windows.net"
+
     @classmethod
     def get_translator_batch_url(cls) -> str:
         """URL de l'API Batch Translation"""
@@ -5,16 +5,18 @@ Copiés et adaptés du code conteneur existant
 
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
-from enum import Enum
 from datetime import datetime
 
-
-class TranslationStatus(str, Enum):
-    """États possibles d'une traduction"""
-    PENDING = "Pending"
-    IN_PROGRESS = "InProgress"
-    SUCCEEDED = "Succeeded"
-    FAILED = "Failed"
+# Statuts et catalogues, réexportés pour les imports existants
+from shared.models.constants import (  # noqa: F401
+    FileFormats,
+    SupportedLanguages,
+    TranslationStatus,
+    get_file_extension,
+    normalize_target_languages,
+    validate_file_format,
+    validate_language_code
+)
 
 
 class TranslationRequest(BaseModel):
@@ -31,6 +33,7 @@ class BlobUrls(BaseModel):
     target_url: str = Field(..., description="URL SAS du blob cible")
     input_blob_name: str = Field(..., description="Nom du blob source")
     output_blob_name: str = Field(..., description="Nom du blob cible")
+    targets: Optional[List[Dict[str, str]]] = Field(None, description="Cibles par langue (language, target_url, output_blob_name)")
 
 
 class TranslationStatusResponse(BaseModel):
@@ -48,6 +51,7 @@ class TranslationInfo(BaseModel):
     """Informations d'une traduction active"""
     file_name: str = Field(..., description="Nom du fichier original")
     target_language: str = Field(..., description="Langue cible")
+    target_languages: Optional[List[str]] = Field(None, description="Langues cibles d'un job multi-langues")
     user_id: str = Field(..., description="ID utilisateur")
     blob_urls: BlobUrls = Field(..., description="URLs des blobs")
     status: str = Field(..., description="Statut actuel")
@@ -80,135 +84,3 @@ class FunctionResponse(BaseModel):
     success: bool = Field(..., description="Succès de l'opération")
     message: str = Field(..., description="Message descriptif")
     data: Optional[Dict[str, Any]] = Field(None, description="Données additionnelles")
-
-
-class SupportedLanguages:
-    """Langues supportées by Azure Translator"""
-
-    LANGUAGES = {
-        "af": "Afrikaans",
-        "ar": "Arabic",
-        "bg": "Bulgarian",
-        "bn": "Bengali",
-        "bs": "Bosnian",
-        "ca": "Catalan",
-        "cs": "Czech",
-        "cy": "Welsh",
-        "da": "Danish",
-        "de": "German",
-        "el": "Greek",
-        "en": "English",
-        "es": "Spanish",
-        "et": "Estonian",
-        "fa": "Persian",
-        "fi": "Finnish",
-        "fr": "French",
-        "ga": "Irish",
-        "gu": "Gujarati",
-        "he": "Hebrew",
-        "hi": "Hindi",
-        "hr": "Croatian",
-        "hu": "Hungarian",
-        "id": "Indonesian",
-        "is": "Icelandic",
-        "it": "Italian",
-        "ja": "Japanese",
-        "kn": "Kannada",
-        "ko": "Korean",
-        "lt": "Lithuanian",
-        "lv": "Latvian",
-        "ml": "Malayalam",
-        "mr": "Marathi",
-        "ms": "Malay",
-        "mt": "Maltese",
-        "nb": "Norwegian",
-        "nl": "Dutch",
-        "pa": "Punjabi",
-        "pl": "Polish",
-        "pt-pt": "Portuguese",
-        "ro": "Romanian",
-        "ru": "Russian",
-        "sk": "Slovak",
-        "sl": "Slovenian",
-        "sv": "Swedish",
-        "ta": "Tamil",
-        "te": "Telugu",
-        "th": "Thai",
-        "tr": "Turkish",
-        "uk": "Ukrainian",
-        "ur": "Urdu",
-        "vi": "Vietnamese",
-        "zh": "Chinese (Simplified)",
-        "zh-Hant": "Chinese (Traditional)",
-        "tlh-Latn": "Klingon (Latin)",
-    }
-
-    @classmethod
-    def is_supported(cls, language_code: str) -> bool:
-        """Vérifie si une langue est supportée"""
-        return language_code.lower() in cls.LANGUAGES
-
-    @classmethod
-    def get_language_name(cls, language_code: str) -> Optional[str]:
-        """Obtient le nom complet d'une langue"""
-        return cls.LANGUAGES.get(language_code.lower())
-
-    @classmethod
-    def get_all_languages(cls) -> Dict[str, str]:
-        """Retourne toutes les langues supportées"""
-        return cls.LANGUAGES.copy()
-
-
-class FileFormats:
-    """Formats de fichiers supportés"""
-
-    SUPPORTED_FORMATS = {
-        ".pdf": "Portable Document Format",
-        ".docx": "Microsoft Word Document",
-        ".doc": "Microsoft Word Document (Legacy)",
-        ".pptx": "Microsoft PowerPoint Presentation",
-        ".ppt": "Microsoft PowerPoint Presentation (Legacy)",
-        ".xlsx": "Microsoft Excel Spreadsheet",
-        ".xls": "Microsoft Excel Spreadsheet (Legacy)",
-        ".txt": "Plain Text File",
-        ".rtf": "Rich Text Format",
-        ".html": "HyperText Markup Language",
-        ".htm": "HyperText Markup Language",
-        ".xml": "eXtensible Markup Language",
-        ".odt": "OpenDocument Text",
-        ".ods": "OpenDocument Spreadsheet",
-        ".odp": "OpenDocument Presentation"
-    }
-
-    @classmethod
-    def is_supported(cls, file_name: str) -> bool:
-        """Vérifie si le format de fichier est supporté"""
-        extension = '.' + file_name.split('.')[-1].lower() if '.' in file_name else ''
-        return extension in cls.SUPPORTED_FORMATS
-
-    @classmethod
-    def get_format_description(cls, file_name: str) -> Optional[str]:
-        """Obtient la description du format"""
-        extension = '.' + file_name.split('.')[-1].lower() if '.' in file_name else ''
-        return cls.SUPPORTED_FORMATS.get(extension)
-
-    @classmethod
-    def get_all_formats(cls) -> Dict[str, str]:
-        """Retourne tous les formats supportés"""
-        return cls.SUPPORTED_FORMATS.copy()
-
-
-# Fonctions utilitaires de validation
-def validate_file_format(file_name: str) -> bool:
-    """Valide le format d'un fichier"""
-    return FileFormats.is_supported(file_name)
-
-
-def validate_language_code(language_code: str) -> bool:
-    """Valide un code de langue"""
-    return SupportedLanguages.is_supported(language_code)
-
-
-def get_file_extension(file_name: str) -> str:
-    """Extrait l'extension d'un fichier"""
-    return '.' + file_name.split('.')[-1].lower() if '.' in file_name else ''
\ No newline at end of file
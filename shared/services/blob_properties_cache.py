@@ -0,0 +1,70 @@
+"""
+Cache court des propriétés de blobs (ETag, taille, Content-MD5)
+Évite de redemander les propriétés d'un fichier traduit à chaque get_result ;
+les écritures et suppressions faites par BlobService invalident l'entrée
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from shared.config import Config
+
+
+class BlobPropertiesCache:
+    """
+    Propriétés de blobs existants, gardées ``ttl_seconds`` secondes
+    Les absences (404) ne sont jamais mises en cache : un fichier traduit peut arriver à tout moment
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = Config.BLOB_PROPERTIES_CACHE_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_entries = max_entries or Config.BLOB_PROPERTIES_CACHE_MAX_ENTRIES
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, float]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, container_name: str, blob_name: str) -> Optional[Any]:
+        """Propriétés encore fraîches, None sinon"""
+        key = (container_name, blob_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry[0]
+                del self._entries[key]
+            self._misses += 1
+            return None
+
+    def put(self, container_name: str, blob_name: str, properties: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[(container_name, blob_name)] = (properties, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end((container_name, blob_name))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, container_name: str, blob_name: str) -> None:
+        with self._lock:
+            self._entries.pop((container_name, blob_name), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 3) if lookups else 0.0
+            }
@@ -3,12 +3,23 @@ Service de gestion des blobs Azure Storage pour Azure Functions
 Adapté du code conteneur existant
 """
 
+import asyncio
 import logging
 import base64
+import hashlib
+import tempfile
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, List, Optional, Tuple
-from azure.storage.blob import BlobServiceClient, generate_blob_sas, BlobSasPermissions
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
+from urllib.parse import quote
+from azure.core import MatchConditions
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.storage.blob import BlobServiceClient
 from shared.config import Config
+from shared.services import storage_metrics
+from shared.services.blob_properties_cache import BlobPropertiesCache
+from shared.services.sas_cache import SasCache
+from shared.services.tracing import traced
+from shared.models.constants import normalize_target_languages
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +28,9 @@ class BlobService:
     """Service pour la gestion des blobs Azure Storage"""
     container_name = Config.INPUT_CONTAINER
 
+    # Nombre maximal de sous-requêtes par appel Blob Batch
+    BATCH_DELETE_SIZE = 256
+
     def __init__(self):
         # Configuration Azure Storage
         self.account_name = Config.AZURE_ACCOUNT_NAME
@@ -25,33 +39,57 @@ class BlobService:
         if not self.account_name:
             raise ValueError(
                 "AZURE_ACCOUNT_NAME environnement variable manquante")
-        if not self.account_key:
+        # Sans clé de compte : identité managée et SAS de délégation utilisateur
+        if not self.account_key and not Config.SAS_USER_DELEGATION:
             raise ValueError(
                 "AZURE_ACCOUNT_KEY environnement variable manquante")
 
         # Assurer le format correct de la clé
-        if not self.account_key.endswith("=="):
+        if self.account_key and not self.account_key.endswith("=="):
             self.account_key += "=="
 
+        # Jetons SAS réutilisés tant que leur tranche d'expiration est en cours
+        self.sas_cache = SasCache(self.account_name, self.account_key)
+        self.properties_cache = BlobPropertiesCache()
+
         # Noms des conteneurs
         self.input_container = Config.INPUT_CONTAINER
         self.output_container = Config.OUTPUT_CONTAINER
 
         # Client Blob Storage
+        # Taille des plages lues en parallèle lors des téléchargements
+        chunk_size = Config.BLOB_DOWNLOAD_CHUNK_MB * 1024 * 1024
+        self.download_concurrency = Config.BLOB_DOWNLOAD_CONCURRENCY
+        self.spool_threshold = Config.BLOB_SPOOL_THRESHOLD_MB * 1024 * 1024
+
         self.blob_service_client = BlobServiceClient(
             account_url=Config.get_storage_url(),
-            credential=self.account_key
+            credential=self._credential(),
+            max_single_get_size=chunk_size,
+            max_chunk_get_size=chunk_size,
+            raw_request_hook=storage_metrics.record_request
         )
 
         logger.info("✅ BlobService initialisé")
 
-    def prepare_blobs(self, file_content_base64: str, file_name: str, target_language: str) -> Dict[str, str]:
+    def _credential(self):
+        """Clé du compte si elle est définie, sinon identité Microsoft Entra ID"""
+        if self.account_key:
+            return {"account_name": self.account_name, "account_key": self.account_key}
+        from azure.identity import DefaultAzureCredential
+        return DefaultAzureCredential()
+
+    @traced("blob.prepare_blobs", "storage")
+    def prepare_blobs(self, file_content_base64: str, file_name: str,
+                      target_language: Union[str, List[str]]) -> Dict[str, Any]:
         """
         Prépare les blobs source et cible pour la traduction
         Version synchrone pour Azure Functions
+        ``target_language`` accepte une langue ou une liste de langues
         """
+        target_languages = normalize_target_languages(target_language)
         logger.info(
-            f"📁 Préparation des blobs pour {file_name} → {target_language}")
+            f"📁 Préparation des blobs pour {file_name} → {', '.join(target_languages)}")
 
         try:
             # Génération des noms de fichiers avec suffixe de langue
@@ -60,18 +98,17 @@ class BlobService:
             file_base, file_ext = input_blob_name.rsplit(
                 ".", 1) if "." in input_blob_name else (input_blob_name, "")
 
-            # Format amélioré: file_name-fr.docx au lieu de file_name_fr.docx
-            output_blob_name = f"{file_base}-{target_language}.{file_ext}" if file_ext else f"{file_base}-{target_language}"
-
             logger.info(f"📄 Fichier source: {input_blob_name}")
-            logger.info(f"📄 Fichier cible: {output_blob_name}")
 
-            # Nettoyage des anciens fichiers (>1h)
-            self._delete_old_files(self.output_container, max_age_hours=1)
+            # Format amélioré: file_name-fr.docx au lieu de file_name_fr.docx
+            output_blob_names = {}
+            for language in target_languages:
+                output_blob_name = f"{file_base}-{language}.{file_ext}" if file_ext else f"{file_base}-{language}"
+                output_blob_names[language] = output_blob_name
+                logger.info(f"📄 Fichier cible: {output_blob_name}")
 
-            # Suppression du fichier cible s'il existe déjà
-            self._check_and_delete_target_blob(
-                self.output_container, output_blob_name)
+            # Suppression des fichiers cibles existants (un seul appel)
+            self._delete_targets(list(output_blob_names.values()))
 
             # Conversion et upload du fichier source
             file_content_binary = base64.b64decode(file_content_base64)
@@ -90,21 +127,15 @@ class BlobService:
                 overwrite=True,
                 content_type=self._get_content_type(file_name)
             )
+            self.properties_cache.invalidate(self.input_container, input_blob_name)
 
             logger.info("✅ Fichier source uploadé avec succès")
 
             # Génération des URLs SAS
             source_url = self._generate_sas_url(
                 self.input_container, input_blob_name, read=True)
-            target_url = self._generate_sas_url(
-                self.output_container, output_blob_name, write=True)
 
-            return {
-                "source_url": source_url,
-                "target_url": target_url,
-                "input_blob_name": input_blob_name,
-                "output_blob_name": output_blob_name
-            }
+            return self._build_blob_urls(source_url, input_blob_name, output_blob_names)
 
         except Exception as e:
             logger.error(
@@ -115,15 +146,9 @@ class BlobService:
         """
         Génère une URL de téléchargement pour le fichier traduit
         """
-        from urllib.parse import quote
         try:
-            # Vérifier si le blob existe
-            blob_client = self.blob_service_client.get_blob_client(
-                container=self.output_container,
-                blob=output_blob_name
-            )
-
-            if not blob_client.exists():
+            # Existence : propriétés en cache, sinon un seul HEAD (404 = absent)
+            if self.get_output_properties(output_blob_name) is None:
                 logger.warning(
                     f"⚠️ Fichier traduit introuvable: {output_blob_name}")
                 return None
@@ -160,32 +185,48 @@ class BlobService:
             logger.error(f"❌ Erreur lors de la génération de l'URL: {str(e)}")
             return None
 
-    def download_translated_file(self, output_blob_name: str) -> Optional[bytes]:
+    @traced("blob.get_output_properties", "storage")
+    def get_output_properties(self, output_blob_name: str) -> Optional[Any]:
+        """Propriétés d'un fichier traduit (cache court), None s'il n'existe pas"""
+        properties = self.properties_cache.get(self.output_container, output_blob_name)
+        if properties is not None:
+            return properties
+        try:
+            properties = self.blob_service_client.get_blob_client(
+                container=self.output_container,
+                blob=output_blob_name
+            ).get_blob_properties()
+        except ResourceNotFoundError:
+            return None
+        self.properties_cache.put(self.output_container, output_blob_name, properties)
+        return properties
+
+    @traced("blob.open_stream", "storage")
+    def stream_translated_file(self, output_blob_name: str) -> Optional[Dict[str, Any]]:
         """
-        Télécharge le contenu du fichier traduit
+        Ouvre le fichier traduit en flux (un seul appel, sans exists() préalable)
+        Retourne {"size", "chunks"} où ``chunks`` itère sur le contenu par blocs
         """
         try:
             blob_client = self.blob_service_client.get_blob_client(
                 container=self.output_container,
                 blob=output_blob_name
             )
+            downloader = blob_client.download_blob()
+            return {
+                "size": downloader.size,
+                "chunks": downloader.chunks()
+            }
 
-            if not blob_client.exists():
-                logger.warning(
-                    f"⚠️ Fichier traduit introuvable: {output_blob_name}")
-                return None
-
-            # Téléchargement du contenu
-            blob_data = blob_client.download_blob()
-            content = blob_data.readall()
-
-            logger.info(f"✅ Fichier téléchargé: {len(content)} bytes")
-            return content
-
+        except ResourceNotFoundError:
+            logger.warning(
+                f"⚠️ Fichier traduit introuvable: {output_blob_name}")
+            return None
         except Exception as e:
-            logger.error(f"❌ Erreur lors du téléchargement: {str(e)}")
+            logger.error(f"❌ Erreur lors de l'ouverture du flux: {str(e)}")
             return None
 
+    @traced("blob.cleanup", "storage")
     def cleanup_translation_files(self, input_blob_name: str, output_blob_name: str) -> bool:
         """
         Nettoie les fichiers de traduction après traitement
@@ -200,22 +241,24 @@ class BlobService:
                     blob=input_blob_name
                 )
                 input_blob_client.delete_blob()
+                self.properties_cache.invalidate(self.input_container, input_blob_name)
                 logger.info(f"🗑️ Fichier source supprimé: {input_blob_name}")
             except Exception as e:
                 logger.warning(
                     f"⚠️ Impossible de supprimer le fichier source: {str(e)}")
                 success = False
 
-            # Suppression du fichier cible (optionnel)
+            # Suppression du fichier cible (optionnel, 404 toléré)
             try:
-                output_blob_client = self.blob_service_client.get_blob_client(
+                self.properties_cache.invalidate(self.output_container, output_blob_name)
+                self.blob_service_client.get_blob_client(
                     container=self.output_container,
                     blob=output_blob_name
-                )
-                if output_blob_client.exists():
-                    output_blob_client.delete_blob()
-                    logger.info(
-                        f"🗑️ Fichier cible supprimé: {output_blob_name}")
+                ).delete_blob()
+                logger.info(
+                    f"🗑️ Fichier cible supprimé: {output_blob_name}")
+            except ResourceNotFoundError:
+                pass
             except Exception as e:
                 logger.warning(
                     f"⚠️ Impossible de supprimer le fichier cible: {str(e)}")
@@ -226,28 +269,45 @@ class BlobService:
             logger.error(f"❌ Erreur lors du nettoyage: {str(e)}")
             return False
 
+    @traced("sas.blob", "sas")
     def _generate_sas_url(self, container_name: str, blob_name: str,
                           read: bool = False, write: bool = False,
-                          expiry_hours: int = 2) -> str:
-        """Génère une URL SAS pour un blob"""
+                          expiry_hours: int = 2, encode_name: bool = False) -> str:
+        """
+        Génère une URL SAS pour un blob
+        ``encode_name`` encode le nom dans le chemin (la signature porte sur le nom brut)
+        """
         # Crée l'objet permission directement
         if write == True:
             permissions = "rw"
         else:
             permissions = "r"
-        expiry_time = datetime.now(timezone.utc) + \
-            timedelta(hours=expiry_hours)
-        sas_token = generate_blob_sas(
-            account_name=self.account_name,
-            container_name=container_name,
-            blob_name=blob_name,
-            account_key=self.account_key,
-            permission=permissions,
-            expiry=expiry_time
-        )
-        logger.info(
-            f"SAS URL générée: {Config.get_storage_url()}/{container_name}/{blob_name}?{sas_token}")
-        return f"{Config.get_storage_url()}/{container_name}/{blob_name}?{sas_token}"
+        sas_token = self.sas_cache.blob_sas(container_name, blob_name, permissions, expiry_hours)
+        url_blob_name = quote(blob_name) if encode_name else blob_name
+        # Jamais d'URL signée dans les logs
+        logger.debug(f"SAS {permissions} prêt pour {container_name}/{blob_name}")
+        return f"{Config.get_storage_url()}/{container_name}/{url_blob_name}?{sas_token}"
+
+    @traced("sas.container", "sas")
+    def _generate_container_sas_url(self, container_name: str, permissions: str,
+                                    path: str = "", expiry_hours: int = 2) -> str:
+        """
+        Génère une URL SAS de conteneur (jobs multi-documents de type Folder)
+        Le jeton porte sur le conteneur : il est partagé par tous les chemins et sous-lots
+        """
+        sas_token = self.sas_cache.container_sas(container_name, permissions, expiry_hours)
+        url = f"{Config.get_storage_url()}/{container_name}"
+        if path:
+            url += f"/{quote(path.strip('/'))}"
+        return f"{url}?{sas_token}"
+
+    def get_sas_stats(self) -> Dict[str, Any]:
+        """Taux de réutilisation des jetons SAS"""
+        return self.sas_cache.get_stats()
+
+    def get_properties_cache_stats(self) -> Dict[str, Any]:
+        """Taux de réutilisation des propriétés de blobs"""
+        return self.properties_cache.get_stats()
 
     def _get_content_type(self, file_name: str) -> str:
         """Détermine le type MIME d'un fichier"""
@@ -271,58 +331,151 @@ class BlobService:
 
         return content_types.get(extension, 'application/octet-stream')
 
+    @traced("blob.delete_target", "storage")
     def _check_and_delete_target_blob(self, container_name: str, blob_name: str) -> bool:
-        """Vérifie et supprime un blob cible s'il existe"""
+        """Supprime un blob cible s'il existe (un seul appel, 404 toléré)"""
+        self.properties_cache.invalidate(container_name, blob_name)
         try:
-            blob_client = self.blob_service_client.get_blob_client(
+            self.blob_service_client.get_blob_client(
                 container=container_name,
                 blob=blob_name
-            )
-
-            if blob_client.exists():
-                blob_client.delete_blob()
-                logger.info(f"🗑️ Ancien fichier cible supprimé: {blob_name}")
-                return True
+            ).delete_blob()
+            logger.info(f"🗑️ Ancien fichier cible supprimé: {blob_name}")
+            return True
 
+        except ResourceNotFoundError:
             return False
-
         except Exception as e:
             logger.warning(
                 f"⚠️ Erreur lors de la suppression du fichier cible: {str(e)}")
             return False
 
-    def _delete_old_files(self, container_name: str, max_age_hours: int = 1) -> int:
-        """Supprime les anciens fichiers du conteneur"""
+    @traced("blob.delete_targets", "storage")
+    def _delete_targets(self, blob_names: List[str]) -> None:
+        """
+        Supprime les anciennes cibles du conteneur de sortie
+        Une langue : un DELETE ; plusieurs : un seul appel Blob Batch
+        """
+        if len(blob_names) <= 1:
+            for blob_name in blob_names:
+                self._check_and_delete_target_blob(self.output_container, blob_name)
+            return
+
+        for blob_name in blob_names:
+            self.properties_cache.invalidate(self.output_container, blob_name)
         try:
-            container_client = self.blob_service_client.get_container_client(
-                container_name)
-            cutoff_time = datetime.now(
-                timezone.utc) - timedelta(hours=max_age_hours)
-            deleted_count = 0
-
-            blobs = container_client.list_blobs()
-            for blob in blobs:
-                if blob.last_modified < cutoff_time:
-                    try:
-                        container_client.delete_blob(blob.name)
-                        deleted_count += 1
-                        logger.debug(
-                            f"🗑️ Ancien fichier supprimé: {blob.name}")
-                    except Exception as e:
-                        logger.warning(
-                            f"⚠️ Impossible de supprimer {blob.name}: {str(e)}")
-
-            if deleted_count > 0:
-                logger.info(
-                    f"🧹 {deleted_count} anciens fichiers supprimés du conteneur {container_name}")
+            responses = self.blob_service_client.get_container_client(
+                self.output_container).delete_blobs(*blob_names, raise_on_any_failure=False)
+            for blob_name, response in zip(blob_names, responses):
+                if response.status_code == 202:
+                    logger.info(f"🗑️ Ancien fichier cible supprimé: {blob_name}")
+                elif response.status_code != 404:
+                    logger.warning(
+                        f"⚠️ Impossible de supprimer {blob_name}: HTTP {response.status_code}")
+        except Exception as e:
+            logger.warning(
+                f"⚠️ Erreur lors de la suppression des fichiers cibles: {str(e)}")
 
-            return deleted_count
+    @traced("blob.sweep", "storage")
+    def sweep_old_files(self, container_name: str, max_age_hours: int = 1,
+                        page_size: int = 1000,
+                        keep: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+        """
+        Supprime les blobs plus anciens que ``max_age_hours`` dans un conteneur
+        Parcourt le listing page par page et supprime par lots (API Blob Batch)
+        ``keep`` : blobs à conserver quel que soit leur âge (sources encore attendues)
+        """
+        container_client = self.blob_service_client.get_container_client(
+            container_name)
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+        report = {
+            "container": container_name,
+            "scanned": 0,
+            "deleted": 0,
+            "failed": 0,
+            "kept": 0,
+            "deleted_blobs": []
+        }
+
+        try:
+            pages = container_client.list_blobs(
+                results_per_page=page_size).by_page()
+            for page in pages:
+                expired = []
+                for blob in page:
+                    report["scanned"] += 1
+                    if blob.last_modified < cutoff_time:
+                        if keep is not None and keep(blob.name):
+                            report["kept"] += 1
+                        else:
+                            expired.append(blob.name)
+
+                # Le jeton de continuation est porté par l'itérateur de pages
+                for start in range(0, len(expired), self.BATCH_DELETE_SIZE):
+                    self._delete_batch(
+                        container_client, expired[start:start + self.BATCH_DELETE_SIZE], report)
+
+                logger.debug(
+                    f"📄 Page traitée ({container_name}), continuation: {pages.continuation_token}")
 
         except Exception as e:
             logger.error(
-                f"❌ Erreur lors du nettoyage des anciens fichiers: {str(e)}")
-            return 0
+                f"❌ Erreur lors du nettoyage du conteneur {container_name}: {str(e)}")
+            report["error"] = str(e)
+
+        if report["deleted"] > 0:
+            logger.info(
+                f"🧹 {report['deleted']} anciens fichiers supprimés du conteneur {container_name}")
+
+        return report
+
+    def _delete_batch(self, container_client, blob_names: List[str], report: Dict[str, Any]) -> None:
+        """Supprime un lot de blobs (256 max) en un seul appel"""
+        if not blob_names:
+            return
+
+        try:
+            responses = container_client.delete_blobs(
+                *blob_names, raise_on_any_failure=False)
+            for blob_name, response in zip(blob_names, responses):
+                # 404 : blob déjà supprimé par un autre passage
+                if response.status_code in (202, 404):
+                    self.properties_cache.invalidate(container_client.container_name, blob_name)
+                    report["deleted"] += 1
+                    report["deleted_blobs"].append(blob_name)
+                    logger.debug(f"🗑️ Ancien fichier supprimé: {blob_name}")
+                else:
+                    report["failed"] += 1
+                    logger.warning(
+                        f"⚠️ Impossible de supprimer {blob_name}: HTTP {response.status_code}")
+        except Exception as e:
+            report["failed"] += len(blob_names)
+            logger.warning(
+                f"⚠️ Échec de la suppression par lot ({len(blob_names)} blobs): {str(e)}")
 
+    @traced("blob.copy", "storage")
+    def copy_blob(self, source_container: str, source_blob_name: str,
+                  target_container: str, target_blob_name: str,
+                  metadata: Optional[Dict[str, str]] = None) -> bool:
+        """
+        Copie côté serveur d'un blob (Put Blob From URL, synchrone)
+        Retourne False si le blob source n'existe pas
+        """
+        copy_source = self._generate_sas_url(
+            source_container, source_blob_name, read=True, encode_name=True)
+        try:
+            self.blob_service_client.get_blob_client(
+                container=target_container,
+                blob=target_blob_name
+            ).upload_blob_from_url(copy_source, overwrite=True, metadata=metadata)
+            self.properties_cache.invalidate(target_container, target_blob_name)
+            return True
+        except ResourceNotFoundError:
+            logger.warning(
+                f"⚠️ Copie impossible, source introuvable: {source_container}/{source_blob_name}")
+            return False
+
+    @traced("blob.exists", "storage")
     def check_blob_exists(self, blob_name: str) -> bool:
         """Vérifie si un blob existe dans un container"""
         try:
@@ -336,66 +489,473 @@ class BlobService:
                 f"Erreur lors de la vérification du blob {blob_name}: {str(e)}")
             return False
 
-    def prepare_translation_urls(self, input_blob_name: str, target_language: str) -> Dict[str, str]:
+    @traced("blob.prepare_translation_urls", "storage")
+    def prepare_translation_urls(self, input_blob_name: str,
+                                 target_language: Union[str, List[str]]) -> Dict[str, Any]:
         """
         Prépare les URLs pour la traduction d'un blob existant
         Le fichier source est déjà dans le container doc-to-trad
+        ``target_language`` accepte une langue ou une liste de langues
         """
-
+        target_languages = normalize_target_languages(target_language)
         logger.info(
-            f"🔄 Préparation des URLs pour {input_blob_name} → {target_language}")
+            f"🔄 Préparation des URLs pour {input_blob_name} → {', '.join(target_languages)}")
 
         try:
-            # Génération du nom du fichier de sortie à partir du nom normalisé
-            file_base, file_ext = input_blob_name.rsplit(
-                ".", 1) if "." in input_blob_name else (input_blob_name, "")
-
-            # Format: file_name-fr.docx avec limitation de longueur
-            lang_suffix = f"-{target_language}"
-
-            # Calculer la longueur maximale pour le nom de base
-            max_total_length = 200  # Limite conservatrice
-            extension_length = len(f".{file_ext}") if file_ext else 0
-            suffix_length = len(lang_suffix)
-            max_base_length = max_total_length - extension_length - suffix_length
-
-            # Tronquer le nom de base si nécessaire
-            if len(file_base) > max_base_length:
-                file_base = file_base[:max_base_length]
-                logger.warning(
-                    f"⚠️ Nom de fichier de base tronqué pour éviter la limite Azure: {len(file_base)} caractères")
-
-            output_blob_name = f"{file_base}{lang_suffix}.{file_ext}" if file_ext else f"{file_base}{lang_suffix}"
-
             logger.info(f"📄 Fichier source: {input_blob_name}")
-            logger.info(f"📝 Fichier source normalisé: {input_blob_name}")
-            logger.info(f"📄 Fichier cible: {output_blob_name}")
-            logger.info(
-                f"📏 Longueur du nom de fichier cible: {len(output_blob_name)} caractères")
 
-            # Nettoyage des anciens fichiers (>1h)
-            self._delete_old_files(self.output_container, max_age_hours=1)
+            output_blob_names = {}
+            for language in target_languages:
+                output_blob_name = self.build_output_blob_name(input_blob_name, language)
+                output_blob_names[language] = output_blob_name
+                logger.info(f"📄 Fichier cible: {output_blob_name}")
+                logger.info(
+                    f"📏 Longueur du nom de fichier cible: {len(output_blob_name)} caractères")
 
-            # Suppression du fichier cible s'il existe déjà
-            self._check_and_delete_target_blob(
-                self.output_container, output_blob_name)
+            # Suppression des fichiers cibles existants (un seul appel)
+            self._delete_targets(list(output_blob_names.values()))
 
             # Génération des SAS URLs
             source_url = self._generate_sas_url(
                 self.input_container, input_blob_name, read=True)
-            target_url = self._generate_sas_url(
-                self.output_container, output_blob_name, write=True)
 
             logger.info("✅ URLs SAS générées")
 
-            return {
-                "source_url": source_url,
-                "target_url": target_url,
-                "input_blob_name": input_blob_name,
-                "output_blob_name": output_blob_name,
-                "original_file_name": input_blob_name
+            blob_urls = self._build_blob_urls(source_url, input_blob_name, output_blob_names)
+            blob_urls["original_file_name"] = input_blob_name
+            return blob_urls
+
+        except Exception as e:
+            logger.error(f"Erreur lors de la préparation des URLs: {str(e)}")
+            raise
+
+    def build_output_blob_name(self, input_blob_name: str, target_language: str) -> str:
+        """
+        Construit le nom du blob traduit: file_name-fr.docx
+        Le nom de base est tronqué pour rester sous la limite Azure
+        """
+        file_base, file_ext = input_blob_name.rsplit(
+            ".", 1) if "." in input_blob_name else (input_blob_name, "")
+
+        lang_suffix = f"-{target_language}"
+
+        # Calculer la longueur maximale pour le nom de base
+        max_total_length = 200  # Limite conservatrice
+        extension_length = len(f".{file_ext}") if file_ext else 0
+        max_base_length = max_total_length - extension_length - len(lang_suffix)
+
+        # Tronquer le nom de base si nécessaire
+        if len(file_base) > max_base_length:
+            file_base = file_base[:max_base_length]
+            logger.warning(
+                f"⚠️ Nom de fichier de base tronqué pour éviter la limite Azure: {len(file_base)} caractères")
+
+        return f"{file_base}{lang_suffix}.{file_ext}" if file_ext else f"{file_base}{lang_suffix}"
+
+    def _build_blob_urls(self, source_url: str, input_blob_name: str,
+                         output_blob_names: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Génère les SAS cibles et assemble le dictionnaire d'URLs
+        ``target_url``/``output_blob_name`` désignent la première langue (compatibilité)
+        """
+        targets = []
+        for language, output_blob_name in output_blob_names.items():
+            targets.append({
+                "language": language,
+                "target_url": self._generate_sas_url(
+                    self.output_container, output_blob_name, write=True),
+                "output_blob_name": output_blob_name
+            })
+
+        return {
+            "source_url": source_url,
+            "target_url": targets[0]["target_url"],
+            "input_blob_name": input_blob_name,
+            "output_blob_name": targets[0]["output_blob_name"],
+            "targets": targets
+        }
+
+    @staticmethod
+    def plan_sub_batches(documents: List[Dict[str, Any]], max_documents: int,
+                         max_total_size: int) -> List[List[Dict[str, Any]]]:
+        """
+        Répartit les documents en sous-lots séquentiels
+        Chaque sous-lot respecte le nombre maximal de documents et la taille totale
+        """
+        sub_batches: List[List[Dict[str, Any]]] = []
+        current: List[Dict[str, Any]] = []
+        current_size = 0
+
+        for document in documents:
+            if current and (len(current) >= max_documents or
+                            current_size + document["size"] > max_total_size):
+                sub_batches.append(current)
+                current = []
+                current_size = 0
+            current.append(document)
+            current_size += document["size"]
+
+        if current:
+            sub_batches.append(current)
+        return sub_batches
+
+
+class AsyncBlobService:
+    """
+    Variante asynchrone des opérations de BlobService utilisées sur le chemin des requêtes
+    (``azure.storage.blob.aio``). Les SAS et les noms de blobs, sans E/S,
+    sont délégués au BlobService partagé du worker
+    """
+
+    def __init__(self, blob_service: Optional[BlobService] = None):
+        # Import local : le transport aio (aiohttp) n'est chargé que par les handlers async
+        from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+        from shared.services.service_registry import get_blob_service
+
+        self.sync = blob_service or get_blob_service()
+        self.input_container = self.sync.input_container
+        self.output_container = self.sync.output_container
+        self.download_concurrency = self.sync.download_concurrency
+        self.spool_threshold = self.sync.spool_threshold
+
+        if self.sync.account_key:
+            credential = {"account_name": self.sync.account_name, "account_key": self.sync.account_key}
+        else:
+            from azure.identity.aio import DefaultAzureCredential
+            credential = DefaultAzureCredential()
+
+        chunk_size = Config.BLOB_DOWNLOAD_CHUNK_MB * 1024 * 1024
+        self.blob_service_client = AsyncBlobServiceClient(
+            account_url=Config.get_storage_url(),
+            credential=credential,
+            max_single_get_size=chunk_size,
+            max_chunk_get_size=chunk_size,
+            raw_request_hook=storage_metrics.record_request
+        )
+        self.properties_cache = self.sync.properties_cache
+
+        logger.info("✅ AsyncBlobService initialisé")
+
+    def build_output_blob_name(self, input_blob_name: str, target_language: str) -> str:
+        return self.sync.build_output_blob_name(input_blob_name, target_language)
+
+    @traced("blob.exists", "storage")
+    async def check_blob_exists(self, blob_name: str) -> bool:
+        """Vérifie si un blob existe dans le container source"""
+        try:
+            return await self.blob_service_client.get_blob_client(
+                container=BlobService.container_name,
+                blob=blob_name
+            ).exists()
+        except Exception as e:
+            logger.error(
+                f"Erreur lors de la vérification du blob {blob_name}: {str(e)}")
+            return False
+
+    @traced("blob.get_content_hash", "storage")
+    async def get_content_hash(self, blob_name: str, properties: Optional[Any] = None,
+                               max_read_size: Optional[int] = None) -> Optional[str]:
+        """
+        Empreinte MD5 (hex) du contenu d'un blob source, None s'il n'existe pas
+        Utilise le Content-MD5 stocké par Azure, sinon lit le blob en flux
+        ``properties`` : propriétés déjà lues par l'appelant (pas de nouvelle requête)
+        ``max_read_size`` : sans Content-MD5, blob lu seulement jusqu'à cette taille (None sinon)
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container=self.input_container,
+            blob=blob_name
+        )
+        if properties is None:
+            try:
+                properties = await blob_client.get_blob_properties()
+            except ResourceNotFoundError:
+                return None
+
+        content_md5 = properties.content_settings.content_md5
+        if content_md5:
+            return bytes(content_md5).hex()
+        if max_read_size is not None and properties.size > max_read_size:
+            logger.debug(f"Empreinte non calculée pour {blob_name} ({properties.size} bytes, sans Content-MD5)")
+            return None
+
+        digest = hashlib.md5()
+        downloader = await blob_client.download_blob(
+            max_concurrency=self.download_concurrency,
+            etag=properties.etag, match_condition=MatchConditions.IfNotModified)
+        async for chunk in downloader.chunks():
+            digest.update(chunk)
+        logger.debug(f"🔑 Empreinte calculée pour {blob_name} ({properties.size} bytes)")
+        return digest.hexdigest()
+
+    @traced("blob.copy", "storage")
+    async def copy_blob(self, source_container: str, source_blob_name: str,
+                        target_container: str, target_blob_name: str,
+                        metadata: Optional[Dict[str, str]] = None,
+                        source_etag: Optional[str] = None) -> bool:
+        """
+        Copie côté serveur d'un blob, False si la source n'existe pas
+        ``source_etag`` limite la copie à cette version de la source (False si elle a changé)
+        """
+        conditions = {}
+        if source_etag:
+            conditions = {"source_etag": source_etag,
+                          "source_match_condition": MatchConditions.IfNotModified}
+        copy_source = self.sync._generate_sas_url(
+            source_container, source_blob_name, read=True, encode_name=True)
+        try:
+            await self.blob_service_client.get_blob_client(
+                container=target_container,
+                blob=target_blob_name
+            ).upload_blob_from_url(copy_source, overwrite=True, metadata=metadata, **conditions)
+            self.properties_cache.invalidate(target_container, target_blob_name)
+            return True
+        except ResourceNotFoundError:
+            logger.warning(
+                f"⚠️ Copie impossible, source introuvable: {source_container}/{source_blob_name}")
+            return False
+        except HttpResponseError as e:
+            if e.status_code != 412:
+                raise
+            logger.warning(
+                f"⚠️ Copie impossible, source modifiée: {source_container}/{source_blob_name}")
+            return False
+
+    @traced("blob.delete_target", "storage")
+    async def _delete_if_exists(self, container_name: str, blob_name: str) -> bool:
+        """Supprime un blob cible s'il existe (404 toléré, sans exists() préalable)"""
+        self.properties_cache.invalidate(container_name, blob_name)
+        try:
+            await self.blob_service_client.get_blob_client(
+                container=container_name,
+                blob=blob_name
+            ).delete_blob()
+            logger.info(f"🗑️ Ancien fichier cible supprimé: {blob_name}")
+            return True
+        except ResourceNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(
+                f"⚠️ Erreur lors de la suppression du fichier cible: {str(e)}")
+            return False
+
+    @traced("blob.delete_targets", "storage")
+    async def _delete_targets(self, blob_names: List[str]) -> None:
+        """Supprime les anciennes cibles : un DELETE par langue seule, un appel Blob Batch sinon"""
+        if len(blob_names) <= 1:
+            for blob_name in blob_names:
+                await self._delete_if_exists(self.output_container, blob_name)
+            return
+
+        for blob_name in blob_names:
+            self.properties_cache.invalidate(self.output_container, blob_name)
+        try:
+            responses = await self.blob_service_client.get_container_client(
+                self.output_container).delete_blobs(*blob_names, raise_on_any_failure=False)
+            index = 0
+            async for response in responses:
+                if response.status_code == 202:
+                    logger.info(f"🗑️ Ancien fichier cible supprimé: {blob_names[index]}")
+                elif response.status_code != 404:
+                    logger.warning(
+                        f"⚠️ Impossible de supprimer {blob_names[index]}: HTTP {response.status_code}")
+                index += 1
+        except Exception as e:
+            logger.warning(
+                f"⚠️ Erreur lors de la suppression des fichiers cibles: {str(e)}")
+
+    @traced("blob.prepare_translation_urls", "storage")
+    async def prepare_translation_urls(self, input_blob_name: str,
+                                       target_language: Union[str, List[str]]) -> Dict[str, Any]:
+        """
+        Prépare les URLs pour la traduction d'un blob existant
+        Les anciennes cibles de toutes les langues sont supprimées en parallèle
+        """
+        target_languages = normalize_target_languages(target_language)
+        logger.info(
+            f"🔄 Préparation des URLs pour {input_blob_name} → {', '.join(target_languages)}")
+
+        try:
+            output_blob_names = {
+                language: self.build_output_blob_name(input_blob_name, language)
+                for language in target_languages
             }
+            await self._delete_targets(list(output_blob_names.values()))
+
+            source_url = self.sync._generate_sas_url(
+                self.input_container, input_blob_name, read=True)
+            blob_urls = self.sync._build_blob_urls(source_url, input_blob_name, output_blob_names)
+            blob_urls["original_file_name"] = input_blob_name
+            return blob_urls
 
         except Exception as e:
             logger.error(f"Erreur lors de la préparation des URLs: {str(e)}")
             raise
+
+    async def get_translated_file_url(self, output_blob_name: str) -> Optional[str]:
+        """URL SAS de téléchargement du fichier traduit, None s'il n'existe pas"""
+        try:
+            # Existence : propriétés en cache, sinon un seul HEAD (404 = absent)
+            if await self.get_output_properties(output_blob_name) is None:
+                logger.warning(
+                    f"⚠️ Fichier traduit introuvable: {output_blob_name}")
+                return None
+
+            return self.sync._generate_sas_url(
+                self.output_container, output_blob_name, write=True,
+                expiry_hours=24, encode_name=True)
+
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la génération de l'URL: {str(e)}")
+            return None
+
+    @traced("blob.get_output_properties", "storage")
+    async def get_output_properties(self, output_blob_name: str) -> Optional[Any]:
+        """Propriétés d'un fichier traduit (cache court), None s'il n'existe pas"""
+        properties = self.properties_cache.get(self.output_container, output_blob_name)
+        if properties is not None:
+            return properties
+        try:
+            properties = await self.blob_service_client.get_blob_client(
+                container=self.output_container,
+                blob=output_blob_name
+            ).get_blob_properties()
+        except ResourceNotFoundError:
+            return None
+        self.properties_cache.put(self.output_container, output_blob_name, properties)
+        return properties
+
+    @traced("blob.download", "storage")
+    async def open_translated_file(self, output_blob_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Télécharge le fichier traduit par plages parallèles dans un fichier temporaire
+        Reste en mémoire sous BLOB_SPOOL_THRESHOLD_MB, déborde sur disque au-delà
+        Retourne {"size", "file"} ; l'appelant ferme ``file``
+        """
+        spool = tempfile.SpooledTemporaryFile(max_size=self.spool_threshold)
+        try:
+            downloader = await self.blob_service_client.get_blob_client(
+                container=self.output_container,
+                blob=output_blob_name
+            ).download_blob(max_concurrency=self.download_concurrency)
+            size = await downloader.readinto(spool)
+            spool.seek(0)
+            self.properties_cache.put(self.output_container, output_blob_name, downloader.properties)
+
+            logger.info(f"✅ Fichier téléchargé: {size} bytes")
+            return {
+                "size": size,
+                "file": spool
+            }
+
+        except ResourceNotFoundError:
+            spool.close()
+            logger.warning(
+                f"⚠️ Fichier traduit introuvable: {output_blob_name}")
+            return None
+        except Exception as e:
+            spool.close()
+            logger.error(f"❌ Erreur lors du téléchargement: {str(e)}")
+            return None
+
+    @traced("blob.get_source_properties", "storage")
+    async def get_source_properties(self, blob_name: str) -> Optional[Any]:
+        """Propriétés d'un blob source (taille, Content-MD5), None s'il n'existe pas"""
+        try:
+            return await self.blob_service_client.get_blob_client(
+                container=self.input_container, blob=blob_name).get_blob_properties()
+        except ResourceNotFoundError:
+            return None
+
+    @traced("blob.prepare_folder_job", "storage")
+    async def prepare_folder_job(self, blob_names: List[str],
+                                 target_language: Union[str, List[str]], job_id: str) -> Dict[str, Any]:
+        """
+        Prépare un job multi-documents de type Folder
+        Les sources sont copiées sous un préfixe propre au job, puis réparties
+        en sous-lots respectant les limites de l'API Batch (nombre et taille)
+        Les propriétés puis les copies des sources sont demandées en parallèle
+        """
+        target_languages = normalize_target_languages(target_language)
+        job_prefix = f"{Config.JOBS_PREFIX}/{job_id}"
+        logger.info(
+            f"📦 Préparation du job {job_id}: {len(blob_names)} documents → {', '.join(target_languages)}")
+
+        properties = await asyncio.gather(*(self.get_source_properties(blob_name) for blob_name in blob_names))
+        max_document_size = Config.BATCH_MAX_DOCUMENT_SIZE_MB * 1024 * 1024
+        missing = [name for name, props in zip(blob_names, properties) if props is None]
+        too_large = [name for name, props in zip(blob_names, properties)
+                     if props is not None and props.size > max_document_size]
+        if missing or too_large:
+            return {
+                "job_id": job_id,
+                "missing": missing,
+                "too_large": too_large,
+                "batches": []
+            }
+
+        sub_batches = BlobService.plan_sub_batches(
+            [{"blob_name": name, "size": props.size, "etag": props.etag}
+             for name, props in zip(blob_names, properties)],
+            max_documents=Config.BATCH_MAX_DOCUMENTS,
+            max_total_size=Config.BATCH_MAX_TOTAL_SIZE_MB * 1024 * 1024
+        )
+
+        batches = []
+        copies = []
+        for index, batch_documents in enumerate(sub_batches):
+            batch_prefix = f"{job_prefix}/{index}/"
+            for document in batch_documents:
+                copies.append(self.copy_blob(
+                    self.input_container, document["blob_name"],
+                    self.input_container, f"{batch_prefix}{document['blob_name']}",
+                    source_etag=document["etag"]))
+
+            batches.append({
+                "index": index,
+                "prefix": batch_prefix,
+                "documents": [document["blob_name"] for document in batch_documents],
+                "size": sum(document["size"] for document in batch_documents),
+                **self.folder_batch_urls(batch_prefix, target_languages)
+            })
+
+        # Une source supprimée ou modifiée entre-temps : même réponse que le contrôle initial
+        copied = await asyncio.gather(*copies)
+        missing = [name for name, ok in zip(
+            (document["blob_name"] for batch in sub_batches for document in batch), copied) if not ok]
+        if missing:
+            return {
+                "job_id": job_id,
+                "missing": missing,
+                "too_large": [],
+                "batches": []
+            }
+
+        logger.info(f"✅ Job {job_id} préparé en {len(batches)} sous-lot(s)")
+        return {
+            "job_id": job_id,
+            "missing": [],
+            "too_large": [],
+            "batches": batches
+        }
+
+    def folder_batch_urls(self, batch_prefix: str, target_languages: List[str]) -> Dict[str, Any]:
+        """
+        URLs SAS d'un sous-lot Folder : conteneur source et un dossier de sortie par langue
+        Recalculées à la soumission d'un lot resté en file d'admission
+        """
+        return {
+            "source_url": self.sync._generate_container_sas_url(self.input_container, "rl"),
+            "targets": [
+                {
+                    "language": language,
+                    "target_url": self.sync._generate_container_sas_url(
+                        self.output_container, "wl", path=f"{batch_prefix}{language}"),
+                    "output_prefix": f"{batch_prefix}{language}/"
+                }
+                for language in target_languages
+            ]
+        }
+
+    async def aclose(self) -> None:
+        """Ferme le transport aiohttp du client"""
+        await self.blob_service_client.close()
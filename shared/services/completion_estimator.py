@@ -0,0 +1,368 @@
+"""
+Estimation de la durée des traductions à partir des jobs déjà terminés
+Chaque job démarré est enregistré avec ses caractéristiques (format, taille, langues) ;
+sa durée réelle est relevée au premier statut final observé. Un modèle linéaire par format
+(durée ≈ a + b × Mo + c × langues supplémentaires), corrigé par langue cible, est réajusté
+sur cet historique, partagé entre workers par le stockage d'état
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from shared.config import Config
+from shared.services.service_registry import get_state_store
+
+logger = logging.getLogger(__name__)
+
+# Types de documents du stockage d'état
+ETA_JOBS = "eta_jobs"
+DURATIONS = "durations"
+
+# Modèle commun à tous les formats
+ALL_FORMATS = "*"
+
+# Bornes du facteur de correction d'une langue cible
+LANGUAGE_FACTOR_BOUNDS = (0.5, 3.0)
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """Horodatage ISO 8601 de l'API Translator en secondes epoch"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _median(values: Sequence[float]) -> float:
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+
+def _solve(matrix: List[List[float]], vector: List[float]) -> Optional[List[float]]:
+    """Résout un petit système linéaire (élimination de Gauss avec pivot partiel)"""
+    size = len(vector)
+    rows = [row[:] + [value] for row, value in zip(matrix, vector)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(rows[row][column]))
+        if abs(rows[pivot][column]) < 1e-12:
+            return None
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        for row in range(size):
+            if row != column:
+                factor = rows[row][column] / rows[column][column]
+                rows[row] = [a - factor * b for a, b in zip(rows[row], rows[column])]
+    return [rows[index][size] / rows[index][index] for index in range(size)]
+
+
+def fit_linear(samples: Sequence[Tuple[Sequence[float], float]]) -> Optional[List[float]]:
+    """
+    Moindres carrés sur (caractéristiques, durée) avec coefficients positifs :
+    une caractéristique de coefficient négatif est retirée et le modèle réajusté
+    """
+    if not samples:
+        return None
+    width = len(samples[0][0])
+    active = list(range(width))
+    while active:
+        # Équations normales, légère régularisation pour les caractéristiques constantes
+        matrix = [[sum(x[i] * x[j] for x, _ in samples) + (1e-6 if i == j else 0.0) for j in active]
+                  for i in active]
+        vector = [sum(x[i] * y for x, y in samples) for i in active]
+        solution = _solve(matrix, vector)
+        if solution is None:
+            return None
+        negative = [index for index, value in zip(active, solution) if value < 0]
+        if not negative:
+            coefficients = [0.0] * width
+            for index, value in zip(active, solution):
+                coefficients[index] = value
+            return coefficients
+        active = [index for index in active if index not in negative]
+    return None
+
+
+class CompletionEstimator:
+    """
+    Durée attendue d'un job et indication de polling (Retry-After)
+    Sans historique suffisant, une estimation par défaut configurable est utilisée
+    """
+
+    # Au-delà, un job sans statut final observé n'est plus suivi
+    JOB_RETENTION_HOURS = 24
+
+    def __init__(self, store=None):
+        self.store = store or get_state_store()
+        self.min_samples = Config.ETA_MIN_SAMPLES
+        self.max_samples = Config.ETA_MAX_SAMPLES
+        self.refit_seconds = Config.ETA_REFIT_SECONDS
+        self.default_model = [
+            Config.ETA_DEFAULT_SECONDS,
+            Config.ETA_DEFAULT_SECONDS_PER_MB,
+            Config.ETA_DEFAULT_SECONDS_PER_LANGUAGE
+        ]
+
+        self._lock = threading.Lock()
+        self._samples: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._models: Dict[str, Tuple[List[float], int]] = {}
+        self._language_factors: Dict[str, float] = {}
+        self._loaded_at = 0.0
+        self._dirty = True
+        # Jobs dont la durée est déjà relevée : les statuts finaux suivants sont ignorés
+        self._recorded: "OrderedDict[str, None]" = OrderedDict()
+
+    # --- Caractéristiques et estimation -------------------------------------------
+
+    @staticmethod
+    def describe_job(blob_name: str, size: Optional[int], languages: Sequence[str],
+                     documents: int = 1) -> Dict[str, Any]:
+        """Caractéristiques d'un job connues au démarrage"""
+        return {
+            "format": os.path.splitext(blob_name)[1].lower() or ALL_FORMATS,
+            "size": int(size or 0),
+            "languages": list(languages),
+            "documents": documents
+        }
+
+    @staticmethod
+    def _features(job: Dict[str, Any]) -> List[float]:
+        return [1.0, job["size"] / (1024 * 1024), max(len(job["languages"]) - 1, 0)]
+
+    def estimate(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Durée attendue (secondes) et modèle utilisé ('format', 'global' ou 'default')"""
+        self._refresh()
+        with self._lock:
+            model = self._models.get(job["format"])
+            basis = "format"
+            if model is None:
+                model, basis = self._models.get(ALL_FORMATS), "global"
+            if model is None:
+                coefficients, samples, basis = self.default_model, 0, "default"
+            else:
+                coefficients, samples = model
+            factor = max((self._language_factors.get(language, 1.0) for language in job["languages"]),
+                         default=1.0)
+
+        seconds = sum(c * x for c, x in zip(coefficients, self._features(job))) * factor
+        return {
+            "seconds": max(round(seconds, 1), 1.0),
+            "basis": basis,
+            "samples": samples
+        }
+
+    @staticmethod
+    def describe(seconds: float) -> str:
+        """Durée lisible pour l'utilisateur"""
+        if seconds < 60:
+            return "moins d'une minute"
+        minutes = round(seconds / 60)
+        return f"environ {minutes} minute{'s' if minutes > 1 else ''}"
+
+    # --- Suivi des jobs -------------------------------------------------------------
+
+    def register_job(self, translation_id: str, job: Dict[str, Any], estimate: Dict[str, Any],
+                     started_at: Optional[float] = None) -> Dict[str, Any]:
+        """Enregistre un job démarré et sa durée estimée ; retourne le document enregistré"""
+        document = {
+            **job,
+            "started_at": started_at or time.time(),
+            "estimated_seconds": estimate["seconds"]
+        }
+        self.store.put(ETA_JOBS, translation_id, document)
+        return document
+
+    def get_job(self, translation_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(ETA_JOBS, translation_id)
+
+    def poll_hint(self, job: Optional[Dict[str, Any]], now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Délai avant le prochain check_status : jusqu'à la fin attendue du job,
+        puis une fraction de sa durée estimée une fois l'échéance dépassée
+        """
+        now = now or time.time()
+        if not job:
+            return {"next_poll_after": Config.POLL_DEFAULT_SECONDS}
+
+        expected_at = job["started_at"] + job["estimated_seconds"]
+        remaining = expected_at - now
+        if remaining > 0:
+            delay = remaining
+        else:
+            delay = job["estimated_seconds"] * Config.ETA_OVERDUE_POLL_FRACTION
+        return {
+            "estimated_completion": datetime.fromtimestamp(expected_at, timezone.utc).isoformat(),
+            "estimated_remaining_seconds": max(round(remaining), 0),
+            "next_poll_after": int(min(max(delay, Config.POLL_MIN_SECONDS), Config.POLL_MAX_SECONDS))
+        }
+
+    def record_completion(self, translation_id: str, status: Dict[str, Any],
+                          completed_at: Optional[float] = None) -> Optional[float]:
+        """
+        Relève la durée réelle d'un job terminé avec succès (une seule fois par job)
+        Horodatages Translator si présents, sinon arrivée des sorties ou observation
+        """
+        with self._lock:
+            if translation_id in self._recorded:
+                return None
+
+        job = self.get_job(translation_id)
+        if job is None:
+            return None
+
+        created_at = _parse_timestamp(status.get("created_at"))
+        finished_at = _parse_timestamp(status.get("last_updated"))
+        if created_at is not None and finished_at is not None and finished_at >= created_at:
+            duration = finished_at - created_at
+        else:
+            duration = (completed_at or time.time()) - job["started_at"]
+
+        sample = {
+            "format": job["format"],
+            "size": job["size"],
+            "languages": job["languages"],
+            "documents": job.get("documents", 1),
+            "characters": status.get("characters_charged"),
+            "duration": round(max(duration, 0.0), 3),
+            "estimated_seconds": job["estimated_seconds"],
+            "started_at": job["started_at"]
+        }
+        self.store.put(DURATIONS, translation_id, sample)
+        self.store.delete(ETA_JOBS, translation_id)
+
+        with self._lock:
+            self._recorded[translation_id] = None
+            while len(self._recorded) > self.max_samples:
+                self._recorded.popitem(last=False)
+            self._add_sample(translation_id, sample)
+            self._dirty = True
+
+        logger.info(f"⏱️ Durée relevée pour {translation_id}: {sample['duration']:.0f} s "
+                    f"(estimée {job['estimated_seconds']:.0f} s)")
+        return sample["duration"]
+
+    def forget(self, translation_id: str) -> None:
+        """Job terminé en échec ou annulé : pas de durée représentative"""
+        with self._lock:
+            if translation_id in self._recorded:
+                return
+            self._recorded[translation_id] = None
+        self.store.delete(ETA_JOBS, translation_id)
+
+    # --- Historique et ajustement -----------------------------------------------------
+
+    def _add_sample(self, key: str, sample: Dict[str, Any]) -> None:
+        self._samples[key] = sample
+        self._samples.move_to_end(key)
+        while len(self._samples) > self.max_samples:
+            self._samples.popitem(last=False)
+
+    def _refresh(self) -> None:
+        """Relit l'historique partagé périodiquement, réajuste si de nouvelles durées sont connues"""
+        now = time.monotonic()
+        reload = now - self._loaded_at > self.refit_seconds
+        if not reload and not self._dirty:
+            return
+
+        history = None
+        if reload:
+            try:
+                cutoff = time.time() - Config.ETA_HISTORY_HOURS * 3600
+                history = [(key, sample) for key, sample in self.store.find(DURATIONS)
+                           if (sample.get("started_at") or 0) >= cutoff]
+            except Exception as e:
+                logger.warning(f"⚠️ Historique des durées indisponible: {str(e)}")
+
+        with self._lock:
+            if history is not None:
+                history.sort(key=lambda item: item[1].get("started_at") or 0)
+                self._samples.clear()
+                for key, sample in history:
+                    self._add_sample(key, sample)
+            if reload:
+                self._loaded_at = now
+            self._fit()
+            self._dirty = False
+
+    def _fit(self) -> None:
+        """Modèles par format et global, puis facteurs par langue cible (sous le verrou)"""
+        by_format: Dict[str, List[Tuple[List[float], float]]] = {ALL_FORMATS: []}
+        for sample in self._samples.values():
+            point = (self._features(sample), sample["duration"])
+            by_format[ALL_FORMATS].append(point)
+            by_format.setdefault(sample["format"], []).append(point)
+
+        models = {}
+        for job_format, points in by_format.items():
+            if len(points) >= self.min_samples:
+                coefficients = fit_linear(points)
+                if coefficients is not None:
+                    models[job_format] = (coefficients, len(points))
+        self._models = models
+
+        # Écart médian durée réelle / durée du modèle, par langue cible,
+        # rapporté à l'écart médian de tous les jobs (biais commun déjà porté par le modèle)
+        ratios: Dict[str, List[float]] = {}
+        all_ratios: List[float] = []
+        for sample in self._samples.values():
+            model = models.get(sample["format"]) or models.get(ALL_FORMATS)
+            if model is None:
+                continue
+            predicted = sum(c * x for c, x in zip(model[0], self._features(sample)))
+            if predicted <= 0:
+                continue
+            ratio = sample["duration"] / predicted
+            all_ratios.append(ratio)
+            for language in sample["languages"]:
+                ratios.setdefault(language, []).append(ratio)
+
+        if not all_ratios:
+            self._language_factors = {}
+            return
+        overall = _median(all_ratios) or 1.0
+        low, high = LANGUAGE_FACTOR_BOUNDS
+        self._language_factors = {
+            language: min(max(_median(values) / overall, low), high)
+            for language, values in ratios.items() if len(values) >= self.min_samples
+        }
+
+    def cleanup_history(self) -> int:
+        """Supprime les durées plus anciennes que ETA_HISTORY_HOURS et les jobs jamais terminés"""
+        now = time.time()
+        removed = 0
+        for kind, max_age_hours in ((DURATIONS, Config.ETA_HISTORY_HOURS), (ETA_JOBS, self.JOB_RETENTION_HOURS)):
+            for key, _ in self.store.find(kind, started_before=now - max_age_hours * 3600):
+                self.store.delete(kind, key)
+                removed += 1
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._refresh()
+        with self._lock:
+            samples = list(self._samples.values())
+            errors = [abs(sample["duration"] - sample["estimated_seconds"]) / sample["duration"]
+                      for sample in samples if sample.get("estimated_seconds") and sample["duration"] > 0]
+            return {
+                "samples": len(samples),
+                "models": {
+                    job_format: {
+                        "samples": count,
+                        "base_seconds": round(coefficients[0], 1),
+                        "seconds_per_mb": round(coefficients[1], 1),
+                        "seconds_per_extra_language": round(coefficients[2], 1)
+                    }
+                    for job_format, (coefficients, count) in self._models.items()
+                },
+                "language_factors": {language: round(factor, 2)
+                                     for language, factor in self._language_factors.items()},
+                # Erreur relative médiane des estimations données au démarrage
+                "median_relative_error": round(_median(errors), 3) if errors else None
+            }
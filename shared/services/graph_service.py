@@ -3,10 +3,19 @@ Service Microsoft Graph pour OneDrive
 Adapté du code conteneur existant
 """
 
+import asyncio
 import logging
-import requests
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, AsyncIterator, BinaryIO, Iterable, Iterator, Optional, Tuple, Union
 from shared.config import Config
+from shared.services import resilience
+from shared.services.resilience import RetryPolicy, parse_retry_after
+from shared.services.tracing import traced
+from shared.services.service_registry import (
+    get_async_http_client,
+    get_graph_token_provider,
+    get_http_client
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,31 +23,92 @@ logger = logging.getLogger(__name__)
 class GraphService:
     """Service pour l'intégration Microsoft Graph (OneDrive)"""
 
+    # État d'une session d'upload qui n'existe plus (404)
+    SESSION_GONE = -1
+
     def __init__(self):
-        self.client_id = Config.CLIENT_ID
-        self.client_secret = Config.CLIENT_SECRET
-        self.tenant_id = Config.TENANT_ID
         self.onedrive_upload_enabled = Config.ONEDRIVE_UPLOAD_ENABLED
         self.onedrive_folder = Config.ONEDRIVE_FOLDER or "Translated Documents"
 
         # URLs Microsoft Graph
-        self.token_url = f"https://login.microsoftonline.com/{self.tenant_id}/oauth2/v2.0/token"
-        self.graph_base_url = "https://graph.microsoft.com/v1.0"
+        self.graph_base_url = Config.GRAPH_BASE_URL
+
+        # Token partagé par le processus, renouvelé en arrière-plan
+        self.token_provider = get_graph_token_provider()
 
-        # Cache du token (en production, utiliser Redis ou équivalent)
-        self._access_token = None
-        self._token_expires_at = None
+        # Upload par session (gros fichiers)
+        self.simple_upload_max = Config.ONEDRIVE_SIMPLE_UPLOAD_MAX_MB * 1024 * 1024
+        fragment_unit = 320 * 1024
+        self.fragment_size = max(
+            fragment_unit, (Config.ONEDRIVE_FRAGMENT_SIZE_KB * 1024) // fragment_unit * fragment_unit)
+        self.fragment_retries = Config.ONEDRIVE_FRAGMENT_RETRIES
+        # Attente entre deux envois d'un fragment (backoff, ou Retry-After de Graph)
+        self.retry_policy = RetryPolicy()
+
+        # Session HTTP keep-alive partagée par le worker
+        self.http = self._http_client()
 
         logger.info("✅ GraphService initialisé")
 
+    def _http_client(self):
+        return get_http_client()
+
     def is_configured(self) -> bool:
         """Vérifie si le service Graph est configuré"""
         return Config.is_onedrive_enabled()
 
-    def upload_to_onedrive(self, file_content: bytes, file_name: str, user_id: str) -> Dict[str, Any]:
+    @traced("graph.upload", "graph")
+    def upload_to_onedrive(self, file_content: Union[bytes, Iterable[bytes], BinaryIO], file_name: str,
+                           user_id: str, file_size: Optional[int] = None) -> Dict[str, Any]:
         """
         Upload un fichier vers OneDrive
+        ``file_content`` peut être un itérateur de blocs ou un fichier (``file_size`` requis) :
+        au-delà de ONEDRIVE_SIMPLE_UPLOAD_MAX_MB, l'envoi passe par une session
+        d'upload fragmentée et reprenable
         """
+        unconfigured = self._unconfigured_result()
+        if unconfigured:
+            return unconfigured
+        try:
+            logger.info(f"☁️ Upload vers OneDrive: {file_name} pour {user_id}")
+
+            # Obtention du token d'accès
+            access_token = self._get_access_token()
+            if not access_token:
+                return {
+                    "success": False,
+                    "error": "Impossible d'obtenir le token d'accès Microsoft Graph"
+                }
+
+            file_size = self._content_size(file_content, file_size)
+
+            # Gros fichier : session d'upload fragmentée
+            if file_size > self.simple_upload_max:
+                return self._upload_with_session(file_content, file_size, file_name, user_id, access_token)
+
+            # Upload vers OneDrive avec le nom de fichier original
+            upload_url = f"{self._item_url(file_name, user_id)}:/content"
+            logger.info(f"📤 URL d'upload OneDrive: {upload_url}")
+
+            data = self._read_all(file_content)
+            response = resilience.call(resilience.GRAPH, lambda: self.http.put(
+                upload_url,
+                headers=self._simple_upload_headers(access_token),
+                data=data,
+                timeout=60
+            ))
+
+            return self._simple_upload_result(response, file_name)
+
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de l'upload OneDrive: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Erreur interne: {str(e)}"
+            }
+
+    def _unconfigured_result(self) -> Optional[Dict[str, Any]]:
+        """Réponse immédiate quand OneDrive n'est pas configuré ou désactivé"""
         if not self.is_configured():
             return {
                 "success": False,
@@ -49,51 +119,330 @@ class GraphService:
                 "success": True,
                 "info": "Upload OneDrive désactivé"
             }
+        return None
+
+    @staticmethod
+    def _content_size(file_content: Union[bytes, Iterable[bytes], BinaryIO],
+                      file_size: Optional[int]) -> int:
+        if isinstance(file_content, (bytes, bytearray)):
+            return len(file_content)
+        if file_size is None:
+            raise ValueError("file_size requis pour un upload en flux")
+        return file_size
+
+    @staticmethod
+    def _read_all(file_content: Union[bytes, Iterable[bytes], BinaryIO]) -> bytes:
+        if hasattr(file_content, "read"):
+            return file_content.read()
+        if not isinstance(file_content, (bytes, bytearray)):
+            return b"".join(file_content)
+        return file_content
+
+    @staticmethod
+    def _simple_upload_headers(access_token: str) -> Dict[str, str]:
+        return {
+            'Authorization': f'Bearer {access_token}',
+            'Content-Type': 'application/octet-stream'
+        }
+
+    def _simple_upload_result(self, response, file_name: str) -> Dict[str, Any]:
+        """Résultat d'un upload simple (PUT .../content)"""
+        if response.status_code in [200, 201]:
+            file_info = response.json()
+            onedrive_url = file_info.get('webUrl')
+
+            logger.info(f"✅ Fichier uploadé vers OneDrive: {file_name}")
+            return {
+                "success": True,
+                "onedrive_url": onedrive_url,
+                "file_id": file_info.get('id'),
+                "file_name": file_name
+            }
+        else:
+            error_msg = f"Erreur HTTP {response.status_code}: {response.text}"
+            logger.error(f"❌ Erreur upload OneDrive: {error_msg}")
+            return {
+                "success": False,
+                "error": error_msg
+            }
+
+    def _upload_with_session(self, file_content: Union[bytes, Iterable[bytes], BinaryIO], file_size: int,
+                             file_name: str, user_id: str, access_token: str) -> Dict[str, Any]:
+        """
+        Upload par session Graph : les fragments sont envoyés au fil du flux,
+        la mémoire reste bornée à un fragment quelle que soit la taille du fichier
+        """
+        # Une session créée en double expire d'elle-même : création renvoyable
+        response = resilience.call(resilience.GRAPH, lambda: self.http.post(
+            **self._session_request(file_name, user_id, access_token)))
+        if response.status_code != 200:
+            return self._session_error(response)
+        upload_url = self._session_upload_url(response, file_size)
+
+        offset = 0
+        file_info = None
+        final_fragment = False
+        try:
+            for fragment in self._iter_fragments(file_content):
+                final_fragment = offset + len(fragment) >= file_size
+                file_info = self._upload_fragment(upload_url, fragment, offset, file_size)
+                offset += len(fragment)
+        except Exception as e:
+            # Dernier fragment validé par Graph malgré l'erreur (réponse perdue) : fichier complet
+            file_info = self._get_uploaded_item(file_name, user_id, access_token, file_size) if final_fragment else None
+            if not file_info:
+                # La session expire d'elle-même côté Graph, on tente de la libérer
+                try:
+                    self.http.delete(upload_url, timeout=15)
+                except Exception:
+                    pass
+                return self._interrupted_result(offset, file_size, e)
+
+        if not file_info:
+            # Dernier fragment déjà reçu (reprise) ou session close : l'élément est lu sur le drive
+            file_info = self._get_uploaded_item(file_name, user_id, access_token, file_size)
+        return self._session_result(file_info, file_name)
+
+    def _session_request(self, file_name: str, user_id: str, access_token: str) -> Dict[str, Any]:
+        """Arguments de la requête de création de session (createUploadSession)"""
+        return {
+            "url": f"{self._item_url(file_name, user_id)}:/createUploadSession",
+            "headers": {
+                'Authorization': f'Bearer {access_token}',
+                'Content-Type': 'application/json'
+            },
+            "json": {"item": {"@microsoft.graph.conflictBehavior": "replace"}},
+            "timeout": 30
+        }
+
+    def _session_upload_url(self, response, file_size: int) -> str:
+        logger.info(
+            f"📤 Session d'upload OneDrive: {file_size} bytes en fragments de {self.fragment_size} bytes")
+        return response.json().get('uploadUrl')
+
+    @staticmethod
+    def _interrupted_result(offset: int, file_size: int, error: Exception) -> Dict[str, Any]:
+        logger.error(f"❌ Upload OneDrive interrompu à {offset}/{file_size} bytes: {str(error)}")
+        return {"success": False, "error": f"Upload interrompu: {str(error)}"}
+
+    def _item_url(self, file_name: str, user_id: str) -> str:
+        return f"{self.graph_base_url}/users/{user_id}/drive/root:/{self.onedrive_folder}/{file_name}"
+
+    @staticmethod
+    def _uploaded_item(response, file_size: int) -> Optional[Dict[str, Any]]:
+        """driveItem issu de la session : présent et de la taille envoyée"""
+        if response.status_code != 200:
+            return None
+        item = response.json()
+        return item if item.get('size') == file_size else None
+
+    @traced("graph.get_item", "graph")
+    def _get_uploaded_item(self, file_name: str, user_id: str, access_token: str,
+                           file_size: int) -> Optional[Dict[str, Any]]:
+        """Élément OneDrive créé par la session quand la réponse du dernier fragment manque"""
+        try:
+            response = resilience.call(resilience.GRAPH, lambda: self.http.get(
+                self._item_url(file_name, user_id), headers=self._auth_headers(access_token), timeout=15))
+            return self._uploaded_item(response, file_size)
+        except Exception as e:
+            logger.warning(f"⚠️ Élément OneDrive introuvable après la session: {str(e)}")
+            return None
+
+    @staticmethod
+    def _auth_headers(access_token: str) -> Dict[str, str]:
+        return {'Authorization': f'Bearer {access_token}'}
+
+    @staticmethod
+    def _session_error(response) -> Dict[str, Any]:
+        error_msg = f"Erreur HTTP {response.status_code}: {response.text}"
+        logger.error(f"❌ Erreur création session OneDrive: {error_msg}")
+        return {"success": False, "error": error_msg}
+
+    @staticmethod
+    def _session_result(file_info: Optional[Dict[str, Any]], file_name: str) -> Dict[str, Any]:
+        if not file_info:
+            return {"success": False, "error": "Session d'upload terminée sans élément OneDrive"}
+
+        logger.info(f"✅ Fichier uploadé vers OneDrive: {file_name}")
+        return {
+            "success": True,
+            "onedrive_url": file_info.get('webUrl'),
+            "file_id": file_info.get('id'),
+            "file_name": file_name
+        }
+
+    def _iter_fragments(self, file_content: Union[bytes, Iterable[bytes], BinaryIO]) -> Iterator[bytes]:
+        """Redécoupe un flux de blocs (ou un fichier) en fragments de taille ``fragment_size``"""
+        if isinstance(file_content, (bytes, bytearray)):
+            file_content = [file_content]
+        elif hasattr(file_content, "read"):
+            stream = file_content
+            file_content = iter(lambda: stream.read(self.fragment_size), b"")
+
+        buffer = bytearray()
+        for chunk in file_content:
+            buffer.extend(chunk)
+            while len(buffer) >= self.fragment_size:
+                yield bytes(buffer[:self.fragment_size])
+                del buffer[:self.fragment_size]
+        if buffer:
+            yield bytes(buffer)
+
+    @traced("graph.upload_fragment", "graph")
+    def _upload_fragment(self, upload_url: str, fragment: bytes, offset: int,
+                         file_size: int) -> Optional[Dict[str, Any]]:
+        """
+        Envoie un fragment ; en cas d'échec, interroge la session pour reprendre
+        à l'octet attendu par Graph au lieu de recommencer le fichier
+        Retourne l'élément OneDrive quand le dernier fragment est accepté
+        """
+        start = 0
+        last_error = None
+        retry_after = None
+        for attempt in range(self.fragment_retries + 1):
+            if attempt:
+                time.sleep(self.retry_policy.backoff(attempt, retry_after))
+                start = self._resume_start(
+                    self._get_next_expected_offset(upload_url), fragment, offset, file_size, start, attempt)
+                if start is None:
+                    return None
+
+            data = fragment[start:]
+            try:
+                # L'URL de session est pré-authentifiée : pas d'en-tête Authorization
+                response = self.http.put(
+                    upload_url,
+                    headers=self._fragment_headers(len(data), offset + start, offset + len(fragment), file_size),
+                    data=data,
+                    timeout=60
+                )
+            except Exception as e:
+                last_error, retry_after = str(e), None
+                continue
+
+            done, file_info, last_error, retry_after = self._fragment_outcome(response)
+            if done:
+                return file_info
+
+        raise Exception(last_error or "Échec de l'envoi du fragment")
+
+    def _resume_start(self, resume_at: Optional[int], fragment: bytes, offset: int, file_size: int,
+                      start: int, attempt: int) -> Optional[int]:
+        """
+        Position de reprise dans ``fragment`` d'après l'octet attendu par la session
+        None : rien à renvoyer (fragment déjà reçu, ou session close après le dernier fragment)
+        """
+        if resume_at == self.SESSION_GONE:
+            return self._session_gone(offset, fragment, file_size)
+        if resume_at is not None:
+            if resume_at >= offset + len(fragment):
+                return None  # fragment déjà reçu
+            start = max(resume_at - offset, 0)
+        logger.warning(
+            f"⚠️ Reprise du fragment à l'octet {offset + start} (tentative {attempt})")
+        return start
+
+    @staticmethod
+    def _fragment_outcome(response) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str], Optional[float]]:
+        """
+        Réponse à un fragment : (terminé, élément OneDrive, erreur, Retry-After)
+        Erreur définitive (4xx hors 408, 416 et 429) : exception, sans nouvel essai
+        """
+        if response.status_code == 202:
+            return True, None, None, None
+        if response.status_code in [200, 201]:
+            return True, response.json(), None, None
+        error = f"Erreur HTTP {response.status_code}: {response.text[:200]}"
+        if response.status_code < 500 and response.status_code not in (408, 416, 429):
+            raise Exception(error)
+        return False, None, error, parse_retry_after(response.headers.get("Retry-After"))
+
+    @staticmethod
+    def _session_gone(offset: int, fragment: bytes, file_size: int) -> None:
+        """
+        Session disparue pendant une reprise : Graph la ferme en validant le fichier
+        après le dernier fragment (réponse perdue) ; avant, elle a expiré ou été annulée
+        """
+        if offset + len(fragment) < file_size:
+            raise Exception("Session d'upload expirée ou annulée")
+        return None
+
+    @staticmethod
+    def _fragment_headers(length: int, range_start: int, range_stop: int, file_size: int) -> Dict[str, str]:
+        return {
+            'Content-Length': str(length),
+            'Content-Range': f"bytes {range_start}-{range_stop - 1}/{file_size}"
+        }
+
+    @classmethod
+    def _resume_offset(cls, response) -> Optional[int]:
+        """Premier octet attendu d'après la réponse d'état de la session (SESSION_GONE si close)"""
+        if response.status_code == 404:
+            return cls.SESSION_GONE
+        if response.status_code != 200:
+            return None
+        ranges = response.json().get('nextExpectedRanges') or []
+        if not ranges:
+            return None
+        return int(ranges[0].split('-')[0])
+
+    @traced("graph.upload_status", "graph")
+    def _get_next_expected_offset(self, upload_url: str) -> Optional[int]:
+        """Premier octet encore attendu par la session d'upload"""
+        try:
+            return self._resume_offset(self.http.get(upload_url, timeout=15))
+        except Exception as e:
+            logger.warning(f"⚠️ État de la session d'upload indisponible: {str(e)}")
+            return None
+
+    def _get_access_token(self) -> Optional[str]:
+        """Token d'accès Microsoft Graph (cache du processus)"""
+        return self.token_provider.get_token()
+
+
+class AsyncGraphService(GraphService):
+    """
+    Variante asynchrone de GraphService (client HTTP aiohttp partagé par la boucle)
+    Les méthodes réseau sont des coroutines ; URLs, en-têtes et analyse des réponses sont partagés
+    """
+
+    def _http_client(self):
+        # Client aiohttp de la boucle : la session ``requests`` n'est jamais construite
+        return get_async_http_client()
+
+    @traced("graph.upload", "graph")
+    async def upload_to_onedrive(self, file_content: Union[bytes, Iterable[bytes], BinaryIO], file_name: str,
+                                 user_id: str, file_size: Optional[int] = None) -> Dict[str, Any]:
+        """Upload un fichier vers OneDrive (voir GraphService.upload_to_onedrive)"""
+        unconfigured = self._unconfigured_result()
+        if unconfigured:
+            return unconfigured
         try:
             logger.info(f"☁️ Upload vers OneDrive: {file_name} pour {user_id}")
 
-            # Obtention du token d'accès
-            access_token = self._get_access_token()
+            access_token = await self._get_access_token()
             if not access_token:
                 return {
                     "success": False,
                     "error": "Impossible d'obtenir le token d'accès Microsoft Graph"
                 }
 
-            # Upload vers OneDrive avec le nom de fichier original
-            upload_url = f"{self.graph_base_url}/users/{user_id}/drive/root:/{self.onedrive_folder}/{file_name}:/content"
-            logger.info(f"📤 URL d'upload OneDrive: {upload_url}")
+            file_size = self._content_size(file_content, file_size)
+            if file_size > self.simple_upload_max:
+                return await self._upload_with_session(file_content, file_size, file_name, user_id, access_token)
 
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/octet-stream'
-            }
+            upload_url = f"{self._item_url(file_name, user_id)}:/content"
+            logger.info(f"📤 URL d'upload OneDrive: {upload_url}")
 
-            response = requests.put(
+            data = await self._read_all_async(file_content)
+            response = await resilience.call_async(resilience.GRAPH, lambda: self.http.put(
                 upload_url,
-                headers=headers,
-                data=file_content,
+                headers=self._simple_upload_headers(access_token),
+                data=data,
                 timeout=60
-            )
+            ))
 
-            if response.status_code in [200, 201]:
-                file_info = response.json()
-                onedrive_url = file_info.get('webUrl')
-
-                logger.info(f"✅ Fichier uploadé vers OneDrive: {file_name}")
-                return {
-                    "success": True,
-                    "onedrive_url": onedrive_url,
-                    "file_id": file_info.get('id'),
-                    "file_name": file_name
-                }
-            else:
-                error_msg = f"Erreur HTTP {response.status_code}: {response.text}"
-                logger.error(f"❌ Erreur upload OneDrive: {error_msg}")
-                return {
-                    "success": False,
-                    "error": error_msg
-                }
+            return self._simple_upload_result(response, file_name)
 
         except Exception as e:
             logger.error(f"❌ Erreur lors de l'upload OneDrive: {str(e)}")
@@ -102,54 +451,120 @@ class GraphService:
                 "error": f"Erreur interne: {str(e)}"
             }
 
-    def _get_access_token(self) -> Optional[str]:
-        """Obtient un token d'accès Microsoft Graph"""
+    async def _upload_with_session(self, file_content: Union[bytes, Iterable[bytes], BinaryIO], file_size: int,
+                                   file_name: str, user_id: str, access_token: str) -> Dict[str, Any]:
+        """Upload par session Graph, fragment par fragment (voir GraphService._upload_with_session)"""
+        response = await resilience.call_async(resilience.GRAPH, lambda: self.http.post(
+            **self._session_request(file_name, user_id, access_token)))
+        if response.status_code != 200:
+            return self._session_error(response)
+        upload_url = self._session_upload_url(response, file_size)
+
+        offset = 0
+        file_info = None
+        final_fragment = False
         try:
-            logger.info(f"🔑 Demande de token Microsoft Graph...")
-            logger.info(
-                f"   Client ID: {self.client_id[:8] if self.client_id else 'None'}...")
-            logger.info(
-                f"   Tenant ID: {self.tenant_id[:8] if self.tenant_id else 'None'}...")
-            logger.info(f"   Token URL: {self.token_url}")
-
-            # Vérifier si le token en cache est encore valide
-            if self._access_token and self._token_expires_at:
-                import time
-                if time.time() < self._token_expires_at - 300:  # 5 min de marge
-                    logger.info("✅ Token en cache encore valide")
-                    return self._access_token
-
-            # Demande d'un nouveau token
-            data = {
-                'client_id': self.client_id,
-                'client_secret': self.client_secret,
-                'scope': 'https://graph.microsoft.com/.default',
-                'grant_type': 'client_credentials'
-            }
+            async for fragment in self._aiter_fragments(file_content):
+                final_fragment = offset + len(fragment) >= file_size
+                file_info = await self._upload_fragment(upload_url, fragment, offset, file_size)
+                offset += len(fragment)
+        except Exception as e:
+            file_info = (await self._get_uploaded_item(file_name, user_id, access_token, file_size)
+                         if final_fragment else None)
+            if not file_info:
+                try:
+                    await self.http.delete(upload_url, timeout=15)
+                except Exception:
+                    pass
+                return self._interrupted_result(offset, file_size, e)
 
-            logger.info(f"📤 Requête token vers: {self.token_url}")
-            response = requests.post(self.token_url, data=data, timeout=30)
-            logger.info(f"📥 Réponse token - Status: {response.status_code}")
-
-            if response.status_code == 200:
-                token_data = response.json()
-                self._access_token = token_data.get('access_token')
-                expires_in = token_data.get('expires_in', 3600)
-                logger.info(
-                    f"✅ Token obtenu avec succès (expire dans {expires_in}s)")
-
-                import time
-                self._token_expires_at = time.time() + expires_in
-
-                logger.info("✅ Token Microsoft Graph obtenu")
-                return self._access_token
-            else:
-                error_text = response.text[:200]  # Limiter la longueur
-                logger.error(
-                    f"❌ Erreur obtention token: {response.status_code}")
-                logger.error(f"   Détails: {error_text}")
-                return None
+        if not file_info:
+            file_info = await self._get_uploaded_item(file_name, user_id, access_token, file_size)
+        return self._session_result(file_info, file_name)
 
+    @traced("graph.get_item", "graph")
+    async def _get_uploaded_item(self, file_name: str, user_id: str, access_token: str,
+                                 file_size: int) -> Optional[Dict[str, Any]]:
+        """Élément OneDrive créé par la session (voir GraphService._get_uploaded_item)"""
+        try:
+            response = await resilience.call_async(resilience.GRAPH, lambda: self.http.get(
+                self._item_url(file_name, user_id), headers=self._auth_headers(access_token), timeout=15))
+            return self._uploaded_item(response, file_size)
         except Exception as e:
-            logger.error(f"❌ Erreur lors de l'obtention du token: {str(e)}")
+            logger.warning(f"⚠️ Élément OneDrive introuvable après la session: {str(e)}")
             return None
+
+    async def _read_all_async(self, file_content: Union[bytes, Iterable[bytes], BinaryIO]) -> bytes:
+        """_read_all hors de la boucle pour un fichier (lecture disque bloquante)"""
+        if hasattr(file_content, "read"):
+            return await asyncio.to_thread(file_content.read)
+        return self._read_all(file_content)
+
+    async def _aiter_fragments(self, file_content: Union[bytes, Iterable[bytes], BinaryIO]) -> AsyncIterator[bytes]:
+        """_iter_fragments dont les lectures de fichier s'exécutent hors de la boucle"""
+        if not hasattr(file_content, "read"):
+            # Contenu déjà en mémoire : aucune E/S
+            for fragment in self._iter_fragments(file_content):
+                yield fragment
+            return
+        while True:
+            fragment = await asyncio.to_thread(self._read_fragment, file_content)
+            if not fragment:
+                return
+            yield fragment
+
+    def _read_fragment(self, stream: BinaryIO) -> bytes:
+        """Lit un fragment complet (``read`` peut rendre moins d'octets avant la fin du flux)"""
+        fragment = stream.read(self.fragment_size)
+        while fragment and len(fragment) < self.fragment_size:
+            more = stream.read(self.fragment_size - len(fragment))
+            if not more:
+                break
+            fragment += more
+        return fragment
+
+    @traced("graph.upload_fragment", "graph")
+    async def _upload_fragment(self, upload_url: str, fragment: bytes, offset: int,
+                               file_size: int) -> Optional[Dict[str, Any]]:
+        """Envoie un fragment, avec reprise à l'octet attendu par Graph (voir GraphService._upload_fragment)"""
+        start = 0
+        last_error = None
+        retry_after = None
+        for attempt in range(self.fragment_retries + 1):
+            if attempt:
+                await asyncio.sleep(self.retry_policy.backoff(attempt, retry_after))
+                start = self._resume_start(
+                    await self._get_next_expected_offset(upload_url), fragment, offset, file_size, start, attempt)
+                if start is None:
+                    return None
+
+            data = fragment[start:]
+            try:
+                response = await self.http.put(
+                    upload_url,
+                    headers=self._fragment_headers(len(data), offset + start, offset + len(fragment), file_size),
+                    data=data,
+                    timeout=60
+                )
+            except Exception as e:
+                last_error, retry_after = str(e), None
+                continue
+
+            done, file_info, last_error, retry_after = self._fragment_outcome(response)
+            if done:
+                return file_info
+
+        raise Exception(last_error or "Échec de l'envoi du fragment")
+
+    @traced("graph.upload_status", "graph")
+    async def _get_next_expected_offset(self, upload_url: str) -> Optional[int]:
+        """Premier octet encore attendu par la session d'upload"""
+        try:
+            return self._resume_offset(await self.http.get(upload_url, timeout=15))
+        except Exception as e:
+            logger.warning(f"⚠️ État de la session d'upload indisponible: {str(e)}")
+            return None
+
+    async def _get_access_token(self) -> Optional[str]:
+        """Token d'accès Microsoft Graph ; un renouvellement éventuel s'exécute hors de la boucle"""
+        return self.token_provider.peek() or await asyncio.to_thread(self.token_provider.get_token)
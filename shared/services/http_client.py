@@ -0,0 +1,283 @@
+"""
+Client HTTP mutualisé pour les appels sortants (Translator, Graph)
+Garde les connexions TCP+TLS ouvertes entre les invocations d'un worker
+Les bibliothèques HTTP (requests, httpx, aiohttp) ne sont importées qu'à la
+construction du client qui les utilise, pas au chargement des fonctions
+"""
+
+import asyncio
+import json as json_module
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from shared.config import Config
+from shared.services import tracing
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClientError(Exception):
+    """Erreur réseau d'un appel sortant, quel que soit le backend (requests, httpx, aiohttp)"""
+
+
+def _counting_adapter(on_new_connection, **kwargs):
+    """Adaptateur ``requests`` qui compte les nouvelles connexions ouvertes"""
+    from requests.adapters import HTTPAdapter
+    from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+
+    class CountingHTTPConnectionPool(HTTPConnectionPool):
+        def _new_conn(self):
+            on_new_connection()
+            return super()._new_conn()
+
+    class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        def _new_conn(self):
+            on_new_connection()
+            return super()._new_conn()
+
+    class CountingAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **pool_kwargs):
+            super().init_poolmanager(*args, **pool_kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": CountingHTTPConnectionPool,
+                "https": CountingHTTPSConnectionPool,
+            }
+
+    return CountingAdapter(**kwargs)
+
+
+class HttpClient:
+    """Session HTTP keep-alive partagée, backend ``requests`` ou ``httpx``"""
+
+    def __init__(self, backend: Optional[str] = None,
+                 pool_connections: Optional[int] = None,
+                 pool_maxsize: Optional[int] = None,
+                 keepalive_expiry: Optional[float] = None,
+                 http2: Optional[bool] = None):
+        self.backend = (backend or Config.HTTP_BACKEND).lower()
+        self.pool_connections = pool_connections or Config.HTTP_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or Config.HTTP_POOL_MAXSIZE
+        self.keepalive_expiry = keepalive_expiry or Config.HTTP_KEEPALIVE_EXPIRY
+        self.http2 = Config.HTTP2_ENABLED if http2 is None else http2
+
+        self._stats_lock = threading.Lock()
+        self._requests_sent = 0
+        self._connections_opened = 0
+
+        if self.backend == "httpx":
+            self._client = self._build_httpx_client()
+        elif self.backend == "requests":
+            self._client = self._build_requests_session()
+        else:
+            raise ValueError(f"HTTP_BACKEND inconnu: {self.backend}")
+
+        logger.info(
+            f"✅ HttpClient initialisé ({self.backend}, pool={self.pool_connections}/{self.pool_maxsize}, "
+            f"http2={self.http2})")
+
+    def _build_requests_session(self):
+        """Session ``requests`` avec pool de connexions dimensionné"""
+        import requests
+
+        self.http2 = False
+        session = requests.Session()
+        adapter = _counting_adapter(
+            self._record_new_connection,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=0
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _build_httpx_client(self):
+        """Client ``httpx`` avec keep-alive et HTTP/2 optionnel"""
+        import httpx
+
+        if self.http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("⚠️ Paquet 'h2' absent, HTTP/2 désactivé")
+                self.http2 = False
+
+        limits = httpx.Limits(
+            max_connections=self.pool_maxsize,
+            max_keepalive_connections=self.pool_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+        return httpx.Client(limits=limits, http2=self.http2)
+
+    def _record_new_connection(self) -> None:
+        with self._stats_lock:
+            self._connections_opened += 1
+
+    def _trace_httpx(self, event_name: str, info: Dict[str, Any]) -> None:
+        """Hook de trace httpcore : compte les connexions TCP établies"""
+        if event_name == "connection.connect_tcp.complete":
+            self._record_new_connection()
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                json: Any = None, data: Any = None, timeout: Optional[float] = None):
+        """
+        Envoie une requête via le pool partagé
+        Retourne un objet réponse exposant status_code, headers, text et json()
+        """
+        with self._stats_lock:
+            self._requests_sent += 1
+        # Propagation du contexte de trace (W3C traceparent)
+        headers = tracing.inject(headers)
+
+        if self.backend == "requests":
+            import requests
+
+            try:
+                return self._client.request(
+                    method, url, headers=headers, json=json, data=data, timeout=timeout)
+            except requests.exceptions.RequestException as e:
+                raise HttpClientError(str(e)) from e
+
+        import httpx
+
+        kwargs: Dict[str, Any] = {"headers": headers, "json": json, "timeout": timeout,
+                                  "extensions": {"trace": self._trace_httpx}}
+        # httpx distingue les formulaires (data) du contenu brut (content)
+        if isinstance(data, dict):
+            kwargs["data"] = data
+        elif data is not None:
+            kwargs["content"] = data
+
+        try:
+            return self._client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            raise HttpClientError(str(e)) from e
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compteurs de réutilisation des connexions"""
+        with self._stats_lock:
+            requests_sent = self._requests_sent
+            opened = self._connections_opened
+        reused = max(requests_sent - opened, 0)
+        return {
+            "backend": self.backend,
+            "http2": self.http2,
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "requests": requests_sent,
+            "connections_opened": opened,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / requests_sent, 3) if requests_sent else 0.0
+        }
+
+    def close(self) -> None:
+        """Ferme toutes les connexions du pool"""
+        self._client.close()
+
+
+class AsyncResponse:
+    """Réponse aiohttp lue en entier, même interface que les réponses ``requests``/``httpx``"""
+
+    def __init__(self, status_code: int, headers, content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json_module.loads(self.content)
+
+
+class AsyncHttpClient:
+    """
+    Équivalent asynchrone de HttpClient (``aiohttp``, déjà transport de azure.storage.blob.aio)
+    Une instance par boucle asyncio : le pool est lié à la boucle qui l'a créé
+    """
+
+    def __init__(self, pool_maxsize: Optional[int] = None,
+                 keepalive_expiry: Optional[float] = None):
+        import aiohttp
+
+        self.backend = "aiohttp"
+        self.pool_maxsize = pool_maxsize or Config.HTTP_POOL_MAXSIZE
+        self.keepalive_expiry = keepalive_expiry or Config.HTTP_KEEPALIVE_EXPIRY
+
+        # Une seule boucle par instance : pas de verrou sur les compteurs
+        self._requests_sent = 0
+        self._connections_opened = 0
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._record_new_connection)
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.pool_maxsize,
+                limit_per_host=self.pool_maxsize,
+                keepalive_timeout=self.keepalive_expiry
+            ),
+            trace_configs=[trace_config]
+        )
+
+        logger.info(f"✅ AsyncHttpClient initialisé (aiohttp, pool={self.pool_maxsize})")
+
+    async def _record_new_connection(self, session, context, params) -> None:
+        self._connections_opened += 1
+
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      json: Any = None, data: Any = None, timeout: Optional[float] = None) -> AsyncResponse:
+        """Envoie une requête via le pool partagé (mêmes paramètres que HttpClient.request)"""
+        import aiohttp
+
+        self._requests_sent += 1
+        headers = tracing.inject(headers)
+        try:
+            async with self._session.request(
+                    method, url, headers=headers, json=json, data=data,
+                    timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                content = await response.read()
+                return AsyncResponse(response.status, response.headers, content)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise HttpClientError(str(e) or type(e).__name__) from e
+
+    async def get(self, url: str, **kwargs) -> AsyncResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> AsyncResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> AsyncResponse:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> AsyncResponse:
+        return await self.request("DELETE", url, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compteurs de réutilisation des connexions"""
+        reused = max(self._requests_sent - self._connections_opened, 0)
+        return {
+            "backend": self.backend,
+            "pool_maxsize": self.pool_maxsize,
+            "requests": self._requests_sent,
+            "connections_opened": self._connections_opened,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / self._requests_sent, 3) if self._requests_sent else 0.0
+        }
+
+    async def aclose(self) -> None:
+        """Ferme toutes les connexions du pool"""
+        await self._session.close()
@@ -0,0 +1,607 @@
+"""
+File d'admission des traductions (INTAKE_MODE=queue)
+start_translation dépose chaque soumission dans une file par voie (interactive, bulk)
+et par classe de taille ; le répartiteur (timer dispatch_translations) les envoie à Translator :
+- tourniquet pondéré entre files : voies prioritaires, petits fichiers favorisés sans affamer les gros
+- tourniquet entre utilisateurs d'une même file, plafond de jobs en cours par utilisateur et global
+- débit de soumission adaptatif (AIMD) : réduit sur 429 ou latence élevée, relevé pas à pas sinon
+"""
+
+import asyncio
+import logging
+import math
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from shared.config import Config
+from shared.models.constants import TranslationStatus
+from shared.services.intake_queue import IntakeMessage, create_intake_queue
+from shared.services.service_registry import (
+    get_async_blob_service,
+    get_async_translation_service,
+    get_completion_estimator,
+    get_state_store
+)
+from shared.services import resilience
+from shared.services.resilience import CircuitOpenError, RetryPolicy
+from shared.services.translation_service import TranslatorThrottledError
+from shared.services.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Types de documents du stockage d'état
+INTAKE = "intake"
+INTAKE_ACTIVE = "intake_active"
+INTAKE_RATE = "intake_rate"
+
+# Préfixe des IDs renvoyés pour une requête en file d'admission
+QUEUED_TRANSLATION_PREFIX = "queued-"
+
+# Voies, de la plus prioritaire à la moins prioritaire
+LANES = ("interactive", "bulk")
+SIZE_CLASSES = ("small", "large")
+
+# États d'une requête en file
+QUEUED = "Queued"
+SUBMITTED = "Submitted"
+CANCELLED = "Cancelled"
+
+# Utilisateurs mémorisés par le tourniquet
+MAX_TRACKED_USERS = 10000
+
+
+def parse_lane_weights(value: str) -> Dict[str, int]:
+    """``interactive=4,bulk=1`` → {"interactive": 4, "bulk": 1} ; voie absente : poids 1"""
+    weights = dict.fromkeys(LANES, 1)
+    for item in (value or "").split(","):
+        lane, _, weight = item.partition("=")
+        if lane.strip() in weights and weight.strip().isdigit():
+            weights[lane.strip()] = max(int(weight), 1)
+    return weights
+
+
+class AdaptiveRateLimiter:
+    """
+    Seau à jetons dont le débit suit un contrôle AIMD :
+    +INTAKE_RATE_INCREASE par soumission rapide, ×INTAKE_LATENCY_DECREASE si la soumission
+    dépasse INTAKE_TARGET_LATENCY_MS, ×INTAKE_RATE_DECREASE et pause (Retry-After) sur 429
+    """
+
+    def __init__(self, initial: Optional[float] = None, minimum: Optional[float] = None,
+                 maximum: Optional[float] = None):
+        self.minimum = minimum or Config.INTAKE_RATE_MIN
+        self.maximum = maximum or Config.INTAKE_RATE_MAX
+        self.rate = min(max(initial or Config.INTAKE_RATE_INITIAL, self.minimum), self.maximum)
+        self.increase = Config.INTAKE_RATE_INCREASE
+        self.decrease = Config.INTAKE_RATE_DECREASE
+        self.target_latency = Config.INTAKE_TARGET_LATENCY_MS / 1000
+        self.latency_decrease = Config.INTAKE_LATENCY_DECREASE
+
+        self._tokens = 1.0
+        self._refilled_at = time.monotonic()
+        # Epoch (partagé entre instances par le stockage d'état)
+        self.paused_until = 0.0
+        self.updated_at = 0.0
+
+        self.throttled = 0
+        self.slow = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        # Rafale limitée à une seconde de débit (au moins un jeton)
+        self._tokens = min(self._tokens + (now - self._refilled_at) * self.rate, max(self.rate, 1.0))
+        self._refilled_at = now
+
+    def delay(self) -> float:
+        """Attente avant la prochaine soumission autorisée (0 : immédiate)"""
+        self._refill()
+        paused = max(self.paused_until - time.time(), 0.0)
+        if self._tokens >= 1.0:
+            return paused
+        return max(paused, (1.0 - self._tokens) / self.rate)
+
+    async def acquire(self, deadline: float) -> bool:
+        """Consomme un jeton ; False si l'attente dépasserait ``deadline`` (horloge monotone)"""
+        while True:
+            wait = self.delay()
+            if wait <= 0:
+                self._tokens -= 1.0
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+    def on_success(self, latency: float) -> None:
+        """Soumission acceptée en ``latency`` secondes"""
+        if latency > self.target_latency:
+            self.slow += 1
+            self.rate = max(self.rate * self.latency_decrease, self.minimum)
+        else:
+            self.rate = min(self.rate + self.increase, self.maximum)
+        self.updated_at = time.time()
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Soumission refusée (429) : débit réduit, aucune soumission avant Retry-After"""
+        self.throttled += 1
+        self.rate = max(self.rate * self.decrease, self.minimum)
+        self._tokens = 0.0
+        self.paused_until = max(self.paused_until, time.time() + (retry_after or 1.0 / self.rate))
+        self.updated_at = time.time()
+
+    def to_document(self) -> Dict[str, Any]:
+        return {"rate": self.rate, "paused_until": self.paused_until, "updated_at": self.updated_at}
+
+    def merge(self, document: Optional[Dict[str, Any]]) -> None:
+        """Reprend le débit partagé s'il est plus récent (autre instance du répartiteur)"""
+        if not document:
+            return
+        self.paused_until = max(self.paused_until, document.get("paused_until") or 0.0)
+        if (document.get("updated_at") or 0.0) > self.updated_at:
+            self.rate = min(max(document["rate"], self.minimum), self.maximum)
+            self.updated_at = document["updated_at"]
+
+
+class FairScheduler:
+    """
+    Choix du prochain message parmi ceux lus dans les files
+    Tourniquet pondéré lissé entre files, puis utilisateur servi le moins récemment,
+    puis ordre d'arrivée pour cet utilisateur
+    """
+
+    def __init__(self, weights: Dict[str, int]):
+        self.weights = weights
+        self._current = dict.fromkeys(weights, 0)
+        self._served: "OrderedDict[str, int]" = OrderedDict()
+        self._sequence = 0
+
+    def pick(self, candidates: Dict[str, List[IntakeMessage]],
+             eligible: Callable[[str], bool]) -> Optional[IntakeMessage]:
+        """Message à soumettre, None si aucun utilisateur en attente n'est sous son plafond"""
+        ready: Dict[str, Dict[str, IntakeMessage]] = {}
+        for queue, messages in candidates.items():
+            heads: Dict[str, IntakeMessage] = {}
+            for message in messages:
+                user_id = message.payload["user_id"]
+                if user_id not in heads and eligible(user_id):
+                    heads[user_id] = message
+            if heads:
+                ready[queue] = heads
+        if not ready:
+            return None
+
+        total = sum(self.weights[queue] for queue in ready)
+        for queue in ready:
+            self._current[queue] += self.weights[queue]
+        queue = max(ready, key=lambda name: self._current[name])
+        self._current[queue] -= total
+
+        # Égalité (jamais servis) : premier arrivé dans la file
+        user_id = min(ready[queue], key=lambda user: self._served.get(user, -1))
+        self._sequence += 1
+        self._served[user_id] = self._sequence
+        self._served.move_to_end(user_id)
+        if len(self._served) > MAX_TRACKED_USERS:
+            self._served.popitem(last=False)
+        return ready[queue][user_id]
+
+
+class IntakeService:
+    """Admission des soumissions Translator : mise en file, répartition et suivi des jobs en cours"""
+
+    def __init__(self):
+        self.enabled = Config.INTAKE_MODE == "queue"
+        self.queue = create_intake_queue()
+        self.store = get_state_store()
+
+        lane_weights = parse_lane_weights(Config.INTAKE_LANE_WEIGHTS)
+        self.weights = {
+            self.queue_name(lane, size_class):
+                lane_weights[lane] * (Config.INTAKE_SMALL_FILE_BOOST if size_class == "small" else 1)
+            for lane in LANES for size_class in SIZE_CLASSES
+        }
+        self.scheduler = FairScheduler(self.weights)
+        self.limiter = AdaptiveRateLimiter()
+        # Soumissions sans retry interne : la file reporte elle-même les messages refusés
+        self.submit_policy = RetryPolicy(max_attempts=1)
+
+        self.small_file_size = Config.INTAKE_SMALL_FILE_MB * 1024 * 1024
+        self.max_active_per_user = Config.INTAKE_MAX_ACTIVE_PER_USER
+        self.max_active_jobs = Config.INTAKE_MAX_ACTIVE_JOBS
+        self.active_timeout = Config.INTAKE_ACTIVE_TIMEOUT_MINUTES * 60
+        self.active_refresh = Config.INTAKE_ACTIVE_REFRESH_SECONDS
+        self.window = Config.INTAKE_WINDOW
+        self.visibility_timeout = Config.INTAKE_VISIBILITY_SECONDS
+        self.max_attempts = Config.INTAKE_MAX_ATTEMPTS
+
+        # Jobs en cours soumis par la file (ID Translator → document), relus périodiquement
+        self._active: Dict[str, Dict[str, Any]] = {}
+        self._active_by_user: Dict[str, int] = {}
+        self._active_loaded_at = 0.0
+        self._checked_at: Dict[str, float] = {}
+        # File vide : pas de nouvelle lecture avant cette échéance (horloge monotone)
+        self._idle_until: Dict[str, float] = {}
+
+        self._enqueued = 0
+        self._submitted = 0
+        self._failed = 0
+        self._retried = 0
+
+        logger.info(
+            f"✅ IntakeService initialisé (mode={Config.INTAKE_MODE}, file={self.queue.name}, "
+            f"poids={self.weights})")
+
+    @property
+    def local(self) -> bool:
+        """Vrai si file et état vivent dans le processus (aucune E/S bloquante)"""
+        return self.queue.local and self.store.backend.local
+
+    async def _run(self, function, *args):
+        """Appel à la file ou à l'état : direct s'ils sont locaux, sinon dans un thread"""
+        if self.local:
+            return function(*args)
+        return await asyncio.to_thread(function, *args)
+
+    @staticmethod
+    def queue_name(lane: str, size_class: str) -> str:
+        return f"{Config.INTAKE_QUEUE_PREFIX}-{lane}-{size_class}"
+
+    @staticmethod
+    def lane_for(priority: Optional[str], bulk: bool = False) -> str:
+        """Voie demandée (``priority``), sinon bulk pour un lot et la voie par défaut pour un document"""
+        if priority in LANES:
+            return priority
+        return "bulk" if bulk else Config.INTAKE_DEFAULT_LANE
+
+    # --- Admission -------------------------------------------------------------
+
+    @traced("intake.enqueue")
+    def enqueue(self, user_id: str, lane: str, size: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Met une soumission en file et retourne son suivi (``intake_id`` renvoyé au client)
+        ``payload`` : kind "document" (blob_name) ou "batch" (prefix, documents), languages, eta_job
+        """
+        intake_id = f"{QUEUED_TRANSLATION_PREFIX}{uuid.uuid4().hex}"
+        queue = self.queue_name(lane, "small" if size <= self.small_file_size else "large")
+        document = {
+            "user_id": user_id,
+            "status": QUEUED,
+            "lane": lane,
+            "queue": queue,
+            "size": size,
+            # Sources lues à la soumission : épargnées par le nettoyage tant que la requête attend
+            "sources": [payload["prefix"] if payload["kind"] == "batch" else payload["blob_name"]],
+            "started_at": time.time()
+        }
+        # État écrit avant le message : le répartiteur le trouve toujours
+        self.store.put(INTAKE, intake_id, document)
+        self.store.flush()
+        self.queue.send(queue, {"intake_id": intake_id, "user_id": user_id, "size": size, **payload})
+        self._enqueued += 1
+        logger.info(f"📥 Soumission {intake_id} mise en file {queue} pour {user_id}")
+        return {"intake_id": intake_id, **document}
+
+    def get(self, intake_id: str) -> Optional[Dict[str, Any]]:
+        """Suivi d'une requête en file, None si inconnue ou expirée"""
+        return self.store.get(INTAKE, intake_id)
+
+    def describe(self, intake_id: str, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Réponse de check_status pour une requête encore en file ou refusée à la soumission"""
+        if document["status"] == CANCELLED:
+            return {
+                "translation_id": intake_id,
+                "status": CANCELLED,
+                "error": document.get("error", "Soumission annulée")
+            }
+        if document["status"] == TranslationStatus.FAILED.value:
+            return {
+                "translation_id": intake_id,
+                "status": TranslationStatus.FAILED.value,
+                "error": document.get("error", "Soumission impossible")
+            }
+        return {
+            "translation_id": intake_id,
+            "status": TranslationStatus.PENDING.value,
+            "queued": True,
+            "lane": document["lane"],
+            "queued_seconds": round(time.time() - document["started_at"]),
+            "next_poll_after": Config.POLL_DEFAULT_SECONDS
+        }
+
+    def cancel(self, intake_id: str, reason: str) -> Optional[str]:
+        """
+        Annule une requête : encore en file, le répartiteur supprimera son message sans la soumettre
+        Retourne l'ID Translator si elle a déjà été soumise (job à annuler par l'appelant)
+        """
+        document = self.store.get(INTAKE, intake_id, refresh=True)
+        if document is None or document["status"] not in (QUEUED, SUBMITTED):
+            return None
+        self.store.put(INTAKE, intake_id, {**document, "status": CANCELLED, "error": reason})
+        self.store.flush()
+        logger.info(f"🚫 Soumission {intake_id} annulée: {reason}")
+        return document.get("translation_id")
+
+    def release(self, translation_id: str) -> None:
+        """
+        Job terminé : il ne compte plus dans les plafonds
+        Le répartiteur le constate à sa prochaine relecture des jobs en cours
+        """
+        if self.store.get(INTAKE_ACTIVE, translation_id) is not None:
+            self.store.delete(INTAKE_ACTIVE, translation_id)
+
+    # --- Répartition -------------------------------------------------------------
+
+    @traced("intake.dispatch")
+    async def dispatch(self, max_seconds: Optional[float] = None) -> Dict[str, int]:
+        """
+        Passe du répartiteur : soumet les messages en file pendant ``max_seconds``
+        Les messages lus mais non soumis redeviennent visibles à la fin de la passe
+        """
+        deadline = time.monotonic() + (max_seconds or Config.INTAKE_DISPATCH_SECONDS)
+        report = {"submitted": 0, "throttled": 0, "failed": 0, "deferred": 0}
+        candidates: Dict[str, List[IntakeMessage]] = {queue: [] for queue in self.weights}
+
+        self.limiter.merge(await self._run(self.store.get, INTAKE_RATE, "translator"))
+        try:
+            while time.monotonic() < deadline:
+                if time.time() - self._active_loaded_at > self.active_refresh:
+                    await self._run(self._load_active)
+                await self._fill(candidates)
+
+                message = self.scheduler.pick(candidates, self._eligible)
+                if message is None:
+                    # Files vides, ou utilisateurs en attente tous au plafond
+                    if not await self._refresh_blocked(candidates):
+                        await asyncio.sleep(min(Config.INTAKE_IDLE_POLL_SECONDS,
+                                                max(deadline - time.monotonic(), 0)))
+                    continue
+
+                if not await self.limiter.acquire(deadline):
+                    break
+                candidates[message.queue].remove(message)
+                await self._submit(message, candidates, report)
+        finally:
+            leftovers = [message for messages in candidates.values() for message in messages]
+            if leftovers:
+                await self._run(self._release_all, leftovers)
+            await self._run(self.store.put, INTAKE_RATE, "translator", self.limiter.to_document())
+
+        if any(report.values()):
+            logger.info(
+                f"📤 Répartition: {report['submitted']} soumis, {report['throttled']} refusés (429), "
+                f"{report['deferred']} reportés, {report['failed']} en échec, "
+                f"débit {self.limiter.rate:.2f}/s")
+        return report
+
+    async def _fill(self, candidates: Dict[str, List[IntakeMessage]]) -> None:
+        """Complète la fenêtre de chaque file ; une file vide n'est relue qu'après une courte pause"""
+        now = time.monotonic()
+        for queue, messages in candidates.items():
+            if len(messages) > self.window // 2 or self._idle_until.get(queue, 0) > now:
+                continue
+            received = await self._run(
+                self.queue.receive, queue, self.window - len(messages), self.visibility_timeout)
+            if received:
+                messages.extend(received)
+            else:
+                self._idle_until[queue] = now + Config.INTAKE_IDLE_POLL_SECONDS
+
+    def _release_all(self, messages: List[IntakeMessage]) -> None:
+        for message in messages:
+            self.queue.release(message)
+
+    def _eligible(self, user_id: str) -> bool:
+        if len(self._active) >= self.max_active_jobs:
+            return False
+        return self._active_by_user.get(user_id, 0) < self.max_active_per_user
+
+    def _load_active(self) -> None:
+        """Relit les jobs en cours partagés ; ceux sans nouvelles depuis trop longtemps sont oubliés"""
+        cutoff = time.time() - self.active_timeout
+        active = {}
+        for translation_id, document in self.store.find(INTAKE_ACTIVE):
+            if document.get("started_at", 0) < cutoff:
+                self.store.delete(INTAKE_ACTIVE, translation_id)
+                continue
+            active[translation_id] = document
+        self._active = active
+        self._recount_active()
+        self._active_loaded_at = time.time()
+
+    def _recount_active(self) -> None:
+        counts: Dict[str, int] = {}
+        for document in self._active.values():
+            counts[document["user_id"]] = counts.get(document["user_id"], 0) + 1
+        self._active_by_user = counts
+
+    async def _refresh_blocked(self, candidates: Dict[str, List[IntakeMessage]]) -> bool:
+        """
+        Utilisateurs en attente au plafond : statut Translator de leurs jobs en cours
+        (un job terminé libère sa place via check_status). Retourne True si une place s'est libérée
+        """
+        waiting = {message.payload["user_id"] for messages in candidates.values() for message in messages}
+        if not waiting:
+            return False
+
+        now = time.time()
+        global_cap = len(self._active) >= self.max_active_jobs
+        stale = [translation_id for translation_id, document in self._active.items()
+                 if (global_cap or document["user_id"] in waiting)
+                 and now - self._checked_at.get(translation_id, document["started_at"]) > self.active_refresh]
+        if not stale:
+            return False
+
+        from shared.services.status_handler import AsyncStatusHandler
+
+        before = len(self._active)
+        handler = AsyncStatusHandler()
+        for translation_id in stale:
+            self._checked_at[translation_id] = now
+        await asyncio.gather(*(handler.check_status(translation_id) for translation_id in stale))
+        await self._run(self._load_active)
+        for translation_id in [key for key in self._checked_at if key not in self._active]:
+            del self._checked_at[translation_id]
+        return len(self._active) < before
+
+    async def _submit(self, message: IntakeMessage, candidates: Dict[str, List[IntakeMessage]],
+                      report: Dict[str, int]) -> None:
+        """Soumet un message à Translator et met à jour son suivi"""
+        payload = message.payload
+        intake_id = payload["intake_id"]
+        document = await self._run(self.store.get, INTAKE, intake_id)
+        if document is None or document["status"] != QUEUED:
+            # Déjà soumis (suppression du message perdue) ou suivi expiré
+            await self._run(self.queue.delete, message)
+            return
+
+        started = time.monotonic()
+        try:
+            # Un seul essai : les 429 règlent le débit adaptatif au lieu d'être absorbés par les retries
+            with resilience.retry_policy(self.submit_policy):
+                translation_id, output_blob_names = await self._start_job(payload)
+        except TranslatorThrottledError as e:
+            self.limiter.on_throttle(e.retry_after)
+            report["throttled"] += 1
+            # Retenté en tête de sa file après la pause
+            candidates[message.queue].insert(0, message)
+            await self._run(self.store.put, INTAKE_RATE, "translator", self.limiter.to_document())
+            return
+        except CircuitOpenError as e:
+            # Translator coupé : reporté à la réouverture du disjoncteur, sans échec enregistré
+            report["deferred"] += 1
+            await self._run(self.queue.release, message, math.ceil(e.retry_after))
+            return
+        except Exception as e:
+            if message.dequeue_count >= self.max_attempts:
+                logger.error(f"❌ Soumission {intake_id} abandonnée après {message.dequeue_count} essais: {str(e)}")
+                report["failed"] += 1
+                self._failed += 1
+                await self._run(self._fail, message, document, str(e))
+            else:
+                logger.warning(f"⚠️ Soumission {intake_id} reportée (essai {message.dequeue_count}): {str(e)}")
+                report["deferred"] += 1
+                self._retried += 1
+                await self._run(self.queue.release, message, min(2 ** message.dequeue_count, 60))
+            return
+
+        self.limiter.on_success(time.monotonic() - started)
+        # Requête annulée pendant la soumission (job multi-lots incomplet) : le job démarré est annulé
+        document = await self._run(self.store.get, INTAKE, intake_id, True)
+        if document is None or document["status"] == CANCELLED:
+            await self._cancel_started(message, translation_id)
+            return
+
+        report["submitted"] += 1
+        self._submitted += 1
+        active = {"user_id": payload["user_id"], "intake_id": intake_id, "started_at": time.time()}
+        self._active[translation_id] = active
+        self._active_by_user[payload["user_id"]] = self._active_by_user.get(payload["user_id"], 0) + 1
+        await self._run(self._record_submission, message, document, translation_id, output_blob_names, active)
+
+    async def _cancel_started(self, message: IntakeMessage, translation_id: str) -> None:
+        """Annule le job Translator d'une requête annulée pendant sa soumission"""
+        intake_id = message.payload["intake_id"]
+        try:
+            if not await get_async_translation_service().cancel_translation(translation_id):
+                logger.warning(f"⚠️ Annulation du job {translation_id} impossible")
+        except Exception as e:
+            logger.warning(f"⚠️ Annulation du job {translation_id} impossible: {str(e)}")
+        logger.info(f"🚫 Soumission {intake_id} annulée pendant son envoi, job {translation_id} annulé")
+        await self._run(self.queue.delete, message)
+
+    async def _start_job(self, payload: Dict[str, Any]):
+        """Construit les URLs SAS et démarre le job ; retourne (ID Translator, sorties attendues)"""
+        blob_service = get_async_blob_service()
+        translation_service = get_async_translation_service()
+        if payload["kind"] == "batch":
+            urls = blob_service.folder_batch_urls(payload["prefix"], payload["languages"])
+            translation_id = await translation_service.start_folder_translation(
+                source_url=urls["source_url"],
+                prefix=payload["prefix"],
+                targets=urls["targets"]
+            )
+            return translation_id, []
+
+        blob_urls = await blob_service.prepare_translation_urls(payload["blob_name"], payload["languages"])
+        translation_id = await translation_service.start_translation(
+            source_url=blob_urls["source_url"],
+            targets=blob_urls["targets"]
+        )
+        return translation_id, [target["output_blob_name"] for target in blob_urls["targets"]]
+
+    def _record_submission(self, message: IntakeMessage, document: Dict[str, Any], translation_id: str,
+                           output_blob_names: List[str], active: Dict[str, Any]) -> None:
+        from shared.services.state_manager import StateManager
+
+        payload = message.payload
+        self.store.put(INTAKE_ACTIVE, translation_id, active)
+        self.store.put(INTAKE, payload["intake_id"], {
+            **document,
+            "status": SUBMITTED,
+            "translation_id": translation_id,
+            "submitted_at": active["started_at"]
+        })
+        if output_blob_names:
+            StateManager().register_expected_outputs(translation_id, output_blob_names)
+        if payload.get("eta_job"):
+            estimator = get_completion_estimator()
+            estimator.register_job(translation_id, payload["eta_job"], estimator.estimate(payload["eta_job"]))
+        self.queue.delete(message)
+        logger.info(f"✅ Soumission {payload['intake_id']} démarrée: {translation_id}")
+
+    def _fail(self, message: IntakeMessage, document: Dict[str, Any], error: str) -> None:
+        self.store.put(INTAKE, message.payload["intake_id"], {
+            **document,
+            "status": TranslationStatus.FAILED.value,
+            "error": f"Soumission impossible: {error}"
+        })
+        self.queue.delete(message)
+
+    # --- Maintenance -------------------------------------------------------------
+
+    def cleanup(self, max_age_hours: int) -> int:
+        """Supprime les suivis de requêtes plus anciens que ``max_age_hours``"""
+        cutoff = time.time() - max_age_hours * 3600
+        expired = [key for key, document in self.store.find(INTAKE, started_before=cutoff)
+                   if document.get("status") != QUEUED]
+        for key in expired:
+            self.store.delete(INTAKE, key)
+        return len(expired)
+
+    def queued_sources(self) -> Tuple[Set[str], Tuple[str, ...]]:
+        """
+        Blobs d'entrée encore attendus par des requêtes en file : noms de documents
+        et préfixes de sous-lots (``jobs/<id>/<n>/``)
+        """
+        blob_names: Set[str] = set()
+        prefixes: Set[str] = set()
+        for _, document in self.store.find(INTAKE, status=QUEUED):
+            for source in document.get("sources") or []:
+                (prefixes if source.endswith("/") else blob_names).add(source)
+        return blob_names, tuple(prefixes)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Files, jobs en cours et débit courant"""
+        stats: Dict[str, Any] = {
+            "mode": Config.INTAKE_MODE,
+            "backend": self.queue.name,
+            "enqueued": self._enqueued,
+            "submitted": self._submitted,
+            "retried": self._retried,
+            "failed": self._failed,
+            "active_jobs": len(self._active),
+            "rate_per_second": round(self.limiter.rate, 3),
+            "throttled": self.limiter.throttled,
+            "slow_submissions": self.limiter.slow,
+            "paused_seconds": round(max(self.limiter.paused_until - time.time(), 0.0), 1)
+        }
+        if self.enabled:
+            try:
+                stats["queues"] = {queue: self.queue.length(queue) for queue in self.weights}
+            except Exception as e:
+                stats["queues"] = {"error": str(e)}
+        return stats
+
+    def close(self) -> None:
+        self.queue.close()
@@ -0,0 +1,222 @@
+"""
+Files de la file d'admission des traductions
+Backends interchangeables : mémoire du processus ou Azure Queue Storage
+(testable localement avec les files d'Azurite). Un message lu reste invisible
+pendant ``visibility_timeout`` puis réapparaît s'il n'a pas été supprimé
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from shared.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class IntakeMessage:
+    """Message lu dans une file, à supprimer ou rendre visible après traitement"""
+
+    __slots__ = ("queue", "id", "receipt", "payload", "dequeue_count")
+
+    def __init__(self, queue: str, message_id: str, receipt: str,
+                 payload: Dict[str, Any], dequeue_count: int):
+        self.queue = queue
+        self.id = message_id
+        self.receipt = receipt
+        self.payload = payload
+        self.dequeue_count = dequeue_count
+
+
+class IntakeQueueBackend:
+    """Interface d'un backend de files (une file par voie et classe de taille)"""
+
+    name = "abstract"
+    # Backend dans le processus : appelé directement depuis la boucle asyncio
+    local = False
+
+    def send(self, queue: str, payload: Dict[str, Any]) -> None:
+        """Ajoute un message en fin de file"""
+        raise NotImplementedError
+
+    def receive(self, queue: str, max_messages: int, visibility_timeout: int) -> List[IntakeMessage]:
+        """Lit jusqu'à ``max_messages`` messages visibles, masqués ``visibility_timeout`` secondes"""
+        raise NotImplementedError
+
+    def delete(self, message: IntakeMessage) -> None:
+        """Supprime un message traité"""
+        raise NotImplementedError
+
+    def release(self, message: IntakeMessage, delay: int = 0) -> None:
+        """Rend un message visible de nouveau après ``delay`` secondes"""
+        raise NotImplementedError
+
+    def length(self, queue: str) -> int:
+        """Nombre approximatif de messages en file"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Libère les ressources du backend"""
+
+
+class MemoryIntakeQueue(IntakeQueueBackend):
+    """Files en mémoire du processus (non durables, un seul worker)"""
+
+    name = "memory"
+    local = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Par file : id → [payload, visible_à, reçu, nombre de lectures], dans l'ordre d'arrivée
+        self._queues: Dict[str, "OrderedDict[str, List[Any]]"] = {}
+
+    def send(self, queue, payload):
+        with self._lock:
+            self._queues.setdefault(queue, OrderedDict())[uuid.uuid4().hex] = [payload, 0.0, None, 0]
+
+    def receive(self, queue, max_messages, visibility_timeout):
+        now = time.monotonic()
+        messages = []
+        with self._lock:
+            for message_id, entry in self._queues.get(queue, {}).items():
+                if len(messages) >= max_messages:
+                    break
+                if entry[1] > now:
+                    continue
+                entry[1] = now + visibility_timeout
+                entry[2] = uuid.uuid4().hex
+                entry[3] += 1
+                messages.append(IntakeMessage(queue, message_id, entry[2], entry[0], entry[3]))
+        return messages
+
+    def delete(self, message):
+        with self._lock:
+            entries = self._queues.get(message.queue, {})
+            entry = entries.get(message.id)
+            if entry is not None and entry[2] == message.receipt:
+                del entries[message.id]
+
+    def release(self, message, delay=0):
+        with self._lock:
+            entry = self._queues.get(message.queue, {}).get(message.id)
+            if entry is not None and entry[2] == message.receipt:
+                entry[1] = time.monotonic() + delay
+
+    def length(self, queue):
+        with self._lock:
+            return len(self._queues.get(queue, ()))
+
+
+class StorageIntakeQueue(IntakeQueueBackend):
+    """
+    Files Azure Queue Storage (partagées entre workers et instances)
+    Contenu des messages en JSON ; Azurite via AZURE_QUEUE_ENDPOINT
+    """
+
+    name = "storage"
+
+    def __init__(self):
+        from azure.storage.queue import QueueServiceClient
+
+        self._service = QueueServiceClient(
+            account_url=Config.get_queue_url(),
+            credential=self._credential()
+        )
+        self._lock = threading.Lock()
+        self._clients: Dict[str, Any] = {}
+
+    @staticmethod
+    def _credential():
+        """Clé du compte si elle est définie, sinon identité Microsoft Entra ID"""
+        if Config.AZURE_ACCOUNT_KEY:
+            return {"account_name": Config.AZURE_ACCOUNT_NAME, "account_key": Config.AZURE_ACCOUNT_KEY}
+        from azure.identity import DefaultAzureCredential
+        return DefaultAzureCredential()
+
+    def _client(self, queue: str):
+        """Client de la file, créée au premier usage par ce worker"""
+        client = self._clients.get(queue)
+        if client is not None:
+            return client
+
+        from azure.core.exceptions import ResourceExistsError
+
+        with self._lock:
+            client = self._clients.get(queue)
+            if client is None:
+                client = self._service.get_queue_client(queue)
+                try:
+                    client.create_queue()
+                    logger.info(f"📦 File d'admission créée: {queue}")
+                except ResourceExistsError:
+                    pass
+                self._clients[queue] = client
+        return client
+
+    def send(self, queue, payload):
+        self._client(queue).send_message(json.dumps(payload, separators=(",", ":")))
+
+    def receive(self, queue, max_messages, visibility_timeout):
+        # 32 messages au plus par appel (limite du service)
+        received = self._client(queue).receive_messages(
+            messages_per_page=min(max_messages, 32),
+            max_messages=max_messages,
+            visibility_timeout=visibility_timeout)
+        messages = []
+        for message in received:
+            try:
+                payload = json.loads(message.content)
+            except (TypeError, ValueError):
+                logger.error(f"❌ Message illisible supprimé de {queue}: {message.id}")
+                self._client(queue).delete_message(message.id, message.pop_receipt)
+                continue
+            messages.append(IntakeMessage(
+                queue, message.id, message.pop_receipt, payload, message.dequeue_count or 1))
+        return messages
+
+    def delete(self, message):
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            self._client(message.queue).delete_message(message.id, message.receipt)
+        except ResourceNotFoundError:
+            # Réception expirée : le message a déjà été relu ailleurs
+            logger.warning(f"⚠️ Message {message.id} déjà repris par un autre répartiteur")
+
+    def release(self, message, delay=0):
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            self._client(message.queue).update_message(
+                message.id, message.receipt, visibility_timeout=delay)
+        except ResourceNotFoundError:
+            pass
+
+    def length(self, queue):
+        return self._client(queue).get_queue_properties().approximate_message_count or 0
+
+    def close(self):
+        self._service.close()
+
+
+BACKENDS = {
+    "memory": MemoryIntakeQueue,
+    "storage": StorageIntakeQueue,
+}
+
+
+def create_intake_queue(name: Optional[str] = None) -> IntakeQueueBackend:
+    """Construit le backend configuré (INTAKE_BACKEND), mémoire en repli"""
+    name = (name or Config.INTAKE_BACKEND).lower()
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"INTAKE_BACKEND inconnu: {name}")
+    try:
+        return backend_class()
+    except ImportError as e:
+        logger.warning(f"⚠️ File d'admission '{name}' indisponible ({str(e)}), repli en mémoire")
+        return MemoryIntakeQueue()
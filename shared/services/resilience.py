@@ -0,0 +1,368 @@
+"""
+Résilience des appels sortants (Translator, Graph, Microsoft Entra ID)
+Retries avec backoff exponentiel et gigue, respect de Retry-After, budget de retries
+borné par l'échéance de la requête entrante, et disjoncteur par dépendance qui
+échoue immédiatement tant que la dépendance est indisponible
+"""
+
+import asyncio
+import email.utils
+import functools
+import inspect
+import logging
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+from shared.config import Config
+from shared.services.http_client import HttpClientError
+from shared.services.tracing import current_span
+
+logger = logging.getLogger(__name__)
+
+# Dépendances suivies (un disjoncteur chacune)
+TRANSLATOR = "translator"
+GRAPH = "graph"
+AUTH = "auth"
+
+# Erreurs transitoires : la même requête peut réussir un peu plus tard
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+# Requête refusée avant traitement : renvoyable même si elle n'est pas idempotente
+SAFE_RETRY_STATUSES = frozenset({429, 503})
+# Réponses qui comptent comme une panne de la dépendance (429 : dépendance saturée mais vivante)
+FAILURE_STATUSES = frozenset({408, 500, 502, 503, 504})
+
+# Échéance de la requête HTTP entrante (time.monotonic), héritée par les tâches et threads
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+# Politique imposée par l'appelant pour les appels du contexte courant
+_policy: ContextVar[Optional["RetryPolicy"]] = ContextVar("retry_policy", default=None)
+
+
+class CircuitOpenError(Exception):
+    """Appel refusé sans contacter la dépendance : disjoncteur ouvert"""
+
+    def __init__(self, dependency: str, retry_after: float):
+        super().__init__(
+            f"Service '{dependency}' momentanément indisponible, réessayer dans {max(math.ceil(retry_after), 1)}s")
+        self.dependency = dependency
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Délai en secondes d'un en-tête Retry-After (nombre de secondes ou date HTTP)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur d'une dépendance : fermé, ouvert après ``failure_threshold`` échecs
+    consécutifs, puis demi-ouvert après ``open_seconds`` (un seul appel d'essai)
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # Délai conseillé pendant l'appel d'essai d'un disjoncteur demi-ouvert
+    TRIAL_RETRY_SECONDS = 1.0
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None,
+                 open_seconds: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or Config.BREAKER_FAILURE_THRESHOLD
+        self.open_seconds = Config.BREAKER_OPEN_SECONDS if open_seconds is None else open_seconds
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+        self._calls = 0
+        self._failures = 0
+        self._retries = 0
+        self._gave_up = 0
+        self._short_circuited = 0
+        self._opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def before_call(self) -> None:
+        """Autorise un appel ou lève CircuitOpenError"""
+        with self._lock:
+            if self._state == self.OPEN:
+                remaining = self._opened_at + self.open_seconds - time.monotonic()
+                if remaining > 0:
+                    self._short_circuited += 1
+                    raise CircuitOpenError(self.name, remaining)
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+                logger.info(f"🔌 Disjoncteur {self.name} demi-ouvert : appel d'essai")
+            if self._state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    self._short_circuited += 1
+                    raise CircuitOpenError(self.name, self.TRIAL_RETRY_SECONDS)
+                self._trial_in_flight = True
+            self._calls += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._consecutive_failures = 0
+            if self._state != self.CLOSED:
+                logger.info(f"✅ Disjoncteur {self.name} refermé")
+            self._state = self.CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._consecutive_failures += 1
+            if self._state == self.HALF_OPEN or (
+                    self._state == self.CLOSED and self._consecutive_failures >= self.failure_threshold):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+                self._opened += 1
+                logger.warning(
+                    f"🔌 Disjoncteur {self.name} ouvert pour {self.open_seconds:.0f}s "
+                    f"({self._consecutive_failures} échec(s) consécutif(s))")
+
+    def release_trial(self) -> None:
+        """Appel interrompu sans réponse de la dépendance (annulation, bug) : essai non concluant"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self._retries += 1
+
+    def record_gave_up(self) -> None:
+        with self._lock:
+            self._gave_up += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "calls": self._calls,
+                "failures": self._failures,
+                "retries": self._retries,
+                "gave_up": self._gave_up,
+                "short_circuited": self._short_circuited,
+                "opened": self._opened
+            }
+            if self._state == self.OPEN:
+                stats["reopens_in"] = round(max(self._opened_at + self.open_seconds - time.monotonic(), 0), 1)
+            return stats
+
+
+class RetryPolicy:
+    """Nombre d'essais et backoff exponentiel « full jitter » entre deux essais"""
+
+    def __init__(self, max_attempts: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None):
+        self.max_attempts = max_attempts or Config.RETRY_MAX_ATTEMPTS
+        self.base_delay = Config.RETRY_BASE_DELAY_MS / 1000 if base_delay is None else base_delay
+        self.max_delay = Config.RETRY_MAX_DELAY_SECONDS if max_delay is None else max_delay
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Attente avant l'essai ``attempt + 1`` ; Retry-After de la dépendance prioritaire"""
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    @staticmethod
+    def should_retry(idempotent: bool, status: Optional[int], error: Optional[Exception]) -> bool:
+        """Erreur réseau ou statut transitoire ; requête non idempotente : refus explicites seulement"""
+        if error is not None:
+            return idempotent
+        if status in SAFE_RETRY_STATUSES:
+            return True
+        return idempotent and status in RETRYABLE_STATUSES
+
+
+_breakers_lock = threading.Lock()
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(dependency: str) -> CircuitBreaker:
+    """Disjoncteur partagé par le processus pour ``dependency``"""
+    breaker = _breakers.get(dependency)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(dependency, CircuitBreaker(dependency))
+    return breaker
+
+
+def remaining_budget() -> float:
+    """Temps disponible pour les retries : budget par appel, borné par l'échéance de la requête"""
+    budget = Config.RETRY_BUDGET_SECONDS
+    deadline = _deadline.get()
+    if deadline is not None:
+        budget = min(budget, deadline - time.monotonic())
+    return max(budget, 0.0)
+
+
+def with_deadline(seconds: Optional[float] = None) -> Callable:
+    """
+    Décorateur de ``main`` : fixe l'échéance de la requête (REQUEST_DEADLINE_SECONDS)
+    au-delà de laquelle les appels sortants ne sont plus retentés
+    """
+    def decorator(handler: Callable) -> Callable:
+        def start():
+            return _deadline.set(time.monotonic() + (
+                Config.REQUEST_DEADLINE_SECONDS if seconds is None else seconds))
+
+        if inspect.iscoroutinefunction(handler):
+            @functools.wraps(handler)
+            async def async_wrapper(*args, **kwargs):
+                token = start()
+                try:
+                    return await handler(*args, **kwargs)
+                finally:
+                    _deadline.reset(token)
+            return async_wrapper
+
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            token = start()
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                _deadline.reset(token)
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def retry_policy(policy: "RetryPolicy") -> Iterator[None]:
+    """Applique ``policy`` aux appels du bloc (ex. un seul essai quand l'appelant gère lui-même les 429)"""
+    token = _policy.set(policy)
+    try:
+        yield
+    finally:
+        _policy.reset(token)
+
+
+def _next_delay(breaker: CircuitBreaker, policy: RetryPolicy, attempt: int, deadline: float,
+                idempotent: bool, response: Any, error: Optional[Exception]) -> Optional[float]:
+    """Enregistre l'issue d'un essai ; retourne l'attente avant le suivant, None pour s'arrêter"""
+    status = None if error is not None else response.status_code
+    if error is not None or status in FAILURE_STATUSES:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+    if error is None and status not in RETRYABLE_STATUSES:
+        return None
+    if not policy.should_retry(idempotent, status, error):
+        return None
+
+    retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+    delay = policy.backoff(attempt, retry_after)
+    reason = f"HTTP {status}" if error is None else type(error).__name__
+    if attempt >= policy.max_attempts or breaker.state == CircuitBreaker.OPEN \
+            or time.monotonic() + delay > deadline:
+        breaker.record_gave_up()
+        logger.warning(f"⚠️ {breaker.name}: {reason}, abandon après {attempt} essai(s)")
+        return None
+
+    breaker.record_retry()
+    span = current_span()
+    if span is not None:
+        span.set_attribute("retries", attempt)
+    logger.warning(f"🔁 {breaker.name}: {reason}, nouvel essai dans {delay:.1f}s "
+                   f"({attempt}/{policy.max_attempts})")
+    return delay
+
+
+def call(dependency: str, send: Callable[[], Any], idempotent: bool = True,
+         policy: Optional[RetryPolicy] = None) -> Any:
+    """
+    Exécute ``send()`` (un appel HTTP) avec retries et disjoncteur
+    Retourne la dernière réponse, dont le statut reste à traiter par l'appelant ;
+    lève CircuitOpenError si la dépendance est coupée, ou l'erreur réseau du dernier essai
+    """
+    breaker = get_breaker(dependency)
+    policy = policy or _policy.get() or RetryPolicy()
+    deadline = time.monotonic() + remaining_budget()
+    attempt = 0
+    while True:
+        attempt += 1
+        breaker.before_call()
+        response, error = None, None
+        try:
+            response = send()
+        except HttpClientError as e:
+            error = e
+        except BaseException:
+            breaker.release_trial()
+            raise
+        delay = _next_delay(breaker, policy, attempt, deadline, idempotent, response, error)
+        if delay is None:
+            if error is not None:
+                raise error
+            return response
+        time.sleep(delay)
+
+
+async def call_async(dependency: str, send: Callable[[], Awaitable[Any]], idempotent: bool = True,
+                     policy: Optional[RetryPolicy] = None) -> Any:
+    """Équivalent asynchrone de ``call`` (``send`` retourne une coroutine)"""
+    breaker = get_breaker(dependency)
+    policy = policy or _policy.get() or RetryPolicy()
+    deadline = time.monotonic() + remaining_budget()
+    attempt = 0
+    while True:
+        attempt += 1
+        breaker.before_call()
+        response, error = None, None
+        try:
+            response = await send()
+        except HttpClientError as e:
+            error = e
+        except BaseException:
+            breaker.release_trial()
+            raise
+        delay = _next_delay(breaker, policy, attempt, deadline, idempotent, response, error)
+        if delay is None:
+            if error is not None:
+                raise error
+            return response
+        await asyncio.sleep(delay)
+
+
+def get_stats() -> Dict[str, Any]:
+    """État et compteurs des disjoncteurs depuis le démarrage du worker"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.to_dict() for breaker in breakers}
+
+
+def reset() -> None:
+    """Oublie les disjoncteurs et leurs compteurs (benchmarks)"""
+    with _breakers_lock:
+        _breakers.clear()
@@ -0,0 +1,169 @@
+"""
+Cache des jetons SAS Azure Storage
+L'expiration est arrondie à la tranche SAS_EXPIRY_BUCKET_MINUTES supérieure : dans une
+même tranche, la signature d'un (conteneur, blob, permissions) est identique et n'est
+calculée qu'une fois. Signature par clé de compte ou par clé de délégation utilisateur
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from azure.storage.blob import generate_blob_sas, generate_container_sas
+
+from shared.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class SasCache:
+    """
+    Jetons SAS de blob et de conteneur, mis en cache jusqu'à la fin de leur tranche d'expiration
+    Un jeton servi reste valide au moins ``expiry_hours`` moins une tranche
+    """
+
+    # Marge de démarrage de la clé de délégation (décalage d'horloge)
+    DELEGATION_KEY_START_SKEW = timedelta(minutes=5)
+    # Durée de validité maximale d'une clé de délégation (limite Azure)
+    DELEGATION_KEY_MAX_HOURS = 7 * 24
+
+    def __init__(self, account_name: str, account_key: Optional[str] = None,
+                 user_delegation: Optional[bool] = None,
+                 bucket_minutes: Optional[int] = None,
+                 max_entries: Optional[int] = None):
+        self.account_name = account_name
+        self.account_key = account_key
+        self.user_delegation = Config.SAS_USER_DELEGATION if user_delegation is None else user_delegation
+        self.bucket_seconds = 60 * (bucket_minutes or Config.SAS_EXPIRY_BUCKET_MINUTES)
+        self.max_entries = max_entries or Config.SAS_CACHE_MAX_ENTRIES
+
+        if not self.user_delegation and not self.account_key:
+            raise ValueError("Clé du compte requise pour signer les SAS (ou SAS_USER_DELEGATION=true)")
+
+        self._lock = threading.Lock()
+        self._tokens: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._hits: Dict[str, int] = {"blob": 0, "container": 0}
+        self._misses: Dict[str, int] = {"blob": 0, "container": 0}
+
+        # Clé de délégation : obtenue une fois, renouvelée avant l'expiration des SAS qu'elle signe
+        self._delegation_lock = threading.Lock()
+        self._delegation_key = None
+        self._delegation_key_expiry: Optional[datetime] = None
+        self._delegation_client = None
+        self._delegation_keys_fetched = 0
+
+    def _bucketed_expiry(self, expiry_hours: float) -> datetime:
+        """Expiration arrondie à la tranche supérieure (même valeur pour toute la tranche)"""
+        target = time.time() + expiry_hours * 3600
+        bucket_end = math.ceil(target / self.bucket_seconds) * self.bucket_seconds
+        return datetime.fromtimestamp(bucket_end, timezone.utc)
+
+    def blob_sas(self, container_name: str, blob_name: str, permissions: str,
+                 expiry_hours: float = 2) -> str:
+        """Jeton SAS d'un blob"""
+        expiry = self._bucketed_expiry(expiry_hours)
+        key = ("blob", container_name, blob_name, permissions, expiry)
+
+        def sign(signing_key: Dict[str, Any]) -> str:
+            return generate_blob_sas(
+                account_name=self.account_name,
+                container_name=container_name,
+                blob_name=blob_name,
+                permission=permissions,
+                expiry=expiry,
+                **signing_key
+            )
+
+        return self._get_or_sign(key, expiry, sign)
+
+    def container_sas(self, container_name: str, permissions: str,
+                      expiry_hours: float = 2) -> str:
+        """Jeton SAS d'un conteneur, partagé par tous les chemins du conteneur"""
+        expiry = self._bucketed_expiry(expiry_hours)
+        key = ("container", container_name, permissions, expiry)
+
+        def sign(signing_key: Dict[str, Any]) -> str:
+            return generate_container_sas(
+                account_name=self.account_name,
+                container_name=container_name,
+                permission=permissions,
+                expiry=expiry,
+                **signing_key
+            )
+
+        return self._get_or_sign(key, expiry, sign)
+
+    def _get_or_sign(self, key: Tuple, expiry: datetime, sign) -> str:
+        kind = key[0]
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is not None:
+                self._tokens.move_to_end(key)
+                self._hits[kind] += 1
+                return token
+            self._misses[kind] += 1
+
+        # Deux appelants concurrents calculent la même signature : pas besoin de single-flight
+        token = sign(self._signing_key(expiry))
+        with self._lock:
+            self._tokens[key] = token
+            while len(self._tokens) > self.max_entries:
+                self._tokens.popitem(last=False)
+        return token
+
+    def _signing_key(self, expiry: datetime) -> Dict[str, Any]:
+        """Argument de signature : clé du compte ou clé de délégation couvrant ``expiry``"""
+        if not self.user_delegation:
+            return {"account_key": self.account_key}
+        return {"user_delegation_key": self._get_delegation_key(expiry)}
+
+    def _get_delegation_key(self, expiry: datetime):
+        """Clé de délégation valide au moins jusqu'à ``expiry`` (un seul appel à la fois)"""
+        with self._delegation_lock:
+            if self._delegation_key is not None and self._delegation_key_expiry >= expiry:
+                return self._delegation_key
+
+            now = datetime.now(timezone.utc)
+            key_hours = min(Config.SAS_USER_DELEGATION_KEY_HOURS, self.DELEGATION_KEY_MAX_HOURS)
+            key_expiry = max(now + timedelta(hours=key_hours), expiry)
+            self._delegation_key = self._get_delegation_client().get_user_delegation_key(
+                now - self.DELEGATION_KEY_START_SKEW, key_expiry)
+            self._delegation_key_expiry = key_expiry
+            self._delegation_keys_fetched += 1
+            logger.info(f"🔑 Clé de délégation utilisateur obtenue (expire {key_expiry.isoformat()})")
+
+            # Les SAS signés avec l'ancienne clé restent valides jusqu'à leur propre expiration
+            return self._delegation_key
+
+    def _get_delegation_client(self):
+        """Client Blob authentifié par Microsoft Entra ID (identité managée en production)"""
+        if self._delegation_client is None:
+            from azure.identity import DefaultAzureCredential
+            from azure.storage.blob import BlobServiceClient
+
+            self._delegation_client = BlobServiceClient(
+                account_url=Config.get_storage_url(), credential=DefaultAzureCredential())
+        return self._delegation_client
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hits/misses par type de jeton"""
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "entries": len(self._tokens),
+                "signing": "user_delegation" if self.user_delegation else "account_key",
+                "bucket_minutes": self.bucket_seconds // 60
+            }
+            for kind in ("blob", "container"):
+                lookups = self._hits[kind] + self._misses[kind]
+                stats[kind] = {
+                    "hits": self._hits[kind],
+                    "misses": self._misses[kind],
+                    "hit_ratio": round(self._hits[kind] / lookups, 3) if lookups else 0.0
+                }
+        if self.user_delegation:
+            stats["delegation_keys_fetched"] = self._delegation_keys_fetched
+        return stats
@@ -0,0 +1,206 @@
+"""
+Registre des services partagés entre les invocations d'un même worker
+Les clients Azure (Storage, Translator, Graph) sont construits une seule fois
+puis réutilisés par toutes les requêtes du processus
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# RLock : un service peut en obtenir un autre pendant sa construction
+_lock = threading.RLock()
+_instances: Dict[str, Any] = {}
+# Boucle asyncio propriétaire des services asynchrones (absente : instance valable pour toute boucle)
+_loops: Dict[str, asyncio.AbstractEventLoop] = {}
+# Fermetures asynchrones planifiées (référence conservée jusqu'à leur fin)
+_closing: Set["asyncio.Future"] = set()
+
+
+def _get_or_create(name: str, factory: Callable[[], Any]) -> Any:
+    """Retourne l'instance nommée, en la construisant au premier appel"""
+    instance = _instances.get(name)
+    if instance is not None:
+        return instance
+
+    with _lock:
+        # Double vérification : un autre thread a pu construire l'instance
+        instance = _instances.get(name)
+        if instance is None:
+            instance = factory()
+            _instances[name] = instance
+            logger.info(f"♻️ Service '{name}' initialisé pour le worker")
+    return instance
+
+
+def _get_or_create_for_loop(name: str, factory: Callable[[], Any]) -> Any:
+    """
+    Variante de _get_or_create pour les services asynchrones
+    Leurs connexions appartiennent à la boucle asyncio qui les a ouvertes :
+    l'instance est reconstruite si la boucle courante a changé
+    """
+    loop = asyncio.get_running_loop()
+    instance = _instances.get(name)
+    if instance is not None and _loops.get(name, loop) is loop:
+        return instance
+
+    with _lock:
+        instance = _instances.get(name)
+        if instance is not None and _loops.get(name, loop) is loop:
+            return instance
+        previous, previous_loop = instance, _loops.get(name)
+        instance = factory()
+        _instances[name] = instance
+        _loops[name] = loop
+        logger.info(f"♻️ Service '{name}' initialisé pour la boucle asyncio")
+
+    if previous is not None:
+        _close(previous, previous_loop)
+    return instance
+
+
+def get_blob_service():
+    """BlobService partagé du worker"""
+    from shared.services.blob_service import BlobService
+    return _get_or_create("blob", BlobService)
+
+
+def get_translation_service():
+    """TranslationService partagé du worker"""
+    from shared.services.translation_service import TranslationService
+    return _get_or_create("translation", TranslationService)
+
+
+def get_graph_service():
+    """GraphService partagé du worker"""
+    from shared.services.graph_service import GraphService
+    return _get_or_create("graph", GraphService)
+
+
+def get_graph_token_provider():
+    """Token Microsoft Graph partagé par le processus"""
+    from shared.services.token_provider import GraphTokenProvider
+    return _get_or_create("graph_token", GraphTokenProvider)
+
+
+def get_http_client():
+    """Client HTTP keep-alive partagé (Translator, Graph)"""
+    from shared.services.http_client import HttpClient
+    return _get_or_create("http", HttpClient)
+
+
+def get_async_http_client():
+    """Client HTTP asynchrone de la boucle courante"""
+    from shared.services.http_client import AsyncHttpClient
+    return _get_or_create_for_loop("async_http", AsyncHttpClient)
+
+
+def get_async_blob_service():
+    """AsyncBlobService de la boucle courante"""
+    from shared.services.blob_service import AsyncBlobService
+    return _get_or_create_for_loop("async_blob", AsyncBlobService)
+
+
+def get_async_translation_service():
+    """AsyncTranslationService de la boucle courante"""
+    from shared.services.translation_service import AsyncTranslationService
+    return _get_or_create_for_loop("async_translation", AsyncTranslationService)
+
+
+def get_async_graph_service():
+    """AsyncGraphService de la boucle courante"""
+    from shared.services.graph_service import AsyncGraphService
+    return _get_or_create_for_loop("async_graph", AsyncGraphService)
+
+
+def get_status_cache():
+    """Cache des statuts de traduction partagé"""
+    from shared.services.status_cache import StatusCache
+    return _get_or_create("status_cache", StatusCache)
+
+
+def get_translation_cache():
+    """Cache des fichiers traduits partagé"""
+    from shared.services.translation_cache import TranslationCache
+    return _get_or_create("translation_cache", TranslationCache)
+
+
+def get_completion_estimator():
+    """Estimation des durées de traduction partagée"""
+    from shared.services.completion_estimator import CompletionEstimator
+    return _get_or_create("completion_estimator", CompletionEstimator)
+
+
+def get_intake_service():
+    """File d'admission des traductions partagée"""
+    from shared.services.intake import IntakeService
+    return _get_or_create("intake", IntakeService)
+
+
+def get_state_store():
+    """Stockage de l'état des traductions (backend STATE_BACKEND)"""
+    from shared.services.state_store import StateStore
+    return _get_or_create("state", StateStore)
+
+
+def _close(instance: Any, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+    """
+    Ferme une instance retirée du registre : ``aclose`` (services asynchrones) est
+    exécuté sur la boucle propriétaire ``loop``, ``close`` directement
+    """
+    aclose = getattr(instance, "aclose", None)
+    if callable(aclose):
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        loop = loop or running
+        try:
+            if loop is None:
+                asyncio.run(aclose())
+            elif loop.is_closed():
+                # Boucle terminée : ses connexions sont déjà perdues
+                logger.debug(f"Fermeture asynchrone ignorée, boucle fermée: {type(instance).__name__}")
+            elif loop.is_running() and loop is not running:
+                asyncio.run_coroutine_threadsafe(aclose(), loop)
+            elif running is None:
+                loop.run_until_complete(aclose())
+            else:
+                # Boucle propriétaire (ou inactive) : fermeture planifiée sur la boucle courante
+                task = running.create_task(aclose())
+                _closing.add(task)
+                task.add_done_callback(_closing.discard)
+        except Exception as e:
+            logger.warning(f"⚠️ Fermeture du service impossible: {str(e)}")
+        return
+
+    close = getattr(instance, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception as e:
+            logger.warning(f"⚠️ Fermeture du service impossible: {str(e)}")
+
+
+def set_service(name: str, instance: Any) -> None:
+    """Remplace une instance du registre, valable pour toute boucle asyncio (tests)"""
+    with _lock:
+        previous, previous_loop = _instances.get(name), _loops.pop(name, None)
+        _instances[name] = instance
+
+    if previous is not None and previous is not instance:
+        _close(previous, previous_loop)
+
+
+def reset_services() -> None:
+    """Vide le registre : les services seront reconstruits au prochain appel (tests)"""
+    with _lock:
+        entries = [(instance, _loops.get(name)) for name, instance in _instances.items()]
+        _instances.clear()
+        _loops.clear()
+
+    for instance, loop in entries:
+        _close(instance, loop)
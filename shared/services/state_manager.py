@@ -1,60 +1,135 @@
 import logging
-import threading
 import time
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from shared.models.schemas import TranslationInfo, TranslationStatus
+from shared.models.constants import TranslationStatus
+from shared.services.service_registry import get_state_store
+
+if TYPE_CHECKING:
+    from shared.models.schemas import TranslationInfo
 
 logger = logging.getLogger(__name__)
 
+# Types de documents du stockage d'état
+TRANSLATIONS = "translations"
+COMPLETIONS = "completions"
+OUTPUTS = "outputs"
+
 
 class StateManager:
-    """Simple gestionnaire d'état en mémoire."""
+    """Gestionnaire d'état des traductions, persisté via le backend STATE_BACKEND."""
 
-    _lock = threading.Lock()
-    _translations: Dict[str, TranslationInfo] = {}
+    def __init__(self, store=None):
+        self.store = store or get_state_store()
 
-    def save_translation_state(self, translation_id: str, info: TranslationInfo) -> bool:
+    @property
+    def local(self) -> bool:
+        """Vrai si le backend d'état vit dans le processus (aucune E/S réseau ou disque)"""
+        return self.store.backend.local
+
+    def save_translation_state(self, translation_id: str, info: "TranslationInfo") -> bool:
         """Enregistre ou met à jour l'état d'une traduction."""
-        with self._lock:
-            self._translations[translation_id] = info
+        self.store.put(TRANSLATIONS, translation_id, info.model_dump())
         logger.debug(f"State saved for {translation_id}")
         return True
 
-    def get_translation_state(self, translation_id: str) -> Optional[TranslationInfo]:
+    def get_translation_state(self, translation_id: str) -> Optional["TranslationInfo"]:
         """Récupère l'état d'une traduction."""
-        with self._lock:
-            return self._translations.get(translation_id)
+        # Modèle pydantic chargé à la demande : hors du chemin de démarrage des fonctions
+        from shared.models.schemas import TranslationInfo
+
+        document = self.store.get(TRANSLATIONS, translation_id)
+        return TranslationInfo(**document) if document else None
 
     def delete_translation_state(self, translation_id: str, delay_minutes: int = 0) -> bool:
         """Supprime l'état d'une traduction."""
         # Ignorer le délai pour cette implémentation simple
-        with self._lock:
-            if translation_id in self._translations:
-                del self._translations[translation_id]
-                logger.debug(f"State deleted for {translation_id}")
-                return True
-        return False
+        if self.store.get(TRANSLATIONS, translation_id) is None:
+            return False
+        self.store.delete(TRANSLATIONS, translation_id)
+        logger.debug(f"State deleted for {translation_id}")
+        return True
 
     def count_active_translations(self, user_id: str) -> int:
         """Compte les traductions en cours pour un utilisateur."""
-        with self._lock:
-            return sum(
-                1
-                for info in self._translations.values()
-                if info.user_id == user_id and info.status == TranslationStatus.IN_PROGRESS.value
-            )
+        return self.store.count(
+            TRANSLATIONS, user_id=user_id, status=TranslationStatus.IN_PROGRESS.value)
 
     def cleanup_old_translations(self, max_age_hours: int = 2) -> int:
         """Supprime les traductions plus anciennes que ``max_age_hours``."""
         cutoff = time.time() - (max_age_hours * 3600)
-        to_delete = []
-        with self._lock:
-            for tid, info in self._translations.items():
-                if info.started_at < cutoff:
-                    to_delete.append(tid)
-            for tid in to_delete:
-                del self._translations[tid]
+        to_delete = [key for key, _ in self.store.find(TRANSLATIONS, started_before=cutoff)]
+        for tid in to_delete:
+            self.store.delete(TRANSLATIONS, tid)
+
+        # Suivi de complétion expiré
+        for kind in (COMPLETIONS, OUTPUTS):
+            for key, _ in self.store.find(kind, started_before=cutoff):
+                self.store.delete(kind, key)
+
         if to_delete:
             logger.debug(f"Cleaned up {len(to_delete)} old translations")
         return len(to_delete)
+
+    def register_expected_outputs(self, translation_id: str, output_blob_names: List[str]) -> None:
+        """Associe les blobs de sortie attendus à un job Azure."""
+        registered_at = time.time()
+        self.store.put(COMPLETIONS, translation_id, {
+            "expected": list(output_blob_names),
+            "started_at": registered_at
+        })
+        # Un document par sortie : les événements BlobCreated d'un même job
+        # n'écrivent jamais le même document
+        for blob_name in output_blob_names:
+            self.store.put(OUTPUTS, blob_name, {
+                "translation_id": translation_id,
+                "started_at": registered_at,
+                "completed": None
+            })
+        logger.debug(f"Outputs registered for {translation_id}: {output_blob_names}")
+
+    def record_output_completed(self, output_blob_name: str, size: Optional[int],
+                                completed_at: float) -> Optional[str]:
+        """Enregistre l'arrivée d'un blob de sortie et retourne l'ID du job associé."""
+        output = self.store.get(OUTPUTS, output_blob_name)
+        if output is None:
+            return None
+        translation_id = output["translation_id"]
+        if self.store.get(COMPLETIONS, translation_id) is None:
+            return None
+
+        self.store.put(OUTPUTS, output_blob_name, {
+            **output,
+            "completed": {
+                "size": size,
+                "completed_at": completed_at
+            }
+        })
+        logger.debug(f"Output {output_blob_name} completed for {translation_id}")
+        return translation_id
+
+    def get_completion(self, translation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        État de complétion connu localement d'un job
+        ``complete`` est vrai quand tous les blobs attendus sont arrivés
+        """
+        completion = self.store.get(COMPLETIONS, translation_id)
+        if completion is None:
+            return None
+        expected = list(completion["expected"])
+
+        completed = {}
+        for blob_name in expected:
+            output = self.store.get(OUTPUTS, blob_name)
+            if output and output.get("translation_id") == translation_id and output.get("completed"):
+                completed[blob_name] = output["completed"]
+
+        complete = bool(expected) and all(name in completed for name in expected)
+        return {
+            "expected": expected,
+            "completed": completed,
+            "complete": complete,
+            "completed_at": max(
+                (output["completed_at"] for output in completed.values()), default=None
+            ) if complete else None
+        }
@@ -0,0 +1,625 @@
+"""
+Stockage de l'état des traductions
+Backends interchangeables (mémoire, SQLite/WAL, Azure Table) derrière un
+tampon d'écriture par lots et un cache de lecture local au worker
+"""
+
+import atexit
+import bisect
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from shared.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Champs d'un document copiés dans des colonnes indexées
+INDEXED_FIELDS = ("user_id", "status", "started_at")
+
+
+class StateBackend:
+    """
+    Interface d'un backend d'état
+    Les documents sont des dict JSON rangés par type (``kind``) et par clé
+    """
+
+    name = "abstract"
+    # Backend dans le processus : ni tampon ni cache devant lui
+    local = False
+
+    def write_many(self, kind: str, documents: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """Écrit un lot de documents ; une valeur None supprime la clé"""
+        raise NotImplementedError
+
+    def insert(self, kind: str, key: str, document: Dict[str, Any]) -> bool:
+        """Crée un document s'il n'existe pas encore (atomique) ; False s'il existe déjà"""
+        raise NotImplementedError
+
+    def get(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        """Lit un document, None s'il n'existe pas"""
+        raise NotImplementedError
+
+    def find(self, kind: str, user_id: Optional[str] = None, status: Optional[str] = None,
+             started_before: Optional[float] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """Liste les documents d'un type filtrés sur les colonnes indexées"""
+        raise NotImplementedError
+
+    def count(self, kind: str, user_id: Optional[str] = None, status: Optional[str] = None) -> int:
+        """Nombre de documents d'un type filtrés sur les colonnes indexées"""
+        return len(self.find(kind, user_id=user_id, status=status))
+
+    def close(self) -> None:
+        """Libère les ressources du backend"""
+
+
+def _matches(document: Dict[str, Any], user_id: Optional[str], status: Optional[str],
+             started_before: Optional[float]) -> bool:
+    if user_id is not None and document.get("user_id") != user_id:
+        return False
+    if status is not None and document.get("status") != status:
+        return False
+    if started_before is not None and not (document.get("started_at") or 0) < started_before:
+        return False
+    return True
+
+
+class MemoryStateBackend(StateBackend):
+    """
+    État en mémoire du processus (non durable)
+    Verrous répartis par clé, index (type, utilisateur, statut) et index
+    temporel par tranches de started_at maintenus à l'écriture :
+    comptage en O(1), recherche des expirés proportionnelle à leur nombre
+    """
+
+    name = "memory"
+    local = True
+
+    # Nombre de segments de verrouillage des documents
+    SHARDS = 16
+    # Largeur d'une tranche de l'index temporel
+    BUCKET_SECONDS = 60
+
+    def __init__(self, shards: Optional[int] = None):
+        self.shards = shards or self.SHARDS
+        self._shard_locks = [threading.Lock() for _ in range(self.shards)]
+        self._shard_documents: List[Dict[Tuple[str, str], Dict[str, Any]]] = [
+            {} for _ in range(self.shards)]
+
+        # Index secondaires : clés par (type, utilisateur, statut) et par tranche de started_at
+        self._index_lock = threading.Lock()
+        self._by_user_status: Dict[Tuple[str, Any, Any], set] = {}
+        self._time_lock = threading.Lock()
+        self._buckets: Dict[str, Dict[int, set]] = {}
+        self._bucket_ids: Dict[str, List[int]] = {}
+
+    def _shard(self, kind: str, key: str) -> int:
+        return hash((kind, key)) % self.shards
+
+    def write_many(self, kind, documents):
+        for key, document in documents.items():
+            shard = self._shard(kind, key)
+            with self._shard_locks[shard]:
+                previous = self._shard_documents[shard].get((kind, key))
+                if document is None:
+                    self._shard_documents[shard].pop((kind, key), None)
+                else:
+                    self._shard_documents[shard][(kind, key)] = document
+                # Index mis à jour sous le verrou du segment : ordre des écritures conservé
+                self._reindex(kind, key, previous, document)
+
+    def _reindex(self, kind: str, key: str, previous: Optional[Dict[str, Any]],
+                 document: Optional[Dict[str, Any]]) -> None:
+        old_index = (kind, previous.get("user_id"), previous.get("status")) if previous else None
+        new_index = (kind, document.get("user_id"), document.get("status")) if document else None
+        if old_index != new_index:
+            with self._index_lock:
+                if old_index is not None:
+                    keys = self._by_user_status.get(old_index)
+                    if keys is not None:
+                        keys.discard(key)
+                        if not keys:
+                            del self._by_user_status[old_index]
+                if new_index is not None:
+                    self._by_user_status.setdefault(new_index, set()).add(key)
+
+        old_started = previous.get("started_at") if previous else None
+        new_started = document.get("started_at") if document else None
+        if old_started != new_started:
+            with self._time_lock:
+                if old_started is not None:
+                    self._unbucket(kind, key, int(old_started // self.BUCKET_SECONDS))
+                if new_started is not None:
+                    bucket_id = int(new_started // self.BUCKET_SECONDS)
+                    buckets = self._buckets.setdefault(kind, {})
+                    if bucket_id not in buckets:
+                        buckets[bucket_id] = set()
+                        bisect.insort(self._bucket_ids.setdefault(kind, []), bucket_id)
+                    buckets[bucket_id].add(key)
+
+    def _unbucket(self, kind: str, key: str, bucket_id: int) -> None:
+        buckets = self._buckets.get(kind, {})
+        keys = buckets.get(bucket_id)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del buckets[bucket_id]
+            bucket_ids = self._bucket_ids[kind]
+            del bucket_ids[bisect.bisect_left(bucket_ids, bucket_id)]
+
+    def insert(self, kind, key, document):
+        shard = self._shard(kind, key)
+        with self._shard_locks[shard]:
+            if (kind, key) in self._shard_documents[shard]:
+                return False
+            self._shard_documents[shard][(kind, key)] = document
+            self._reindex(kind, key, None, document)
+        return True
+
+    def get(self, kind, key):
+        shard = self._shard(kind, key)
+        with self._shard_locks[shard]:
+            return self._shard_documents[shard].get((kind, key))
+
+    def count(self, kind, user_id=None, status=None):
+        if user_id is None or status is None:
+            return super().count(kind, user_id=user_id, status=status)
+        with self._index_lock:
+            return len(self._by_user_status.get((kind, user_id, status), ()))
+
+    def find(self, kind, user_id=None, status=None, started_before=None):
+        if started_before is not None:
+            items = self._started_before(kind, started_before)
+        elif user_id is not None and status is not None:
+            with self._index_lock:
+                keys = list(self._by_user_status.get((kind, user_id, status), ()))
+            items = [(key, self.get(kind, key)) for key in keys]
+        else:
+            items = []
+            for shard in range(self.shards):
+                with self._shard_locks[shard]:
+                    items.extend((key, document) for (item_kind, key), document
+                                 in self._shard_documents[shard].items() if item_kind == kind)
+
+        return [(key, document) for key, document in items
+                if document is not None and _matches(document, user_id, status, started_before)]
+
+    def _started_before(self, kind: str, cutoff: float) -> List[Tuple[str, Dict[str, Any]]]:
+        """Documents démarrés avant ``cutoff`` : tranches antérieures, puis filtre de la tranche limite"""
+        last_bucket = int(cutoff // self.BUCKET_SECONDS)
+        with self._time_lock:
+            bucket_ids = self._bucket_ids.get(kind, [])
+            buckets = self._buckets.get(kind, {})
+            keys = [key
+                    for bucket_id in bucket_ids[:bisect.bisect_right(bucket_ids, last_bucket)]
+                    for key in buckets[bucket_id]]
+        return [(key, self.get(kind, key)) for key in keys]
+
+
+class SqliteStateBackend(StateBackend):
+    """État dans une base SQLite locale en mode WAL (un seul nœud)"""
+
+    name = "sqlite"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or Config.STATE_SQLITE_PATH
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS state ("
+            "kind TEXT NOT NULL, key TEXT NOT NULL, user_id TEXT, status TEXT, "
+            "started_at REAL, data TEXT NOT NULL, PRIMARY KEY (kind, key))")
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_state_user ON state (kind, user_id, status)")
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_state_started ON state (kind, started_at)")
+        self._connection.commit()
+
+    def write_many(self, kind, documents):
+        upserts = [
+            (kind, key, *(document.get(field) for field in INDEXED_FIELDS), json.dumps(document))
+            for key, document in documents.items() if document is not None
+        ]
+        deletes = [(kind, key) for key, document in documents.items() if document is None]
+        # Une transaction par lot : un seul fsync du WAL
+        with self._lock, self._connection:
+            if upserts:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO state (kind, key, user_id, status, started_at, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", upserts)
+            if deletes:
+                self._connection.executemany(
+                    "DELETE FROM state WHERE kind = ? AND key = ?", deletes)
+
+    def insert(self, kind, key, document):
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT OR IGNORE INTO state (kind, key, user_id, status, started_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, key, *(document.get(field) for field in INDEXED_FIELDS), json.dumps(document)))
+        return cursor.rowcount == 1
+
+    def get(self, kind, key):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM state WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find(self, kind, user_id=None, status=None, started_before=None):
+        where, parameters = self._where(kind, user_id, status, started_before)
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT key, data FROM state WHERE {where}", parameters).fetchall()
+        return [(key, json.loads(data)) for key, data in rows]
+
+    def count(self, kind, user_id=None, status=None):
+        where, parameters = self._where(kind, user_id, status, None)
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT COUNT(*) FROM state WHERE {where}", parameters).fetchone()[0]
+
+    @staticmethod
+    def _where(kind, user_id, status, started_before) -> Tuple[str, List[Any]]:
+        clauses = ["kind = ?"]
+        parameters: List[Any] = [kind]
+        for clause, value in (("user_id = ?", user_id), ("status = ?", status),
+                              ("started_at < ?", started_before)):
+            if value is not None:
+                clauses.append(clause)
+                parameters.append(value)
+        return " AND ".join(clauses), parameters
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class TableStateBackend(StateBackend):
+    """
+    État dans Azure Table Storage (partagé entre workers et instances)
+    PartitionKey = type de document suivi d'un segment dérivé de la clé, RowKey = clé ;
+    testable localement avec Azurite
+    """
+
+    name = "table"
+
+    # Limite d'une transaction de table (même partition)
+    TRANSACTION_SIZE = 100
+
+    def __init__(self, table_name: Optional[str] = None, partitions: Optional[int] = None):
+        from azure.core.exceptions import ResourceExistsError
+        from azure.data.tables import TableServiceClient
+
+        self.table_name = table_name or Config.STATE_TABLE_NAME
+        # Une partition par type concentrerait toutes les écritures d'un type sur un seul serveur
+        self.partitions = max(1, partitions or Config.STATE_TABLE_PARTITIONS)
+        service = TableServiceClient(
+            endpoint=Config.get_table_url(),
+            credential=self._credential()
+        )
+        try:
+            service.create_table(self.table_name)
+        except ResourceExistsError:
+            pass
+        self._table = service.get_table_client(self.table_name)
+
+    @staticmethod
+    def _credential():
+        from azure.core.credentials import AzureNamedKeyCredential
+        return AzureNamedKeyCredential(Config.AZURE_ACCOUNT_NAME, Config.AZURE_ACCOUNT_KEY)
+
+    @staticmethod
+    def _row_key(key: str) -> str:
+        # Caractères interdits dans une RowKey : / \ # ?
+        return key.replace("%", "%25").replace("/", "%2F").replace("\\", "%5C") \
+            .replace("#", "%23").replace("?", "%3F")
+
+    def _partition(self, kind: str, key: str) -> str:
+        # crc32 plutôt que hash() : la répartition doit être identique dans tous les processus
+        return f"{kind}-{zlib.crc32(key.encode('utf-8')) % self.partitions:02d}"
+
+    def _entity(self, kind: str, key: str, document: Dict[str, Any]) -> Dict[str, Any]:
+        entity = {"PartitionKey": self._partition(kind, key), "RowKey": self._row_key(key)}
+        for field in INDEXED_FIELDS:
+            if document.get(field) is not None:
+                entity[field] = document[field]
+        entity["key"] = key
+        entity["data"] = json.dumps(document)
+        return entity
+
+    def write_many(self, kind, documents):
+        # Une transaction ne couvre qu'une partition : lots regroupés par partition
+        operations: Dict[str, List[Tuple[str, Dict[str, Any], Dict[str, Any]]]] = {}
+        for key, document in documents.items():
+            if document is None:
+                # Hors transaction : une entité absente ferait échouer tout le lot
+                self._table.delete_entity(self._partition(kind, key), self._row_key(key))
+                continue
+            entity = self._entity(kind, key, document)
+            operations.setdefault(entity["PartitionKey"], []).append(
+                ("upsert", entity, {"mode": "replace"}))
+
+        for batch in operations.values():
+            for start in range(0, len(batch), self.TRANSACTION_SIZE):
+                self._table.submit_transaction(batch[start:start + self.TRANSACTION_SIZE])
+
+    def insert(self, kind, key, document):
+        from azure.core.exceptions import ResourceExistsError
+        try:
+            self._table.create_entity(self._entity(kind, key, document))
+        except ResourceExistsError:
+            return False
+        return True
+
+    def get(self, kind, key):
+        from azure.core.exceptions import ResourceNotFoundError
+        try:
+            entity = self._table.get_entity(
+                self._partition(kind, key), self._row_key(key), select=["data"])
+        except ResourceNotFoundError:
+            return None
+        return json.loads(entity["data"])
+
+    def find(self, kind, user_id=None, status=None, started_before=None):
+        clauses = ["PartitionKey eq @partition"]
+        parameters: Dict[str, Any] = {}
+        for clause, name, value in (("user_id eq @user_id", "user_id", user_id),
+                                    ("status eq @status", "status", status),
+                                    ("started_at lt @started_before", "started_before", started_before)):
+            if value is not None:
+                clauses.append(clause)
+                parameters[name] = value
+        query = " and ".join(clauses)
+
+        def query_partition(shard: int) -> List[Tuple[str, Dict[str, Any]]]:
+            entities = self._table.query_entities(
+                query, parameters={**parameters, "partition": f"{kind}-{shard:02d}"},
+                select=["key", "data"])
+            return [(entity["key"], json.loads(entity["data"])) for entity in entities]
+
+        # Une requête par partition, en parallèle
+        with ThreadPoolExecutor(max_workers=min(self.partitions, 8)) as executor:
+            pages = list(executor.map(query_partition, range(self.partitions)))
+        return [item for page in pages for item in page]
+
+    def close(self):
+        self._table.close()
+
+
+BACKENDS = {
+    "memory": MemoryStateBackend,
+    "sqlite": SqliteStateBackend,
+    "table": TableStateBackend,
+}
+
+
+def create_state_backend(name: Optional[str] = None) -> StateBackend:
+    """Construit le backend configuré (STATE_BACKEND), mémoire en repli"""
+    name = (name or Config.STATE_BACKEND).lower()
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"STATE_BACKEND inconnu: {name}")
+    try:
+        return backend_class()
+    except ImportError as e:
+        logger.warning(f"⚠️ Backend d'état '{name}' indisponible ({str(e)}), repli en mémoire")
+        return MemoryStateBackend()
+
+
+class StateStore:
+    """
+    Tampon d'écriture et cache de lecture devant un backend
+    Les écritures sont regroupées et envoyées par lots (taille ou délai),
+    les lectures récentes sont servies depuis le worker
+    Un backend local (mémoire) est appelé directement, sans verrou global
+    """
+
+    # Marqueur de suppression dans le tampon et le cache
+    _DELETED = object()
+
+    # Au-delà, les entrées expirées sont purgées à la lecture
+    CACHE_MAX_ENTRIES = 10000
+
+    def __init__(self, backend: Optional[StateBackend] = None,
+                 batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None,
+                 cache_ttl: Optional[float] = None):
+        self.backend = backend or create_state_backend()
+        self.batch_size = batch_size or Config.STATE_WRITE_BATCH_SIZE
+        self.flush_interval = Config.STATE_FLUSH_INTERVAL_MS / 1000 if flush_interval is None else flush_interval
+        self.cache_ttl = Config.STATE_CACHE_TTL_SECONDS if cache_ttl is None else cache_ttl
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], Any] = {}
+        self._cache: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        self._wakeup = threading.Event()
+        self._closed = False
+
+        self._writes = 0
+        self._batches = 0
+        self._cache_hits = 0
+        self._backend_reads = 0
+
+        self._direct = self.backend.local
+        if not self._direct:
+            self._flusher = threading.Thread(target=self._flush_loop, name="state-flush", daemon=True)
+            self._flusher.start()
+            atexit.register(self._flush_at_exit)
+
+        logger.info(f"✅ StateStore initialisé (backend={self.backend.name}, lot={self.batch_size})")
+
+    def put(self, kind: str, key: str, document: Dict[str, Any]) -> None:
+        """Enregistre un document (écriture différée)"""
+        if self._direct:
+            self.backend.write_many(kind, {key: document})
+            return
+        self._write(kind, key, document)
+
+    def delete(self, kind: str, key: str) -> None:
+        """Supprime un document (écriture différée)"""
+        if self._direct:
+            self.backend.write_many(kind, {key: None})
+            return
+        self._write(kind, key, self._DELETED)
+
+    def insert(self, kind: str, key: str, document: Dict[str, Any]) -> bool:
+        """
+        Crée un document s'il n'existe pas (écriture immédiate, conditionnelle côté backend)
+        Retourne False si un autre appelant, de ce worker ou d'un autre, l'a déjà créé
+        """
+        if self._direct:
+            return self.backend.insert(kind, key, document)
+
+        with self._lock:
+            buffered = (kind, key) in self._pending
+        if buffered:
+            # Suppression ou écriture en attente : appliquée avant la condition
+            self.flush()
+        created = self.backend.insert(kind, key, document)
+        with self._lock:
+            if created:
+                self._cache[(kind, key)] = (document, time.monotonic() + self.cache_ttl)
+            else:
+                # Document d'un autre appelant : relu sur le backend
+                self._cache.pop((kind, key), None)
+        return created
+
+    def _write(self, kind: str, key: str, value: Any) -> None:
+        with self._lock:
+            self._pending[(kind, key)] = value
+            # Écriture locale : toujours fraîche pour ce worker
+            self._cache[(kind, key)] = (value, float("inf"))
+            self._writes += 1
+            full = len(self._pending) >= self.batch_size
+        if full or self.flush_interval <= 0:
+            self.flush()
+        else:
+            self._wakeup.set()
+
+    def get(self, kind: str, key: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Lit un document : tampon, cache local puis backend
+        ``refresh`` ignore le cache de lecture (écriture récente d'un autre worker)
+        """
+        if self._direct:
+            return self.backend.get(kind, key)
+
+        with self._lock:
+            entry = self._cache.get((kind, key))
+            if (entry is not None and entry[1] > time.monotonic() and
+                    (not refresh or (kind, key) in self._pending)):
+                self._cache_hits += 1
+                return None if entry[0] is self._DELETED else entry[0]
+            self._backend_reads += 1
+
+        document = self.backend.get(kind, key)
+        with self._lock:
+            # Une écriture locale concurrente reste prioritaire
+            if (kind, key) not in self._pending:
+                value = self._DELETED if document is None else document
+                self._cache[(kind, key)] = (value, time.monotonic() + self.cache_ttl)
+                if len(self._cache) > self.CACHE_MAX_ENTRIES:
+                    self._evict_expired()
+        return document
+
+    def find(self, kind: str, **filters) -> List[Tuple[str, Dict[str, Any]]]:
+        """Requête sur les colonnes indexées (après envoi du tampon)"""
+        self.flush()
+        return self.backend.find(kind, **filters)
+
+    def count(self, kind: str, user_id: Optional[str] = None, status: Optional[str] = None) -> int:
+        """Comptage sur les colonnes indexées (après envoi du tampon)"""
+        self.flush()
+        return self.backend.count(kind, user_id=user_id, status=status)
+
+    def flush(self) -> None:
+        """Envoie les écritures en attente au backend, par type de document"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return
+
+            by_kind: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {}
+            for (kind, key), value in pending.items():
+                by_kind.setdefault(kind, {})[key] = None if value is self._DELETED else value
+
+            try:
+                for kind, documents in by_kind.items():
+                    self.backend.write_many(kind, documents)
+            except Exception:
+                # Remise en file : les écritures plus récentes restent prioritaires
+                with self._lock:
+                    for item_key, value in pending.items():
+                        self._pending.setdefault(item_key, value)
+                raise
+
+            with self._lock:
+                self._batches += 1
+                # Les entrées écrites expirent désormais comme les lectures
+                expires_at = time.monotonic() + self.cache_ttl
+                for item_key, value in pending.items():
+                    entry = self._cache.get(item_key)
+                    if entry is not None and entry[0] is value and item_key not in self._pending:
+                        self._cache[item_key] = (value, expires_at)
+                self._evict_expired()
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for item_key in [item_key for item_key, (_, expires_at) in self._cache.items()
+                         if expires_at <= now]:
+            del self._cache[item_key]
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self.flush_interval > 0:
+                time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"❌ Écriture de l'état impossible ({self.backend.name}): {str(e)}")
+
+    def _flush_at_exit(self) -> None:
+        if self._closed:
+            return
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"❌ État non écrit à l'arrêt ({self.backend.name}): {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compteurs d'écritures, de lots et de lectures servies localement"""
+        if self._direct:
+            return {"backend": self.backend.name, "direct": True}
+
+        with self._lock:
+            reads = self._cache_hits + self._backend_reads
+            return {
+                "backend": self.backend.name,
+                "pending": len(self._pending),
+                "writes": self._writes,
+                "batches": self._batches,
+                "cache_entries": len(self._cache),
+                "cache_hits": self._cache_hits,
+                "backend_reads": self._backend_reads,
+                "hit_ratio": round(self._cache_hits / reads, 3) if reads else 0.0
+            }
+
+    def close(self) -> None:
+        """Envoie le tampon puis ferme le backend"""
+        self._closed = True
+        self._wakeup.set()
+        if not self._direct:
+            self.flush()
+        self.backend.close()
@@ -0,0 +1,182 @@
+"""
+Cache des statuts de traduction avec coalescence des requêtes concurrentes
+Plusieurs sessions qui interrogent le même job partagent un seul appel Translator
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from shared.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class _InFlight:
+    """Appel amont en cours pour une clé, attendu par les requêtes concurrentes"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _LeaderCancelled(Exception):
+    """L'appelant qui chargeait la valeur a été annulé : un appelant en attente reprend le chargement"""
+
+
+class StatusCache:
+    """
+    Cache TTL + single-flight
+    La fonction de chargement retourne ``(valeur, ttl)`` :
+    ttl > 0 met en cache pour ttl secondes, None indéfiniment (état terminal),
+    0 ne met pas en cache (erreur transitoire)
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or Config.STATUS_CACHE_MAX_ENTRIES
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._in_flight: Dict[str, _InFlight] = {}
+        # Appels asynchrones en cours, par boucle asyncio
+        self._async_in_flight: Dict[Tuple[int, str], "asyncio.Future"] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Tuple[Any, Optional[float]]]) -> Any:
+        """Retourne la valeur en cache ou la charge une seule fois pour tous les appelants"""
+        with self._lock:
+            found, value = self._lookup_locked(key)
+            if found:
+                return value
+
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None:
+                self._coalesced += 1
+                leader = False
+            else:
+                in_flight = _InFlight()
+                self._in_flight[key] = in_flight
+                self._misses += 1
+                leader = True
+
+        if not leader:
+            in_flight.event.wait()
+            if in_flight.error is not None:
+                raise in_flight.error
+            return in_flight.value
+
+        try:
+            value, ttl = fetch()
+            in_flight.value = value
+            self._store(key, value, ttl)
+            return value
+        except BaseException as e:
+            in_flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            in_flight.event.set()
+
+    async def get_or_fetch_async(self, key: str,
+                                 fetch: Callable[[], Awaitable[Tuple[Any, Optional[float]]]]) -> Any:
+        """
+        Équivalent asynchrone de get_or_fetch : ``fetch`` est une coroutine
+        Les appelants concurrents d'une même boucle attendent le même Future
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            found, value = self._lookup_locked(key)
+            if found:
+                return value
+
+            future = self._async_in_flight.get(flight_key)
+            if future is not None:
+                self._coalesced += 1
+                leader = False
+            else:
+                future = loop.create_future()
+                self._async_in_flight[flight_key] = future
+                self._misses += 1
+                leader = True
+
+        if not leader:
+            # shield : l'annulation d'un appelant n'annule pas l'appel partagé
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                return await self.get_or_fetch_async(key, fetch)
+
+        try:
+            value, ttl = await fetch()
+            future.set_result(value)
+            self._store(key, value, ttl)
+            return value
+        except asyncio.CancelledError:
+            # Ne pas annuler le Future partagé : CancelledError échapperait aux
+            # ``except Exception`` des appelants en attente
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Marque l'exception comme consultée s'il n'y a aucun appelant en attente
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                self._async_in_flight.pop(flight_key, None)
+
+    def _lookup_locked(self, key: str) -> Tuple[bool, Any]:
+        """Entrée valide du cache (appelé sous verrou)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return True, value
+            del self._entries[key]
+        return False, None
+
+    def _store(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        if ttl == 0:
+            return
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        """Retire une entrée du cache"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Vide le cache et remet les compteurs à zéro"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._coalesced = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compteurs de hits/misses/coalescence"""
+        with self._lock:
+            lookups = self._hits + self._misses + self._coalesced
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "coalesced": self._coalesced,
+                "hit_ratio": round((self._hits + self._coalesced) / lookups, 3) if lookups else 0.0
+            }
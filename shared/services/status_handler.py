@@ -3,13 +3,25 @@ Handler pour la gestion des statuts de traduction
 Remplace le polling de la fonction durable
 """
 
+import asyncio
 import logging
-import time
-from typing import Dict, Any, Optional
-from shared.services.translation_service import TranslationService
-from shared.services.blob_service import BlobService
-from shared.services.graph_service import GraphService
-from shared.models.schemas import TranslationStatus, TranslationResult
+import math
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+from shared.services.service_registry import (
+    get_async_translation_service,
+    get_completion_estimator,
+    get_intake_service,
+    get_status_cache,
+    get_translation_cache,
+    get_translation_service
+)
+from shared.services.intake import QUEUED_TRANSLATION_PREFIX
+from shared.services.state_manager import StateManager
+from shared.services.translation_cache import CACHED_TRANSLATION_PREFIX
+from shared.models.constants import TranslationStatus
+from shared.config import Config
+from shared.services.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -18,35 +30,344 @@ class StatusHandler:
     """Handler pour vérifier et gérer les statuts de traduction"""
 
     def __init__(self):
-        self.translation_service = TranslationService()
-        self.blob_service = BlobService()
-        self.graph_service = GraphService()
+        self.translation_service = get_translation_service()
+        self.status_cache = get_status_cache()
+        self.state_manager = StateManager()
+        self.completion_estimator = get_completion_estimator()
         self.translation_id = None
         
         logger.info("✅ StatusHandler initialisé")
-    
+
+    @traced("status.check_status")
     def check_status(self, translation_id: str) -> dict:
-        """Interroge directement Azure Translator."""
+        """
+        Interroge Azure Translator (via le cache des statuts)
+        Un job dont toutes les sorties sont arrivées est résolu localement
+        """
         try:
-            status = self.translation_service.check_translation_status(translation_id)
-            response_data = {
+            requested_id = translation_id
+            translation_id, queued_result = self._resolve_queued(translation_id)
+            if queued_result:
+                return queued_result
+
+            local_result = self._check_local_completion(translation_id)
+            if local_result:
+                self._settle_cached(requested_id, local_result["data"])
+                return local_result
+
+            status = self._get_translation_status(translation_id)
+            response_data = self._build_status_data(translation_id, status)
+            if self._has_languages(response_data):
+                response_data["languages"] = self._get_languages_status(
+                    translation_id, self._status_ttl(status))
+            self._track_completion(translation_id, status, response_data)
+            self._settle_cached(requested_id, status)
+
+            return self._check_result(response_data)
+        except Exception as e:
+            return self._check_error(e)
+
+    @traced("status.check_job_status")
+    def check_job_status(self, translation_ids: List[str]) -> dict:
+        """
+        Agrège le statut des sous-lots d'un job multi-documents
+        Le job reste en cours tant qu'un sous-lot n'est pas terminé
+        """
+        try:
+            resolved = [self._resolve_queued(translation_id) for translation_id in translation_ids]
+            statuses = [
+                self._queued_batch_status(queued_result) if queued_result
+                else self._get_translation_status(translation_id)
+                for translation_id, queued_result in resolved
+            ]
+            response_data = self._aggregate_job_status(translation_ids, statuses)
+            self._track_job_completion(self._resolved_ids(resolved), statuses, response_data)
+            for translation_id, status in zip(translation_ids, statuses):
+                self._settle_cached(translation_id, status)
+            return self._check_result(response_data)
+        except Exception as e:
+            return self._check_error(e, job=True)
+
+    @traced("status.get_job_documents")
+    def get_job_documents(self, translation_ids: List[str]) -> List[Dict[str, Any]]:
+        """Liste les documents (source, langue, sortie, statut) de tous les sous-lots"""
+        documents = []
+        for translation_id in translation_ids:
+            translation_id, queued_result = self._resolve_queued(translation_id)
+            if queued_result:
+                continue
+            for document in self.translation_service.get_documents_status(translation_id):
+                document["translation_id"] = translation_id
+                documents.append(document)
+        return documents
+
+    def _resolve_queued(self, translation_id: str) -> Tuple[str, Optional[dict]]:
+        """
+        Requête passée par la file d'admission : ID du job Translator une fois soumise,
+        sinon réponse de check_status tant qu'elle attend (ou si sa soumission a échoué)
+        """
+        if not translation_id.startswith(QUEUED_TRANSLATION_PREFIX):
+            return translation_id, None
+
+        intake = get_intake_service()
+        document = intake.get(translation_id)
+        if document is None:
+            return translation_id, {
+                "success": False,
+                "message": f"Requête {translation_id} introuvable dans la file d'admission"
+            }
+        if document.get("translation_id"):
+            return document["translation_id"], None
+        return translation_id, {
+            "success": True,
+            "data": intake.describe(translation_id, document)
+        }
+
+    @staticmethod
+    def _check_result(response_data: Dict[str, Any]) -> dict:
+        return {
+            "success": True,
+            "data": response_data
+        }
+
+    @staticmethod
+    def _check_error(error: Exception, job: bool = False) -> dict:
+        """Réponse de check_status / check_job_status quand la vérification a échoué"""
+        logger.error(f"❌ Erreur vérification statut{' du job' if job else ''}: {str(error)}")
+        return {
+            "success": False,
+            "message": f"Erreur lors de la vérification: {str(error)}"
+        }
+
+    @staticmethod
+    def _resolved_ids(resolved: List[Tuple[str, Optional[dict]]]) -> List[str]:
+        """IDs Translator (ou de file d'admission) des sous-lots résolus par _resolve_queued"""
+        return [translation_id for translation_id, _ in resolved]
+
+    @staticmethod
+    def _has_languages(response_data: Dict[str, Any]) -> bool:
+        """Job multi-langues : le détail par langue cible complète la réponse"""
+        return "summary" in response_data
+
+    @staticmethod
+    def _queued_batch_status(queued_result: dict) -> Dict[str, Any]:
+        """Statut d'un sous-lot encore en file d'admission, au format du statut Translator"""
+        if not queued_result["success"]:
+            return {"status": TranslationStatus.FAILED.value, "error": queued_result["message"]}
+        data = queued_result["data"]
+        status = {"status": data["status"]}
+        if data.get("error"):
+            status["error"] = data["error"]
+        return status
+
+    def _build_status_data(self, translation_id: str, status: Dict[str, Any]) -> Dict[str, Any]:
+        """Réponse de check_status à partir du statut Translator (hors détail par langue)"""
+        response_data = {
+            "translation_id": translation_id,
+            "status": status.get("status")
+        }
+        if status.get("status") == "Failed":
+            response_data["error"] = status.get("error", "Erreur inconnue")
+        elif status.get("transient"):
+            # Translator momentanément injoignable : le job continue, ne pas le relancer
+            response_data["transient"] = True
+            response_data["warning"] = status.get("error")
+
+        # Job multi-langues : le détail par langue cible est ajouté par l'appelant
+        summary = status.get("summary") or {}
+        if summary.get("total", 0) > 1:
+            response_data["summary"] = summary
+        return response_data
+
+    def _aggregate_job_status(self, translation_ids: List[str],
+                              statuses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Statut global d'un job : en cours tant qu'un sous-lot n'est pas terminé"""
+        batches = []
+        summary = {"total": 0, "failed": 0, "success": 0, "in_progress": 0}
+        for translation_id, status in zip(translation_ids, statuses):
+            batch = {
                 "translation_id": translation_id,
                 "status": status.get("status")
             }
             if status.get("status") == "Failed":
-                response_data["error"] = status.get("error", "Erreur inconnue")
+                batch["error"] = status.get("error", "Erreur inconnue")
+            elif status.get("transient"):
+                batch["transient"] = True
+            batches.append(batch)
 
+            for key, value in (status.get("summary") or {}).items():
+                summary[key] = summary.get(key, 0) + value
+
+        batch_statuses = {batch["status"] for batch in batches}
+        if batch_statuses == {TranslationStatus.PENDING.value}:
+            overall_status = TranslationStatus.PENDING.value
+        elif batch_statuses - {TranslationStatus.SUCCEEDED.value, TranslationStatus.FAILED.value}:
+            overall_status = TranslationStatus.IN_PROGRESS.value
+        elif TranslationStatus.SUCCEEDED.value in batch_statuses:
+            overall_status = TranslationStatus.SUCCEEDED.value
+        else:
+            overall_status = TranslationStatus.FAILED.value
+
+        return {
+            "translation_ids": translation_ids,
+            "status": overall_status,
+            "summary": summary,
+            "batches": batches
+        }
+
+    @traced("status.local_completion")
+    def _check_local_completion(self, translation_id: str) -> Optional[dict]:
+        """
+        Statut Succeeded sans appel Translator : requête servie par le cache
+        des traductions, ou sorties toutes signalées par les événements BlobCreated
+        """
+        # Requête servie par le cache des traductions : fichiers déjà copiés
+        if translation_id.startswith(CACHED_TRANSLATION_PREFIX):
             return {
                 "success": True,
-                "data": response_data
+                "data": {
+                    "translation_id": translation_id,
+                    "status": TranslationStatus.SUCCEEDED.value,
+                    "cached": True
+                }
             }
+
+        completion = self.state_manager.get_completion(translation_id)
+        if not completion or not completion["complete"]:
+            return None
+
+        response_data = {
+            "translation_id": translation_id,
+            "status": TranslationStatus.SUCCEEDED.value,
+            "completed_at": datetime.fromtimestamp(
+                completion["completed_at"], timezone.utc).isoformat()
+        }
+        if len(completion["expected"]) > 1:
+            response_data["outputs"] = completion["completed"]
+        self._track_completion(translation_id, {
+            "status": TranslationStatus.SUCCEEDED.value,
+            "original_status": "Succeeded"
+        }, response_data, completed_at=completion["completed_at"])
+
+        logger.info(f"✅ Statut résolu localement pour {translation_id}")
+        return {
+            "success": True,
+            "data": response_data
+        }
+
+    @traced("status.track_completion")
+    def _track_completion(self, translation_id: str, status: Dict[str, Any],
+                          response_data: Dict[str, Any], completed_at: Optional[float] = None) -> None:
+        """
+        Statut final : durée réelle relevée pour l'estimation des prochains jobs
+        Job en cours : fin attendue et délai conseillé avant le prochain check_status
+        """
+        try:
+            current_status = status.get("status")
+            if current_status == TranslationStatus.SUCCEEDED.value:
+                self.completion_estimator.record_completion(translation_id, status, completed_at)
+            elif current_status == TranslationStatus.FAILED.value and status.get("original_status"):
+                self.completion_estimator.forget(translation_id)
+            else:
+                response_data.update(self.completion_estimator.poll_hint(
+                    self.completion_estimator.get_job(translation_id)))
+                # Translator saturé ou coupé : pas de nouveau check_status avant son Retry-After
+                if status.get("retry_after"):
+                    response_data["next_poll_after"] = max(
+                        response_data["next_poll_after"], math.ceil(status["retry_after"]))
+                return
+
+            # Job terminé : sa place est libérée dans les plafonds de la file d'admission
+            if Config.INTAKE_MODE == "queue":
+                get_intake_service().release(translation_id)
         except Exception as e:
-            logger.error(f"❌ Erreur vérification statut: {str(e)}")
-            return {
-                "success": False,
-                "message": f"Erreur lors de la vérification: {str(e)}"
+            logger.warning(f"⚠️ Suivi de la durée impossible pour {translation_id}: {str(e)}")
+
+    @staticmethod
+    def _is_final(status: Dict[str, Any]) -> bool:
+        """Succès, ou échec rapporté par Translator (pas une erreur d'appel)"""
+        return (status.get("status") == TranslationStatus.SUCCEEDED.value or
+                (status.get("status") == TranslationStatus.FAILED.value and bool(status.get("original_status"))))
+
+    @traced("status.settle_cached")
+    def _settle_cached(self, translation_id: str, status: Dict[str, Any]) -> None:
+        """
+        Job terminé : le cache des traductions publie ses sorties, y compris celles
+        des requêtes identiques rattachées au job, avant que le client ne les demande
+        ``translation_id`` est l'ID connu du client (ID de file d'admission compris)
+        """
+        translation_cache = get_translation_cache()
+        if not translation_cache.enabled or not self._is_final(status):
+            return
+        try:
+            translation_cache.settle(translation_id, status["status"] == TranslationStatus.SUCCEEDED.value)
+        except Exception as e:
+            logger.warning(f"⚠️ Publication des sorties en cache impossible pour {translation_id}: {str(e)}")
+
+    def _track_job_completion(self, translation_ids: List[str], statuses: List[Dict[str, Any]],
+                              response_data: Dict[str, Any]) -> None:
+        """Suivi de chaque sous-lot ; le job est attendu à la fin de son dernier lot"""
+        hints = []
+        for translation_id, status in zip(translation_ids, statuses):
+            hint: Dict[str, Any] = {}
+            self._track_completion(translation_id, status, hint)
+            if hint:
+                hints.append(hint)
+        if hints:
+            response_data["next_poll_after"] = min(hint["next_poll_after"] for hint in hints)
+            completions = [hint["estimated_completion"] for hint in hints if "estimated_completion" in hint]
+            if completions:
+                response_data["estimated_completion"] = max(completions)
+
+    @traced("status.translation_status")
+    def _get_translation_status(self, translation_id: str) -> Dict[str, Any]:
+        """
+        Statut Translator d'un job, partagé par les requêtes concurrentes
+        Les états terminaux restent en cache, les autres expirent rapidement
+        """
+        def fetch():
+            status = self.translation_service.check_translation_status(translation_id)
+            return status, self._status_ttl(status)
+
+        return self.status_cache.get_or_fetch(translation_id, fetch)
+
+    def _status_ttl(self, status: Dict[str, Any]) -> Optional[float]:
+        """Durée de cache d'un statut : None pour un état terminal, 0 pour une erreur"""
+        # Sans statut d'origine, l'appel a échoué (réseau, HTTP) : ne pas figer l'erreur
+        if not status.get("original_status"):
+            return 0
+        if status.get("status") in (TranslationStatus.SUCCEEDED.value, TranslationStatus.FAILED.value):
+            return None
+        return Config.STATUS_CACHE_TTL_SECONDS
+
+    @traced("status.languages_status")
+    def _get_languages_status(self, translation_id: str,
+                              ttl: Optional[float] = 0) -> Dict[str, Dict[str, Any]]:
+        """Statut de chaque langue cible d'un job multi-langues"""
+        try:
+            documents = self.status_cache.get_or_fetch(
+                f"{translation_id}/documents",
+                lambda: (self.translation_service.get_documents_status(translation_id), ttl)
+            )
+            return self._languages_from_documents(documents)
+        except Exception as e:
+            logger.warning(f"⚠️ Détail par langue indisponible: {str(e)}")
+            return {}
+
+    @staticmethod
+    def _languages_from_documents(documents: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        languages = {}
+        for document in documents:
+            language_status = {
+                "status": document["status"],
+                "output_blob_name": document.get("output_blob_name")
             }
+            if document.get("error"):
+                language_status["error"] = document["error"]
+            languages[document["language"]] = language_status
+        return languages
 
+    @traced("status.get_result")
     def get_result(self, translation_id: str) -> Dict[str, Any]:
         """
         Récupère le résultat complet d'une traduction terminée
@@ -56,44 +377,7 @@ class StatusHandler:
 
         try:
             # Vérification du statut d'abord
-            status_result = self.check_status(translation_id)
-            if not status_result["success"]:
-                return status_result
-
-            status_data = status_result["data"]
-            current_status = status_data.get("status")
-
-            # Vérifier que la traduction est terminée
-            if current_status not in [TranslationStatus.SUCCEEDED.value, TranslationStatus.FAILED.value]:
-                return {
-                    "success": False,
-                    "message": f"Traduction non terminée (statut: {current_status})"
-                }
-
-            # Pour les traductions échouées
-            if current_status == TranslationStatus.FAILED.value:
-                return {
-                    "success": True,
-                    "data": {
-                        "translation_id": translation_id,
-                        "status": current_status,
-                        "error": status_data.get("error", "Traduction échouée"),
-                        "file_name": status_data.get("file_name"),
-                        "target_language": status_data.get("target_language")
-                    }
-                }
-
-            # Pour les traductions réussies - information limitée car pas de state manager
-            # Dans Azure Functions v1, on retourne directement le statut d'Azure Translator
-            return {
-                "success": True,
-                "data": {
-                    "translation_id": translation_id,
-                    "status": current_status,
-                    "message": "Traduction terminée avec succès",
-                    "note": "Utilisez l'endpoint get_result pour récupérer le fichier traduit"
-                }
-            }
+            return self._build_result(translation_id, self.check_status(translation_id))
 
         except Exception as e:
             logger.error(f"❌ Erreur lors de la récupération du résultat: {str(e)}")
@@ -102,86 +386,171 @@ class StatusHandler:
                 "message": f"Erreur de récupération: {str(e)}"
             }
 
-    def _prepare_download_info(self, translation_info) -> Dict[str, Any]:
-        """Prépare les informations de téléchargement"""
+    @traced("status.build_result")
+    def _build_result(self, translation_id: str, status_result: dict) -> Dict[str, Any]:
+        """Résultat d'une traduction terminée à partir de la réponse de check_status"""
+        if not status_result["success"]:
+            return status_result
+
+        status_data = status_result["data"]
+        current_status = status_data.get("status")
+
+        # Vérifier que la traduction est terminée
+        if current_status not in [TranslationStatus.SUCCEEDED.value, TranslationStatus.FAILED.value]:
+            return {
+                "success": False,
+                "message": f"Traduction non terminée (statut: {current_status})"
+            }
+
+        # Pour les traductions échouées
+        if current_status == TranslationStatus.FAILED.value:
+            result_data = {
+                "translation_id": translation_id,
+                "status": current_status,
+                "error": status_data.get("error", "Traduction échouée"),
+                "file_name": status_data.get("file_name"),
+                "target_language": status_data.get("target_language")
+            }
+        else:
+            # Pour les traductions réussies - information limitée car pas de state manager
+            # Dans Azure Functions v1, on retourne directement le statut d'Azure Translator
+            result_data = {
+                "translation_id": translation_id,
+                "status": current_status,
+                "message": "Traduction terminée avec succès",
+                "note": "Utilisez l'endpoint get_result pour récupérer le fichier traduit"
+            }
+
+        # Résultat par langue pour les jobs multi-langues
+        if status_data.get("languages"):
+            result_data["languages"] = status_data["languages"]
+
+        return {
+            "success": True,
+            "data": result_data
+        }
+
+
+class AsyncStatusHandler(StatusHandler):
+    """
+    Variante asynchrone de StatusHandler pour les handlers ``async def main``
+    Les appels Translator sont des coroutines, coalescées par le cache des statuts
+    """
+
+    def __init__(self):
+        self.translation_service = get_async_translation_service()
+        self.status_cache = get_status_cache()
+        self.state_manager = StateManager()
+        self.completion_estimator = get_completion_estimator()
+        self.translation_id = None
+
+    async def _run_state(self, function, *args):
+        """Appel au stockage d'état : direct s'il est local, sinon dans un thread"""
+        if self.state_manager.local:
+            return function(*args)
+        return await asyncio.to_thread(function, *args)
+
+    @traced("status.check_status")
+    async def check_status(self, translation_id: str) -> dict:
+        """Interroge Azure Translator (via le cache des statuts)"""
         try:
-            output_blob_name = translation_info.blob_urls.output_blob_name
-            
-            # Génération de l'URL de téléchargement
-            download_url = self.blob_service.get_translated_file_url(output_blob_name)
-            
-            download_info = {}
-            if download_url:
-                download_info["download_url"] = download_url
-                download_info["download_expires_at"] = time.time() + (24 * 3600)  # 24h
-                logger.info("✅ URL de téléchargement générée")
-            else:
-                download_info["download_error"] = "Fichier traduit introuvable"
-                logger.warning("⚠️ Fichier traduit introuvable")
+            requested_id = translation_id
+            translation_id, queued_result = await self._run_state(self._resolve_queued, translation_id)
+            if queued_result:
+                return queued_result
+
+            local_result = await self._run_state(self._check_local_completion, translation_id)
+            if local_result:
+                await self._settle_cached_async(requested_id, local_result["data"])
+                return local_result
 
-            return download_info
+            status = await self._get_translation_status(translation_id)
+            response_data = self._build_status_data(translation_id, status)
+            if self._has_languages(response_data):
+                response_data["languages"] = await self._get_languages_status(
+                    translation_id, self._status_ttl(status))
+            await self._run_state(self._track_completion, translation_id, status, response_data)
+            await self._settle_cached_async(requested_id, status)
 
+            return self._check_result(response_data)
         except Exception as e:
-            logger.error(f"❌ Erreur préparation téléchargement: {str(e)}")
-            return {"download_error": f"Erreur: {str(e)}"}
+            return self._check_error(e)
 
-    def _prepare_final_result(self, translation_info, status_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Prépare le résultat final avec toutes les options de récupération"""
-        output_blob_name = translation_info.blob_urls.output_blob_name
-        
-        result = {
-            "translation_id": status_data["translation_id"],
-            "status": status_data["status"],
-            "file_name": translation_info.file_name,
-            "target_language": translation_info.target_language,
-            "user_id": translation_info.user_id
-        }
+    @traced("status.check_job_status")
+    async def check_job_status(self, translation_ids: List[str]) -> dict:
+        """Agrège le statut des sous-lots d'un job, interrogés en parallèle"""
+        try:
+            resolved = [await self._run_state(self._resolve_queued, translation_id)
+                        for translation_id in translation_ids]
+
+            async def batch_status(translation_id: str, queued_result: Optional[dict]) -> Dict[str, Any]:
+                if queued_result:
+                    return self._queued_batch_status(queued_result)
+                return await self._get_translation_status(translation_id)
+
+            statuses = list(await asyncio.gather(*(
+                batch_status(translation_id, queued_result) for translation_id, queued_result in resolved)))
+            response_data = self._aggregate_job_status(translation_ids, statuses)
+            await self._run_state(self._track_job_completion, self._resolved_ids(resolved), statuses, response_data)
+            await asyncio.gather(*(
+                self._settle_cached_async(translation_id, status)
+                for translation_id, status in zip(translation_ids, statuses)))
+            return self._check_result(response_data)
+        except Exception as e:
+            return self._check_error(e, job=True)
+
+    async def _settle_cached_async(self, translation_id: str, status: Dict[str, Any]) -> None:
+        """_settle_cached hors de la boucle : copies de blobs et stockage d'état synchrones"""
+        if get_translation_cache().enabled and self._is_final(status):
+            await asyncio.to_thread(self._settle_cached, translation_id, status)
+
+    @traced("status.get_job_documents")
+    async def get_job_documents(self, translation_ids: List[str]) -> List[Dict[str, Any]]:
+        """Liste les documents de tous les sous-lots, interrogés en parallèle"""
+        resolved = [await self._run_state(self._resolve_queued, translation_id)
+                    for translation_id in translation_ids]
+        # Sous-lots encore en file d'admission : aucun document à lister
+        translation_ids = [translation_id for translation_id, queued_result in resolved if not queued_result]
+        pages = await asyncio.gather(*(
+            self.translation_service.get_documents_status(translation_id)
+            for translation_id in translation_ids))
+        documents = []
+        for translation_id, page in zip(translation_ids, pages):
+            for document in page:
+                document["translation_id"] = translation_id
+                documents.append(document)
+        return documents
+
+    @traced("status.translation_status")
+    async def _get_translation_status(self, translation_id: str) -> Dict[str, Any]:
+        async def fetch():
+            status = await self.translation_service.check_translation_status(translation_id)
+            return status, self._status_ttl(status)
+
+        return await self.status_cache.get_or_fetch_async(translation_id, fetch)
+
+    @traced("status.languages_status")
+    async def _get_languages_status(self, translation_id: str,
+                                    ttl: Optional[float] = 0) -> Dict[str, Dict[str, Any]]:
+        async def fetch():
+            return await self.translation_service.get_documents_status(translation_id), ttl
 
-        # Option 1: URL de téléchargement direct
-        download_url = self.blob_service.get_translated_file_url(output_blob_name)
-        if download_url:
-            result["download_url"] = download_url
-            result["download_expires_at"] = time.time() + (24 * 3600)  # 24h
-
-        # Option 2: Upload vers OneDrive (si configuré)
-        if self.graph_service.is_configured():
-            try:
-                # Téléchargement du fichier depuis le blob
-                file_content = self.blob_service.download_translated_file(output_blob_name)
-                if file_content:
-                    # Upload vers OneDrive
-                    onedrive_result = self.graph_service.upload_to_onedrive(
-                        file_content=file_content,
-                        file_name=f"{translation_info.file_name}",
-                        user_id=translation_info.user_id
-                    )
-                    
-                    if onedrive_result["success"]:
-                        result["onedrive_url"] = onedrive_result["onedrive_url"]
-                        result["onedrive_file_id"] = onedrive_result.get("file_id")
-                        logger.info("✅ Fichier uploadé vers OneDrive")
-                    else:
-                        result["onedrive_error"] = onedrive_result["error"]
-                        logger.warning(f"⚠️ Erreur upload OneDrive: {onedrive_result['error']}")
-                else:
-                    result["onedrive_error"] = "Fichier traduit inaccessible"
-            except Exception as e:
-                result["onedrive_error"] = f"Erreur upload: {str(e)}"
-                logger.error(f"❌ Erreur upload OneDrive: {str(e)}")
-
-        return result
-
-    def _cleanup_after_completion(self, translation_info) -> None:
-        """Nettoie les ressources après completion"""
         try:
-            # Nettoyage des blobs après un délai (optionnel)
-            # En production, on pourrait vouloir garder les fichiers plus longtemps
-            cleanup_delay_hours = 1
-            
-            # Programmer le nettoyage (en production, utiliser une queue ou un timer)
-            # Pour l'instant, on ne fait qu'enregistrer l'intention
-            logger.info(f"🗑️ Nettoyage programmé dans {cleanup_delay_hours}h")
-            
+            documents = await self.status_cache.get_or_fetch_async(f"{translation_id}/documents", fetch)
+            return self._languages_from_documents(documents)
         except Exception as e:
-            logger.error(f"❌ Erreur programmation nettoyage: {str(e)}")
+            logger.warning(f"⚠️ Détail par langue indisponible: {str(e)}")
+            return {}
 
+    @traced("status.get_result")
+    async def get_result(self, translation_id: str) -> Dict[str, Any]:
+        """Récupère le résultat complet d'une traduction terminée"""
+        logger.info(f"📥 Récupération du résultat: {translation_id}")
+        try:
+            return self._build_result(translation_id, await self.check_status(translation_id))
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la récupération du résultat: {str(e)}")
+            return {
+                "success": False,
+                "message": f"Erreur de récupération: {str(e)}"
+            }
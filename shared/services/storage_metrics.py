@@ -0,0 +1,152 @@
+"""
+Compteurs d'allers-retours Azure Storage par requête HTTP
+Chaque tentative envoyée par les clients Blob (``raw_request_hook``) est comptée dans
+le contexte de la requête en cours (contextvar, hérité par les tâches asyncio et
+asyncio.to_thread) et dans les totaux par fonction exposés par /health
+"""
+
+import functools
+import inspect
+import logging
+import threading
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# En-tête de réponse portant le nombre d'allers-retours de la requête
+ROUND_TRIPS_HEADER = "X-Storage-Round-Trips"
+
+
+class RoundTrips:
+    """Allers-retours Storage d'une requête, par type d'opération"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.operations: Dict[str, int] = {}
+
+    def add(self, operation: str) -> None:
+        with self._lock:
+            self.operations[operation] = self.operations.get(operation, 0) + 1
+
+    @property
+    def total(self) -> int:
+        with self._lock:
+            return sum(self.operations.values())
+
+    def describe(self) -> str:
+        with self._lock:
+            return ", ".join(f"{name}={count}" for name, count in sorted(self.operations.items()))
+
+
+_current: ContextVar[Optional[RoundTrips]] = ContextVar("storage_round_trips", default=None)
+
+_totals_lock = threading.Lock()
+_totals: Dict[str, Dict[str, Any]] = {}
+_untracked = RoundTrips()
+
+
+def _operation(http_request) -> str:
+    """Nom court de l'opération Blob d'après la méthode et le paramètre ``comp``"""
+    method = http_request.method.upper()
+    comp = http_request.query.get("comp")
+    if method == "HEAD":
+        return "get_properties"
+    if method == "DELETE":
+        return "delete"
+    if method == "GET":
+        return "list" if comp == "list" else f"get_{comp}" if comp else "download"
+    if method == "PUT":
+        if "x-ms-copy-source" in http_request.headers:
+            return "copy"
+        return f"put_{comp}" if comp else "upload"
+    if method == "POST" and comp == "batch":
+        return "batch"
+    return method.lower()
+
+
+def record_request(request) -> None:
+    """``raw_request_hook`` des clients Blob : appelé à chaque tentative (retries compris)"""
+    operation = _operation(request.http_request)
+    trips = _current.get()
+    # Hors requête HTTP (timers, Event Grid) : compté à part
+    (trips if trips is not None else _untracked).add(operation)
+
+
+def current() -> Optional[RoundTrips]:
+    """Compteurs de la requête en cours (None hors d'une fonction suivie)"""
+    return _current.get()
+
+
+def _record_totals(function_name: str, trips: RoundTrips) -> None:
+    total = trips.total
+    with _totals_lock:
+        stats = _totals.setdefault(function_name, {
+            "requests": 0, "round_trips": 0, "max": 0, "operations": {}})
+        stats["requests"] += 1
+        stats["round_trips"] += total
+        stats["max"] = max(stats["max"], total)
+        for operation, count in trips.operations.items():
+            stats["operations"][operation] = stats["operations"].get(operation, 0) + count
+    logger.debug(f"📊 {function_name}: {total} appel(s) Storage ({trips.describe()})")
+
+
+def track_round_trips(function_name: str) -> Callable:
+    """
+    Décorateur de ``main`` : compte les allers-retours Storage de chaque requête
+    et les renvoie dans l'en-tête X-Storage-Round-Trips
+    """
+    def decorator(handler: Callable) -> Callable:
+        def finish(response, trips: RoundTrips):
+            if response is not None and hasattr(response, "headers"):
+                response.headers[ROUND_TRIPS_HEADER] = str(trips.total)
+            return response
+
+        if inspect.iscoroutinefunction(handler):
+            @functools.wraps(handler)
+            async def async_wrapper(*args, **kwargs):
+                trips = RoundTrips()
+                token = _current.set(trips)
+                try:
+                    return finish(await handler(*args, **kwargs), trips)
+                finally:
+                    _current.reset(token)
+                    _record_totals(function_name, trips)
+            return async_wrapper
+
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            trips = RoundTrips()
+            token = _current.set(trips)
+            try:
+                return finish(handler(*args, **kwargs), trips)
+            finally:
+                _current.reset(token)
+                _record_totals(function_name, trips)
+        return wrapper
+
+    return decorator
+
+
+def get_stats() -> Dict[str, Any]:
+    """Allers-retours moyens et maximaux par fonction depuis le démarrage du worker"""
+    with _totals_lock:
+        stats = {
+            name: {
+                "requests": values["requests"],
+                "mean": round(values["round_trips"] / values["requests"], 2),
+                "max": values["max"],
+                "operations": dict(values["operations"])
+            }
+            for name, values in _totals.items()
+        }
+    stats["untracked"] = {"round_trips": _untracked.total, "operations": dict(_untracked.operations)}
+    return stats
+
+
+def reset_stats() -> None:
+    """Remet les totaux à zéro (benchmarks)"""
+    global _untracked
+    with _totals_lock:
+        _totals.clear()
+        _untracked = RoundTrips()
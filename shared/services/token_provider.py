@@ -0,0 +1,254 @@
+"""
+Token d'accès Microsoft Graph partagé par toutes les instances de GraphService du processus
+Renouvellement en arrière-plan avant expiration, un seul appel OAuth à la fois
+et cache disque optionnel conservé au redémarrage du worker
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from shared.config import Config
+from shared.services import resilience
+from shared.services.service_registry import get_http_client
+from shared.services.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+class GraphTokenProvider:
+    """
+    Token client_credentials de Microsoft Graph
+    ``get_token`` ne contacte login.microsoftonline.com que si aucun token valide n'est
+    disponible ; les appelants concurrents attendent alors le même renouvellement
+    """
+
+    SCOPE = "https://graph.microsoft.com/.default"
+    # Un token n'est plus distribué s'il expire dans moins de EXPIRY_SKEW secondes
+    EXPIRY_SKEW = 60
+    # Délai avant une nouvelle tentative de renouvellement en arrière-plan
+    RETRY_SECONDS = 30
+
+    def __init__(self, refresh_margin: Optional[int] = None,
+                 background_refresh: Optional[bool] = None,
+                 cache_path: Optional[str] = None):
+        self.client_id = Config.CLIENT_ID
+        self.client_secret = Config.CLIENT_SECRET
+        self.tenant_id = Config.TENANT_ID
+        self.token_url = f"{Config.GRAPH_AUTHORITY_URL}/{self.tenant_id}/oauth2/v2.0/token"
+
+        self.refresh_margin = Config.GRAPH_TOKEN_REFRESH_MARGIN_SECONDS if refresh_margin is None else refresh_margin
+        self.background_refresh = (Config.GRAPH_TOKEN_BACKGROUND_REFRESH
+                                   if background_refresh is None else background_refresh)
+        self.cache_path = cache_path if cache_path is not None else Config.GRAPH_TOKEN_CACHE_PATH
+        # Un fichier de cache ne sert qu'à l'application (tenant + client) qui l'a écrit
+        self._cache_key = hashlib.sha256(f"{self.tenant_id}:{self.client_id}".encode()).hexdigest()[:16]
+
+        self._lock = threading.Lock()
+        # Single-flight : un seul appel OAuth, les autres appelants attendent son résultat
+        self._refresh_lock = threading.Lock()
+        self._access_token: Optional[str] = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._used_since_refresh = False
+
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self._fetches = 0
+        self._failures = 0
+        self._hits = 0
+
+        self._load_cache()
+
+    @property
+    def http(self):
+        """Client HTTP du worker, construit au premier appel OAuth (pas pour un token en cache)"""
+        return get_http_client()
+
+    def peek(self) -> Optional[str]:
+        """Token valide déjà disponible, sans appel réseau (None sinon)"""
+        now = time.time()
+        with self._lock:
+            if not self._access_token or now >= self._expires_at - self.EXPIRY_SKEW:
+                return None
+            # Sans renouvellement en arrière-plan, l'appelant renouvelle lui-même à l'approche de l'expiration
+            if not self.background_refresh and now >= self._refresh_at:
+                return None
+            self._hits += 1
+            self._used_since_refresh = True
+            token = self._access_token
+            # Token repris du disque, ou renouvellement suspendu par inactivité
+            restart_refresher = self.background_refresh and self._refresher is None
+
+        if restart_refresher:
+            self._ensure_refresher()
+        return token
+
+    def get_token(self) -> Optional[str]:
+        """Token valide, obtenu auprès de Microsoft Entra ID si nécessaire"""
+        token = self.peek()
+        if token:
+            return token
+
+        with self._refresh_lock:
+            # Un autre appelant a pu renouveler le token pendant l'attente
+            token = self.peek()
+            if token:
+                return token
+            token = self._fetch()
+            if token is None:
+                # Échec du renouvellement anticipé : le token courant reste utilisable
+                with self._lock:
+                    if self._access_token and time.time() < self._expires_at - self.EXPIRY_SKEW:
+                        return self._access_token
+            return token
+
+    @traced("auth.graph_token", "auth")
+    def _fetch(self) -> Optional[str]:
+        """Appel OAuth client_credentials (appelé sous _refresh_lock)"""
+        data = {
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'scope': self.SCOPE,
+            'grant_type': 'client_credentials'
+        }
+        try:
+            response = resilience.call(
+                resilience.AUTH, lambda: self.http.post(self.token_url, data=data, timeout=30))
+        except Exception as e:
+            self._record_failure()
+            logger.error(f"❌ Erreur lors de l'obtention du token: {str(e)}")
+            return None
+
+        if response.status_code != 200:
+            self._record_failure()
+            logger.error(
+                f"❌ Erreur obtention token: {response.status_code} {response.text[:200]}")
+            return None
+
+        token_data = response.json()
+        token = token_data.get('access_token')
+        expires_in = int(token_data.get('expires_in', 3600))
+        expires_at = time.time() + expires_in
+        with self._lock:
+            self._access_token = token
+            self._set_expiry(expires_at, expires_in)
+            self._used_since_refresh = False
+            self._fetches += 1
+
+        logger.info(f"🔑 Token Microsoft Graph obtenu (expire dans {int(expires_at - time.time())}s)")
+        self._save_cache(token, expires_at)
+        self._ensure_refresher()
+        return token
+
+    def _set_expiry(self, expires_at: float, lifetime: float) -> None:
+        """Expiration et date de renouvellement (au plus tard à mi-vie du token) ; sous _lock"""
+        self._expires_at = expires_at
+        self._refresh_at = expires_at - min(self.refresh_margin, lifetime / 2)
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+
+    def _ensure_refresher(self) -> None:
+        """Démarre le thread de renouvellement en arrière-plan s'il ne tourne pas"""
+        if not self.background_refresh:
+            return
+        with self._lock:
+            if self._refresher is not None and self._refresher.is_alive() or self._stop.is_set():
+                return
+            self._refresher = threading.Thread(
+                target=self._refresh_loop, name="graph-token-refresh", daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        """Renouvelle le token ``refresh_margin`` secondes avant son expiration"""
+        while True:
+            with self._lock:
+                wait = self._refresh_at - time.time()
+            if wait > 0 and self._stop.wait(wait):
+                return
+
+            with self._lock:
+                # Worker inactif : pas de renouvellement, le prochain appel obtiendra un token
+                if not self._used_since_refresh:
+                    logger.debug("🔑 Token Graph inutilisé, renouvellement suspendu")
+                    self._refresher = None
+                    return
+
+            with self._refresh_lock:
+                with self._lock:
+                    due = time.time() >= self._refresh_at
+                failed = due and self._fetch() is None
+
+            # Échec : nouvelle tentative tant que le token courant reste valide
+            if failed:
+                if self._stop.wait(self.RETRY_SECONDS):
+                    return
+                with self._lock:
+                    if time.time() >= self._expires_at - self.EXPIRY_SKEW:
+                        self._refresher = None
+                        return
+
+    def _load_cache(self) -> None:
+        """Reprend un token encore valide depuis le cache disque"""
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                cached = json.load(cache_file)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"⚠️ Cache du token Graph illisible: {str(e)}")
+            return
+
+        if cached.get("key") != self._cache_key:
+            return
+        if cached.get("expires_at", 0) - self.EXPIRY_SKEW > time.time():
+            self._access_token = cached.get("access_token")
+            self._set_expiry(float(cached["expires_at"]), float(cached["expires_at"]) - time.time())
+            logger.info("🔑 Token Microsoft Graph repris du cache disque")
+
+    def _save_cache(self, token: str, expires_at: float) -> None:
+        """Écrit le token dans le cache disque (remplacement atomique, lisible par le seul propriétaire)"""
+        if not self.cache_path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".graph-token-")
+            try:
+                os.chmod(temp_path, 0o600)
+                with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+                    json.dump({"key": self._cache_key, "access_token": token, "expires_at": expires_at},
+                              cache_file)
+                os.replace(temp_path, self.cache_path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except Exception as e:
+            logger.warning(f"⚠️ Écriture du cache du token Graph impossible: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compteurs d'appels OAuth et de tokens servis depuis la mémoire"""
+        with self._lock:
+            return {
+                "token_valid": bool(self._access_token) and time.time() < self._expires_at - self.EXPIRY_SKEW,
+                "expires_in": max(int(self._expires_at - time.time()), 0) if self._access_token else 0,
+                "fetches": self._fetches,
+                "failures": self._failures,
+                "hits": self._hits,
+                "background_refresh": self._refresher is not None and self._refresher.is_alive(),
+                "disk_cache": bool(self.cache_path)
+            }
+
+    def close(self) -> None:
+        """Arrête le renouvellement en arrière-plan"""
+        self._stop.set()
@@ -0,0 +1,355 @@
+"""
+Traces distribuées des fonctions, sur le modèle OpenTelemetry (trace, spans, traceparent W3C)
+Sans dépendance : le span courant vit dans une contextvar (héritée par les tâches asyncio
+et asyncio.to_thread), les spans d'une requête sont exportés à sa fin (journal ou fichier
+JSON lines, hors ligne) et résumés dans l'en-tête Server-Timing
+"""
+
+import functools
+import inspect
+import json
+import logging
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from shared.config import Config
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+TRACE_ID_HEADER = "X-Trace-Id"
+
+# Catégories des appels externes, reprises dans Server-Timing ; les autres spans sont des étapes
+EXTERNAL_CATEGORIES = ("storage", "sas", "translator", "graph", "auth")
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Span:
+    """Opération chronométrée d'une trace"""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "category", "attributes",
+                 "start_time", "_start", "duration_ms", "error", "counted", "_categories")
+
+    def __init__(self, trace: "_Trace", name: str, category: str,
+                 parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = _new_id(64)
+        self.parent_id = parent.span_id if parent else trace.remote_parent_id
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[str] = None
+        # Un span imbriqué dans un span de même catégorie n'est pas recompté dans Server-Timing
+        parent_categories = parent._categories if parent is not None else frozenset()
+        self.counted = category in EXTERNAL_CATEGORIES and category not in parent_categories
+        self._categories = parent_categories | {category} if self.counted else parent_categories
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Représentation proche d'un span OTLP/JSON"""
+        start_ns = int(self.start_time * 1e9)
+        return {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "category": self.category,
+            "startTimeUnixNano": start_ns,
+            "endTimeUnixNano": start_ns + int((self.duration_ms or 0) * 1e6),
+            "durationMs": round(self.duration_ms or 0, 3),
+            "attributes": self.attributes,
+            "status": {"code": "ERROR", "message": self.error} if self.error else {"code": "OK"}
+        }
+
+
+class _NoopSpan:
+    """Span de substitution hors requête suivie ou traces désactivées"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Trace:
+    """Spans terminés d'une requête"""
+
+    def __init__(self, trace_id: Optional[str] = None, remote_parent_id: Optional[str] = None):
+        self.trace_id = trace_id or _new_id(128)
+        self.remote_parent_id = remote_parent_id
+        self.root: Optional[Span] = None
+        self._lock = threading.Lock()
+        self.spans: List[Span] = []
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def finished(self) -> List[Span]:
+        with self._lock:
+            return list(self.spans)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("trace_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def _parse_traceparent(value: Optional[str]):
+    """(trace_id, parent_id) d'un en-tête traceparent valide, sinon (None, None)"""
+    match = _TRACEPARENT_RE.match((value or "").strip().lower())
+    if not match or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None, None
+    return match.group(1), match.group(2)
+
+
+@contextmanager
+def span(name: str, category: str = "stage", **attributes: Any) -> Iterator[Any]:
+    """Chronomètre un bloc comme span enfant du span courant (no-op hors requête suivie)"""
+    parent = _current_span.get()
+    if parent is None:
+        yield _NOOP_SPAN
+        return
+
+    current = Span(parent.trace, name, category, parent, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.duration_ms = current.elapsed_ms()
+        current.trace.add(current)
+
+
+def traced(name: str, category: str = "stage") -> Callable:
+    """Décorateur : chaque appel de la fonction (synchrone ou async) devient un span"""
+    def decorator(function: Callable) -> Callable:
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with span(name, category):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name, category):
+                return function(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def inject(headers: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+    """En-têtes sortants complétés du traceparent du span courant (Translator, Graph)"""
+    current = _current_span.get()
+    if current is None:
+        return headers
+    headers = dict(headers or {})
+    headers.setdefault(TRACEPARENT_HEADER, current.traceparent())
+    return headers
+
+
+def server_timing() -> Optional[str]:
+    """
+    Valeur Server-Timing de la requête en cours : durée cumulée par catégorie d'appel
+    externe (desc = nombre d'appels) et durée totale écoulée depuis le début de la requête
+    """
+    current = _current_span.get()
+    if current is None:
+        return None
+
+    totals: Dict[str, List[float]] = {}
+    for finished in current.trace.finished():
+        if finished.counted:
+            entry = totals.setdefault(finished.category, [0.0, 0])
+            entry[0] += finished.duration_ms
+            entry[1] += 1
+
+    root = current.trace.root
+    metrics = [f'{category};dur={duration:.1f};desc="{count}"'
+               for category, (duration, count) in totals.items()]
+    metrics.append(f"total;dur={root.elapsed_ms():.1f}")
+    return ", ".join(metrics)
+
+
+def response_headers() -> Dict[str, str]:
+    """En-têtes de trace à ajouter à la réponse HTTP (vide hors requête suivie)"""
+    current = _current_span.get()
+    if current is None:
+        return {}
+    return {
+        "Server-Timing": server_timing(),
+        TRACE_ID_HEADER: current.trace_id
+    }
+
+
+class LogExporter:
+    """Une ligne INFO par requête (répartition par catégorie), le détail des spans en DEBUG"""
+
+    def export(self, root: Span, spans: List[Span]) -> None:
+        totals: Dict[str, float] = {}
+        for finished in spans:
+            if finished.counted:
+                totals[finished.category] = totals.get(finished.category, 0.0) + finished.duration_ms
+        breakdown = ", ".join(f"{category} {duration:.1f} ms" for category, duration in totals.items())
+        logger.info(f"🧭 Trace {root.trace_id} {root.name}: {root.duration_ms:.1f} ms"
+                    + (f" ({breakdown})" if breakdown else ""))
+        if logger.isEnabledFor(logging.DEBUG):
+            for finished in spans:
+                logger.debug(f"   {finished.category:<10} {finished.name:<40} {finished.duration_ms:>8.1f} ms")
+
+
+class FileExporter:
+    """Spans au format JSON lines (un span OTLP/JSON par ligne), lisibles hors ligne"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, root: Span, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(finished.to_dict(), ensure_ascii=False, default=str) + "\n"
+                        for finished in spans)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as export_file:
+                export_file.write(lines)
+        except OSError as e:
+            logger.warning(f"⚠️ Export des traces impossible ({self.path}): {str(e)}")
+
+
+_exporter: Any = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter():
+    """Exporteur configuré par TRACE_EXPORTER (None si 'none')"""
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                kind = Config.TRACE_EXPORTER
+                if kind == "log":
+                    _exporter = LogExporter()
+                elif kind == "file":
+                    _exporter = FileExporter(Config.TRACE_EXPORT_PATH)
+                else:
+                    if kind != "none":
+                        logger.warning(f"⚠️ TRACE_EXPORTER inconnu: {kind}, export désactivé")
+                    _exporter = False
+    return _exporter or None
+
+
+def set_exporter(exporter) -> None:
+    """Remplace l'exporteur (benchmarks, exporteur personnalisé)"""
+    global _exporter
+    _exporter = exporter if exporter is not None else False
+
+
+def _export(root: Span) -> None:
+    exporter = get_exporter()
+    if exporter is None:
+        return
+    try:
+        exporter.export(root, root.trace.finished())
+    except Exception as e:
+        logger.warning(f"⚠️ Export de la trace {root.trace_id} impossible: {str(e)}")
+
+
+def _request_headers(args) -> Dict[str, str]:
+    """En-têtes de la requête HTTP passée au handler (premier argument qui en porte)"""
+    for argument in args:
+        headers = getattr(argument, "headers", None)
+        if headers is not None:
+            return headers
+    return {}
+
+
+def trace_request(function_name: str) -> Callable:
+    """
+    Décorateur de ``main`` : ouvre le span racine de la requête, en reprenant
+    le traceparent entrant s'il est fourni, puis exporte la trace à la fin
+    """
+    def decorator(handler: Callable) -> Callable:
+        def open_root(args) -> Span:
+            trace_id, parent_id = _parse_traceparent(_request_headers(args).get(TRACEPARENT_HEADER))
+            trace = _Trace(trace_id, parent_id)
+            root = Span(trace, function_name, "request", None, {"function": function_name})
+            trace.root = root
+            return root
+
+        def record_status(root: Span, response):
+            status_code = getattr(response, "status_code", None)
+            if status_code is not None:
+                root.set_attribute("http.status_code", status_code)
+            return response
+
+        def close_root(root: Span) -> None:
+            root.duration_ms = root.elapsed_ms()
+            root.trace.add(root)
+            _export(root)
+
+        if inspect.iscoroutinefunction(handler):
+            @functools.wraps(handler)
+            async def async_wrapper(*args, **kwargs):
+                if not Config.TRACING_ENABLED:
+                    return await handler(*args, **kwargs)
+                root = open_root(args)
+                token = _current_span.set(root)
+                try:
+                    return record_status(root, await handler(*args, **kwargs))
+                except BaseException as e:
+                    root.error = f"{type(e).__name__}: {e}"
+                    raise
+                finally:
+                    _current_span.reset(token)
+                    close_root(root)
+            return async_wrapper
+
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            if not Config.TRACING_ENABLED:
+                return handler(*args, **kwargs)
+            root = open_root(args)
+            token = _current_span.set(root)
+            try:
+                return record_status(root, handler(*args, **kwargs))
+            except BaseException as e:
+                root.error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                _current_span.reset(token)
+                close_root(root)
+        return wrapper
+
+    return decorator
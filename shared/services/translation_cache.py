@@ -0,0 +1,299 @@
+"""
+Cache des traductions adressé par le contenu
+Clé : empreinte du document source + langue cible + options Translator
+Un document déjà traduit est recopié immédiatement vers le conteneur de sortie,
+une requête identique à un job en cours se rattache à ce job
+Jobs en cours et requêtes rattachées vivent dans le stockage d'état (partagés entre workers) ;
+les sorties sont publiées quand check_status constate la fin du job
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import quote
+
+from shared.config import Config
+from shared.services.service_registry import get_blob_service, get_state_store
+
+logger = logging.getLogger(__name__)
+
+# Préfixe des IDs renvoyés pour une requête servie entièrement depuis le cache
+CACHED_TRANSLATION_PREFIX = "cached-"
+
+# Types de documents du stockage d'état
+# Clé de cache → job en cours (translation_id absent tant que la soumission n'a pas abouti)
+CACHE_PENDING = "translation_cache_pending"
+# ID renvoyé au client → sorties à publier et sorties des requêtes rattachées
+CACHE_JOB = "translation_cache_job"
+# Sortie d'une requête rattachée → ID du job qui la produira (get_result sans ID de traduction)
+CACHE_OUTPUT = "translation_cache_output"
+
+
+class TranslationCache:
+    """Cache des fichiers traduits et déduplication des jobs en cours"""
+
+    # Attente maximale d'une requête identique en cours de soumission
+    SUBMIT_WAIT_SECONDS = 30
+    # Intervalle de relecture d'une soumission en cours
+    SUBMIT_POLL_SECONDS = 0.2
+
+    def __init__(self):
+        self.enabled = Config.TRANSLATION_CACHE_ENABLED
+        self.container_name = Config.TRANSLATION_CACHE_CONTAINER
+        self.retention_hours = Config.TRANSLATION_CACHE_RETENTION_HOURS
+        self.pending_timeout = Config.TRANSLATION_CACHE_PENDING_TIMEOUT_MINUTES * 60
+        self.blob_service = get_blob_service()
+        self.store = get_state_store()
+
+        # Jobs en cours et requêtes rattachées doivent être visibles de tous les workers
+        if self.enabled and self.store.backend.name != "table":
+            logger.warning(
+                f"⚠️ Cache des traductions désactivé : STATE_BACKEND={self.store.backend.name}, "
+                f"'table' requis pour partager les jobs en cours entre workers")
+            self.enabled = False
+
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._attached = 0
+        self._stored = 0
+
+        if self.enabled:
+            self._ensure_container()
+
+        logger.info(f"✅ TranslationCache initialisé (actif={self.enabled}, conteneur={self.container_name})")
+
+    def _ensure_container(self) -> None:
+        from azure.core.exceptions import ResourceExistsError
+
+        try:
+            self.blob_service.blob_service_client.create_container(self.container_name)
+            logger.info(f"📦 Conteneur de cache créé: {self.container_name}")
+        except ResourceExistsError:
+            pass
+        except Exception as e:
+            logger.warning(f"⚠️ Conteneur de cache indisponible: {str(e)}")
+
+    @staticmethod
+    def build_key(content_hash: str, target_language: str,
+                  options: Optional[Dict[str, Any]] = None) -> str:
+        """Clé de cache : SHA-256 de (empreinte du contenu, langue, options)"""
+        payload = json.dumps(
+            [content_hash, target_language.lower(), options or {}],
+            sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def resolve(self, content_hash: str, output_blob_names: Dict[str, str],
+                options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Détermine pour chaque langue : fichier en cache, job en cours ou nouvelle soumission
+        Les fichiers en cache sont recopiés vers ``output_blob_names`` avant le retour
+        Retourne {"hits": [...], "attached": {langue: translation_id}, "submit": {langue: clé}}
+        Les clés de ``submit`` doivent ensuite passer par register_job() ou abandon()
+        """
+        resolution = {"hits": [], "attached": {}, "submit": {}}
+        for language, output_blob_name in output_blob_names.items():
+            key = self.build_key(content_hash, language, options)
+
+            # 1. Job identique en cours : rattachement
+            translation_id = self._attach(key, output_blob_name)
+            if translation_id:
+                resolution["attached"][language] = translation_id
+                continue
+
+            # 2. Fichier déjà traduit : copie vers le conteneur de sortie
+            if self.blob_service.copy_blob(self.container_name, key,
+                                           Config.OUTPUT_CONTAINER, output_blob_name):
+                with self._lock:
+                    self._hits += 1
+                resolution["hits"].append(language)
+                logger.info(f"🎯 Traduction servie depuis le cache: {output_blob_name}")
+                continue
+
+            # 3. Absent : la requête devient responsable de la soumission
+            translation_id = self._claim(key, output_blob_name)
+            if translation_id:
+                resolution["attached"][language] = translation_id
+            else:
+                resolution["submit"][language] = key
+
+        return resolution
+
+    def _attach(self, key: str, output_blob_name: str) -> Optional[str]:
+        """Rattache la requête au job en cours pour ``key`` et retourne son ID"""
+        deadline = time.monotonic() + self.SUBMIT_WAIT_SECONDS
+        while True:
+            pending = self.store.get(CACHE_PENDING, key)
+            if pending is None:
+                return None
+            if time.time() - pending["started_at"] > self.pending_timeout:
+                self.store.delete(CACHE_PENDING, key)
+                return None
+            if pending.get("translation_id"):
+                break
+            # Soumission en cours par une autre requête : attendre son ID
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.SUBMIT_POLL_SECONDS)
+
+        translation_id = pending["translation_id"]
+        job = self.store.get(CACHE_JOB, translation_id)
+        if job is None or key not in job["outputs"]:
+            # Job déjà publié : la clé est obsolète
+            return None
+        followers = job["followers"].get(key, [])
+        if output_blob_name != job["outputs"][key] and output_blob_name not in followers:
+            self.store.put(CACHE_JOB, translation_id, {
+                **job,
+                "followers": {**job["followers"], key: followers + [output_blob_name]}
+            })
+            self.store.put(CACHE_OUTPUT, output_blob_name, {
+                "translation_id": translation_id,
+                "started_at": time.time()
+            })
+            self.store.flush()
+        with self._lock:
+            self._attached += 1
+        logger.info(f"🔗 Requête rattachée au job en cours {translation_id}")
+        return translation_id
+
+    def _claim(self, key: str, output_blob_name: str) -> Optional[str]:
+        """
+        Réserve la clé pour une nouvelle soumission (retourne None)
+        Si une requête concurrente l'a réservée, s'y rattache et retourne l'ID de son job
+        """
+        for _ in range(2):
+            # Création conditionnelle sur le backend : une seule requête, tous workers confondus
+            if self.store.insert(CACHE_PENDING, key, {
+                "output_blob_name": output_blob_name,
+                "translation_id": None,
+                "started_at": time.time()
+            }):
+                with self._lock:
+                    self._misses += 1
+                return None
+            # Réservée par une requête concurrente : rattachement à son job
+            translation_id = self._attach(key, output_blob_name)
+            if translation_id:
+                return translation_id
+
+        # Soumission concurrente bloquée : job séparé, sans réservation
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def register_job(self, keys: Dict[str, str], translation_id: str,
+                     output_blob_names: Dict[str, str]) -> None:
+        """Associe les clés réservées au job soumis et libère les requêtes en attente"""
+        claimed = {}
+        for language, key in keys.items():
+            pending = self.store.get(CACHE_PENDING, key)
+            # Réservation détenue par une autre requête : ne pas la détourner
+            if (pending is None or pending.get("translation_id") or
+                    pending["output_blob_name"] != output_blob_names[language]):
+                continue
+            claimed[key] = pending
+        if not claimed:
+            return
+
+        # Suivi du job écrit avant les réservations : une requête qui voit l'ID trouve le job
+        self.store.put(CACHE_JOB, translation_id, {
+            "started_at": time.time(),
+            "outputs": {key: pending["output_blob_name"] for key, pending in claimed.items()},
+            "followers": {}
+        })
+        for key, pending in claimed.items():
+            self.store.put(CACHE_PENDING, key, {**pending, "translation_id": translation_id})
+        self.store.flush()
+
+    def abandon(self, keys: Dict[str, str]) -> None:
+        """Libère les clés réservées d'une soumission échouée"""
+        for key in keys.values():
+            pending = self.store.get(CACHE_PENDING, key)
+            if pending is not None and not pending.get("translation_id"):
+                self.store.delete(CACHE_PENDING, key)
+        self.store.flush()
+
+    def settle(self, translation_id: str, succeeded: bool) -> None:
+        """
+        Job terminé, constaté par check_status : en cas de succès, sorties copiées
+        dans le cache et vers les requêtes rattachées ; les clés sont ensuite libérées
+        Sans effet pour un job inconnu du cache (appelé à chaque statut final)
+        """
+        job = self.store.get(CACHE_JOB, translation_id)
+        if job is None:
+            return
+
+        if succeeded:
+            for key, output_blob_name in job["outputs"].items():
+                self._publish(translation_id, key, output_blob_name, job["followers"].get(key, []))
+
+        for key in job["outputs"]:
+            pending = self.store.get(CACHE_PENDING, key)
+            if pending is not None and pending.get("translation_id") == translation_id:
+                self.store.delete(CACHE_PENDING, key)
+        for followers in job["followers"].values():
+            for follower in followers:
+                self.store.delete(CACHE_OUTPUT, follower)
+        self.store.delete(CACHE_JOB, translation_id)
+        self.store.flush()
+
+    def job_for_output(self, output_blob_name: str) -> Optional[str]:
+        """ID du job dont dépend la sortie d'une requête rattachée, None si elle n'en attend aucun"""
+        document = self.store.get(CACHE_OUTPUT, output_blob_name)
+        return document["translation_id"] if document else None
+
+    def _publish(self, translation_id: str, key: str, output_blob_name: str, followers: list) -> None:
+        """Copie un fichier traduit dans le cache et vers les sorties des requêtes rattachées"""
+        try:
+            metadata = {
+                "translation_id": translation_id,
+                "output_blob_name": quote(output_blob_name)
+            }
+            if not self.blob_service.copy_blob(Config.OUTPUT_CONTAINER, output_blob_name,
+                                               self.container_name, key, metadata=metadata):
+                return
+            with self._lock:
+                self._stored += 1
+            logger.info(f"💾 Traduction mise en cache: {output_blob_name}")
+
+            for follower in followers:
+                self.blob_service.copy_blob(Config.OUTPUT_CONTAINER, output_blob_name,
+                                            Config.OUTPUT_CONTAINER, follower)
+                logger.info(f"🔗 Sortie copiée pour une requête rattachée: {follower}")
+        except Exception as e:
+            logger.error(f"❌ Erreur mise en cache de {output_blob_name}: {str(e)}")
+
+    def sweep(self) -> Dict[str, Any]:
+        """Supprime les entrées plus anciennes que TRANSLATION_CACHE_RETENTION_HOURS"""
+        report = self.blob_service.sweep_old_files(
+            self.container_name, max_age_hours=self.retention_hours)
+
+        # Jobs en cours jamais terminés (ou dont le statut final n'a jamais été consulté)
+        cutoff = time.time() - self.pending_timeout
+        for kind in (CACHE_PENDING, CACHE_JOB, CACHE_OUTPUT):
+            for key, _ in self.store.find(kind, started_before=cutoff):
+                self.store.delete(kind, key)
+        self.store.flush()
+        return report
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compteurs de hits/misses/rattachements"""
+        pending = self.store.count(CACHE_PENDING)
+        with self._lock:
+            lookups = self._hits + self._misses + self._attached
+            return {
+                "enabled": self.enabled,
+                "container": self.container_name,
+                "retention_hours": self.retention_hours,
+                "pending": pending,
+                "hits": self._hits,
+                "misses": self._misses,
+                "attached": self._attached,
+                "stored": self._stored,
+                "hit_ratio": round((self._hits + self._attached) / lookups, 3) if lookups else 0.0
+            }
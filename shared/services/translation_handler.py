@@ -6,18 +6,19 @@ Remplace la fonction durable orchestrator
 import logging
 import uuid
 import time
-from typing import Dict, Any
-from shared.services.blob_service import BlobService
-from shared.services.translation_service import TranslationService
+from typing import Dict, Any, List, Union
+from shared.services.service_registry import get_blob_service, get_translation_service
 from shared.services.state_manager import StateManager
 from shared.models.schemas import (
     TranslationRequest, 
     TranslationInfo, 
     TranslationStatus,
     validate_file_format,
-    validate_language_code
+    validate_language_code,
+    normalize_target_languages
 )
 from shared.config import Config
+from shared.services.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -26,25 +27,28 @@ class TranslationHandler:
     """Handler pour orchestrer les traductions de documents"""
 
     def __init__(self):
-        self.blob_service = BlobService()
-        self.translation_service = TranslationService()
+        self.blob_service = get_blob_service()
+        self.translation_service = get_translation_service()
         self.state_manager = StateManager()
         self.max_age_hours = Config.CLEANUP_INTERVAL_HOURS
 
         logger.info("✅ TranslationHandler initialisé")
 
+    @traced("translation.start")
     def start_translation(self, file_content: str, file_name: str, 
-                         target_language: str, user_id: str) -> Dict[str, Any]:
+                         target_language: Union[str, List[str]], user_id: str) -> Dict[str, Any]:
         """
         Démarre une nouvelle traduction
         Remplace l'orchestrator de la fonction durable
+        ``target_language`` accepte une liste : un seul job Azure couvre toutes les langues
         """
+        target_languages = normalize_target_languages(target_language)
         logger.info(f"🚀 Nouveau processus de traduction pour {user_id}")
-        logger.info(f"📄 Fichier: {file_name} → {target_language}")
+        logger.info(f"📄 Fichier: {file_name} → {', '.join(target_languages)}")
 
         try:
             # Validation des paramètres
-            validation_errors = self._validate_request(file_content, file_name, target_language, user_id)
+            validation_errors = self._validate_request(file_content, file_name, target_languages, user_id)
             if validation_errors:
                 return {
                     "success": False,
@@ -61,7 +65,7 @@ class TranslationHandler:
                 blob_urls = self.blob_service.prepare_blobs(
                     file_content_base64=file_content,
                     file_name=file_name,
-                    target_language=target_language
+                    target_language=target_languages
                 )
                 logger.info("✅ Blobs préparés avec succès")
             except Exception as e:
@@ -76,17 +80,17 @@ class TranslationHandler:
             try:
                 azure_translation_id = self.translation_service.start_translation(
                     source_url=blob_urls["source_url"],
-                    target_url=blob_urls["target_url"],
-                    target_language=target_language
+                    targets=blob_urls["targets"]
                 )
                 logger.info(f"✅ Traduction démarrée avec l'ID Azure: {azure_translation_id}")
             except Exception as e:
                 logger.error(f"❌ Erreur démarrage traduction: {str(e)}")
                 # Nettoyage des blobs en cas d'erreur
-                self.blob_service.cleanup_translation_files(
-                    blob_urls["input_blob_name"], 
-                    blob_urls["output_blob_name"]
-                )
+                for target in blob_urls["targets"]:
+                    self.blob_service.cleanup_translation_files(
+                        blob_urls["input_blob_name"],
+                        target["output_blob_name"]
+                    )
                 return {
                     "success": False,
                     "message": f"Erreur de démarrage de traduction: {str(e)}"
@@ -96,7 +100,8 @@ class TranslationHandler:
             logger.info("💾 Étape 3: Sauvegarde de l'état...")
             translation_info = TranslationInfo(
                 file_name=file_name,
-                target_language=target_language,
+                target_language=target_languages[0],
+                target_languages=target_languages,
                 user_id=user_id,
                 blob_urls=blob_urls,
                 status=TranslationStatus.IN_PROGRESS.value,
@@ -108,6 +113,10 @@ class TranslationHandler:
             if not success:
                 logger.warning("⚠️ Impossible de sauvegarder l'état (continuons quand même)")
 
+            # Sorties attendues, complétées par les événements BlobCreated
+            self.state_manager.register_expected_outputs(
+                azure_translation_id, [target["output_blob_name"] for target in blob_urls["targets"]])
+
             # Retour du résultat
             result = {
                 "translation_id": translation_id,
@@ -115,9 +124,14 @@ class TranslationHandler:
                 "status": TranslationStatus.IN_PROGRESS.value,
                 "message": "Traduction démarrée avec succès",
                 "file_name": file_name,
-                "target_language": target_language,
+                "target_language": target_languages[0],
                 "started_at": time.time()
             }
+            if len(target_languages) > 1:
+                result["target_languages"] = target_languages
+                result["output_blob_names"] = {
+                    target["language"]: target["output_blob_name"] for target in blob_urls["targets"]
+                }
 
             logger.info(f"✅ Traduction {translation_id} démarrée avec succès")
             return {
@@ -133,6 +147,7 @@ class TranslationHandler:
                 "message": f"Erreur interne: {str(e)}"
             }
 
+    @traced("translation.cancel")
     def cancel_translation(self, translation_id: str) -> Dict[str, Any]:
         """
         Annule une traduction en cours
@@ -153,11 +168,17 @@ class TranslationHandler:
                 translation_info.translation_id
             )
 
-            # Nettoyage des blobs
-            cleanup_success = self.blob_service.cleanup_translation_files(
-                translation_info.blob_urls.input_blob_name,
-                translation_info.blob_urls.output_blob_name
-            )
+            # Nettoyage des blobs (une sortie par langue cible)
+            output_blob_names = [
+                target["output_blob_name"] for target in (translation_info.blob_urls.targets or [])
+            ] or [translation_info.blob_urls.output_blob_name]
+            cleanup_success = all([
+                self.blob_service.cleanup_translation_files(
+                    translation_info.blob_urls.input_blob_name,
+                    output_blob_name
+                )
+                for output_blob_name in output_blob_names
+            ])
 
             # Mise à jour de l'état
             translation_info.status = TranslationStatus.FAILED.value
@@ -185,8 +206,9 @@ class TranslationHandler:
                 "message": f"Erreur d'annulation: {str(e)}"
             }
 
+    @traced("translation.validate")
     def _validate_request(self, file_content: str, file_name: str, 
-                         target_language: str, user_id: str) -> list:
+                         target_languages: List[str], user_id: str) -> list:
         """Validate request parameters"""
         errors = []
 
@@ -200,11 +222,14 @@ class TranslationHandler:
         elif not validate_file_format(file_name):
             errors.append(f"Unsupported file format: {file_name}")
 
-        # Validate target language
-        if not target_language or not target_language.strip():
+        # Validate target languages
+        if not target_languages:
             errors.append("Missing target language")
-        elif not validate_language_code(target_language):
-            errors.append(f"Unsupported language code: {target_language}")
+        elif len(target_languages) > Config.MAX_TARGET_LANGUAGES:
+            errors.append(f"Too many target languages (max {Config.MAX_TARGET_LANGUAGES})")
+        for target_language in target_languages:
+            if not validate_language_code(target_language):
+                errors.append(f"Unsupported language code: {target_language}")
 
         # Validate user identifier
         if not user_id or not user_id.strip():
@@ -220,6 +245,7 @@ class TranslationHandler:
             logger.error(f"❌ Erreur comptage traductions: {str(e)}")
             return 0
 
+    @traced("translation.cleanup_old")
     def cleanup_old_translations(self, max_age_hours: int = 2) -> int:
         """Nettoie les anciennes traductions"""
         try:
@@ -4,16 +4,45 @@ Adapté du code conteneur existant
 """
 
 import logging
-import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse
 from shared.config import Config
+from shared.services import resilience
+from shared.services.http_client import HttpClientError
+from shared.services.resilience import (
+    CircuitOpenError,
+    RETRYABLE_STATUSES,
+    SAFE_RETRY_STATUSES,
+    parse_retry_after
+)
+from shared.services.tracing import traced
+from shared.services.service_registry import get_async_http_client, get_http_client
 
 logger = logging.getLogger(__name__)
 
 
+class TranslatorThrottledError(Exception):
+    """Soumission refusée par Translator (HTTP 429 ou 503), à retenter après ``retry_after`` secondes"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class TranslationService:
     """Service pour la traduction de documents via Azure Translator"""
 
+    # Mapping des statuts Azure vers des statuts simplifiés
+    STATUS_MAPPING = {
+        'NotStarted': 'Pending',
+        'Running': 'InProgress',
+        'Succeeded': 'Succeeded',
+        'Failed': 'Failed',
+        'Cancelled': 'Failed',
+        'Cancelling': 'InProgress',
+        'ValidationFailed': 'Failed'
+    }
+
     def __init__(self):
         # Configuration Azure Translator
         self.trans_key = Config.TRANSLATOR_KEY
@@ -37,176 +66,307 @@ class TranslationService:
             'Ocp-Apim-Subscription-Key': self.trans_key
         }
 
+        # Session HTTP keep-alive partagée par le worker
+        self.http = self._http_client()
+
         logger.info("✅ TranslationService initialisé")
 
-    def start_translation(self, source_url: str, target_url: str, target_language: str) -> str:
+    def _http_client(self):
+        return get_http_client()
+
+    def start_translation(self, source_url: str, target_url: Optional[str] = None,
+                          target_language: Optional[str] = None,
+                          targets: Optional[List[Dict[str, str]]] = None) -> str:
         """
         Démarre une traduction batch
         Version synchrone pour Azure Functions
+        ``targets`` (liste de {"target_url", "language"}) permet de traduire
+        le document vers plusieurs langues dans un seul job
         """
-        logger.info(f"🚀 Démarrage traduction batch vers {target_language}")
-        logger.info(f"📂 Source: {source_url}")
-        logger.info(f"📁 Target: {target_url}")
+        return self._submit_batch(self._file_batch_body(source_url, target_url, target_language, targets))
 
-        try:
-            # Corps de la requête pour l'API Batch Translation
-            body = {
-                "inputs": [
-                    {
-                        "storageType": "File",
-                        "source": {
-                            "sourceUrl": source_url
-                        },
-                        "targets": [
-                            {
-                                "targetUrl": target_url,
-                                "language": target_language
-                            }
-                        ]
-                    }
-                ]
+    def start_folder_translation(self, source_url: str, prefix: str,
+                                 targets: List[Dict[str, str]]) -> str:
+        """
+        Démarre une traduction batch de type Folder (plusieurs documents)
+        ``source_url`` est un SAS de conteneur filtré sur ``prefix``
+        """
+        return self._submit_batch(self._folder_batch_body(source_url, prefix, targets))
+
+    def _file_batch_body(self, source_url: str, target_url: Optional[str],
+                         target_language: Optional[str],
+                         targets: Optional[List[Dict[str, str]]]) -> Dict[str, Any]:
+        """Corps d'une requête Batch Translation pour un document"""
+        if targets is None:
+            targets = [{"target_url": target_url, "language": target_language}]
+
+        languages = ', '.join(target["language"] for target in targets)
+        logger.info(f"🚀 Démarrage traduction batch vers {languages}")
+
+        # Corps de la requête pour l'API Batch Translation
+        return {
+            "inputs": [
+                {
+                    "storageType": "File",
+                    "source": {
+                        "sourceUrl": source_url
+                    },
+                    "targets": self._batch_targets(targets)
+                }
+            ]
+        }
+
+    def _folder_batch_body(self, source_url: str, prefix: str,
+                           targets: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Corps d'une requête Batch Translation de type Folder"""
+        languages = ', '.join(target["language"] for target in targets)
+        logger.info(f"🚀 Démarrage traduction Folder '{prefix}' vers {languages}")
+
+        return {
+            "inputs": [
+                {
+                    "storageType": "Folder",
+                    "source": {
+                        "sourceUrl": source_url,
+                        "filter": {
+                            "prefix": prefix
+                        }
+                    },
+                    "targets": self._batch_targets(targets)
+                }
+            ]
+        }
+
+    @staticmethod
+    def _batch_targets(targets: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        return [
+            {
+                "targetUrl": target["target_url"],
+                "language": target["language"]
             }
+            for target in targets
+        ]
 
-            # Envoi de la requête
-            logger.info("📤 Envoi de la requête de traduction...")
-            response = requests.post(
+    def get_cache_options(self) -> Dict[str, Any]:
+        """
+        Options qui déterminent le contenu traduit (clé du cache de traductions)
+        Un changement de version d'API invalide les traductions en cache
+        """
+        return {
+            "api": urlparse(self.batch_api_url).path.strip("/"),
+            "storage_type": "File"
+        }
+
+    @traced("translator.submit", "translator")
+    def _submit_batch(self, body: Dict[str, Any]) -> str:
+        """Soumet une requête Batch Translation et retourne l'ID de traduction"""
+        logger.info("📤 Envoi de la requête de traduction...")
+        try:
+            # POST non idempotent : renvoyé seulement sur un refus explicite (429, 503)
+            response = resilience.call(resilience.TRANSLATOR, lambda: self.http.post(
                 self.batch_api_url,
                 headers=self.headers,
                 json=body,
                 timeout=30
-            )
-
-            # Vérification de la réponse
-            if response.status_code != 202:  # 202 = Accepted pour les opérations async
-                error_msg = f"Erreur HTTP {response.status_code}: {response.text}"
-                logger.error(f"❌ {error_msg}")
-                raise Exception(f"Erreur de traduction: {error_msg}")
-
-            # Récupération de l'URL de statut
-            translation_status_url = response.headers.get('Operation-Location')
-            if not translation_status_url:
-                raise Exception("URL de statut de traduction non trouvée dans la réponse")
-
-            # Extraction de l'ID de traduction depuis l'URL
-            translation_id = translation_status_url.split('/')[-1]
-
-            logger.info("✅ Traduction démarrée avec succès")
-            logger.info(f"🆔 Translation ID: {translation_id}")
-            logger.info(f"📍 Status URL: {translation_status_url}")
-
-            return translation_id
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Erreur réseau lors du démarrage: {str(e)}")
-            raise Exception(f"Erreur réseau: {str(e)}")
+            ), idempotent=False)
+            return self._parse_submission(response)
         except Exception as e:
-            logger.error(f"❌ Erreur lors du démarrage: {str(e)}")
-            raise
-
+            raise self._submission_error(e)
+
+    @staticmethod
+    def _submission_error(error: Exception) -> Exception:
+        """Exception à relever pour une soumission échouée (erreur réseau reformulée)"""
+        if isinstance(error, HttpClientError):
+            logger.error(f"❌ Erreur réseau lors du démarrage: {str(error)}")
+            return Exception(f"Erreur réseau: {str(error)}")
+        logger.error(f"❌ Erreur lors du démarrage: {str(error)}")
+        return error
+
+    def _parse_submission(self, response) -> str:
+        """Extrait l'ID de traduction de la réponse de soumission"""
+        # Vérification de la réponse
+        if response.status_code != 202:  # 202 = Accepted pour les opérations async
+            error_msg = f"Erreur HTTP {response.status_code}: {response.text}"
+            logger.error(f"❌ {error_msg}")
+            if response.status_code in SAFE_RETRY_STATUSES:
+                raise TranslatorThrottledError(
+                    f"Erreur de traduction: {error_msg}",
+                    parse_retry_after(response.headers.get("Retry-After")))
+            raise Exception(f"Erreur de traduction: {error_msg}")
+
+        # Récupération de l'URL de statut
+        translation_status_url = response.headers.get('Operation-Location')
+        if not translation_status_url:
+            raise Exception("URL de statut de traduction non trouvée dans la réponse")
+
+        # Extraction de l'ID de traduction depuis l'URL
+        translation_id = translation_status_url.split('/')[-1]
+
+        logger.info("✅ Traduction démarrée avec succès")
+        logger.info(f"🆔 Translation ID: {translation_id}")
+        logger.info(f"📍 Status URL: {translation_status_url}")
+
+        return translation_id
+
+    @traced("translator.get_status", "translator")
     def check_translation_status(self, translation_id: str) -> Dict[str, Any]:
         """
         Vérifie le statut d'une traduction
         Version synchrone pour Azure Functions
         """
+        logger.info(f"🔍 Vérification statut traduction: {translation_id}")
         try:
-            # Construction de l'URL de statut
-            status_url = f"{self.batch_api_url}/{translation_id}"
-
-            # Headers pour la requête de statut
-            status_headers = {
-                'Ocp-Apim-Subscription-Key': self.trans_key
-            }
+            response = resilience.call(resilience.TRANSLATOR, lambda: self.http.get(
+                self._job_url(translation_id), headers=self._key_headers(), timeout=15))
+            return self._parse_status(response)
+        except Exception as e:
+            return self._status_error(e)
 
-            logger.info(f"🔍 Vérification statut traduction: {translation_id}")
+    def _job_url(self, translation_id: str) -> str:
+        return f"{self.batch_api_url}/{translation_id}"
 
-            # Requête de statut
-            response = requests.get(status_url, headers=status_headers, timeout=15)
+    def _key_headers(self) -> Dict[str, str]:
+        return {'Ocp-Apim-Subscription-Key': self.trans_key}
 
-            if response.status_code != 200:
-                error_msg = f"Erreur HTTP {response.status_code}: {response.text}"
-                logger.error(f"❌ Erreur lors de la vérification: {error_msg}")
-                return {
-                    "status": "Failed",
-                    "error": error_msg
-                }
+    def _status_error(self, error: Exception) -> Dict[str, Any]:
+        """
+        Statut d'un job quand Translator n'a pas répondu : transitoire pour une erreur
+        réseau ou un disjoncteur ouvert (le job continue), échec sinon
+        """
+        if isinstance(error, HttpClientError):
+            logger.error(f"❌ Erreur réseau lors de la vérification: {str(error)}")
+            return self._transient_status(f"Erreur réseau: {str(error)}")
+        if isinstance(error, CircuitOpenError):
+            return self._transient_status(str(error), error.retry_after)
+        logger.error(f"❌ Erreur lors de la vérification: {str(error)}")
+        return {
+            "status": "Failed",
+            "error": f"Erreur interne: {str(error)}"
+        }
 
-            # Analyse de la réponse
-            status_data = response.json()
-            api_status = status_data.get('status', 'Unknown')
-
-            # Mapping des statuts Azure vers des statuts simplifiés
-            status_mapping = {
-                'NotStarted': 'Pending',
-                'Running': 'InProgress',
-                'Succeeded': 'Succeeded',
-                'Failed': 'Failed',
-                'Cancelled': 'Failed',
-                'Cancelling': 'InProgress'
+    @staticmethod
+    def _transient_status(error: str, retry_after: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Translator injoignable après les retries : le job, lui, continue
+        Statut non terminal (pas de statut d'origine, donc jamais mis en cache)
+        pour que le client revienne plus tard au lieu de relancer la traduction
+        """
+        status = {
+            "status": "InProgress",
+            "transient": True,
+            "error": error
+        }
+        if retry_after is not None:
+            status["retry_after"] = retry_after
+        return status
+
+    def _parse_status(self, response) -> Dict[str, Any]:
+        """Convertit la réponse de statut Translator en statut simplifié"""
+        if response.status_code in RETRYABLE_STATUSES:
+            error_msg = f"Erreur HTTP {response.status_code}: {response.text[:200]}"
+            logger.warning(f"⚠️ Statut momentanément indisponible: {error_msg}")
+            return self._transient_status(error_msg, parse_retry_after(response.headers.get("Retry-After")))
+        if response.status_code != 200:
+            error_msg = f"Erreur HTTP {response.status_code}: {response.text}"
+            logger.error(f"❌ Erreur lors de la vérification: {error_msg}")
+            return {
+                "status": "Failed",
+                "error": error_msg
             }
 
-            simplified_status = status_mapping.get(api_status, 'Unknown')
+        # Analyse de la réponse
+        status_data = response.json()
+        api_status = status_data.get('status', 'Unknown')
 
-            # Informations détaillées
-            result = {
-                "status": simplified_status,
-                "original_status": api_status,
-                "progress": self._get_progress_info(status_data),
-                "created_at": status_data.get('createdDateTimeUtc'),
-                "last_updated": status_data.get('lastActionDateTimeUtc')
-            }
+        # Mapping des statuts Azure vers des statuts simplifiés
+        simplified_status = self.STATUS_MAPPING.get(api_status, 'Unknown')
 
-            # Ajout des détails d'erreur si échec
-            if simplified_status == 'Failed':
-                result["error"] = self._extract_error_info(status_data)
-
-            # Ajout des statistiques si disponibles
-            if 'summary' in status_data:
-                summary = status_data['summary']
-                result["summary"] = {
-                    "total": summary.get('total', 0),
-                    "failed": summary.get('failed', 0),
-                    "success": summary.get('success', 0),
-                    "in_progress": summary.get('inProgress', 0)
-                }
+        # Informations détaillées
+        result = {
+            "status": simplified_status,
+            "original_status": api_status,
+            "progress": self._get_progress_info(status_data),
+            "created_at": status_data.get('createdDateTimeUtc'),
+            "last_updated": status_data.get('lastActionDateTimeUtc')
+        }
 
-            logger.info(f"📊 Statut: {simplified_status} ({api_status})")
-            return result
+        # Ajout des détails d'erreur si échec
+        if simplified_status == 'Failed':
+            result["error"] = self._extract_error_info(status_data)
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Erreur réseau lors de la vérification: {str(e)}")
-            return {
-                "status": "Failed",
-                "error": f"Erreur réseau: {str(e)}"
+        # Ajout des statistiques si disponibles
+        if 'summary' in status_data:
+            summary = status_data['summary']
+            result["characters_charged"] = summary.get('totalCharacterCharged')
+            result["summary"] = {
+                "total": summary.get('total', 0),
+                "failed": summary.get('failed', 0),
+                "success": summary.get('success', 0),
+                "in_progress": summary.get('inProgress', 0)
             }
-        except Exception as e:
-            logger.error(f"❌ Erreur lors de la vérification: {str(e)}")
-            return {
-                "status": "Failed",
-                "error": f"Erreur interne: {str(e)}"
+
+        logger.info(f"📊 Statut: {simplified_status} ({api_status})")
+        return result
+
+    @traced("translator.get_documents", "translator")
+    def get_documents_status(self, translation_id: str) -> List[Dict[str, Any]]:
+        """
+        Retourne le statut de chaque document d'un job (une entrée par langue cible)
+        Suit la pagination @nextLink de l'API
+        """
+        documents_url = f"{self._job_url(translation_id)}/documents"
+        documents = []
+
+        while documents_url:
+            response = resilience.call(resilience.TRANSLATOR, lambda: self.http.get(
+                documents_url, headers=self._key_headers(), timeout=15))
+            page, documents_url = self._parse_documents_page(response)
+            documents.extend(page)
+
+        return documents
+
+    def _parse_documents_page(self, response) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Documents d'une page de /documents et lien vers la page suivante"""
+        if response.status_code != 200:
+            raise Exception(f"Erreur HTTP {response.status_code}: {response.text}")
+
+        payload = response.json()
+        documents = []
+        for document in payload.get('value', []):
+            api_status = document.get('status', 'Unknown')
+            entry = {
+                "language": document.get('to'),
+                "status": self.STATUS_MAPPING.get(api_status, 'Unknown'),
+                "original_status": api_status,
+                "output_blob_name": self._blob_name_from_url(document.get('path')),
+                "source_blob_name": self._blob_name_from_url(document.get('sourcePath')),
+                "characters_charged": document.get('characterCharged')
             }
+            if 'error' in document:
+                entry["error"] = self._extract_error_info(document)
+            documents.append(entry)
 
+        return documents, payload.get('@nextLink')
+
+    @traced("translator.cancel", "translator")
     def cancel_translation(self, translation_id: str) -> bool:
         """Annule une traduction en cours"""
         try:
-            cancel_url = f"{self.batch_api_url}/{translation_id}"
-
-            response = requests.delete(
-                cancel_url,
-                headers={'Ocp-Apim-Subscription-Key': self.trans_key},
-                timeout=15
-            )
-
-            if response.status_code in [200, 204]:
-                logger.info(f"✅ Traduction {translation_id} annulée")
-                return True
-            else:
-                logger.error(f"❌ Erreur lors de l'annulation: {response.status_code}")
-                return False
-
+            response = resilience.call(resilience.TRANSLATOR, lambda: self.http.delete(
+                self._job_url(translation_id), headers=self._key_headers(), timeout=15))
+            return self._parse_cancellation(translation_id, response)
         except Exception as e:
             logger.error(f"❌ Erreur lors de l'annulation: {str(e)}")
             return False
 
+    @staticmethod
+    def _parse_cancellation(translation_id: str, response) -> bool:
+        if response.status_code in [200, 204]:
+            logger.info(f"✅ Traduction {translation_id} annulée")
+            return True
+        logger.error(f"❌ Erreur lors de l'annulation: {response.status_code}")
+        return False
+
     def _get_progress_info(self, status_data: Dict[str, Any]) -> str:
         """Extrait les informations de progression"""
         if 'summary' in status_data:
@@ -223,6 +383,15 @@ class TranslationService:
 
         return status_data.get('status', 'En cours...')
 
+    def _blob_name_from_url(self, url: Optional[str]) -> Optional[str]:
+        """Extrait le nom du blob (sans conteneur ni SAS) d'une URL de document"""
+        if not url:
+            return None
+        from urllib.parse import unquote, urlparse
+        path = urlparse(url).path.lstrip('/')
+        # Le premier segment est le conteneur
+        return unquote(path.split('/', 1)[1]) if '/' in path else None
+
     def _extract_error_info(self, status_data: Dict[str, Any]) -> str:
         """Extrait les informations d'erreur détaillées"""
         # Vérification des erreurs dans le summary
@@ -236,4 +405,76 @@ class TranslationService:
                 return error.get('message', 'Erreur inconnue')
             return str(error)
 
-        return "Traduction échouée pour une raison inconnue"
\ No newline at end of file
+        return "Traduction échouée pour une raison inconnue"
+
+class AsyncTranslationService(TranslationService):
+    """
+    Variante asynchrone de TranslationService (client HTTP aiohttp partagé par la boucle)
+    Toutes les méthodes réseau sont des coroutines, l'analyse des réponses est partagée
+    """
+
+    def _http_client(self):
+        # Client aiohttp de la boucle : la session ``requests`` n'est jamais construite
+        return get_async_http_client()
+
+    async def start_translation(self, source_url: str, target_url: Optional[str] = None,
+                                target_language: Optional[str] = None,
+                                targets: Optional[List[Dict[str, str]]] = None) -> str:
+        """Démarre une traduction batch"""
+        return await self._submit_batch(self._file_batch_body(source_url, target_url, target_language, targets))
+
+    async def start_folder_translation(self, source_url: str, prefix: str,
+                                       targets: List[Dict[str, str]]) -> str:
+        """Démarre une traduction batch de type Folder (plusieurs documents)"""
+        return await self._submit_batch(self._folder_batch_body(source_url, prefix, targets))
+
+    @traced("translator.submit", "translator")
+    async def _submit_batch(self, body: Dict[str, Any]) -> str:
+        """Soumet une requête Batch Translation et retourne l'ID de traduction"""
+        logger.info("📤 Envoi de la requête de traduction...")
+        try:
+            response = await resilience.call_async(resilience.TRANSLATOR, lambda: self.http.post(
+                self.batch_api_url,
+                headers=self.headers,
+                json=body,
+                timeout=30
+            ), idempotent=False)
+            return self._parse_submission(response)
+        except Exception as e:
+            raise self._submission_error(e)
+
+    @traced("translator.get_status", "translator")
+    async def check_translation_status(self, translation_id: str) -> Dict[str, Any]:
+        """Vérifie le statut d'une traduction"""
+        logger.info(f"🔍 Vérification statut traduction: {translation_id}")
+        try:
+            response = await resilience.call_async(resilience.TRANSLATOR, lambda: self.http.get(
+                self._job_url(translation_id), headers=self._key_headers(), timeout=15))
+            return self._parse_status(response)
+        except Exception as e:
+            return self._status_error(e)
+
+    @traced("translator.get_documents", "translator")
+    async def get_documents_status(self, translation_id: str) -> List[Dict[str, Any]]:
+        """Statut de chaque document d'un job, pagination @nextLink comprise"""
+        documents_url = f"{self._job_url(translation_id)}/documents"
+        documents = []
+
+        while documents_url:
+            response = await resilience.call_async(resilience.TRANSLATOR, lambda: self.http.get(
+                documents_url, headers=self._key_headers(), timeout=15))
+            page, documents_url = self._parse_documents_page(response)
+            documents.extend(page)
+
+        return documents
+
+    @traced("translator.cancel", "translator")
+    async def cancel_translation(self, translation_id: str) -> bool:
+        """Annule une traduction en cours"""
+        try:
+            response = await resilience.call_async(resilience.TRANSLATOR, lambda: self.http.delete(
+                self._job_url(translation_id), headers=self._key_headers(), timeout=15))
+            return self._parse_cancellation(translation_id, response)
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de l'annulation: {str(e)}")
+            return False
@@ -2,57 +2,101 @@
 Helpers pour les réponses HTTP Azure Functions
 """
 
+import hashlib
 import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, NamedTuple, Optional
 import azure.functions as func
 from datetime import datetime
+from shared.config import Config
+from shared.services import tracing
 
 logger = logging.getLogger(__name__)
 
+# En-têtes constants, copiés à chaque réponse plutôt que reconstruits
+_SERVICE_HEADERS = {
+    'Content-Type': 'application/json; charset=utf-8',
+    'X-Service': 'Azure-Functions-Translation'
+}
+_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-Requested-With'
+}
+_RESPONSE_CORS_HEADERS = {**_CORS_HEADERS, 'Timing-Allow-Origin': '*'}
+_ERROR_HEADERS = {**_SERVICE_HEADERS, **_CORS_HEADERS}
+
+_UNRESOLVED = object()
+_orjson_module: Any = _UNRESOLVED
+
+
+def _orjson():
+    """Module orjson si RESPONSE_JSON_ENCODER le permet et qu'il est installé, sinon None"""
+    global _orjson_module
+    if Config.RESPONSE_JSON_ENCODER == 'json':
+        return None
+    if _orjson_module is _UNRESOLVED:
+        try:
+            import orjson
+            _orjson_module = orjson
+        except ImportError:
+            if Config.RESPONSE_JSON_ENCODER == 'orjson':
+                logger.warning("⚠️ Paquet 'orjson' absent, sérialisation avec json")
+            _orjson_module = None
+    return _orjson_module
+
+
+def serialize_json(payload: Any) -> bytes:
+    """
+    Corps JSON UTF-8 d'une réponse : compact sauf RESPONSE_JSON_COMPACT=false
+    orjson est utilisé s'il est disponible ; les valeurs qu'il refuse passent par json
+    """
+    compact = Config.RESPONSE_JSON_COMPACT
+    orjson = _orjson()
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | (0 if compact else orjson.OPT_INDENT_2))
+        except TypeError:
+            pass
+    if compact:
+        return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(payload, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _utc_timestamp() -> str:
+    return datetime.utcnow().isoformat() + 'Z'
+
 
 def create_response(data: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> func.HttpResponse:
     """
     Crée une réponse HTTP standardisée pour Azure Functions
     """
     try:
-        # Headers par défaut
-        default_headers = {
-            'Content-Type': 'application/json; charset=utf-8',
-            'X-Timestamp': datetime.utcnow().isoformat() + 'Z',
-            'X-Service': 'Azure-Functions-Translation'
-        }
+        # Un seul horodatage pour l'en-tête et le corps
+        timestamp = _utc_timestamp()
+        response_headers = dict(_SERVICE_HEADERS)
+        response_headers['X-Timestamp'] = timestamp
+        # Durées par dépendance (Server-Timing) et identifiant de trace
+        response_headers.update(tracing.response_headers())
         
         if headers:
-            default_headers.update(headers)
+            response_headers.update(headers)
         
         # Ajout des headers CORS si nécessaire
-        if 'Access-Control-Allow-Origin' not in default_headers:
-            default_headers['Access-Control-Allow-Origin'] = '*'
-            default_headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
-            default_headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, X-Requested-With'
-        
-        # Sérialisation des données
-        if isinstance(data, dict):
-            # Ajout des métadonnées de réponse
-            response_data = {
-                'success': True,
-                'timestamp': datetime.utcnow().isoformat() + 'Z',
-                'data': data
-            }
-        else:
-            response_data = {
-                'success': True,
-                'timestamp': datetime.utcnow().isoformat() + 'Z',
-                'result': data
-            }
+        if 'Access-Control-Allow-Origin' not in response_headers:
+            response_headers.update(_RESPONSE_CORS_HEADERS)
         
-        json_data = json.dumps(response_data, ensure_ascii=False, indent=2)
+        # Ajout des métadonnées de réponse
+        response_data = {
+            'success': True,
+            'timestamp': timestamp,
+            'data' if isinstance(data, dict) else 'result': data
+        }
         
         return func.HttpResponse(
-            body=json_data,
+            body=serialize_json(response_data),
             status_code=status_code,
-            headers=default_headers,
+            headers=response_headers,
             mimetype='application/json'
         )
         
@@ -63,14 +107,16 @@ def create_response(data: Any, status_code: int = 200, headers: Optional[Dict[st
 
 def create_error_response(message: str, status_code: int = 400, 
                          error_code: Optional[str] = None,
-                         details: Optional[Dict[str, Any]] = None) -> func.HttpResponse:
+                         details: Optional[Dict[str, Any]] = None,
+                         headers: Optional[Dict[str, str]] = None) -> func.HttpResponse:
     """
     Crée une réponse d'erreur standardisée
     """
     try:
+        timestamp = _utc_timestamp()
         error_data = {
             'success': False,
-            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'timestamp': timestamp,
             'error': {
                 'message': message,
                 'status_code': status_code
@@ -84,21 +130,16 @@ def create_error_response(message: str, status_code: int = 400,
             error_data['error']['details'] = details
         
         # Headers avec CORS
-        headers = {
-            'Content-Type': 'application/json; charset=utf-8',
-            'X-Timestamp': datetime.utcnow().isoformat() + 'Z',
-            'X-Service': 'Azure-Functions-Translation',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
-            'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-Requested-With'
-        }
-        
-        json_data = json.dumps(error_data, ensure_ascii=False, indent=2)
+        response_headers = dict(_ERROR_HEADERS)
+        response_headers['X-Timestamp'] = timestamp
+        response_headers.update(tracing.response_headers())
+        if headers:
+            response_headers.update(headers)
         
         return func.HttpResponse(
-            body=json_data,
+            body=serialize_json(error_data),
             status_code=status_code,
-            headers=headers,
+            headers=response_headers,
             mimetype='application/json'
         )
         
@@ -113,6 +154,67 @@ def create_error_response(message: str, status_code: int = 400,
         )
 
 
+class _CatalogEntry(NamedTuple):
+    source: Dict[str, Any]
+    body: bytes
+    headers: Dict[str, str]
+    etag: str
+
+
+_catalog_entries: Dict[str, _CatalogEntry] = {}
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparaison faible de If-None-Match (RFC 9110) : liste d'ETags ou '*'"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+def _build_catalog_entry(source: Dict[str, Any], build: Callable[[Dict[str, Any]], Any]) -> _CatalogEntry:
+    # Sans horodatage : corps identique d'une instance à l'autre, donc ETag fort stable
+    body = serialize_json({'success': True, 'data': build(source)})
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    headers = {
+        **_SERVICE_HEADERS,
+        **_RESPONSE_CORS_HEADERS,
+        'ETag': etag,
+        'Cache-Control': f'public, max-age={Config.CATALOG_CACHE_MAX_AGE_SECONDS}'
+    }
+    return _CatalogEntry(dict(source), body, headers, etag)
+
+
+def create_catalog_response(req: func.HttpRequest, name: str, source: Dict[str, Any],
+                            build: Callable[[Dict[str, Any]], Any]) -> func.HttpResponse:
+    """
+    Réponse d'un catalogue statique (langues, formats) : corps, ETag et en-têtes calculés
+    une fois par contenu de ``source`` et régénérés seulement s'il change
+    If-None-Match correspondant → 304 sans corps
+    """
+    entry = _catalog_entries.get(name)
+    if entry is None or entry.source != source:
+        entry = _build_catalog_entry(source, build)
+        _catalog_entries[name] = entry
+        logger.info(f"📦 Catalogue '{name}' sérialisé ({len(entry.body)} octets, ETag {entry.etag})")
+
+    headers = dict(entry.headers)
+    headers.update(tracing.response_headers())
+    if req.method.upper() in ('GET', 'HEAD') and _etag_matches(req.headers.get('If-None-Match'), entry.etag):
+        del headers['Content-Type']
+        return func.HttpResponse(body=b'', status_code=304, headers=headers)
+
+    return func.HttpResponse(
+        body=entry.body,
+        status_code=200,
+        headers=headers,
+        mimetype='application/json'
+    )
+
+
 def create_health_response(service_status: Dict[str, Any]) -> func.HttpResponse:
     """
     Crée une réponse spécifique pour le health check
@@ -147,9 +249,7 @@ def create_cors_preflight_response() -> func.HttpResponse:
     Crée une réponse pour les requêtes OPTIONS (CORS preflight)
     """
     headers = {
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
-        'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-Requested-With',
+        **_CORS_HEADERS,
         'Access-Control-Max-Age': '86400',  # 24 heures
         'Content-Length': '0'
     }
@@ -2,21 +2,43 @@
 Démarre une nouvelle traduction de document
 """
 
+import asyncio
 import azure.functions as func
 import logging
+import math
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO)
+# Journalisation configurée par le worker Azure Functions
 logger = logging.getLogger(__name__)
 
 # Import des handlers
 from shared.utils.response_helper import create_response, create_error_response
-from shared.services.blob_service import BlobService
-from shared.services.translation_service import TranslationService
+from shared.services.service_registry import (
+    get_async_blob_service,
+    get_async_translation_service,
+    get_completion_estimator,
+    get_intake_service,
+    get_translation_cache
+)
+from shared.services.resilience import CircuitOpenError, with_deadline
+from shared.services.translation_cache import CACHED_TRANSLATION_PREFIX
+from shared.services.translation_service import TranslatorThrottledError
+from shared.services.storage_metrics import track_round_trips
+from shared.services.state_manager import StateManager
+from shared.models.constants import normalize_target_languages
+from shared.config import Config
+from shared.services.tracing import span, trace_request, traced
 
-def main(req: func.HttpRequest) -> func.HttpResponse:
+@trace_request("start_translation")
+@track_round_trips("start_translation")
+@with_deadline()
+async def main(req: func.HttpRequest) -> func.HttpResponse:
     """
     Démarre une nouvelle traduction de document
+    Handler asynchrone : Storage et Translator sont appelés sans bloquer le worker
     """
     logger.info("🚀 Démarrage d'une nouvelle traduction")
 
@@ -29,44 +51,351 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
         except ValueError as e:
             return create_error_response(f"JSON invalide: {str(e)}", 400)
 
-        required_fields = ["blob_name", "target_language", "user_id"]
+        # Mode multi-documents : une liste de blobs traduits par lots Folder
+        if "blob_names" in data:
+            return await _start_folder_job(data)
+
+        required_fields = ["blob_name", "user_id"]
         for field in required_fields:
             if field not in data:
                 return create_error_response(f"Paramètre manquant: {field}", 400)
 
         blob_name = data["blob_name"]
-        target_language = data["target_language"]
         user_id = data["user_id"]
 
-        # 1. Vérifier l’existence du blob
-        blob_service = BlobService()
-        if not blob_service.check_blob_exists(blob_name):
+        # Une langue ("fr") ou plusieurs (["fr", "de"] / "fr,de") traduites dans un seul job
+        target_languages = normalize_target_languages(
+            data.get("target_languages") or data.get("target_language"))
+        if not target_languages:
+            return create_error_response("Paramètre manquant: target_language", 400)
+        if len(target_languages) > Config.MAX_TARGET_LANGUAGES:
+            return create_error_response(
+                f"Trop de langues cibles ({len(target_languages)}, max {Config.MAX_TARGET_LANGUAGES})", 400)
+
+        blob_service = get_async_blob_service()
+        translation_service = get_async_translation_service()
+        output_blob_names = {
+            language: blob_service.build_output_blob_name(blob_name, language)
+            for language in target_languages
+        }
+
+        # 1. Vérifier l’existence du blob (taille et Content-MD5 lus en une requête),
+        #    puis consulter le cache des traductions
+        source = await blob_service.get_source_properties(blob_name)
+        if source is None:
             return create_error_response(f"Fichier '{blob_name}' non trouvé", 404)
 
-        # 2. Construire les URLs SAS
-        blob_urls = blob_service.prepare_translation_urls(blob_name, target_language)
-        source_url = blob_urls["source_url"]
-        target_url = blob_urls["target_url"]
+        translation_cache = get_translation_cache()
+        content_hash = None
+        if translation_cache.enabled:
+            # Sans Content-MD5, pas de lecture complète de la source au-delà du seuil : cache ignoré
+            content_hash = await blob_service.get_content_hash(
+                blob_name, source, max_read_size=int(Config.TRANSLATION_CACHE_HASH_MAX_MB * 1024 * 1024))
+        if content_hash:
+            # Le cache partage son état avec les handlers synchrones (threads) :
+            # copies et attente d'une soumission concurrente hors de la boucle
+            with span("start.translation_cache"):
+                cache = await asyncio.to_thread(
+                    translation_cache.resolve,
+                    content_hash, output_blob_names, translation_service.get_cache_options())
+        else:
+            cache = {"hits": [], "attached": {}, "submit": dict.fromkeys(target_languages)}
+
+        # Toutes les langues déjà traduites : résultat immédiat
+        if not cache["submit"] and not cache["attached"]:
+            return create_response({
+                "success": True,
+                "translation_id": f"{CACHED_TRANSLATION_PREFIX}{content_hash}",
+                "message": f"Traduction servie depuis le cache pour {blob_name}",
+                "status": "Succeeded",
+                "cached": True,
+                "target_language": target_languages[0] if len(target_languages) == 1 else target_languages,
+                "output_blob_names": output_blob_names
+            }, 200)
+
+        estimator = get_completion_estimator()
+        submitted_languages = list(cache["submit"]) or target_languages
+        eta_description = estimator.describe_job(blob_name, source.size, submitted_languages)
+
+        translation_id = None
+        intake = get_intake_service()
+        queued = None
+        if cache["submit"] and intake.enabled:
+            # 2-4. File d'admission : le répartiteur construit les URLs SAS et démarre le job
+            try:
+                queued = await _enqueue(user_id, intake.lane_for(data.get("priority")), source.size, {
+                    "kind": "document",
+                    "blob_name": blob_name,
+                    "languages": list(cache["submit"]),
+                    "eta_job": eta_description
+                })
+            except Exception:
+                if content_hash:
+                    translation_cache.abandon(cache["submit"])
+                raise
+            translation_id = queued["intake_id"]
+            # Requêtes identiques rattachées à la requête en file (résolue par check_status)
+            if content_hash:
+                translation_cache.register_job(cache["submit"], translation_id, output_blob_names)
+        elif cache["submit"]:
+            submit_languages = list(cache["submit"])
+            try:
+                # 2. Construire les URLs SAS (une cible par langue à traduire)
+                blob_urls = await blob_service.prepare_translation_urls(blob_name, submit_languages)
+
+                # 3. Démarrer la traduction
+                translation_id = await translation_service.start_translation(
+                    source_url=blob_urls["source_url"],
+                    targets=blob_urls["targets"]
+                )
+            except Exception:
+                if content_hash:
+                    translation_cache.abandon(cache["submit"])
+                raise
+
+            if content_hash:
+                translation_cache.register_job(cache["submit"], translation_id, output_blob_names)
+
+            # 4. Sorties attendues, complétées par les événements BlobCreated
+            await _register_expected_outputs(
+                translation_id, [target["output_blob_name"] for target in blob_urls["targets"]])
 
-        # 3. Démarrer la traduction
-        translation_service = TranslationService()
-        translation_id = translation_service.start_translation(
-            source_url=source_url,
-            target_url=target_url,
-            target_language=target_language
-        )
+        # Langues réparties entre le job soumis et des jobs en cours : tous leurs IDs sont renvoyés
+        translation_ids = [translation_id] if translation_id else []
+        for attached_id in cache["attached"].values():
+            if attached_id not in translation_ids:
+                translation_ids.append(attached_id)
+        translation_id = translation_ids[0]
+
+        # 5. Durée attendue (historique des jobs terminés) et délai conseillé avant check_status
+        #    Requête en file : estimation enregistrée par le répartiteur à la soumission
+        #    Jobs rattachés : estimation enregistrée à leur soumission ; attente jusqu'au plus long
+        eta_jobs = await asyncio.gather(*(
+            _estimate_completion(
+                job_translation_id, eta_description,
+                register=job_translation_id == translation_id and bool(cache["submit"]) and queued is None)
+            for job_translation_id in translation_ids
+        ))
+        eta_job = max(eta_jobs, key=lambda eta: eta["started_at"] + eta["estimated_seconds"])
+        poll_hint = estimator.poll_hint(eta_job)
 
         result = {
             "success": True,
             "translation_id": translation_id,
-            "message": f"Traduction démarrée avec succès pour {blob_name}",
-            "status": "En cours",
-            "target_language": target_language,
-            "estimated_time": "2-5 minutes"
+            "message": (f"Traduction mise en file pour {blob_name}" if queued
+                        else f"Traduction démarrée avec succès pour {blob_name}"),
+            "status": "En file d'attente" if queued else "En cours",
+            "target_language": target_languages[0] if len(target_languages) == 1 else target_languages,
+            "estimated_time": estimator.describe(eta_job["estimated_seconds"]),
+            "estimated_seconds": eta_job["estimated_seconds"],
+            **poll_hint
         }
-        return create_response(result, 202)
+        if len(translation_ids) > 1:
+            # À suivre via check_status?translation_ids=..., comme un job multi-documents
+            result["translation_ids"] = translation_ids
+        if queued:
+            result["queued"] = True
+            result["lane"] = queued["lane"]
+        if len(target_languages) > 1:
+            result["target_languages"] = target_languages
+            result["output_blob_names"] = output_blob_names
+        if cache["hits"] or cache["attached"]:
+            result["cache"] = {
+                "hits": cache["hits"],
+                "attached": cache["attached"]
+            }
+        return create_response(result, 202, headers={"Retry-After": str(poll_hint["next_poll_after"])})
 
+    except (TranslatorThrottledError, CircuitOpenError) as e:
+        # Translator saturé ou coupé malgré les retries : le client réessaie après le délai indiqué
+        retry_after = max(math.ceil(e.retry_after or Config.POLL_DEFAULT_SECONDS), 1)
+        logger.warning(f"⚠️ Traduction non soumise, Translator indisponible: {str(e)}")
+        return create_error_response(
+            f"Service de traduction momentanément indisponible: {str(e)}", 503,
+            error_code="TRANSLATOR_UNAVAILABLE", headers={"Retry-After": str(retry_after)})
     except Exception as e:
         logger.error(f"❌ Erreur traduction: {str(e)}")
         return create_error_response(f"Erreur lors de la traduction: {str(e)}", 500)
 
+
+@traced("start.register_expected_outputs")
+async def _register_expected_outputs(translation_id: str, output_blob_names: list) -> None:
+    """Enregistre les sorties attendues ; hors de la boucle si le backend d'état est distant"""
+    state_manager = StateManager()
+    if state_manager.local:
+        state_manager.register_expected_outputs(translation_id, output_blob_names)
+    else:
+        await asyncio.to_thread(state_manager.register_expected_outputs, translation_id, output_blob_names)
+
+
+@traced("start.estimate_completion")
+async def _estimate_completion(translation_id: str, job: Dict[str, Any], register: bool) -> Dict[str, Any]:
+    """
+    Job soumis par cette requête : estimation enregistrée pour le suivi de check_status
+    Job existant (rattachement) : estimation enregistrée à sa soumission, sinon recalculée
+    """
+    estimator = get_completion_estimator()
+
+    def run() -> Dict[str, Any]:
+        existing = None if register else estimator.get_job(translation_id)
+        if existing is not None:
+            return existing
+        estimate = estimator.estimate(job)
+        if register:
+            return estimator.register_job(translation_id, job, estimate)
+        return {**job, "started_at": time.time(), "estimated_seconds": estimate["seconds"]}
+
+    if StateManager().local:
+        return run()
+    return await asyncio.to_thread(run)
+
+
+async def _enqueue(user_id: str, lane: str, size: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Dépose une soumission dans la file d'admission ; hors de la boucle si file ou état sont distants"""
+    intake = get_intake_service()
+    if intake.local:
+        return intake.enqueue(user_id, lane, size, payload)
+    return await asyncio.to_thread(intake.enqueue, user_id, lane, size, payload)
+
+
+async def _cancel_queued(intake_id: str, reason: str) -> bool:
+    """Annule une soumission encore en file ; hors de la boucle si file ou état sont distants"""
+    intake = get_intake_service()
+    if intake.local:
+        translation_id = intake.cancel(intake_id, reason)
+    else:
+        translation_id = await asyncio.to_thread(intake.cancel, intake_id, reason)
+    if translation_id:
+        # Déjà soumise par le répartiteur : le job Translator est annulé lui aussi
+        return await get_async_translation_service().cancel_translation(translation_id)
+    return True
+
+
+async def _abort_partial_job(job_id: str, results: List[Any], cancel: Callable[[Any], Awaitable[Any]]) -> None:
+    """
+    Un job multi-lots est tout ou rien : si un sous-lot a échoué, les sous-lots acceptés
+    sont annulés (aucun ID ne serait renvoyé au client) puis l'erreur est relevée
+    """
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if not errors:
+        return
+    accepted = [result for result in results if not isinstance(result, BaseException)]
+    logger.error(
+        f"❌ Job {job_id}: {len(errors)} sous-lot(s) refusé(s), annulation de {len(accepted)} sous-lot(s) accepté(s)")
+    outcomes = await asyncio.gather(*(cancel(result) for result in accepted), return_exceptions=True)
+    for result, outcome in zip(accepted, outcomes):
+        if isinstance(outcome, BaseException) or outcome is False:
+            logger.warning(f"⚠️ Job {job_id}: annulation du sous-lot {result} impossible")
+    raise errors[0]
+
+
+def _batch_format(blob_names: List[str]) -> str:
+    """Nom représentatif du format d'un lot : extension commune, sinon aucune"""
+    extensions = {os.path.splitext(name)[1].lower() for name in blob_names}
+    return f"batch{extensions.pop()}" if len(extensions) == 1 else "batch"
+
+
+async def _start_folder_job(data: dict) -> func.HttpResponse:
+    """
+    Démarre un job multi-documents
+    Les sources sont regroupées sous un préfixe propre au job et soumises
+    en un ou plusieurs lots Folder selon les limites de l'API Batch
+    """
+    blob_names = data.get("blob_names")
+    if not isinstance(blob_names, list) or not blob_names:
+        return create_error_response("Le paramètre blob_names doit être une liste non vide", 400)
+    if "user_id" not in data:
+        return create_error_response("Paramètre manquant: user_id", 400)
+
+    target_languages = normalize_target_languages(
+        data.get("target_languages") or data.get("target_language"))
+    if not target_languages:
+        return create_error_response("Paramètre manquant: target_language", 400)
+    if len(target_languages) > Config.MAX_TARGET_LANGUAGES:
+        return create_error_response(
+            f"Trop de langues cibles ({len(target_languages)}, max {Config.MAX_TARGET_LANGUAGES})", 400)
+
+    job_id = uuid.uuid4().hex
+    blob_service = get_async_blob_service()
+    job = await blob_service.prepare_folder_job(blob_names, target_languages, job_id)
+
+    if job["missing"]:
+        return create_error_response(
+            f"Fichiers non trouvés: {', '.join(job['missing'])}", 404,
+            error_code="BLOBS_NOT_FOUND", details={"missing": job["missing"]})
+    if job["too_large"]:
+        return create_error_response(
+            f"Fichiers trop volumineux (max {Config.BATCH_MAX_DOCUMENT_SIZE_MB} MB): "
+            f"{', '.join(job['too_large'])}", 413,
+            error_code="DOCUMENT_TOO_LARGE", details={"too_large": job["too_large"]})
+
+    estimator = get_completion_estimator()
+    eta_descriptions = [
+        estimator.describe_job(_batch_format(batch["documents"]), batch["size"], target_languages,
+                               documents=len(batch["documents"]))
+        for batch in job["batches"]
+    ]
+
+    intake = get_intake_service()
+    if intake.enabled:
+        # File d'admission (voie bulk par défaut) : un message par sous-lot, URLs SAS faites à la soumission
+        lane = intake.lane_for(data.get("priority"), bulk=True)
+        queued = await asyncio.gather(*(
+            _enqueue(data["user_id"], lane, batch["size"], {
+                "kind": "batch",
+                "prefix": batch["prefix"],
+                "documents": batch["documents"],
+                "languages": target_languages,
+                "eta_job": eta_description
+            })
+            for batch, eta_description in zip(job["batches"], eta_descriptions)
+        ), return_exceptions=True)
+        await _abort_partial_job(
+            job_id, queued, lambda entry: _cancel_queued(entry["intake_id"], f"Job {job_id} incomplet"))
+        translation_ids = [entry["intake_id"] for entry in queued]
+    else:
+        # Sous-lots soumis en parallèle, l'ordre des réponses suit celui des lots
+        translation_service = get_async_translation_service()
+        translation_ids = await asyncio.gather(*(
+            translation_service.start_folder_translation(
+                source_url=batch["source_url"],
+                prefix=batch["prefix"],
+                targets=batch["targets"]
+            )
+            for batch in job["batches"]
+        ), return_exceptions=True)
+        await _abort_partial_job(job_id, translation_ids, translation_service.cancel_translation)
+    # Durée attendue du job : celle de son lot le plus long
+    eta_jobs = await asyncio.gather(*(
+        _estimate_completion(translation_id, eta_description, register=not intake.enabled)
+        for eta_description, translation_id in zip(eta_descriptions, translation_ids)
+    ))
+    eta_job = max(eta_jobs, key=lambda eta: eta["started_at"] + eta["estimated_seconds"])
+    poll_hint = estimator.poll_hint(eta_job)
+
+    batches = []
+    for batch, translation_id in zip(job["batches"], translation_ids):
+        batches.append({
+            "translation_id": translation_id,
+            "documents": len(batch["documents"]),
+            "size": batch["size"],
+            "output_prefixes": {
+                target["language"]: target["output_prefix"] for target in batch["targets"]
+            }
+        })
+
+    result = {
+        "success": True,
+        "job_id": job_id,
+        "translation_ids": list(translation_ids),
+        "message": (f"Traduction mise en file pour {len(blob_names)} documents en {len(batches)} lot(s)"
+                    if intake.enabled else
+                    f"Traduction démarrée pour {len(blob_names)} documents en {len(batches)} lot(s)"),
+        "status": "En file d'attente" if intake.enabled else "En cours",
+        "target_languages": target_languages,
+        "batches": batches,
+        "estimated_time": estimator.describe(eta_job["estimated_seconds"]),
+        "estimated_seconds": eta_job["estimated_seconds"],
+        **poll_hint
+    }
+    return create_response(result, 202, headers={"Retry-After": str(poll_hint["next_poll_after"])})